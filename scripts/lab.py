@@ -6,11 +6,15 @@ Modes:
   --audit     : Comprehensive analysis of harvest logs (Accuracy, PnL, Coverage)
   --optimize  : Genetic evolutionary grid search for V2 strategy parameters
   --refine    : The Loop™ - Audits, checks threshold (default 80%), and auto-optimizes if needed.
+  --error-tables : Folds newly settled days of the weather harvest into the forecast-error tables.
+  --candles   : Backfills Coinbase spot candles into the local store (resumable; only missing ranges).
 
 Usage:
   python scripts/lab.py --audit
   python scripts/lab.py --optimize [--strategy crypto|weather]
   python scripts/lab.py --refine [--threshold 80]
+  python scripts/lab.py --error-tables
+  python scripts/lab.py --candles [--days 90 --granularity 60]
 """
 
 import os
@@ -20,16 +24,20 @@ import json
 import itertools
 import argparse
 import pandas as pd
+import time
 from datetime import datetime
 from typing import List, Dict, Any
 
 # Ensure project root is in path
 sys.path.append(os.getcwd())
 
-from src.core.interfaces import MarketData
+from src.core.interfaces import MarketDataBatch, SignalBatch
 from src.core.matching_engine import SimulatedExchange
+from src.data.candle_store import CandleStore, backfill
+from src.data.coinbase_provider import CoinbaseProvider
 from src.strategies.crypto_strategy import Crypto15mTrendStrategyV2
 from src.strategies.weather_strategy import WeatherArbitrageStrategyV2
+from src.strategies.forecast_error import ForecastErrorTables, DEFAULT_TABLES_PATH, read_harvest
 from src.utils.logger import logger
 
 # --- CONFIGURATION ---
@@ -39,7 +47,7 @@ OPTIMAL_PARAMS_FILE = os.path.join(LOG_DIR, "optimal_params.json")
 
 class Lab:
     def __init__(self):
-        self.data = []
+        self.df = pd.DataFrame()
         self._load_data()
         
     def _load_data(self):
@@ -75,9 +83,56 @@ class Lab:
         full_df = pd.concat(df_list, ignore_index=True)
         full_df['Timestamp'] = pd.to_datetime(full_df['Timestamp'])
         full_df = full_df.sort_values('Timestamp')
+        full_df['Price'] = pd.to_numeric(full_df['Price'], errors='coerce')
+        full_df = full_df.dropna(subset=['Price'])
         
-        self.data = full_df.to_dict('records')
-        print(f"✅ Loaded {len(self.data):,} data points.")
+        self.df = full_df.reset_index(drop=True)
+        print(f"✅ Loaded {len(self.df):,} data points.")
+
+    def _select(self, kind: str) -> pd.DataFrame:
+        """Rows relevant to a strategy family ('crypto' or 'weather')."""
+        symbols = self.df['Symbol'].astype(str)
+        if kind == "crypto":
+            mask = symbols.str.contains("BTC") | symbols.str.contains("ETH")
+        else:
+            mask = symbols.str.contains("HIGH") | symbols.str.contains("LOW") | symbols.str.contains("RAIN")
+        return self.df[mask]
+
+    def _build_batch(self, df: pd.DataFrame, source: str) -> MarketDataBatch:
+        """Columnar view of harvest rows for Strategy.analyze_batch (built once per strategy)."""
+        price = df['Price'].astype(float)
+        bid = pd.to_numeric(df['Bid'], errors='coerce').fillna(price) if 'Bid' in df else price
+        ask = pd.to_numeric(df['Ask'], errors='coerce').fillna(price) if 'Ask' in df else price
+        codes, uniques = pd.factorize(df['Symbol'].astype(str))
+        return MarketDataBatch(
+            timestamps=df['Timestamp'].values,
+            symbol_ids=codes,
+            symbols=list(uniques),
+            bid=bid.values,
+            ask=ask.values,
+            spot=price.values,
+            source=source
+        )
+
+    def _replay(self, oms: SimulatedExchange, batch: MarketDataBatch, signals: SignalBatch,
+                ticker_fmt: str, track_btc: bool):
+        """Marks the OMS and opens batch signals in row order (marks precede same-row entries)."""
+        opened = signals.to_signals(batch)
+        is_btc = batch.per_symbol(lambda sym: "BTC" in sym, dtype=bool)
+        rows = range(len(batch)) if track_btc else signals.rows
+        k = 0
+        for i in rows:
+            if track_btc and is_btc[i]:
+                oms.update_market('BTC', batch.spot[i])
+            while k < len(signals) and signals.rows[k] == i:
+                s = opened[k]
+                ticker = s.symbol if "BTC-USD" not in s.symbol else ticker_fmt.format(row=i)
+                oms.open_position(ticker, s.side, s.limit_price, s.quantity,
+                                  getattr(s, 'stop_loss', 0),
+                                  getattr(s, 'trailing_rules', None),
+                                  getattr(s, 'expiration_time', None),
+                                  contract_side=s.contract_side)
+                k += 1
 
     def run_audit(self) -> Dict[str, Any]:
         """
@@ -87,7 +142,7 @@ class Lab:
         print("\n🔍 LAB: AUDIT REPORT")
         print("====================")
         
-        if not self.data: return {}
+        if self.df.empty: return {}
 
         # Instantiate V2 Strategies
         strategies = {
@@ -101,54 +156,13 @@ class Lab:
         oms_instances = {name: SimulatedExchange() for name in strategies}
         
         count = 0
-        for row in self.data:
-            try:
-                price = float(row['Price'])
-                bid = float(row.get('Bid', price)) if not pd.isna(row.get('Bid')) else price
-                ask = float(row.get('Ask', price)) if not pd.isna(row.get('Ask')) else price
-
-                md = MarketData(
-                    symbol=row['Symbol'],
-                    price=price,
-                    bid=bid,
-                    ask=ask,
-                    volume=0,
-                    timestamp=row['Timestamp'],
-                    extra={'source': 'audit'}
-                )
-            except: continue
-
-            # Route to correct strategy
-            for name, strategy in strategies.items():
-                # Filter for strategy relevance
-                is_crypto = "BTC" in md.symbol or "ETH" in md.symbol
-                is_weather = "HIGH" in md.symbol or "LOW" in md.symbol or "RAIN" in md.symbol
-                
-                if name == "Crypto V2" and is_crypto:
-                    oms = oms_instances[name]
-                    # Update OMS market price for tracking
-                    if "BTC" in md.symbol: oms.update_market('BTC', md.price)
-                    
-                    sigs = strategy.analyze(md)
-                    for s in sigs:
-                        ticker = s.symbol if "BTC-USD" not in s.symbol else f"KXBTC-AUDIT-{count}"
-                        oms.open_position(ticker, s.side, s.limit_price, s.quantity, 
-                                          getattr(s, 'stop_loss', 0), 
-                                          getattr(s, 'trailing_rules', None),
-                                          getattr(s, 'expiration_time', None))
-
-                elif name == "Weather V2" and is_weather:
-                    oms = oms_instances[name]
-                    # Weather doesn't need "update_market" global price usually, specific to contract
-                    # But we simulate fills
-                    sigs = strategy.analyze(md)
-                    for s in sigs:
-                        oms.open_position(s.symbol, s.side, s.limit_price, s.quantity,
-                                          getattr(s, 'stop_loss', 0),
-                                          getattr(s, 'trailing_rules', None),
-                                          getattr(s, 'expiration_time', None))
-                                          
-            count += 1
+        for name, strategy in strategies.items():
+            kind = "crypto" if name == "Crypto V2" else "weather"
+            batch = self._build_batch(self._select(kind), source='audit')
+            # Columnar fast path (per-row fallback for strategies without one)
+            sigs = strategy.analyze_batch(batch)
+            self._replay(oms_instances[name], batch, sigs, "KXBTC-AUDIT-{row}", track_btc=(kind == "crypto"))
+            count += len(batch)
             
         print(f"Processed {count} ticks.")
         
@@ -187,7 +201,7 @@ class Lab:
         print("\n🧬 LAB: EVOLUTIONARY OPTIMIZATION")
         print("===================================")
         
-        if not self.data: return
+        if self.df.empty: return
 
         # Parameter Grids
         # Crypto V2
@@ -219,6 +233,10 @@ class Lab:
             print(f"   Testing {len(combos)} genomes...")
             
             results = []
+
+            # Pre-filter and columnarize once; every genome replays the same batch
+            kind = "crypto" if name == "Crypto V2" else "weather"
+            batch = self._build_batch(self._select(kind), source='opt')
             
             for i, vals in enumerate(combos):
                 params = dict(zip(keys, vals))
@@ -227,42 +245,8 @@ class Lab:
                 oms = SimulatedExchange()
                 strategy = strat_class(**params)
                 
-                count = 0 
-                
-                # Optimized loop: filter data beforehand? 
-                # For simplicity, we stream all, route relevance inside loop (slower but safer)
-                # Or pre-filter self.data for this strategy type to speed up
-                
-                # Pre-filter for speed
-                relevant_data = self.data # Default all
-                if name == "Crypto V2":
-                    relevant_data = [d for d in self.data if "BTC" in d['Symbol'] or "ETH" in d['Symbol']]
-                elif name == "Weather V2":
-                    relevant_data = [d for d in self.data if "HIGH" in d['Symbol'] or "LOW" in d['Symbol']]
-                
-                for row in relevant_data:
-                    try:
-                        md = MarketData(
-                            symbol=row['Symbol'],
-                            price=float(row['Price']),
-                            bid=float(row.get('Bid', row['Price'])),
-                            ask=float(row.get('Ask', row['Price'])),
-                            volume=0, timestamp=row['Timestamp'], extra={'source': 'opt'}
-                        )
-                    except: continue
-                    
-                    if name == "Crypto V2" and "BTC" in md.symbol:
-                        oms.update_market('BTC', md.price)
-                        
-                    sigs = strategy.analyze(md)
-                    for s in sigs:
-                        # Unique ID for simulation
-                        ticker = s.symbol if "BTC-USD" not in s.symbol else f"KXBTC-{i}-{count}"
-                        oms.open_position(ticker, s.side, s.limit_price, s.quantity,
-                                          getattr(s, 'stop_loss', 0),
-                                          getattr(s, 'trailing_rules', None),
-                                          getattr(s, 'expiration_time', None))
-                    count += 1
+                sigs = strategy.analyze_batch(batch)
+                self._replay(oms, batch, sigs, f"KXBTC-{i}-{{row}}", track_btc=(kind == "crypto"))
                     
                 # Score
                 stats = oms.get_stats()
@@ -339,12 +323,63 @@ class Lab:
             
         print("\n✅ Refinement Cycle Complete.")
 
+    def run_error_tables(self, path: str = DEFAULT_TABLES_PATH):
+        """
+        ERROR TABLES MODE: incremental rebuild of the forecast-error lookup tables.
+        Only (city, day) pairs not already in the tables are folded in.
+        """
+        print("\n📐 LAB: FORECAST-ERROR TABLES")
+        print("==========================================")
+        files = sorted(glob.glob(os.path.join(LOG_DIR, "weather_harvest_*.csv")))
+        if not files:
+            print("❌ No weather harvest files found.")
+            return
+
+        tables = ForecastErrorTables.load(path)
+        before = len(tables.processed)
+        added = tables.add_harvest(read_harvest(files))
+        tables.save(path)
+        print(f"Harvest files: {len(files)} | New city-days: {added} | Total: {before + added}")
+
+        for city in sorted(tables.cities):
+            counts = [tables.sample_size(city, h) for h in (1, 4, 9, 18, 36, 72)]
+            print(f"  {city:<12} days per lead bucket (<=2h..>48h): {counts}")
+        print(f"💾 Saved to {path}")
+
+    def run_candle_backfill(self, days: float = 90, granularity: int = 60, product: str = "BTC-USD",
+                            workers: int = 4):
+        """
+        CANDLES MODE: pages Coinbase history into the local candle store.
+        Interrupted runs resume (covered ranges are on disk); backtests read it with spot_history().
+        """
+        print(f"\n🕯️ LAB: SPOT CANDLES ({product}, {granularity}s, {days:g} days)")
+        print("==========================================")
+        store = CandleStore.load(product, granularity)
+        now = int(time.time())
+        added = backfill(CoinbaseProvider(product), store, now - int(days * 86400), now, workers=workers)
+        if len(store):
+            first, last = (datetime.fromtimestamp(t) for t in store.data[[0, -1], 0])
+            print(f"New candles: {added} | Total: {len(store)} | {first:%Y-%m-%d %H:%M} -> {last:%Y-%m-%d %H:%M}")
+        print(f"💾 Saved to {store.path}")
+
+    @staticmethod
+    def spot_history(product: str = "BTC-USD", granularity: int = 60) -> pd.DataFrame:
+        """The local candle store as a DataFrame indexed by bucket start (naive UTC)."""
+        store = CandleStore.load(product, granularity)
+        df = pd.DataFrame(store.data[:, 1:], columns=['low', 'high', 'open', 'close', 'volume'])
+        df.index = pd.to_datetime(store.data[:, 0], unit='s', utc=True).tz_convert(None)
+        return df
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Money Printer Laboratory")
     parser.add_argument("--audit", action="store_true", help="Run strategy audit")
     parser.add_argument("--optimize", action="store_true", help="Run parameter optimization")
     parser.add_argument("--refine", action="store_true", help="Run audit and optimize if needed")
+    parser.add_argument("--error-tables", action="store_true", help="Rebuild forecast-error tables from the weather harvest")
+    parser.add_argument("--candles", action="store_true", help="Backfill Coinbase spot candles into the local store")
+    parser.add_argument("--days", type=float, default=90, help="Candle history to backfill (days)")
+    parser.add_argument("--granularity", type=int, default=60, help="Candle size in seconds (60/300/900/3600/21600/86400)")
     parser.add_argument("--strategy", type=str, default="all", help="Target strategy for optimization (crypto/weather)")
     parser.add_argument("--threshold", type=float, default=80.0, help="Win rate threshold for refinement")
     
@@ -352,7 +387,11 @@ if __name__ == "__main__":
     
     lab = Lab()
     
-    if args.refine:
+    if args.error_tables:
+        lab.run_error_tables()
+    elif args.candles:
+        lab.run_candle_backfill(days=args.days, granularity=args.granularity)
+    elif args.refine:
         lab.run_refinement(threshold=args.threshold)
     elif args.optimize:
         lab.run_optimization(target_strategy=args.strategy)
@@ -1,26 +1,57 @@
 import time
+_BOOT = time.perf_counter()
 import threading
 import os
 import sys
-import re
+from concurrent.futures import ThreadPoolExecutor
 
 # Add project root to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.visualization.dashboard import Dashboard
-from src.data.nws_provider import NWSProvider
+from src.data.nws_provider import NWSProvider, DEFAULT_STATION_META_PATH
 from src.data.coinbase_provider import CoinbaseProvider
 from src.data.kalshi_provider import KalshiProvider
-from src.strategies.weather_strategy import WeatherArbitrageStrategy, WeatherArbitrageStrategyV2
-from src.strategies.crypto_strategy import CryptoArbitrageStrategy, CryptoHourlyStrategy, CryptoHourlyStrategyV3, Crypto15mTrendStrategy, Crypto15mTrendStrategyV2, Crypto15mTrendStrategyV3, CryptoLongShotFader, Crypto15mLateSniper
-from src.core.interfaces import TradeSignal
+from src.data.kalshi_stream import KalshiStreamProvider
+from src.data.coinbase_stream import CoinbaseStreamProvider
+from src.data.quote_cache import QuoteCache
+from src.data.market_index import MarketIndex, event_quotes, rank_markets
+from src.data.candle_store import CandleStore, backfill
+from src.data.async_providers import (AsyncHTTP, AsyncRunner, AsyncCoinbaseProvider, AsyncKalshiProvider,
+                                      AsyncNWSProvider, gather_with_deadline)
+from src.strategies.forecast_error import forecast_harvest_rows, append_harvest
+from src.strategies.registry import StrategyLoadReport, by_role, load_strategies
+from src.strategies.weather_strategy import CITY_CONFIG
+from src.core.interfaces import TradeSignal, EventSnapshot, MarketData
 from src.core.risk_manager import RiskManager
+from src.core.probability_surface import ImpliedProbabilitySurface
 from src.utils.system_utils import prevent_sleep
 from src.utils.logger import logger
 import os
-import copy
+import numpy as np
 from datetime import datetime, timedelta
 
+_CORE_IMPORT_SECONDS = time.perf_counter() - _BOOT
+
+# Strategy names from src.strategies.registry; override with ENABLED_STRATEGIES=weather,crypto_hr,...
+DEFAULT_STRATEGIES = ["weather", "crypto", "crypto_hr", "longshot", "late_sniper"]
+
+# Per-tick fetches (spot, every station, every weather event) run concurrently; late ones are skipped this tick
+TICK_DEADLINE_SEC = 8.0
+# Kalshi quotes younger than this are reused within a tick (positions, ladder, strategies)
+QUOTE_TTL_SEC = 2.0
+# Series kept in a local market index (src.data.market_index), refreshed in the background
+INDEX_REFRESH_SEC = 60
+INDEX_MAX_AGE_SEC = 300  # older indexes are not trusted for resolution (falls back to listing)
+# Spot candles (src.data.candle_store) seed strategy/vol state on startup; the store is topped up in the background
+CANDLE_HYDRATE_SEC = 3600
+CANDLE_TOPUP_SEC = 86400
+CANDLE_TOPUP_INTERVAL_SEC = 3600
+# Strike shown/fed to the OMS per weather event: a src.data.market_index.RANKING_CRITERIA name
+WEATHER_LEAD_CRITERIA = "sentiment"
+# Weather cities are analyzed in parallel (fetches are already concurrent; NWS politeness is AsyncHTTP.HOST_LIMITS)
+WEATHER_WORKERS = 8
+
 class OrchestratorEngine:
     def __init__(self):
         self.dashboard = Dashboard()
@@ -31,25 +62,44 @@ class OrchestratorEngine:
         # Wire the trade-close callback to the dashboard for strategy tracking
         self.risk_manager.exchange.on_close = self._on_trade_close
         
-        self.strategies = {
-            "weather": WeatherArbitrageStrategyV2(), # UPGRADED TO V2
-            "crypto": Crypto15mTrendStrategyV3(),   # UPGRADED TO V3
-            "crypto_hr": CryptoHourlyStrategyV3(),  # UPGRADED TO V3
-            "longshot": CryptoLongShotFader(),      # Fade low-prob contracts
-            "late_sniper": Crypto15mLateSniper()    # Late-entry sniper
-        }
+        # Only enabled strategies are imported and constructed; market_loop drives each by its registry role
+        enabled = [n.strip() for n in os.getenv("ENABLED_STRATEGIES", ",".join(DEFAULT_STRATEGIES)).split(",") if n.strip()]
+        self.strategy_report = StrategyLoadReport()
+        self.strategies = load_strategies(enabled, report=self.strategy_report)
+        logger.info(f"[Orchestrator] Core imports: {_CORE_IMPORT_SECONDS * 1000:.1f} ms")
+        for line in self.strategy_report.lines():
+            logger.info(line)
         self.dashboard.active_strategies = list(self.strategies.keys())
+        self.crypto_15m = by_role(self.strategies, "crypto_15m")
+        self.crypto_hourly = by_role(self.strategies, "crypto_hourly")
+        self.weather_strategies = by_role(self.strategies, "weather_event")
+
+        # Shared implied CDF across BTC ladder strikes (OMS marks + strategy fair values)
+        self.probability_surface = ImpliedProbabilitySurface()
+        self.risk_manager.exchange.probability_surface = self.probability_surface
+        for _, _, strategy in self.crypto_hourly:
+            strategy.probability_surface = self.probability_surface
         self.ticker_cache = {} # Cache resolved tickers: { "KXHIGHNY": "KXHIGHNY-26JAN30-T20" }
+        self.ladder_cache = None # Last BTC ladder + the spot range it stays valid for
+        self.harvest_last = {} # Last forecast-harvest write per city (forecast-error tables input)
+        self.HARVEST_INTERVAL_SEC = 900
         
         # Initialize Providers
         # NWS
         nws_ua = os.getenv("NWS_USER_AGENT", "(MoneyPrinter, test@example.com)")
-        # Updated Stations: KNYC (Central Park), KMDW (Midway), KLAX, KMIA
-        self.nws_stations = ["KNYC", "KLAX", "KMDW", "KMIA"]
-        self.nws = NWSProvider(nws_ua, self.nws_stations)
+        # Map NWS Station -> Kalshi Series Ticker, one per CITY_CONFIG city (add a city there to trade it)
+        self.station_map = {config['station']: series for series, config in CITY_CONFIG.items()}
+        self.nws_stations = list(self.station_map)
+        self.nws = NWSProvider(nws_ua, self.nws_stations, meta_path=DEFAULT_STATION_META_PATH)
+        self.weather_pool = ThreadPoolExecutor(max_workers=WEATHER_WORKERS, thread_name_prefix="weather")
         
-        # Coinbase
+        # Coinbase (REST, pooled) + WebSocket ticker/level2 feed; COINBASE_STREAM=0 polls REST only
         self.coinbase = CoinbaseProvider("BTC-USD")
+        self.coinbase_stream = None
+        if os.getenv("COINBASE_STREAM", "1") != "0":
+            self.coinbase_stream = CoinbaseStreamProvider(["BTC-USD"], rest=self.coinbase)
+        self.last_spot_sample = None  # newest streamed spot sample already fed to the strategies
+        self.candles = CandleStore.load("BTC-USD", 60)
         
         # Kalshi (For Balance Sync & Live Price Discovery)
         k_id = os.getenv("KALSHI_KEY_ID")
@@ -60,6 +110,25 @@ class OrchestratorEngine:
             # SAFETY: Always force read_only=True for now
             self.kalshi = KalshiProvider(k_id, k_key, k_url, read_only=True)
 
+        # Kalshi WebSocket quotes (local book cache, REST fallback); KALSHI_STREAM=0 polls REST only
+        self.kalshi_stream = None
+        if self.kalshi and os.getenv("KALSHI_STREAM", "1") != "0":
+            self.kalshi_stream = KalshiStreamProvider(rest=self.kalshi)
+        self.quotes = QuoteCache(self.kalshi_stream or self.kalshi, ttl=QUOTE_TTL_SEC) if self.kalshi else None
+
+        # Series -> market index (loaded from disk; refreshed by index_loop)
+        self.market_indexes = {}
+        if self.kalshi:
+            for series in ["KXBTC15M"] + list(self.station_map.values()):
+                self.market_indexes[series] = MarketIndex.load(series)
+
+        # Async variants on one pooled HTTP client, driven from a background event loop
+        self.async_runner = AsyncRunner()
+        self.http = AsyncHTTP()
+        self.async_nws = AsyncNWSProvider(self.nws, self.http)
+        self.async_coinbase = AsyncCoinbaseProvider(self.coinbase, self.http)
+        self.async_kalshi = AsyncKalshiProvider(self.kalshi, self.http) if self.kalshi else None
+
     def _on_trade_close(self, position: dict):
         """Callback from OMS when a trade is settled/closed. Reports result to dashboard."""
         strategy_name = position.get('strategy_name', 'Unknown')
@@ -68,14 +137,14 @@ class OrchestratorEngine:
         logger.info(f"[Orchestrator] 📊 Strategy Result: {strategy_name} | PnL: ${pnl:+.2f}")
 
         # Forward Late Sniper closes to the strategy for adaptive threshold adjustment
-        if strategy_name == "Late Sniper":
+        if strategy_name == "Late Sniper" and "late_sniper" in self.strategies:
             self.strategies["late_sniper"]._handle_position_close(position)
 
-    def _resolve_smart_ticker(self, series_base, criteria="time"):
+    def _resolve_smart_ticker(self, series_base):
         """
-        Dynamically finds the best market ticker for a given series.
-        criteria="time": Finds nearest future expiration (for Crypto).
-        criteria="sentiment": Finds market with highest YES price (for Weather).
+        Dynamically finds the market with the nearest future expiration in a
+        series (for Crypto). BTC hourly strikes are resolved by
+        _resolve_btc_ladder, weather events by _resolve_weather_event.
         """
         # Check Cache (TTL 60s)
         cached = self.ticker_cache.get(series_base)
@@ -83,61 +152,14 @@ class OrchestratorEngine:
             return cached['ticker']
 
         if not self.kalshi: return None
-        
-        # --- SPECIAL CASE: KXBTCHOURLY (V1 Discovery) ---
-        if series_base == "KXBTCHOURLY":
-             try:
-                 # Use the special V1 probe method we added to KalshiProvider
-                 v1_markets = self.kalshi.fetch_btc_hourly_markets()
-                 if v1_markets:
-                     # 1. Group by Expiration (Find Soonest)
-                     # Sort by close_time (ISO string)
-                     # Filter out any that might have slipped through (just to be safe)
-                     future_markets = v1_markets # Already filtered by provider
-                     
-                     if not future_markets: return None
-                     
-                     # Sort by time first
-                     future_markets.sort(key=lambda x: x.extra.get('close_time', '9999'))
-                     
-                     # Get the soonest close time
-                     soonest_time = future_markets[0].extra.get('close_time')
-                     
-                     # Filter for only this hour's markets
-                     this_hour_markets = [m for m in future_markets if m.extra.get('close_time') == soonest_time]
-                     
-                     # 2. Find ATM Strike
-                     # Get current Spot Price
-                     spot_price = 50000.0 # Fallback
-                     try:
-                         cb_data = self.coinbase.fetch_latest()
-                         if cb_data: spot_price = cb_data.price
-                     except: pass
-                     
-                     def get_strike_diff(m):
-                         try:
-                             # Format: ...-T60999.99
-                             strike_part = m.symbol.split('-')[-1]
-                             strike_val = float(re.sub(r'[A-Za-z]', '', strike_part))
-                             return abs(strike_val - spot_price)
-                         except:
-                             return 999999.0
-                             
-                     # Sort by proximity to spot
-                     this_hour_markets.sort(key=get_strike_diff)
-                     
-                     best = this_hour_markets[0].symbol
-                     
-                     # Cache slightly longer since we did a heavy V1 scan? 
-                     # Actually V1 scan is expensive (12 requests). We should cache this for maybe 5 mins?
-                     # Existing cache is 60s. That's OK.
-                     
-                     self.ticker_cache[series_base] = {'ticker': best, 'time': time.time()}
-                     logger.info(f"[Dashboard] Smart Resolve {series_base} -> {best} (ATM Strike @ {spot_price})")
-                     return best
-             except Exception as e:
-                 logger.error(f"V1 Discovery Failed: {e}")
-                 pass
+
+        # --- LOCAL INDEX: soonest-expiring active market straight from memory ---
+        index = self.market_indexes.get(series_base)
+        if index and index.is_fresh(INDEX_MAX_AGE_SEC):
+            best = index.soonest_active()
+            if best:
+                self.ticker_cache[series_base] = {'ticker': best['ticker'], 'time': time.time()}
+                return best['ticker']
         
         try:
             # 1. Fetch markets with PAGINATION (Kalshi API does NOT support status filtering)
@@ -162,46 +184,13 @@ class OrchestratorEngine:
             
             if not active_markets: return None
 
-            best_ticker = None
-            
-            if criteria == "time":
-                # Sort by expiration_time (soonest first)
-                # Filter for active (already done)
-                active_markets.sort(key=lambda x: x.get('expiration_time', '9999'))
-                if active_markets:
-                    best_ticker = active_markets[0].get('ticker')
-
-            elif criteria == "sentiment":
-                # Weather: Find highest YES price (Implied Probability)
-                # Filter for TODAY or TOMORROW first to stay relevant
-                now = datetime.now()
-                target_dates = [now.strftime("%y%b%d").upper(), (now + timedelta(days=1)).strftime("%y%b%d").upper()]
-                
-                candidates = []
-                for m in active_markets:
-                    tick = m.get('ticker', '')
-                    if any(d in tick for d in target_dates):
-                        candidates.append(tick)
-                
-                # If no date match, check all (fallback)
-                if not candidates: candidates = [m.get('ticker') for m in active_markets]
-                
-                highest_bid = -1.0
-                winner = None
-                
-                # Find Highest Sentiment by fetching latest price for candidates
-                # Rate limit safety: Limit to top 5 candidates? 
-                # For now, we assume candidates list is small (usually ~5-10 strikes per day)
-                for ticker in candidates:
-                    data = self.kalshi.fetch_latest(ticker)
-                    if data and data.bid > highest_bid:
-                        highest_bid = data.bid
-                        winner = ticker
-                        
-                best_ticker = winner
+            # Sort by expiration_time (soonest first)
+            # Filter for active (already done)
+            active_markets.sort(key=lambda x: x.get('expiration_time', '9999'))
+            best_ticker = active_markets[0].get('ticker')
 
             if best_ticker:
-                logger.info(f"[Dashboard] Smart Resolve {series_base} -> {best_ticker} ({criteria})")
+                logger.info(f"[Dashboard] Smart Resolve {series_base} -> {best_ticker} (time)")
                 self.ticker_cache[series_base] = {'ticker': best_ticker, 'time': time.time()}
                 return best_ticker
                 
@@ -211,85 +200,208 @@ class OrchestratorEngine:
             logger.error(f"Resolution Error ({series_base}): {e}")
             return None
 
-    def _resolve_btc_ladder(self):
+    def _resolve_btc_event(self):
         """
-        Resolves the 'Ladder' of BTC Hourly markets:
-        1. Center (Closest to Spot)
-        2. Lower (Center - $250)
-        3. Upper (Center + $250)
-        Returns a list of tickers, with Center first.
+        Snapshot of every strike in the soonest-expiring BTC Hourly event
+        (yes/no bid/ask per strike, sorted by strike), or None. Event discovery
+        is cached by the provider; quotes come fresh from self.quotes.
         """
-        if not self.kalshi: return []
-        
+        if not self.kalshi: return None
+
         try:
-            # 1. Fetch V1 Markets
+            # 1. Fetch V1 Markets (cached discovery)
             markets = self.kalshi.fetch_btc_hourly_markets()
             if not markets:
                 logger.warning("[Dashboard] No V1 BTC Markets found.")
-                return []
-            
+                return None
+
             # 2. Filter for Soonest Expiration
             markets.sort(key=lambda x: x.extra.get('close_time', '9999'))
             soonest_time = markets[0].extra.get('close_time')
             this_hour_markets = [m for m in markets if m.extra.get('close_time') == soonest_time]
-            
-            if not this_hour_markets:
-                logger.warning(f"[Dashboard] No markets found for soonest hour: {soonest_time}")
-                return []
-            
-            # 3. Get Spot Price
 
-            spot_price = 50000.0
+            # 3. Current quotes for every strike (stream / quote cache), discovery data as fallback
+            quotes = self.quotes.fetch_many([m.symbol for m in this_hour_markets])
+            this_hour_markets = [quotes.get(m.symbol, m) for m in this_hour_markets]
+
+            event = EventSnapshot.from_markets(this_hour_markets)
+            if not len(event):
+                logger.warning(f"[Dashboard] No valid strikes parsed from {len(this_hour_markets)} markets. Sample: {this_hour_markets[0].symbol}")
+                return None
+            return event
+
+        except Exception as e:
+            logger.error(f"[Dashboard] BTC Event Resolve Failed: {e}")
+            return None
+
+    def _resolve_weather_event(self, series_base):
+        """
+        Snapshot of every active strike in the series' current KXHIGH event
+        (see _weather_event_candidates), from one event-level request, or None.
+        The resolved event ticker is cached for 60s; quotes are always fresh.
+        """
+        if not self.kalshi: return None
+
+        for event_ticker in self._weather_event_candidates(series_base):
+            event = self._accept_weather_event(series_base, event_ticker, self.kalshi.fetch_event(event_ticker))
+            if event:
+                return event
+        return None
+
+    async def _resolve_weather_event_async(self, series_base):
+        """_resolve_weather_event on the async client (used by the concurrent tick fan-out)."""
+        if not self.async_kalshi: return None
+
+        for event_ticker in self._weather_event_candidates(series_base):
+            event = self._accept_weather_event(series_base, event_ticker, await self.async_kalshi.fetch_event(event_ticker))
+            if event:
+                return event
+        return None
+
+    @staticmethod
+    def _weather_lead_strike(event, criteria=None):
+        """
+        Position of the event's lead strike: best by a RANKING_CRITERIA name
+        (default WEATHER_LEAD_CRITERIA) over the snapshot's own quotes,
+        highest YES bid if no strike is rankable.
+        """
+        ranked = rank_markets(event_quotes(event), criteria or WEATHER_LEAD_CRITERIA)
+        return event.symbols.index(ranked[0]['ticker']) if ranked else int(np.argmax(event.yes_bid))
+
+    def _weather_event_candidates(self, series_base):
+        """
+        Event tickers to try in order: the cached one, else the event of the
+        series' soonest-expiring active market from a fresh local index, then
+        today's and tomorrow's by date (index missing, stale or behind).
+        """
+        cached = self.ticker_cache.get(f"{series_base}_EVENT")
+        if cached and (time.time() - cached['time'] < 60):
+            return [cached['ticker']]
+        now = datetime.now()
+        candidates = [f"{series_base}-{(now + timedelta(days=d)).strftime('%y%b%d').upper()}" for d in (0, 1)]
+        index = self.market_indexes.get(series_base)
+        if index and index.is_fresh(INDEX_MAX_AGE_SEC):
+            best = index.soonest_active()
+            if best:
+                candidates = [best['event_ticker']] + [c for c in candidates if c != best['event_ticker']]
+        return candidates
+
+    def _accept_weather_event(self, series_base, event_ticker, markets):
+        """EventSnapshot of the active markets (caching the event ticker), or None if none are active."""
+        active = [m for m in markets if m.extra.get('status') == 'active']
+        if not active:
+            return None
+        cache_key = f"{series_base}_EVENT"
+        cached = self.ticker_cache.get(cache_key)
+        if not cached or cached['ticker'] != event_ticker:
+            logger.info(f"[Dashboard] Weather event {series_base} -> {event_ticker} ({len(active)} strikes)")
+        self.ticker_cache[cache_key] = {'ticker': event_ticker, 'time': time.time()}
+        return EventSnapshot.from_markets(active, event_ticker)
+
+    def _gather_tick_inputs(self):
+        """
+        Fetches everything a tick needs at once: BTC spot ('spot'), each
+        station's observation ('nws:KNYC') and each weather event
+        ('event:KXHIGHNY'). Anything slower than TICK_DEADLINE_SEC is None.
+        """
+        streamed = self.coinbase_stream.cached() if self.coinbase_stream else None
+        calls = {} if streamed else {'spot': self.async_coinbase.fetch_latest()}
+        for station in self.nws_stations:
+            calls[f"nws:{station}"] = self.async_nws.fetch_latest(station)
+            series = self.station_map.get(station)
+            if self.async_kalshi and series:
+                calls[f"event:{series}"] = self._resolve_weather_event_async(series)
+        try:
+            inputs = self.async_runner.run(gather_with_deadline(calls, TICK_DEADLINE_SEC), TICK_DEADLINE_SEC + 2)
+        except Exception as e:
+            logger.error(f"[Dashboard] Tick fetch failed: {e}")
+            inputs = {}
+        if streamed:
+            # Read again after the fan-out so the streamed spot is as fresh as possible
+            inputs['spot'] = self.coinbase_stream.cached() or streamed
+        return inputs
+
+    def _spot_samples(self, btc_data):
+        """
+        (timestamp, price) spot points new since the last tick: the streamed
+        trades resampled to 1 s, else just this tick's quote.
+        """
+        samples = []
+        if self.coinbase_stream:
+            since = self.last_spot_sample or datetime.now() - timedelta(minutes=20)
+            samples = self.coinbase_stream.spot_samples(since=since)
+        if not samples:
+            samples = [(btc_data.timestamp or datetime.now(), btc_data.price)]
+        self.last_spot_sample = samples[-1][0]
+        return samples
+
+    def _hydrate_from_candles(self):
+        """
+        Seeds strategy indicators and the OMS vol estimator with the last hour
+        of 1m closes (one request at most: only the part not already on disk).
+        """
+        now = int(time.time())
+        try:
+            backfill(self.coinbase, self.candles, now - CANDLE_HYDRATE_SEC, now, workers=1)
+        except Exception as e:
+            logger.error(f"[Orchestrator] Candle top-up failed: {e}")
+        times, prices = self.candles.recent_closes(CANDLE_HYDRATE_SEC, now)
+        if not times:
+            return
+        for strategy in self.strategies.values():
+            strategy.hydrate(times, prices)
+        for ts, price in zip(times, prices):
+            self.risk_manager.exchange.pricer.observe_spot(price, ts)
+        self.last_spot_sample = times[-1]
+        self.dashboard.log(f"Hydrated spot history: {len(times)} candles")
+
+    def candle_loop(self):
+        """Background thread: every CANDLE_TOPUP_INTERVAL_SEC, tops up the last CANDLE_TOPUP_SEC of spot candles on disk (for restarts and the lab)."""
+        while self.running:
+            now = int(time.time())
             try:
-                cb_data = self.coinbase.fetch_latest()
-                if cb_data: spot_price = cb_data.price
-            except: pass
-            
-            # 4. Find Center (Closest to Spot)
-            def get_strike(m):
+                backfill(self.coinbase, self.candles, now - CANDLE_TOPUP_SEC, now, workers=2, max_rps=3)
+            except Exception as e:
+                logger.error(f"[Orchestrator] Candle backfill failed: {e}")
+            time.sleep(CANDLE_TOPUP_INTERVAL_SEC)
+
+    def _resolve_btc_ladder(self, event=None, spot_price=None):
+        """
+        Resolves the 'Ladder' of BTC Hourly markets:
+        1. Center (Closest to Spot)
+        2. Lower (Center - $250)
+        3. Upper (Center + $250)
+        Returns a list of tickers, with Center first.
+        The ladder is only recomputed when the event changes or spot leaves
+        the range in which the current center strike is the closest one.
+        """
+        if event is None:
+            event = self._resolve_btc_event()
+        if not event: return []
+
+        cached = self.ladder_cache
+        if (cached and spot_price is not None and cached['event'] == event.event_ticker
+                and cached['low'] <= spot_price < cached['high']):
+            return cached['tickers']
+
+        try:
+            # 3. Get Spot Price (callers in the tick loop pass the one they already fetched)
+            if spot_price is None:
+                spot_price = 50000.0
                 try:
-                    # KXBTCD-YYMMMDDHH-Txxxxx
-                    parts = m.symbol.split('-')
-                    strike_part = parts[-1]
-                    return float(re.sub(r'[A-Za-z]', '', strike_part))
-                except Exception as e:
-                    logger.error(f"Strike Parse Error ({m.symbol}): {e}")
-                    return -1.0
-            
-            # Parse all valid markets
-            valid_markets = [] # (strike, market_obj)
-            for m in this_hour_markets:
-                s = get_strike(m)
-                if s > 0: 
-                    valid_markets.append((s, m))
-                else:
-                    logger.debug(f"Failed to parse strike for: {m.symbol}")
-                
-            if not valid_markets:
-                logger.warning(f"[Dashboard] No valid strikes parsed from {len(this_hour_markets)} markets. Sample: {this_hour_markets[0].symbol}")
-                return []
-            
-            # Sort by distance to spot
+                    cb_data = self.coinbase.fetch_latest()
+                    if cb_data: spot_price = cb_data.price
+                except: pass
 
-            valid_markets.sort(key=lambda x: abs(x[0] - spot_price))
-            
-            center_strike, center_market = valid_markets[0]
-            
-            # 5. Find Neighbors (+/- 250)
-            ladder_tickers = [center_market.symbol]
-            
-            # We want specific targets: Center - 250, Center + 250
-            targets = [center_strike - 250, center_strike + 250]
-            
-            for t in targets:
-                # Find best match for this target (within small epsilon, e.g. 5.0)
-                # re-using valid_markets
-                match = next((m for s, m in valid_markets if abs(s - t) < 5.0), None)
-                if match:
-                    ladder_tickers.append(match.symbol)
-            
+            # 4. Center (closest to spot) + neighbors at +/- 250, within a small epsilon
+            strike_index = event.strike_index
+            ladder_tickers = strike_index.ladder(spot_price, step=250, tol=5.0)
+
+            # Spot range that keeps this center: halfway to the neighbouring strikes
+            low, high = strike_index.center_range(strike_index.nearest(spot_price))
+            self.ladder_cache = {'event': event.event_ticker, 'tickers': ladder_tickers, 'low': low, 'high': high}
             return ladder_tickers
-            
+
         except Exception as e:
             logger.error(f"[Dashboard] Ladder Resolve Failed: {e}")
             return []
@@ -304,36 +416,40 @@ class OrchestratorEngine:
                 # Heartbeat (Every 60s)
                 if time.time() - last_heartbeat > 60:
                     self.dashboard.log("[System] Heartbeat: Market Loop is Alive.")
+                    if self.quotes:
+                        logger.info(f"[Dashboard] Quote cache: {self.quotes.stats} (hit rate {self.quotes.hit_rate:.0%})")
+                    logger.info(f"[Dashboard] NWS HTTP cache: {self.nws.http_cache.stats}")
                     last_heartbeat = time.time()
                     
                 # 0. Update Active Positions (PnL & Expiry)
                 if self.risk_manager and self.kalshi:
                     # Snapshot positions to avoid modification during iteration issues
                     active_positions = list(self.risk_manager.exchange.positions)
-                    for pos in active_positions:
-                        symbol = pos['symbol']
-                        
-                        # Optimization: If we just fetched this symbol in the main loop, skip?
-                        # For safety, let's just re-fetch or use cache if implemented.
-                        # NWS/Crypto loops update market data, but we need to ensure ALL positions are covered.
-                        
-                        # If it's a Kalshi market
-                        if "KX" in symbol:
-                            try:
-                                k_data = self.kalshi.fetch_latest(symbol)
-                                if k_data:
-                                    # Cache real Kalshi price on the position for accurate exits
-                                    real_price = k_data.bid if k_data.bid > 0 else k_data.ask
-                                    if real_price > 0:
-                                        self.risk_manager.exchange.update_market_price(symbol, real_price)
-                                    # Update Price & PnL in Risk Manager
-                                    # This triggers 'update_market' in SimulatedExchange, which checks stops/expiry
-                                    self.risk_manager.update_market_data(symbol, k_data.price)
-                            except Exception:
-                                pass
+                    # All Kalshi positions in one bulk quote request
+                    kx_symbols = [pos['symbol'] for pos in active_positions if "KX" in pos['symbol']]
+                    try:
+                        position_quotes = self.quotes.fetch_many(kx_symbols) if kx_symbols else {}
+                    except Exception:
+                        position_quotes = {}
+                    for symbol in dict.fromkeys(kx_symbols):
+                        try:
+                            k_data = position_quotes.get(symbol)
+                            if k_data:
+                                # Cache real Kalshi price on the position for accurate exits
+                                real_price = k_data.bid if k_data.bid > 0 else k_data.ask
+                                if real_price > 0:
+                                    self.risk_manager.exchange.update_market_price(symbol, real_price)
+                                # Update Price & PnL in Risk Manager
+                                # This triggers 'update_market' in SimulatedExchange, which checks stops/expiry
+                                self.risk_manager.update_market_data(symbol, k_data.price)
+                        except Exception:
+                            pass
                                 
+                # Spot, stations and weather events in one concurrent round trip
+                inputs = self._gather_tick_inputs()
+
                 # 1. Fetch Crypto
-                btc_data = self.coinbase.fetch_latest()
+                btc_data = inputs.get('spot')
                 if btc_data:
                     # Clear stale tickers from Dashboard to keep it clean (Basic Rotation)
                     # We'll just rely on the dashboard to overwrite if key matches, 
@@ -341,23 +457,28 @@ class OrchestratorEngine:
                     # TODO: Implement a clean sweep in Dashboard class.
                     
                     self.dashboard.update_price("BTC-USD (Coinbase)", btc_data.price)
-
-                    # Feed raw spot price to hourly strategy for price history accumulation
-                    spot_feed = copy.deepcopy(btc_data)
-                    spot_feed.symbol = "BTC-USD (Coinbase)"
-                    if spot_feed.extra is None:
-                        spot_feed.extra = {}
-                    spot_feed.extra['source'] = 'live_coinbase'
-                    self.strategies['crypto_hr'].analyze(spot_feed)
+                    # Every spot sample since the last tick goes to the OMS realized-vol estimator
+                    # (digital fair-value marks) and the hourly strategy's price history
+                    for ts, price in self._spot_samples(btc_data):
+                        self.risk_manager.exchange.pricer.observe_spot(price, ts)
+                        for _, _, strategy in self.crypto_hourly:
+                            spot_feed = MarketData("BTC-USD (Coinbase)", ts, price, 0, 0, 0, {'source': 'live_coinbase'})
+                            strategy.analyze(spot_feed)
 
                     # Try to fetch Live Kalshi BTC Price (High Frequency 15M)
                     btc_15m_resolved = False
                     if self.kalshi:
                         try:
                             # A. Resolve 15M Ticker (TIME priority)
-                            btc_15m = self._resolve_smart_ticker("KXBTC15M", criteria="time")
+                            btc_15m = self._resolve_smart_ticker("KXBTC15M")
+                            # B. Resolve HOURLY Event (all strikes) + display Ladder (Spot, -250, +250) - LIVE FEED
+                            btc_event = self._resolve_btc_event()
+                            ladder = self._resolve_btc_ladder(btc_event, spot_price=btc_data.price)
+                            # One bulk quote request for the 15m ticker and every ladder strike
+                            tick_quotes = self.quotes.fetch_many(([btc_15m] if btc_15m else []) + ladder)
+
                             if btc_15m:
-                                k_data_15 = self.kalshi.fetch_latest(btc_15m)
+                                k_data_15 = tick_quotes.get(btc_15m)
                                 if k_data_15:
                                     self.dashboard.update_price(f"{btc_15m} (15m)", k_data_15.bid)
                                     # FUSE DATA for 15M Strategy
@@ -369,6 +490,8 @@ class OrchestratorEngine:
                                     if btc_data.extra is None:
                                         btc_data.extra = {}
                                     btc_data.extra['spot_price'] = original_spot
+                                    # Cycle boundaries for the 15m strategies come from the market's close time
+                                    btc_data.extra['close_time'] = (k_data_15.extra or {}).get('close_time')
                                     self.risk_manager.update_market_data(btc_15m, btc_data.price)
                                     btc_15m_resolved = True
                             else:
@@ -376,36 +499,26 @@ class OrchestratorEngine:
                                 if ticks % 60 == 0:  # Log every ~5 min to avoid spam
                                     logger.warning("[Dashboard] Ghost Ticker: No active KXBTC15M markets found. 15M strategy SKIPPED.")
                             
-                            # B. Resolve HOURLY Ladder (Spot, -250, +250) - LIVE FEED
-                            ladder = self._resolve_btc_ladder()
+                            if btc_event and self.probability_surface.update(btc_event):
+                                self.probability_surface.log_violations(btc_event.event_ticker)
                             
                             if ladder:
                                 # Update Dashboard with ALL 3 (or however many found)
                                 for ticker in ladder:
-                                    k_data_ladder = self.kalshi.fetch_latest(ticker)
+                                    k_data_ladder = tick_quotes.get(ticker)
                                     if k_data_ladder:
                                         self.dashboard.update_price(f"{ticker} (1h)", k_data_ladder.bid)
+                                        k_extra = k_data_ladder.extra or {}
+                                        self.probability_surface.update_quote(ticker, k_data_ladder.bid, k_data_ladder.ask,
+                                                                              k_extra.get('no_bid', 0.0), k_extra.get('no_ask', np.nan))
                                 
-                                # Use the CENTER one (First in list) for Strategy
-                                center_ticker = ladder[0]
-                                k_data_center = self.kalshi.fetch_latest(center_ticker)
-                                
-                                if k_data_center:
-                                    btc_data_hr = copy.deepcopy(btc_data)
-                                    btc_data_hr.bid = k_data_center.bid
-                                    btc_data_hr.ask = k_data_center.ask
-                                    btc_data_hr.symbol = center_ticker
-                                    # Inject hourly-specific extra fields for strategy
-                                    if k_data_center.extra:
-                                        if btc_data_hr.extra is None:
-                                            btc_data_hr.extra = {}
-                                        btc_data_hr.extra['no_bid'] = k_data_center.extra.get('no_bid', 0.0)
-                                        btc_data_hr.extra['no_ask'] = k_data_center.extra.get('no_ask', 0.0)
-                                        btc_data_hr.extra['close_time'] = k_data_center.extra.get('close_time')
-
-                                    # Run Hourly Strategy
-                                    hr_signals = self.strategies['crypto_hr'].analyze(btc_data_hr)
-                                    self._process_signals(hr_signals, strategy_name="Crypto Hourly")
+                                for _, label, strategy in self.crypto_hourly:
+                                    # Run Hourly Strategy over EVERY strike of the event (ranked signals)
+                                    hr_signals = strategy.analyze_event(btc_event)
+                                    # Strikes of one hour are correlated: size them jointly from the strategy's own
+                                    # forecast distribution (the ladder-implied one prices the asks at no edge)
+                                    hr_outcomes = strategy.outcome_model(btc_event, self.risk_manager.exchange.pricer.volatility)
+                                    self._process_signals(hr_signals, strategy_name=label, outcome_model=hr_outcomes)
 
                             else:
                                 if ticks % 10 == 0:
@@ -424,16 +537,12 @@ class OrchestratorEngine:
                                         current_interval_id != self.last_15m_trade_interval)
 
                         if can_trade_15m:
-                            signals = self.strategies['crypto'].analyze(btc_data)
-                            traded = self._process_signals(signals, strategy_name="Trend Catcher V3")
-                            if not traded:
-                                # LongShot Fader: also check the 15m option for longshot pricing
-                                ls_signals = self.strategies['longshot'].analyze(btc_data)
-                                traded = self._process_signals(ls_signals, strategy_name="LongShot Fader")
-                            if not traded:
-                                # Late Sniper: enter in last 5 minutes of cycle
-                                sniper_signals = self.strategies['late_sniper'].analyze(btc_data)
-                                traded = self._process_signals(sniper_signals, strategy_name="Late Sniper")
+                            # In enabled order (default: Trend Catcher, LongShot Fader, Late Sniper); first trade wins
+                            traded = False
+                            for _, label, strategy in self.crypto_15m:
+                                traded = self._process_signals(strategy.analyze(btc_data), strategy_name=label)
+                                if traded:
+                                    break
                             if traded:
                                 self.last_15m_trade_interval = current_interval_id
                         elif minute_in_interval < 7 and ticks % 30 == 0:
@@ -443,49 +552,53 @@ class OrchestratorEngine:
                     if ticks % 10 == 0:
                         self.dashboard.log("[System] ⚠️ Coinbase Fetch Failed (Network/Timeout)")
 
-                # 2. Fetch Weather (Iterate all stations)
-                # Map NWS Station -> Kalshi Series Ticker
-                station_map = {
-                    "KNYC": "KXHIGHNY",
-                    "KLAX": "KXHIGHLAX",
-                    "KMDW": "KXHIGHCHI",
-                    "KMIA": "KXHIGHMIA"
-                }
+                # 2. Weather (all stations, already fetched above): strategies score every city in parallel,
+                # bookkeeping and order placement stay on this thread
+                weather_jobs = {}
+                for station, series in self.station_map.items():
+                    nws_data, weather_event = inputs.get(f"nws:{station}"), inputs.get(f"event:{series}")
+                    if nws_data and weather_event:
+                        nws_data.extra['portfolio_balance'] = self.risk_manager.balance  # condor budget
+                        weather_jobs[station] = [(label, self.weather_pool.submit(strategy.analyze_event, weather_event, nws_data))
+                                                 for _, label, strategy in self.weather_strategies]
 
                 for station in self.nws_stations:
-                    nws_data = self.nws.fetch_latest(station)
+                    nws_data = inputs.get(f"nws:{station}")
                     if nws_data:
                         temp = nws_data.extra.get('temperature_f')
-                        kalshi_ticker = station_map.get(station)
+                        kalshi_ticker = self.station_map.get(station)
+
+                        # HARVEST: forecasts vs observed max for the offline error tables (lab.py --error-tables)
+                        if kalshi_ticker and time.time() - self.harvest_last.get(kalshi_ticker, 0) >= self.HARVEST_INTERVAL_SEC:
+                            harvest_path = os.path.join(self.dashboard.log_dir, f"weather_harvest_{datetime.now():%Y%m%d}.csv")
+                            append_harvest(harvest_path, forecast_harvest_rows(
+                                kalshi_ticker, nws_data.extra.get('forecast'), nws_data.extra.get('max_temp_today_f'),
+                                std_offset_sec=nws_data.extra.get('std_offset_sec')))
+                            self.harvest_last[kalshi_ticker] = time.time()
                         
-                        # FETCH LIVE KALSHI PRICE
+                        # FETCH LIVE KALSHI EVENT (every strike with quotes, one request)
+                        active_ticker = None
+                        weather_event = None
                         if self.kalshi and kalshi_ticker:
                             try:
-                                # Resolve dynamic ticker (SENTIMENT priority)
-                                active_ticker = self._resolve_smart_ticker(kalshi_ticker, criteria="sentiment")
-                                
-                                if active_ticker:
-                                    k_data = self.kalshi.fetch_latest(active_ticker)
-                                    if k_data:
-                                        # Pass Max Temp to Dashboard
-                                        max_t = nws_data.extra.get('max_temp_today_f')
-                                        self.dashboard.update_price(f"{active_ticker} (Market)", k_data.bid, max_temp=max_t)
-                                        
-                                        # FUSE DATA: Inject price into NWS object for Strategy
-                                        nws_data.bid = k_data.bid
-                                        nws_data.ask = k_data.ask
-                                        nws_data.price = k_data.price
-                                        nws_data.symbol = active_ticker
+                                weather_event = inputs.get(f"event:{kalshi_ticker}")
+                                if weather_event:
+                                    # Lead strike (WEATHER_LEAD_CRITERIA on this tick's quotes) for the dashboard and OMS feed
+                                    lead = self._weather_lead_strike(weather_event)
+                                    active_ticker = weather_event.symbols[lead]
+                                    max_t = nws_data.extra.get('max_temp_today_f')
+                                    self.dashboard.update_price(f"{active_ticker} (Market)", weather_event.yes_bid[lead], max_temp=max_t)
                             except Exception as e:
                                 logger.error(f"Market Fetch Fail ({kalshi_ticker}): {e}")
                         
                         if temp:
                             self.dashboard.update_price(f"{kalshi_ticker or station} (F)", temp)
                             # FEED OMS for Weather Exits (Use resolved ticker for PnL tracking)
+                            day_max = nws_data.extra.get('max_temp_today_f')
                             if active_ticker:
-                                self.risk_manager.update_market_data(active_ticker, temp)
+                                self.risk_manager.update_market_data(active_ticker, temp, day_max)
                             else:
-                                self.risk_manager.update_market_data(f"TEMP_{station}", temp)
+                                self.risk_manager.update_market_data(f"TEMP_{station}", temp, day_max)
                         
                         # Extract PoP for Precip Updates
                         forecasts = nws_data.extra.get('forecast') or []
@@ -503,9 +616,14 @@ class OrchestratorEngine:
                             else:
                                 self.risk_manager.update_market_data(f"PRECIP_{station}", pop_prob)
                         
-                        signals = self.strategies['weather'].analyze(nws_data)
-                        self._process_signals(signals, strategy_name="Meteorologist V1")
-                    time.sleep(1) # 1 sec between cities
+                        for label, job in weather_jobs.get(station, []):
+                            # Whole event in one pass: ranked best-first, so the city slot takes the strongest trade
+                            try:
+                                signals = job.result()
+                            except Exception as e:
+                                logger.error(f"[Dashboard] Weather analysis failed ({label}, {kalshi_ticker}): {e}")
+                                signals = []
+                            self._process_signals(signals, strategy_name=label)
 
                 time.sleep(5) # 5 second tick
                 ticks += 1
@@ -514,50 +632,117 @@ class OrchestratorEngine:
                 self.dashboard.log(f"Error in loop: {str(e)}")
                 time.sleep(5)
 
+    def index_loop(self):
+        """Background thread: incremental refresh of every market index, persisted after each pass."""
+        while self.running:
+            for series, index in self.market_indexes.items():
+                try:
+                    listed = index.refresh(self.kalshi)
+                    index.save()
+                    logger.debug(f"[MarketIndex] {series}: {len(index)} markets ({listed} listed)")
+                except Exception as e:
+                    logger.error(f"[MarketIndex] Refresh failed ({series}): {e}")
+            time.sleep(INDEX_REFRESH_SEC)
+
+    @staticmethod
+    def _weather_city(symbol):
+        """CITY_CONFIG series a weather symbol belongs to (KXHIGH ticker or TEMP_/PRECIP_<station>), else UNKNOWN."""
+        for series, config in CITY_CONFIG.items():
+            if series in symbol or config['station'] in symbol:
+                return series
+        return "UNKNOWN"
+
     def _is_weather_slot_full(self, symbol):
         """
         Checks if we already have an active trade for this City + Type.
         Limit: 1 active trade per City per Type (Temp/Precip).
         """
-        city = "UNKNOWN"
         type_ = "TEMP"
         
         if "PRECIP" in symbol: type_ = "PRECIP"
         
-        # Map Symbol to City
-        if "NY" in symbol or "JFK" in symbol: city = "NY"
-        elif "CHI" in symbol or "ORD" in symbol: city = "CHI"
-        elif "LAX" in symbol: city = "LAX"
-        elif "MIA" in symbol: city = "MIA"
-        
-        slot_key = f"{city}_{type_}"
+        slot_key = f"{self._weather_city(symbol)}_{type_}"
         
         # Count active positions matching this slot
         count = 0
         if self.risk_manager and self.risk_manager.exchange:
             for pos in self.risk_manager.exchange.positions:
                 p_sym = pos['symbol']
-                p_city = "UNKNOWN"
                 p_type = "TEMP"
                 
                 if "PRECIP" in p_sym: p_type = "PRECIP"
                 
-                if "NY" in p_sym or "JFK" in p_sym: p_city = "NY"
-                elif "CHI" in p_sym or "ORD" in p_sym: p_city = "CHI"
-                elif "LAX" in p_sym: p_city = "LAX"
-                elif "MIA" in p_sym: p_city = "MIA"
-                
-                p_key = f"{p_city}_{p_type}"
+                p_key = f"{self._weather_city(p_sym)}_{p_type}"
                 
                 if p_key == slot_key:
                     count += 1
                     
         return count >= 1
 
-    def _process_signals(self, signals, strategy_name=None):
+    def _process_signal_group(self, legs, strategy_name=None):
+        """
+        Atomic multi-leg entry (e.g. both condor legs): one risk check on the
+        group's joint worst-case loss, then every leg is filled or none is.
+        Legs keep the strategy's joint sizing (no per-leg Kelly resize).
+        """
+        first = legs[0]
+        category = "general"
+        if "BTC" in first.symbol or "ETH" in first.symbol: category = "crypto"
+        elif "HIGH" in first.symbol or "PRECIP" in first.symbol or "TEMP" in first.symbol: category = "weather"
+
+        if category == 'weather' and self._is_weather_slot_full(first.symbol):
+            return False
+
+        group_cost = getattr(first, 'group_max_loss', None)
+        if group_cost is None:
+            group_cost = sum((1.0 - s.limit_price) * s.quantity if s.side == 'sell' else s.limit_price * s.quantity for s in legs)
+        ex = getattr(first, 'expiration_time', None)
+
+        if not self.risk_manager.check_order(group_cost, category=category, strategy_name=strategy_name, expiration_time=ex):
+            self.dashboard.log(f"⚠️ HARVEST: {first.group_id} ({len(legs)} legs, Risky but Recorded)")
+            for sig in legs:
+                self.dashboard.record_signal(sig, status="HARVEST_ONLY", strategy_name=strategy_name)
+            return False
+
+        self.dashboard.log(f"EXEC GROUP: {first.group_id} | {len(legs)} legs | Max Loss: ${group_cost:.2f}")
+        for sig in legs:
+            cs = getattr(sig, 'contract_side', 'YES')
+            est_cost = (1.0 - sig.limit_price) * sig.quantity if sig.side == 'sell' and cs == 'YES' else sig.limit_price * sig.quantity
+            self.dashboard.log(f"EXEC: {sig.side.upper()} {cs} {sig.quantity}x {sig.symbol} @ {sig.limit_price} | Debit: ${est_cost:.2f}")
+            self.dashboard.record_signal(sig, status="EXECUTED", strategy_name=strategy_name)
+            self.risk_manager.record_execution(est_cost, sig.symbol, sig.side, sig.quantity, sig.limit_price,
+                                               stop_loss=getattr(sig, 'stop_loss', 0.0), trailing_rules=getattr(sig, 'trailing_rules', None),
+                                               expiration_time=getattr(sig, 'expiration_time', None), strategy_name=strategy_name,
+                                               contract_side=cs, disable_profit_targets=getattr(sig, 'disable_profit_targets', False))
+        return True
+
+    def _process_signals(self, signals, strategy_name=None, outcome_model=None):
+        """
+        outcome_model: optional (outcomes, probabilities) of the signals' shared
+        underlying; when given, entries are sized jointly (portfolio Kelly)
+        instead of as independent bets.
+        """
         if not signals: return False
         if not isinstance(signals, list): signals = [signals]
         traded = False
+
+        # Grouped legs (group_id) are all-or-nothing
+        groups = {}
+        for sig in signals:
+            if getattr(sig, 'group_id', None):
+                groups.setdefault(sig.group_id, []).append(sig)
+        for legs in groups.values():
+            traded = self._process_signal_group(legs, strategy_name) or traded
+        signals = [sig for sig in signals if not getattr(sig, 'group_id', None)]
+
+        joint_qty = {}
+        if outcome_model is not None and len(signals) > 1:
+            sizes = self.risk_manager.calculate_portfolio_kelly_sizes(signals, *outcome_model)
+            if any(sizes):
+                joint_qty = {id(sig): qty for sig, qty in zip(signals, sizes)}
+            else:
+                # The model sees no edge anywhere: size each signal on its own confidence instead
+                logger.debug(f"[Process] Joint Kelly sized {len(signals)} signals at 0, falling back to per-signal sizing")
         
         for sig in signals:
             # Determine Category
@@ -572,7 +757,9 @@ class OrchestratorEngine:
 
 
             # DYNAMIC SIZING (FRACTIONAL KELLY)
-            if sig.limit_price > 0:
+            if id(sig) in joint_qty:
+                sig.quantity = joint_qty[id(sig)]
+            elif sig.limit_price > 0:
                 # Default confidence if not provided
                 conf = getattr(sig, 'confidence', 0.55)
                 if conf <= 0: conf = 0.55
@@ -661,6 +848,18 @@ class OrchestratorEngine:
         else:
              self.dashboard.alert("Coinbase Connection Failed")
 
+        if self.coinbase_stream:
+            if self.coinbase_stream.connect():
+                self.dashboard.log("Coinbase Stream Connected")
+            else:
+                self.dashboard.alert("Coinbase Stream Offline (REST fallback)")
+
+        if self.kalshi_stream:
+            if self.kalshi_stream.connect():
+                self.dashboard.log("Kalshi Stream Connected")
+            else:
+                self.dashboard.alert("Kalshi Stream Offline (REST fallback)")
+
         # Initial Balance Sync (Piggy Bank Mode)
         if self.kalshi:
             try:
@@ -670,11 +869,17 @@ class OrchestratorEngine:
             except Exception as e:
                 self.dashboard.alert(f"Balance Sync Failed: {e}")
 
+        self._hydrate_from_candles()
+
         # Start Market Thread
         t = threading.Thread(target=self.market_loop)
         t.daemon = True
         t.start()
 
+        if self.market_indexes:
+            threading.Thread(target=self.index_loop, daemon=True).start()
+        threading.Thread(target=self.candle_loop, daemon=True).start()
+
         self.dashboard.log("Trading Engine STARTED.")
 
         # Main UI Loop
@@ -0,0 +1,112 @@
+"""
+Distribution of a station's daily maximum temperature for the rest of the
+(LST) climate day.
+
+The high is max(observed max so far, max of the remaining hourly forecast
+path). Forecast error is modelled as one shift of the whole path
+(errors between neighbouring hours are strongly correlated), Normal with a
+per-city bias and a spread that grows with the lead time to the forecast
+peak. P(high >= strike) for every strike of an event is one vectorized call.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.core.pricing import norm_cdf
+
+
+class HourlyForecast:
+    """An NWS hourly forecast (gridpoints/.../forecast/hourly) as arrays: period start (epoch) and °F."""
+
+    def __init__(self, starts: np.ndarray, temps_f: np.ndarray):
+        order = np.argsort(starts)
+        self.starts = np.asarray(starts, dtype=float)[order]
+        self.temps_f = np.asarray(temps_f, dtype=float)[order]
+
+    @classmethod
+    def from_periods(cls, periods: List[Dict[str, Any]]) -> 'HourlyForecast':
+        starts, temps = [], []
+        for p in periods or []:
+            temp = p.get('temperature')
+            if isinstance(temp, dict):  # newer payloads: {"unitCode": "wmoUnit:degC", "value": ...}
+                unit = 'C' if 'degC' in (temp.get('unitCode') or '') else 'F'
+                temp = temp.get('value')
+            else:
+                unit = p.get('temperatureUnit') or 'F'
+            if temp is None or not p.get('startTime'):
+                continue
+            try:
+                starts.append(datetime.fromisoformat(p['startTime'].replace('Z', '+00:00')).timestamp())
+            except ValueError:
+                continue
+            temps.append(temp * 9 / 5 + 32 if unit == 'C' else float(temp))
+        return cls(np.array(starts), np.array(temps))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+class DailyMaxErrorModel:
+    """
+    Error of the forecast path peak: Normal(bias, sigma(h)) with
+        sigma(h) = sqrt(floor^2 + per_hour^2 * h),  h = hours until the peak,
+    capped at `max_sigma`. `bias_f` > 0 means the forecast runs warm.
+    """
+
+    def __init__(self, bias_f: float = 0.0, floor_sigma: float = 1.0, per_hour_sigma: float = 0.6,
+                 max_sigma: float = 6.0):
+        self.bias_f = bias_f
+        self.floor_sigma = floor_sigma
+        self.per_hour_sigma = per_hour_sigma
+        self.max_sigma = max_sigma
+
+    @classmethod
+    def for_city(cls, city_config: Optional[dict]) -> 'DailyMaxErrorModel':
+        """Per-city model from a CITY_CONFIG entry (bias_f, optional hourly_sigma_f floor)."""
+        config = city_config or {}
+        return cls(bias_f=config.get('bias_f', 0.0), floor_sigma=config.get('hourly_sigma_f', 1.0))
+
+    def sigma(self, hours) -> float:
+        return float(min(np.sqrt(self.floor_sigma ** 2 + self.per_hour_sigma ** 2 * max(hours, 0.0)), self.max_sigma))
+
+
+class DailyMaxForecast:
+    """Observed max so far + the forecast path for the remaining hours of one climate day."""
+
+    def __init__(self, observed_max_f: Optional[float], hourly: Optional[HourlyForecast], now: float, day_end: float):
+        """
+        :param now: epoch of the evaluation
+        :param day_end: epoch the climate day ends (next LST midnight)
+        """
+        self.observed_max_f = observed_max_f
+        self.now = now
+        self.day_end = day_end
+        self.path_times = np.zeros(0)
+        self.path_f = np.zeros(0)
+        if hourly is not None and len(hourly):
+            # hours still (partly) ahead and starting before the day ends
+            keep = (hourly.starts + 3600 > now) & (hourly.starts < day_end)
+            self.path_times, self.path_f = hourly.starts[keep], hourly.temps_f[keep]
+
+    @property
+    def peak_f(self) -> Optional[float]:
+        return float(self.path_f.max()) if len(self.path_f) else None
+
+    @property
+    def hours_to_peak(self) -> float:
+        if not len(self.path_f):
+            return 0.0
+        return max(0.0, (self.path_times[int(np.argmax(self.path_f))] - self.now) / 3600)
+
+    def prob_at_least(self, strikes, error_model: Optional[DailyMaxErrorModel] = None) -> np.ndarray:
+        """P(daily high >= K) for an array of strikes (°F). NaN where neither an observation nor a path exists."""
+        strikes = np.asarray(strikes, dtype=float)
+        model = error_model or DailyMaxErrorModel()
+        observed = self.observed_max_f if self.observed_max_f is not None else -np.inf
+        if self.peak_f is None:
+            p_path = np.zeros_like(strikes) if self.observed_max_f is not None else np.full_like(strikes, np.nan)
+        else:
+            z = (self.peak_f - model.bias_f - strikes) / model.sigma(self.hours_to_peak)
+            p_path = norm_cdf(z)
+        return np.where(observed >= strikes, 1.0, p_path)
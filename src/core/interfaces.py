@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Callable
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cached_property
+import numpy as np
+import re
 
 @dataclass
 class MarketData:
@@ -24,6 +27,214 @@ class TradeSignal:
     confidence: float = 0.0  # 0.0 to 1.0
     contract_side: str = 'YES'  # 'YES' or 'NO'
 
+@dataclass
+class MarketDataBatch:
+    """
+    Columnar block of market rows for replay (one array entry per row).
+    Row i is equivalent to a MarketData with price=spot[i] and
+    extra={'source': source, 'spot_price': spot[i], <extra columns>[i]}.
+    Optional extra columns: 'no_bid', 'no_ask', 'forecast_high' (expanded to a
+    single daytime NWS forecast period). Rows are expected in time order.
+    """
+    timestamps: np.ndarray  # datetime64[us]
+    symbol_ids: np.ndarray  # int index into `symbols`
+    symbols: List[str]
+    bid: np.ndarray
+    ask: np.ndarray
+    spot: np.ndarray
+    extra: Dict[str, np.ndarray] = field(default_factory=dict)
+    source: str = 'batch'
+
+    def __post_init__(self):
+        self.timestamps = np.asarray(self.timestamps).astype('datetime64[us]')
+        self.symbol_ids = np.asarray(self.symbol_ids, dtype=np.int64)
+        self.bid = np.asarray(self.bid, dtype=float)
+        self.ask = np.asarray(self.ask, dtype=float)
+        self.spot = np.asarray(self.spot, dtype=float)
+        self.extra = {k: np.asarray(v, dtype=float) for k, v in self.extra.items()}
+
+    def __len__(self) -> int:
+        return len(self.symbol_ids)
+
+    def per_symbol(self, fn: Callable[[str], Any], dtype=float) -> np.ndarray:
+        """Evaluates fn once per distinct symbol and broadcasts it to every row."""
+        table = np.array([fn(s) for s in self.symbols], dtype=dtype)
+        return table[self.symbol_ids] if len(table) else np.zeros(0, dtype=dtype)
+
+    def row(self, i: int) -> MarketData:
+        """Materializes row i as a MarketData (slow path)."""
+        spot = float(self.spot[i])
+        extra = {'source': self.source, 'spot_price': spot}
+        for key, col in self.extra.items():
+            if key == 'forecast_high':
+                extra['forecast'] = [{'isDaytime': True, 'temperature': float(col[i])}]
+            else:
+                extra[key] = float(col[i])
+        return MarketData(
+            symbol=self.symbols[self.symbol_ids[i]],
+            timestamp=self.timestamps[i].item(),
+            price=spot,
+            volume=0,
+            bid=float(self.bid[i]),
+            ask=float(self.ask[i]),
+            extra=extra
+        )
+
+@dataclass
+class SignalBatch:
+    """
+    Columnar output of Strategy.analyze_batch.
+    `rows` indexes the MarketDataBatch row that produced each signal.
+    stop_loss == 0 means no stop; NaN trailing columns mean no trailing rules.
+    """
+    rows: np.ndarray
+    side: np.ndarray
+    contract_side: np.ndarray
+    quantity: np.ndarray
+    limit_price: np.ndarray
+    confidence: np.ndarray
+    stop_loss: np.ndarray
+    trailing_trigger: np.ndarray
+    trailing_new_sl: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @classmethod
+    def build(cls, rows, side, quantity, limit_price, confidence, contract_side='YES',
+              stop_loss=0.0, trailing_trigger=np.nan, trailing_new_sl=np.nan) -> 'SignalBatch':
+        """Builds a batch from row indices, broadcasting scalar columns."""
+        rows = np.asarray(rows, dtype=np.int64)
+        n = len(rows)
+
+        def col(value, dtype):
+            return np.broadcast_to(np.asarray(value, dtype=dtype), (n,)).copy()
+
+        return cls(
+            rows=rows,
+            side=col(side, '<U4'),
+            contract_side=col(contract_side, '<U3'),
+            quantity=col(quantity, np.int64),
+            limit_price=col(limit_price, float),
+            confidence=col(confidence, float),
+            stop_loss=col(stop_loss, float),
+            trailing_trigger=col(trailing_trigger, float),
+            trailing_new_sl=col(trailing_new_sl, float)
+        )
+
+    @classmethod
+    def empty(cls) -> 'SignalBatch':
+        return cls.build([], 'buy', 0, 0.0, 0.0)
+
+    @classmethod
+    def from_signals(cls, rows: List[int], signals: List[TradeSignal]) -> 'SignalBatch':
+        """Packs per-row TradeSignals (the fallback path) into columns."""
+        if not signals:
+            return cls.empty()
+        trailing = [getattr(s, 'trailing_rules', None) or {} for s in signals]
+        return cls.build(
+            rows,
+            [s.side for s in signals],
+            [s.quantity for s in signals],
+            [s.limit_price if s.limit_price is not None else np.nan for s in signals],
+            [s.confidence for s in signals],
+            contract_side=[s.contract_side for s in signals],
+            stop_loss=[getattr(s, 'stop_loss', 0.0) or 0.0 for s in signals],
+            trailing_trigger=[t.get('trigger', np.nan) for t in trailing],
+            trailing_new_sl=[t.get('new_sl', np.nan) for t in trailing]
+        )
+
+    @classmethod
+    def concat(cls, parts: List['SignalBatch']) -> 'SignalBatch':
+        """Concatenates batches, ordered by row (stable within a row)."""
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return cls.empty()
+        merged = cls(*[np.concatenate([getattr(p, f) for p in parts])
+                       for f in cls.__dataclass_fields__])
+        order = np.argsort(merged.rows, kind='stable')
+        return cls(*[getattr(merged, f)[order] for f in cls.__dataclass_fields__])
+
+    def to_signals(self, batch: MarketDataBatch) -> List[TradeSignal]:
+        """Materializes TradeSignals (with stop/trailing attributes) for the OMS."""
+        signals = []
+        for k in range(len(self.rows)):
+            sig = TradeSignal(
+                symbol=batch.symbols[batch.symbol_ids[self.rows[k]]],
+                side=str(self.side[k]),
+                quantity=int(self.quantity[k]),
+                limit_price=float(self.limit_price[k]),
+                confidence=float(self.confidence[k]),
+                contract_side=str(self.contract_side[k])
+            )
+            if self.stop_loss[k]:
+                sig.stop_loss = float(self.stop_loss[k])
+            if not np.isnan(self.trailing_trigger[k]):
+                sig.trailing_rules = {'trigger': float(self.trailing_trigger[k]),
+                                      'new_sl': float(self.trailing_new_sl[k])}
+            signals.append(sig)
+        return signals
+
+@dataclass
+class EventSnapshot:
+    """
+    Every strike of one Kalshi event at one instant, as columns sorted by strike.
+    Missing no_bid is stored as 0.0 and missing no_ask as NaN, mirroring the
+    `extra.get(...)` defaults strategies apply to a single MarketData.
+    """
+    event_ticker: str
+    timestamp: datetime
+    symbols: List[str]
+    strikes: np.ndarray
+    yes_bid: np.ndarray
+    yes_ask: np.ndarray
+    no_bid: np.ndarray
+    no_ask: np.ndarray
+    close_time: Optional[str] = None
+
+    def __post_init__(self):
+        for name in ('strikes', 'yes_bid', 'yes_ask', 'no_bid', 'no_ask'):
+            setattr(self, name, np.asarray(getattr(self, name), dtype=float))
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @cached_property
+    def strike_index(self) -> 'StrikeIndex':
+        """Sorted strike -> ticker index (nearest / k-nearest / band / ±Δ queries), built once per snapshot."""
+        from src.core.strike_index import StrikeIndex
+        return StrikeIndex(self.strikes, self.symbols)
+
+    @staticmethod
+    def parse_strike(symbol: str) -> float:
+        """Strike from the last ticker segment (KXBTCD-26FEB1717-T68999.99 -> 68999.99), NaN if unparseable."""
+        try:
+            return float(re.sub(r'[A-Za-z]', '', symbol.split('-')[-1]))
+        except ValueError:
+            return np.nan
+
+    @classmethod
+    def from_markets(cls, markets: List[MarketData], event_ticker: Optional[str] = None) -> 'EventSnapshot':
+        """Packs per-strike MarketData (e.g. V1 discovery output) into one snapshot; unparseable strikes are dropped."""
+        markets = [m for m in markets if not np.isnan(cls.parse_strike(m.symbol))]
+        strikes = np.array([cls.parse_strike(m.symbol) for m in markets], dtype=float)
+        order = np.argsort(strikes, kind='stable')
+        markets = [markets[i] for i in order]
+        extras = [m.extra or {} for m in markets]
+        if event_ticker is None:
+            event_ticker = markets[0].symbol.rsplit('-', 1)[0] if markets else ''
+        return cls(
+            event_ticker=event_ticker,
+            timestamp=max((m.timestamp for m in markets), default=None) or datetime.now(),
+            symbols=[m.symbol for m in markets],
+            strikes=strikes[order],
+            yes_bid=[m.bid for m in markets],
+            yes_ask=[m.ask for m in markets],
+            no_bid=[e.get('no_bid', 0.0) for e in extras],
+            no_ask=[e.get('no_ask', np.nan) for e in extras],
+            close_time=next((e['close_time'] for e in extras if e.get('close_time')), None)
+        )
+
 class DataProvider(ABC):
     """Interface for fetching data (Market, Weather, etc)."""
     
@@ -45,6 +256,32 @@ class Strategy(ABC):
         """Process data and potentially return a trade signal."""
         pass
 
+    def analyze_batch(self, batch: MarketDataBatch) -> SignalBatch:
+        """
+        Columnar replay of `analyze` over a whole MarketDataBatch.
+        Default: per-row fallback. Strategies override with a vectorized path
+        that must leave the same signals and end state as the row loop.
+        """
+        rows, signals = [], []
+        for i in range(len(batch)):
+            out = self.analyze(batch.row(i))
+            if not out:
+                continue
+            if not isinstance(out, list):
+                out = [out]
+            for sig in out:
+                rows.append(i)
+                signals.append(sig)
+        return SignalBatch.from_signals(rows, signals)
+
+    def hydrate(self, times: List[datetime], prices: List[float]):
+        """
+        Seeds indicator state from historical spot prices (oldest first)
+        before live data arrives, e.g. from src.data.candle_store on startup.
+        Default: nothing to seed.
+        """
+        pass
+
     @abstractmethod
     def name(self) -> str:
         """Strategy name."""
@@ -3,7 +3,8 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 import re
-import math
+import numpy as np
+from src.core.pricing import DigitalPricer
 from src.utils.logger import logger
 
 
@@ -259,6 +260,11 @@ class SimulatedExchange:
         self.STOP_LOSS_PCT = 0.15    # -15% loss -> Close (tightened from 30%)
         self.TIME_LIMIT_MIN = 60     # Force close after 60 mins (for hourly markets)
 
+        # Fair-value marks: N(d2) digitals on EWMA vol (BTC), temperature error model (KXHIGH)
+        self.pricer = DigitalPricer()
+        # Optional ImpliedProbabilitySurface: ladder fair values take precedence when available
+        self.probability_surface = None
+
     def open_position(self, symbol: str, side: str, entry_price: float, quantity: int, stop_loss: float = 0.0, trailing_rules: dict = None, expiration_time: any = None, strategy_name: str = None, contract_side: str = 'YES', disable_profit_targets: bool = False):
         """
         Records a new position.
@@ -305,9 +311,10 @@ class SimulatedExchange:
             if symbol in pos['symbol'] or pos['symbol'] in symbol:
                 pos['last_market_price'] = real_price
 
-    def update_market(self, symbol_fragment: str, current_spot_price: float):
+    def update_market(self, symbol_fragment: str, current_spot_price: float, observed_max: Optional[float] = None):
         """
         Updates the valuation of open positions based on the underlying spot price.
+        observed_max: for temperature feeds, the day's high so far (strikes at or below it have settled).
         """
         # Mapping station IDs to Ticker fragments
         symbol_map = {
@@ -328,8 +335,8 @@ class SimulatedExchange:
             target_fragment = symbol_map.get(symbol_fragment, symbol_fragment)
             if target_fragment in ["NY", "LAX", "CHI", "MIA"]: update_type = "TEMP"
         
-        now_dt = datetime.now().astimezone() # Local aware for comparison
-
+        # Pass 1: expiry / routing / time limit -> positions that need a mark
+        live = []
         for pos in self.positions[:]: 
             # --- EXPIRATION CHECK ---
             if pos.get('expiration_time'):
@@ -359,7 +366,13 @@ class SimulatedExchange:
                 # Use estimated option price, NOT raw spot price
                 self._close_position(pos, pos.get('current_price', pos['entry_price']), reason="TIME_LIMIT")
                 continue
+            live.append((pos, age))
+
+        # Fair-value marks for every strike-based position in one vectorized call
+        marks = self._mark_positions([pos for pos, _ in live], current_spot_price, observed_max)
 
+        # Pass 2: PnL, targets and exits
+        for pos, age in live:
             # Calculate Synthetic PnL
             try:
                 estimated_price = pos['entry_price']
@@ -368,36 +381,21 @@ class SimulatedExchange:
                 if "PRECIP" in pos['symbol']:
                     estimated_price = current_spot_price
                 # --- CASE 2: STRIKE BASED (KXHIGH, KXBTC, kxbtcd) ---
-                elif "KXHIGH" in pos['symbol'] or "KXBTC" in pos['symbol'] or "kxbtcd" in pos['symbol']:
-                    try:
-                        parts = pos['symbol'].split('-')
-                        strike_str = parts[-1]
-                        is_above = not strike_str.startswith('B')
-                        strike = float(re.sub(r'[A-Za-z]', '', strike_str))
-                        
-                        if is_above:
-                            diff = current_spot_price - strike
-                        else:
-                            diff = strike - current_spot_price
-                        
-                        # Sigmoid-like scaling using tanh for smooth probability mapping
-                        # Scale factor: 10 for temp (degrees matter), 1000 for BTC (dollars matter)
-                        scale = 10.0 if "KXHIGH" in pos['symbol'] else 1000.0
-                        normalized_diff = diff / scale
-                        # tanh maps (-inf, inf) -> (-1, 1), then scale to price range
-                        probability_shift = math.tanh(normalized_diff) * 0.49
-                        tanh_estimate = max(0.01, min(0.99, 0.50 + probability_shift))
-
-                        # If tanh gives a weak signal (near 0.50) and we have a real market price,
-                        # prefer the cached market price to avoid phantom 0.50 exits
-                        if abs(probability_shift) < 0.10 and pos.get('last_market_price', 0) != pos['entry_price']:
-                            estimated_price = pos['last_market_price']
-                            logger.debug(f"[OMS] Using cached market price {estimated_price:.2f} (tanh was {tanh_estimate:.2f})")
-                        else:
-                            estimated_price = tanh_estimate
-                    except Exception as e:
-                        logger.warning(f"[OMS] Price calc error for {pos['symbol']}: {e}")
-                        estimated_price = pos['entry_price']
+                elif id(pos) in marks:
+                    model_estimate = marks[id(pos)]
+
+                    # Prefer the ladder-implied fair value when the surface covers this strike
+                    fair = self.probability_surface.fair_value(pos['symbol']) if self.probability_surface else None
+
+                    if fair is not None:
+                        estimated_price = max(0.01, min(0.99, fair))
+                    # If the model gives a weak signal (near 0.50) and we have a real market price,
+                    # prefer the cached market price to avoid phantom 0.50 exits
+                    elif abs(model_estimate - 0.50) < 0.10 and pos.get('last_market_price', 0) != pos['entry_price']:
+                        estimated_price = pos['last_market_price']
+                        logger.debug(f"[OMS] Using cached market price {estimated_price:.2f} (model was {model_estimate:.2f})")
+                    else:
+                        estimated_price = model_estimate
 
                 # --- COMMON PNL CALC ---
                 # For NO contracts, invert the estimated price
@@ -471,6 +469,46 @@ class SimulatedExchange:
             
         self.unrealized_pnl = sum(p['pnl'] for p in self.positions)
 
+    def _mark_positions(self, positions: list, underlying: float,
+                        observed_max: Optional[float] = None) -> Dict[int, float]:
+        """
+        Digital fair value (YES side) for every strike-based position, keyed by id(pos).
+        Strikes are parsed here; the pricing itself is a single DigitalPricer.mark call.
+        Horizon: contract expiry, else the TIME_LIMIT_MIN exit (BTC) / the model default (weather).
+        """
+        now = datetime.now()
+        now_aware = now.astimezone()
+        keys, strikes, is_above, seconds_left, is_temp = [], [], [], [], []
+        for pos in positions:
+            symbol = pos['symbol']
+            if "PRECIP" in symbol or not ("KXHIGH" in symbol or "KXBTC" in symbol or "kxbtcd" in symbol):
+                continue
+            strike_str = symbol.split('-')[-1]
+            try:
+                strike = float(re.sub(r'[A-Za-z]', '', strike_str))
+            except ValueError as e:
+                logger.warning(f"[OMS] Price calc error for {symbol}: {e}")
+                continue
+
+            exp = pos.get('expiration_time')
+            if exp is not None:
+                left = (exp - (now if exp.tzinfo is None else now_aware)).total_seconds()
+            elif "KXHIGH" in symbol:
+                left = np.nan
+            else:
+                left = (pos['open_time'] + timedelta(minutes=self.TIME_LIMIT_MIN) - now).total_seconds()
+
+            keys.append(id(pos))
+            strikes.append(strike)
+            is_above.append(not strike_str.startswith('B'))
+            seconds_left.append(left)
+            is_temp.append("KXHIGH" in symbol)
+
+        if not keys:
+            return {}
+        marks = self.pricer.mark(underlying, strikes, is_above, seconds_left, is_temp, observed_max)
+        return dict(zip(keys, marks.tolist()))
+
     def _check_profit_targets(self, pos, current_price) -> bool:
         """
         Check profit target ladder for partial exits.
@@ -0,0 +1,144 @@
+from typing import Tuple
+import numpy as np
+
+
+# ==============================================================================
+# OUTCOME DISTRIBUTIONS
+# ==============================================================================
+
+def outcome_distribution(strikes, p_above) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Discretizes a survival curve P(X > K) given at ladder strikes into one
+    representative outcome per settlement region (below the lowest strike,
+    between neighbours, above the highest) and its probability.
+    """
+    strikes = np.asarray(strikes, dtype=float)
+    order = np.argsort(strikes)
+    k = strikes[order]
+    surv = np.clip(np.minimum.accumulate(np.asarray(p_above, dtype=float)[order]), 0.0, 1.0)
+    gap = np.diff(k).min() if len(k) > 1 else 1.0
+    outcomes = np.concatenate([[k[0] - gap / 2], (k[:-1] + k[1:]) / 2, [k[-1] + gap / 2]])
+    probs = -np.diff(np.concatenate([[1.0], surv, [0.0]]))
+    return outcomes, probs
+
+
+def bet_returns(strikes, is_above, holds_yes, costs, outcomes) -> np.ndarray:
+    """
+    Return per dollar staked for each binary at each outcome, shape
+    (n_outcomes, n_bets): (settlement - cost) / cost, where the YES leg of an
+    "Above K" contract settles 1 iff X > K ("Below K": X < K).
+    """
+    o = np.asarray(outcomes, dtype=float)[:, None]
+    k = np.asarray(strikes, dtype=float)[None, :]
+    yes = np.where(np.asarray(is_above, dtype=bool)[None, :], o > k, o < k)
+    settle = np.where(np.asarray(holds_yes, dtype=bool)[None, :], yes, ~yes).astype(float)
+    costs = np.asarray(costs, dtype=float)[None, :]
+    return (settle - costs) / costs
+
+
+# ==============================================================================
+# PORTFOLIO KELLY (projected Newton)
+# ==============================================================================
+
+def _box_newton(R: np.ndarray, p: np.ndarray, cap: np.ndarray, mu: float, f: np.ndarray,
+                tol: float, max_iter: int) -> np.ndarray:
+    """
+    Projected Newton ascent (Bertsekas' two-metric method) on
+        E[log(1 + R f)] - mu * sum(f)   over 0 <= f <= cap.
+    Coordinates pinned at a bound by the gradient take a projected gradient
+    step; the free block takes a Newton step. Armijo backtracking along the
+    projection arc keeps wealth 1 + R f positive.
+    """
+    def value(f):
+        w = 1.0 + R @ f
+        return p @ np.log(w) - mu * f.sum() if np.all(w > 0) else -np.inf
+
+    v = value(f)
+    for _ in range(max_iter):
+        w = 1.0 + R @ f
+        g = R.T @ (p / w) - mu
+        residual = np.max(np.abs(np.clip(f + g, 0.0, cap) - f))
+        if residual < tol:
+            break
+        eps = min(1e-6, residual)
+        free = ~(((f <= eps) & (g < 0)) | ((f >= cap - eps) & (g > 0)))
+
+        d = g.copy()
+        if free.any():
+            scaled = R[:, free] * (np.sqrt(p) / w)[:, None]
+            H = scaled.T @ scaled  # minus the Hessian of the free block
+            d[free] = np.linalg.solve(H + 1e-12 * (np.trace(H) + 1.0) * np.eye(len(H)), g[free])
+
+        alpha = 1.0
+        while True:
+            f_next = np.clip(f + alpha * d, 0.0, cap)
+            v_next = value(f_next)
+            if v_next >= v + 1e-4 * (g @ (f_next - f)) or alpha < 1e-12:
+                break
+            alpha *= 0.5
+        if v_next <= v:
+            break  # no further ascent at machine precision
+        f, v = f_next, v_next
+    return f
+
+
+def optimize_kelly(returns: np.ndarray, probs, max_fraction=1.0, max_total: float = 0.5,
+                   tol: float = 1e-9, max_iter: int = 100) -> np.ndarray:
+    """
+    Fractions f of bankroll per bet maximizing E[log(1 + R f)] over the
+    outcome distribution, subject to 0 <= f_i <= max_fraction and
+    sum(f) <= max_total.
+
+    Box constraints are handled by projected Newton steps. When the total
+    cap binds, its multiplier mu (a per-dollar hurdle charged on every bet)
+    is found by regula falsi, warm-starting each solve from the last one.
+    """
+    R = np.asarray(returns, dtype=float)
+    p = np.asarray(probs, dtype=float)
+    n = R.shape[1]
+    if n == 0:
+        return np.zeros(0)
+    cap = np.broadcast_to(np.asarray(max_fraction, dtype=float), (n,))
+
+    f = _box_newton(R, p, cap, 0.0, np.zeros(n), tol, max_iter)
+    if f.sum() <= max_total:
+        return f
+
+    # sum(f(mu)) is non-increasing in mu; at mu >= max E[R_i] nothing is worth betting.
+    # Illinois regula falsi on excess(mu) = sum(f(mu)) - max_total, keeping a bracket.
+    lo, hi = 0.0, float(np.max(R.T @ p))
+    ex_lo, ex_hi = f.sum() - max_total, -max_total
+    best, side = np.zeros(n), 0
+    for _ in range(60):
+        mid = hi - ex_hi * (hi - lo) / (ex_hi - ex_lo)
+        f = _box_newton(R, p, cap, mid, f, tol, max_iter)
+        excess = f.sum() - max_total
+        if excess > 0:
+            lo, ex_lo = mid, excess
+            if side == -1:
+                ex_hi *= 0.5
+            side = -1
+        else:
+            hi, ex_hi, best = mid, excess, f
+            if side == 1:
+                ex_lo *= 0.5
+            side = 1
+            if excess > -1e-9:
+                break
+        if hi - lo < 1e-14:
+            break
+    return best
+
+
+def portfolio_kelly(strikes, is_above, holds_yes, costs, outcomes, probs,
+                    fraction: float = 0.75, max_per_bet: float = 0.05,
+                    max_total: float = 0.5) -> np.ndarray:
+    """
+    Dampened joint Kelly fractions for binaries on one underlying.
+    The per-bet cap is enforced inside the solver (at max_per_bet / fraction),
+    so a lone bet reduces to min(fraction * f*, max_per_bet) like the
+    independent sizing.
+    """
+    R = bet_returns(strikes, is_above, holds_yes, costs, outcomes)
+    f = optimize_kelly(R, probs, max_fraction=max_per_bet / fraction, max_total=min(max_total / fraction, 0.95))
+    return np.minimum(fraction * f, max_per_bet)
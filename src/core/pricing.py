@@ -0,0 +1,154 @@
+from typing import Optional
+from datetime import datetime
+import math
+import numpy as np
+
+
+# ==============================================================================
+# NORMAL CDF (vectorized, no scipy)
+# ==============================================================================
+
+def norm_cdf(x) -> np.ndarray:
+    """Standard normal CDF over arrays (Abramowitz-Stegun 7.1.26 erf, |err| < 1.5e-7)."""
+    x = np.asarray(x, dtype=float)
+    z = np.abs(x) / math.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+# ==============================================================================
+# STREAMING REALIZED VOLATILITY
+# ==============================================================================
+
+SECONDS_PER_YEAR = 365.0 * 24 * 3600
+
+
+class EwmaVolatility:
+    """
+    Time-weighted EWMA of squared log returns from a streaming spot feed.
+    Tracks variance per second, so ticks can arrive at any cadence; returns
+    are only taken once at least `min_interval_sec` has elapsed (faster ticks
+    are absorbed into the next return). Starts from `prior_annual_vol`.
+    """
+
+    def __init__(self, halflife_sec: float = 900.0, prior_annual_vol: float = 0.50,
+                 min_interval_sec: float = 1.0):
+        self.halflife_sec = halflife_sec
+        self.min_interval_sec = min_interval_sec
+        self.var_per_sec = prior_annual_vol ** 2 / SECONDS_PER_YEAR
+        self.last_price = None
+        self.last_time = None
+        self.samples = 0
+
+    def update(self, price: float, timestamp: Optional[datetime] = None) -> float:
+        """Folds one spot observation in; returns the current annualized vol."""
+        timestamp = timestamp or datetime.now()
+        if price is None or price <= 0:
+            return self.annualized
+        if self.last_price is None:
+            self.last_price, self.last_time = price, timestamp
+            return self.annualized
+
+        dt = (timestamp - self.last_time).total_seconds()
+        if dt < self.min_interval_sec:
+            return self.annualized
+
+        r = math.log(price / self.last_price)
+        alpha = 1.0 - 0.5 ** (dt / self.halflife_sec)
+        self.var_per_sec = (1.0 - alpha) * self.var_per_sec + alpha * (r * r / dt)
+        self.last_price, self.last_time = price, timestamp
+        self.samples += 1
+        return self.annualized
+
+    @property
+    def annualized(self) -> float:
+        return math.sqrt(self.var_per_sec * SECONDS_PER_YEAR)
+
+    def sigma_sqrt_t(self, seconds) -> np.ndarray:
+        """Return std-dev over each horizon (seconds, array-friendly)."""
+        return np.sqrt(self.var_per_sec * np.maximum(np.asarray(seconds, dtype=float), 0.0))
+
+
+# ==============================================================================
+# DIGITAL (BINARY) FAIR VALUE
+# ==============================================================================
+
+def digital_fair_value(spot, strikes, sigma_sqrt_t, is_above) -> np.ndarray:
+    """
+    Cash-or-nothing digital under lognormal spot, zero rate:
+        P(S_T > K) = N(d2),  d2 = (ln(S/K) - sigma^2 T / 2) / (sigma sqrt T)
+    Broadcasts over strikes / horizons; `is_above` False returns P(S_T < K).
+    Expired (sigma sqrt T == 0) contracts collapse to intrinsic 0/1.
+    """
+    spot = np.asarray(spot, dtype=float)
+    strikes = np.asarray(strikes, dtype=float)
+    s = np.asarray(sigma_sqrt_t, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_m = np.log(spot / strikes)
+        d2 = np.where(s > 0, (log_m - 0.5 * s * s) / s, np.sign(log_m) * np.inf)
+    p_above = np.where(strikes <= 0, 1.0, norm_cdf(np.nan_to_num(d2, nan=0.0, posinf=40.0, neginf=-40.0)))
+    return np.where(is_above, p_above, 1.0 - p_above)
+
+
+class TemperatureErrorModel:
+    """
+    Error distribution of the settlement temperature around the latest
+    reading: Normal(observed, sigma(h)) with
+        sigma(h) = sqrt(floor^2 + per_hour^2 * h),  h = hours to settlement,
+    capped at `max_sigma`. Unknown horizons use `default_hours` (a full day).
+    """
+
+    def __init__(self, floor_sigma: float = 1.5, per_hour_sigma: float = 1.5,
+                 max_sigma: float = 8.0, default_hours: float = 24.0):
+        self.floor_sigma = floor_sigma
+        self.per_hour_sigma = per_hour_sigma
+        self.max_sigma = max_sigma
+        self.default_hours = default_hours
+
+    def sigma(self, hours_left) -> np.ndarray:
+        h = np.asarray(hours_left, dtype=float)
+        h = np.where(np.isnan(h), self.default_hours, np.maximum(h, 0.0))
+        return np.minimum(np.sqrt(self.floor_sigma ** 2 + self.per_hour_sigma ** 2 * h), self.max_sigma)
+
+    def fair_value(self, observed, strikes, hours_left, is_above, observed_max=None) -> np.ndarray:
+        """
+        P(T > K) (or P(T < K) where not is_above) for arrays of strikes/horizons.
+        `observed_max` (the day's high so far) settles strikes it already reached.
+        """
+        strikes = np.asarray(strikes, dtype=float)
+        z = (np.asarray(observed, dtype=float) - strikes) / self.sigma(hours_left)
+        p_above = norm_cdf(z)
+        if observed_max is not None:
+            p_above = np.where(observed_max >= strikes, 1.0, p_above)
+        return np.where(is_above, p_above, 1.0 - p_above)
+
+
+class DigitalPricer:
+    """
+    Marks strike-based binaries (BTC ladders and KXHIGH temperature contracts)
+    in one vectorized call per tick. BTC uses the streaming EWMA vol; weather
+    uses the temperature error model. Marks are clipped to [0.01, 0.99].
+    """
+
+    def __init__(self, volatility: EwmaVolatility = None, temperature: TemperatureErrorModel = None):
+        self.volatility = volatility or EwmaVolatility()
+        self.temperature = temperature or TemperatureErrorModel()
+
+    def observe_spot(self, price: float, timestamp: Optional[datetime] = None) -> float:
+        return self.volatility.update(price, timestamp)
+
+    def mark(self, underlying: float, strikes, is_above, seconds_left, is_temperature,
+             observed_max: Optional[float] = None) -> np.ndarray:
+        """
+        Fair YES prices for arrays of positions sharing one underlying value.
+        seconds_left may hold NaN (unknown expiry; temperature uses its default horizon).
+        observed_max is the day's high so far (temperature only).
+        """
+        strikes = np.asarray(strikes, dtype=float)
+        seconds_left = np.asarray(seconds_left, dtype=float)
+        is_temperature = np.asarray(is_temperature, dtype=bool)
+        btc = digital_fair_value(underlying, strikes, self.volatility.sigma_sqrt_t(np.nan_to_num(seconds_left)), is_above)
+        temp = self.temperature.fair_value(underlying, strikes, seconds_left / 3600.0, is_above, observed_max)
+        return np.clip(np.where(is_temperature, temp, btc), 0.01, 0.99)
@@ -0,0 +1,223 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+import numpy as np
+from src.core.interfaces import EventSnapshot
+from src.core.portfolio_kelly import outcome_distribution
+from src.utils.logger import logger
+
+
+# ==============================================================================
+# ISOTONIC FIT HELPERS
+# ==============================================================================
+
+def isotonic_decreasing(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Weighted least-squares non-increasing fit, in closed form:
+        fit_i = min_{j<=i} max_{k>=i} mean_w(values[j..k])
+    Every segment mean comes from prefix sums, so the fit is O(n^2) array work
+    with no Python loop (n is a strike ladder: tens of points).
+    """
+    values = np.asarray(values, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    n = len(values)
+    if n == 0:
+        return values.copy()
+
+    cw = np.concatenate(([0.0], np.cumsum(weights)))
+    cwy = np.concatenate(([0.0], np.cumsum(weights * values)))
+    j = np.arange(n)[:, None]
+    k = np.arange(n)[None, :]
+    valid = j <= k
+    seg_w = np.where(valid, cw[k + 1] - cw[j], 1.0)
+    seg_mean = np.where(valid, (cwy[k + 1] - cwy[j]) / seg_w, -np.inf)
+
+    # inner[j, i] = max_{k>=i} seg_mean[j, k]   (suffix max along k)
+    inner = np.maximum.accumulate(seg_mean[:, ::-1], axis=1)[:, ::-1]
+    # fit[i] = min_{j<=i} inner[j, i]
+    return np.where(valid, inner, np.inf).min(axis=0)
+
+
+def quote_probabilities(event: EventSnapshot) -> tuple:
+    """
+    Per-strike market estimate of P(S > K) and its fit weight.
+    Mid of YES bid and reciprocal YES ask (1 - NO bid when quoted); weight is
+    1 / spread, and 0 for strikes with no two-sided quote.
+    """
+    implied_ask = np.where(event.no_bid > 0, 1.0 - event.no_bid, event.yes_ask)
+    quoted = (event.yes_bid > 0) & (implied_ask > 0) & (implied_ask >= event.yes_bid)
+    mid = np.where(quoted, 0.5 * (event.yes_bid + implied_ask), np.nan)
+    weight = np.where(quoted, 1.0 / np.maximum(implied_ask - event.yes_bid, 0.01), 0.0)
+    return mid, weight
+
+
+# ==============================================================================
+# IMPLIED PROBABILITY SURFACE
+# ==============================================================================
+
+@dataclass
+class MonotonicityViolation:
+    """Quotes imply P(S > lower) < P(S > upper) although lower < upper."""
+    lower_symbol: str
+    upper_symbol: str
+    lower_strike: float
+    upper_strike: float
+    edge: float  # mid(upper) - mid(lower)
+    tradeable: bool  # upper YES bid > lower YES ask: buy lower, sell upper
+
+
+@dataclass
+class _EventFit:
+    event: EventSnapshot
+    mid: np.ndarray
+    weight: np.ndarray
+    fitted: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    dirty: bool = True
+    updated: datetime = field(default_factory=datetime.now)
+
+
+class ImpliedProbabilitySurface:
+    """
+    Monotone implied CDF across the strikes of each Kalshi ladder event.
+    fair_value(K) = P(S > K) from a weighted isotonic fit of the ladder mids,
+    linearly interpolated between strikes (flat beyond the outermost strikes).
+    Only 'above' strikes are modelled (B-prefixed strikes are ignored).
+    Refits are lazy: quote updates only mark an event dirty.
+    """
+
+    def __init__(self, max_events: int = 24):
+        self.max_events = max_events
+        self.events: Dict[str, _EventFit] = {}
+
+    @staticmethod
+    def _above_only(event: EventSnapshot) -> EventSnapshot:
+        """Copy of the event restricted to 'above' strikes (the surface mutates its own copy)."""
+        keep = [i for i, s in enumerate(event.symbols) if not s.split('-')[-1].startswith('B')]
+        return EventSnapshot(
+            event_ticker=event.event_ticker,
+            timestamp=event.timestamp,
+            symbols=[event.symbols[i] for i in keep],
+            strikes=event.strikes[keep],
+            yes_bid=event.yes_bid[keep],
+            yes_ask=event.yes_ask[keep],
+            no_bid=event.no_bid[keep],
+            no_ask=event.no_ask[keep],
+            close_time=event.close_time
+        )
+
+    def update(self, event: EventSnapshot) -> bool:
+        """
+        Loads a full event snapshot. Returns True if any quote changed
+        (the event will be refit on the next query), False otherwise.
+        """
+        event = self._above_only(event)
+        if not len(event):
+            return False
+        mid, weight = quote_probabilities(event)
+        fit = self.events.get(event.event_ticker)
+
+        if fit is not None and np.array_equal(fit.event.strikes, event.strikes):
+            changed = ~((fit.mid == mid) | (np.isnan(fit.mid) & np.isnan(mid))) | (fit.weight != weight)
+            fit.event, fit.updated = event, datetime.now()
+            if not changed.any():
+                return False
+            fit.mid, fit.weight, fit.dirty = mid, weight, True
+            return True
+
+        self.events.pop(event.event_ticker, None)
+        self.events[event.event_ticker] = _EventFit(event=event, mid=mid, weight=weight)
+        while len(self.events) > self.max_events:
+            self.events.pop(next(iter(self.events)))
+        return True
+
+    def update_quote(self, symbol: str, yes_bid: float, yes_ask: float,
+                     no_bid: float = 0.0, no_ask: float = np.nan) -> bool:
+        """Applies one strike's new quote to its event. False if the strike is unknown or unchanged."""
+        fit = self.events.get(symbol.rsplit('-', 1)[0])
+        if fit is None:
+            return False
+        strike = EventSnapshot.parse_strike(symbol)
+        i = int(np.searchsorted(fit.event.strikes, strike))
+        if i >= len(fit.event) or fit.event.strikes[i] != strike:
+            return False
+
+        ev = fit.event
+        ev.yes_bid[i], ev.yes_ask[i], ev.no_bid[i], ev.no_ask[i] = yes_bid, yes_ask, no_bid, no_ask
+        mid, weight = quote_probabilities(ev)
+        if (mid[i] == fit.mid[i] or (np.isnan(mid[i]) and np.isnan(fit.mid[i]))) and weight[i] == fit.weight[i]:
+            return False
+        fit.mid[i], fit.weight[i], fit.dirty = mid[i], weight[i], True
+        fit.updated = datetime.now()
+        return True
+
+    def _fitted(self, event_ticker: str) -> Optional[_EventFit]:
+        fit = self.events.get(event_ticker)
+        if fit is None:
+            return None
+        if fit.dirty:
+            ok = fit.weight > 0
+            fitted = np.full(len(fit.mid), np.nan)
+            if ok.any():
+                fitted[ok] = np.clip(isotonic_decreasing(fit.mid[ok], fit.weight[ok]), 0.0, 1.0)
+            fit.fitted, fit.dirty = fitted, False
+        return fit
+
+    def probabilities(self, event_ticker: str, strikes) -> Optional[np.ndarray]:
+        """P(S > K) for an array of strikes of one event (None if the event has no quotes)."""
+        fit = self._fitted(event_ticker)
+        if fit is None:
+            return None
+        ok = ~np.isnan(fit.fitted)
+        if not ok.any():
+            return None
+        return np.interp(np.asarray(strikes, dtype=float), fit.event.strikes[ok], fit.fitted[ok])
+
+    def outcome_distribution(self, event_ticker: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Settlement distribution implied by the fitted CDF (one outcome per strike region), or None."""
+        fit = self._fitted(event_ticker)
+        if fit is None or len(fit.event) < 2:
+            return None
+        probs = self.probabilities(event_ticker, fit.event.strikes)
+        return None if probs is None else outcome_distribution(fit.event.strikes, probs)
+
+    def fair_value(self, symbol: str) -> Optional[float]:
+        """Fair YES price of one ladder ticker, or None if it is not covered by the surface."""
+        if symbol.split('-')[-1].startswith('B'):
+            return None
+        strike = EventSnapshot.parse_strike(symbol)
+        if np.isnan(strike):
+            return None
+        probs = self.probabilities(symbol.rsplit('-', 1)[0], [strike])
+        return None if probs is None else float(probs[0])
+
+    def violations(self, event_ticker: str) -> List[MonotonicityViolation]:
+        """
+        Every strike pair whose quoted mids break monotonicity, widest first.
+        `tradeable` marks pairs that can be locked in at the quoted prices.
+        """
+        fit = self.events.get(event_ticker)
+        if fit is None:
+            return []
+        ev, mid = fit.event, fit.mid
+        implied_ask = np.where(ev.no_bid > 0, 1.0 - ev.no_bid, ev.yes_ask)
+
+        edge = mid[None, :] - mid[:, None]  # edge[i, j] = mid_j - mid_i
+        lower, upper = np.nonzero(np.triu(np.nan_to_num(edge, nan=0.0) > 0, k=1))
+        order = np.argsort(-edge[lower, upper], kind='stable')
+        lower, upper = lower[order], upper[order]
+        tradeable = ev.yes_bid[upper] > implied_ask[lower]
+        return [
+            MonotonicityViolation(
+                lower_symbol=ev.symbols[i], upper_symbol=ev.symbols[j],
+                lower_strike=float(ev.strikes[i]), upper_strike=float(ev.strikes[j]),
+                edge=float(edge[i, j]), tradeable=bool(t)
+            )
+            for i, j, t in zip(lower, upper, tradeable)
+        ]
+
+    def log_violations(self, event_ticker: str, limit: int = 3) -> List[MonotonicityViolation]:
+        found = self.violations(event_ticker)
+        for v in found[:limit]:
+            tag = "ARB" if v.tradeable else "skew"
+            logger.info(f"[Surface] {tag}: P(>{v.lower_strike}) < P(>{v.upper_strike}) by {v.edge:.2f} ({v.lower_symbol} / {v.upper_symbol})")
+        return found
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from datetime import datetime, date, timedelta
+import numpy as np
 from src.utils.logger import logger
 
 @dataclass
@@ -11,6 +12,8 @@ class PortfolioState:
     last_trade_time: datetime
 
 from src.core.matching_engine import SimulatedExchange
+from src.core.interfaces import EventSnapshot, TradeSignal
+from src.core.portfolio_kelly import portfolio_kelly
 
 class RiskManager:
     """
@@ -35,6 +38,7 @@ class RiskManager:
         
         # RULES
         self.MAX_RISK_PER_TRADE_PCT = 0.05 
+        self.KELLY_FRACTION = 0.75 # Fractional Kelly dampener (V1.5 PRD)
         self.MAX_DAILY_DRAWDOWN_PCT = 0.05 
         self.MAX_STRATEGY_DRAWDOWN_PCT = 0.10
         self.MAX_PORTFOLIO_EXPOSURE_PCT = 0.50 # Max 50% of funds active at once
@@ -88,9 +92,9 @@ class RiskManager:
         
         self._sync_balance()
 
-    def update_market_data(self, symbol: str, price: float):
-        """Passes live data to OMS to update PnL."""
-        self.exchange.update_market(symbol, price)
+    def update_market_data(self, symbol: str, price: float, observed_max: Optional[float] = None):
+        """Passes live data to OMS to update PnL (observed_max: the day's high so far, weather only)."""
+        self.exchange.update_market(symbol, price, observed_max)
         stats = self.exchange.get_stats()
         self.daily_pnl = stats['realized']
         self.unrealized_pnl = stats['unrealized']
@@ -136,15 +140,19 @@ class RiskManager:
         
         # 3. Apply Fractional Multiplier (Safety)
         # User Rule: Fractional Kelly (0.75x V1.5 PRD)
-        f_fractional = f * 0.75
+        f_fractional = f * self.KELLY_FRACTION
         
         if f_fractional <= 0: return 0
         
         # 4. Apply Hard Cap (5% of Bankroll)
         f_capped = min(f_fractional, self.MAX_RISK_PER_TRADE_PCT)
         
+        return self._kelly_quantity(f_capped, price)
+
+    def _kelly_quantity(self, fraction: float, price: float) -> int:
+        """Bankroll fraction -> contract quantity, with the short-exposure and runaway caps."""
         # 5. Calculate Dollar Amount
-        allocation = self.balance * f_capped
+        allocation = self.balance * fraction
         
         # 6. Convert to Quantity
         quantity = int(allocation / price)
@@ -152,8 +160,34 @@ class RiskManager:
         if price < 0.15:
             max_short_qty = int(10.0 / (1.0 - price))
             quantity = min(quantity, max_short_qty)
-        # Hard cap: Prevent runaway position growth
-        return max(1, min(quantity, 500))
+        # Hard cap: Prevent runaway position growth (0 = too small to trade; the caller skips it)
+        return max(0, min(quantity, 500))
+
+    def calculate_portfolio_kelly_sizes(self, signals: List[TradeSignal], outcomes, probabilities) -> List[int]:
+        """
+        Joint fractional-Kelly quantities for correlated signals on one underlying
+        (strikes of one BTC hour, legs on one city's high), instead of sizing each
+        as an independent bet. `outcomes` / `probabilities` discretize the
+        underlying at settlement (see portfolio_kelly.outcome_distribution).
+        Same dampener and per-trade cap as calculate_kelly_size; the group also
+        stays within the remaining portfolio exposure. Unpriceable signals get 0.
+        """
+        if not signals or self.balance <= 0:
+            return [0] * len(signals)
+
+        strikes = np.array([EventSnapshot.parse_strike(s.symbol) for s in signals])
+        is_above = np.array([not s.symbol.split('-')[-1].startswith('B') for s in signals])
+        holds_yes = np.array([(s.side == 'buy') == (getattr(s, 'contract_side', 'YES') == 'YES') for s in signals])
+        costs = np.array([s.limit_price if s.side == 'buy' else 1.0 - s.limit_price for s in signals], dtype=float)
+
+        ok = ~np.isnan(strikes) & (costs > 0) & (costs < 1)
+        room = max(0.0, self.MAX_PORTFOLIO_EXPOSURE_PCT - self.get_current_exposure() / self.balance)
+        fractions = np.zeros(len(signals))
+        if ok.any() and room > 0:
+            fractions[ok] = portfolio_kelly(strikes[ok], is_above[ok], holds_yes[ok], costs[ok], outcomes, probabilities,
+                                            fraction=self.KELLY_FRACTION, max_per_bet=self.MAX_RISK_PER_TRADE_PCT,
+                                            max_total=room)
+        return [self._kelly_quantity(f, c) if f > 1e-9 else 0 for f, c in zip(fractions, costs)]
 
     def get_current_exposure(self, category: Optional[str] = None) -> float:
         """
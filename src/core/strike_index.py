@@ -0,0 +1,93 @@
+"""
+Sorted strike index for one event: strikes as a sorted NumPy array mapped to
+tickers, with O(log n) nearest / k-nearest / band / ±Δ queries.
+
+Shared by ladder resolution, the dashboard ladder view and the hourly
+strategies (EventSnapshot.strike_index builds it once per snapshot).
+"""
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class StrikeIndex:
+    """Queries return positions into `strikes` / `symbols` (sorted by strike)."""
+
+    def __init__(self, strikes, symbols: List[str]):
+        strikes = np.asarray(strikes, dtype=float)
+        order = np.argsort(strikes, kind='stable')
+        if not np.array_equal(order, np.arange(len(strikes))):
+            strikes = strikes[order]
+            symbols = [symbols[i] for i in order]
+        self.strikes = strikes
+        self.symbols = list(symbols)
+
+    @classmethod
+    def from_symbols(cls, symbols: Iterable[str]) -> 'StrikeIndex':
+        """Index over tickers whose last segment is the strike (unparseable ones are dropped)."""
+        from src.core.interfaces import EventSnapshot
+        parsed = [(EventSnapshot.parse_strike(s), s) for s in symbols]
+        parsed = [(k, s) for k, s in parsed if not np.isnan(k)]
+        return cls([k for k, _ in parsed], [s for _, s in parsed])
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def nearest(self, x):
+        """Position of the strike closest to x (ties go to the lower strike); vectorized over arrays of x."""
+        x = np.asarray(x, dtype=float)
+        n = len(self.strikes)
+        hi = np.clip(np.searchsorted(self.strikes, x), 1, n - 1) if n > 1 else np.zeros(x.shape, dtype=np.int64)
+        lo = np.maximum(hi - 1, 0)
+        pos = np.where(np.abs(x - self.strikes[lo]) <= np.abs(self.strikes[hi] - x), lo, hi)
+        return int(pos) if pos.ndim == 0 else pos
+
+    def k_nearest(self, x: float, k: int) -> np.ndarray:
+        """Positions of the k strikes closest to x, closest first (two pointers out from the insertion point)."""
+        n = len(self.strikes)
+        hi = int(np.searchsorted(self.strikes, x))
+        lo = hi - 1
+        out = []
+        while len(out) < min(k, n):
+            if hi >= n or (lo >= 0 and x - self.strikes[lo] <= self.strikes[hi] - x):
+                out.append(lo)
+                lo -= 1
+            else:
+                out.append(hi)
+                hi += 1
+        return np.array(out, dtype=np.int64)
+
+    def band(self, low: float, high: float) -> slice:
+        """Positions of the strikes in [low, high]."""
+        return slice(int(np.searchsorted(self.strikes, low, side='left')),
+                     int(np.searchsorted(self.strikes, high, side='right')))
+
+    def band_mask(self, low: float, high: float) -> np.ndarray:
+        mask = np.zeros(len(self.strikes), dtype=bool)
+        mask[self.band(low, high)] = True
+        return mask
+
+    def at(self, strike: float, tol: float = 5.0) -> Optional[int]:
+        """Position of the strike within tol of `strike`, or None."""
+        if not len(self.strikes):
+            return None
+        i = self.nearest(strike)
+        return i if abs(self.strikes[i] - strike) < tol else None
+
+    def offsets(self, center: int, deltas: Iterable[float], tol: float = 5.0) -> List[Optional[int]]:
+        """Positions of the strikes at center strike ± each delta (None where the ladder has a gap)."""
+        return [self.at(self.strikes[center] + d, tol) for d in deltas]
+
+    def center_range(self, i: int) -> Tuple[float, float]:
+        """Spot range [low, high) in which strike i stays the nearest one."""
+        low = (self.strikes[i - 1] + self.strikes[i]) / 2 if i > 0 else -np.inf
+        high = (self.strikes[i] + self.strikes[i + 1]) / 2 if i + 1 < len(self.strikes) else np.inf
+        return low, high
+
+    def ladder(self, spot: float, step: float = 250.0, tol: float = 5.0) -> List[str]:
+        """Tickers of the strike nearest spot, then the ones at -step / +step (when listed)."""
+        if not len(self.strikes):
+            return []
+        center = self.nearest(spot)
+        return [self.symbols[center]] + [self.symbols[j] for j in self.offsets(center, (-step, step), tol)
+                                         if j is not None]
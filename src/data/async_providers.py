@@ -0,0 +1,378 @@
+"""
+Asyncio variants of the Kalshi, Coinbase and NWS providers.
+
+All of them share one pooled aiohttp client (keep-alive connections,
+per-host concurrency limits), so a tick can fan out every fetch at once and
+collect whatever arrived before its deadline with gather_with_deadline.
+Parsing and request signing are reused from the synchronous providers; the
+synchronous DataProvider interface stays available through
+SyncProviderAdapter.
+"""
+import asyncio
+import concurrent.futures
+import inspect
+import json
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from src.core.interfaces import DataProvider, MarketData
+from src.data.coinbase_provider import CoinbaseProvider
+from src.data.http_cache import HttpCache
+from src.data.kalshi_provider import KalshiProvider
+from src.data.nws_provider import NWSProvider
+from src.utils.logger import logger
+
+
+# ==============================================================================
+# POOLED CLIENT
+# ==============================================================================
+
+class AsyncHTTP:
+    """
+    Shared aiohttp session with a concurrency limit per host. The session and
+    semaphores belong to the event loop that first uses them.
+    """
+
+    HOST_LIMITS = {
+        "api.weather.gov": 4,
+        "api.exchange.coinbase.com": 4,
+        "api.elections.kalshi.com": 8,
+    }
+
+    def __init__(self, default_per_host: int = 4, total_limit: int = 32, timeout: float = 10.0,
+                 host_limits: Optional[Dict[str, int]] = None):
+        self.default_per_host = default_per_host
+        self.total_limit = total_limit
+        self.timeout = timeout
+        self.host_limits = dict(self.HOST_LIMITS, **(host_limits or {}))
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self.in_flight: Dict[str, int] = defaultdict(int)
+        self.peak_in_flight: Dict[str, int] = defaultdict(int)
+        self.stats = {'requests': 0, 'errors': 0}
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        sem = self._limits.get(host)
+        if sem is None:
+            sem = self._limits[host] = asyncio.Semaphore(self.host_limits.get(host, self.default_per_host))
+        return sem
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.total_limit, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    async def get_json(self, url: str, headers: Optional[Dict[str, str]] = None, params: Optional[Dict[str, Any]] = None,
+                       timeout: Optional[float] = None, cache: Optional[HttpCache] = None) -> Any:
+        """
+        GET and decode JSON; raises on transport errors and non-2xx statuses.
+        With `cache` (parameterless URLs only) fresh responses are served
+        without a request and stale ones are revalidated conditionally.
+        """
+        if cache is not None:
+            cached = cache.lookup(url)
+            if cached is not None:
+                return cached
+            headers = {**(headers or {}), **cache.validators(url)}
+        host = urlsplit(url).hostname or ""
+        async with self._semaphore(host):
+            self.in_flight[host] += 1
+            self.peak_in_flight[host] = max(self.peak_in_flight[host], self.in_flight[host])
+            try:
+                kwargs = {'headers': headers, 'params': params}
+                if timeout is not None:
+                    kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+                async with self._get_session().get(url, **kwargs) as resp:
+                    self.stats['requests'] += 1
+                    if cache is not None and resp.status == 304:
+                        return cache.not_modified(url, resp.headers)
+                    resp.raise_for_status()
+                    if cache is None:
+                        return await resp.json(content_type=None)
+                    raw = await resp.read()
+                    return cache.store(url, resp.headers, json.loads(raw), len(raw))
+            except Exception:
+                self.stats['errors'] += 1
+                raise
+            finally:
+                self.in_flight[host] -= 1
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._limits.clear()
+
+
+async def gather_with_deadline(calls: Dict[str, Awaitable], deadline: float) -> Dict[str, Any]:
+    """
+    Runs every awaitable concurrently and returns {key: result} after at most
+    `deadline` seconds. Calls that fail or miss the deadline map to None (and
+    are cancelled), so one slow endpoint cannot stall the rest.
+    """
+    tasks = {key: asyncio.ensure_future(call) for key, call in calls.items()}
+    if not tasks:
+        return {}
+    done, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    results = {}
+    for key, task in tasks.items():
+        if task in done and task.exception() is None:
+            results[key] = task.result()
+        else:
+            if task in pending:
+                logger.warning(f"[AsyncProviders] {key} missed the {deadline:.1f}s deadline")
+            else:
+                logger.error(f"[AsyncProviders] {key} failed: {task.exception()}")
+            results[key] = None
+    return results
+
+
+# ==============================================================================
+# PROVIDERS
+# ==============================================================================
+
+class AsyncKalshiProvider:
+    """Async Kalshi market data; signing and parsing come from the wrapped KalshiProvider."""
+
+    def __init__(self, provider: KalshiProvider, http: AsyncHTTP):
+        self.sync = provider
+        self.http = http
+
+    async def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        return await self.http.get_json(f"{self.sync.api_url}{path}", headers=self.sync._headers(path), params=params)
+
+    async def connect(self) -> bool:
+        try:
+            await self._get("/exchange/status")
+            return True
+        except Exception as e:
+            logger.error(f"[AsyncKalshi] Connection Error: {e}")
+            return False
+
+    async def fetch_latest(self, symbol: str) -> Optional[MarketData]:
+        try:
+            data = await self._get(f"/markets/{symbol}")
+            return self.sync._to_market_data(data.get('market', {}), symbol)
+        except Exception as e:
+            logger.error(f"[AsyncKalshi] Fetch Error for {symbol}: {e}")
+            return None
+
+    async def fetch_event(self, event_ticker: str) -> List[MarketData]:
+        try:
+            data = await self._get("/markets", {"event_ticker": event_ticker, "limit": 200})
+            return [self.sync._to_market_data(m) for m in data.get('markets', []) if m.get('ticker')]
+        except Exception as e:
+            logger.error(f"[AsyncKalshi] Event Fetch Error for {event_ticker}: {e}")
+            return []
+
+    async def _fetch_v1_event(self, event_ticker: str) -> List[MarketData]:
+        series = event_ticker.split('-')[0]
+        try:
+            data = await self.http.get_json(f"{self.sync.V1_API_URL}/series/{series}/events/{event_ticker}", timeout=2)
+            return [self.sync._v1_to_market_data(m) for m in data.get('event', {}).get('markets', []) if m.get('ticker_name')]
+        except Exception:
+            return []
+
+    async def _fetch_chunk(self, chunk: List[str]) -> Dict[str, MarketData]:
+        found = {}
+        params = {"tickers": ",".join(chunk), "limit": len(chunk)}
+        while True:
+            try:
+                data = await self._get("/markets", params)
+            except Exception as e:
+                logger.error(f"[AsyncKalshi] Bulk Fetch Error ({len(chunk)} tickers): {e}")
+                return found
+            for m in data.get('markets', []):
+                if m.get('ticker') in chunk:
+                    found[m['ticker']] = self.sync._to_market_data(m)
+            cursor = data.get('cursor')
+            if not cursor or all(t in found for t in chunk):
+                return found
+            params = dict(params, cursor=cursor)
+
+    async def fetch_many(self, tickers: List[str]) -> Dict[str, MarketData]:
+        """Same contract as KalshiProvider.fetch_many; chunks and V1 events are fetched concurrently."""
+        wanted = list(dict.fromkeys(t for t in tickers if t))
+        n = self.sync.MAX_TICKERS_PER_REQUEST
+        found: Dict[str, MarketData] = {}
+        for part in await asyncio.gather(*(self._fetch_chunk(wanted[i:i + n]) for i in range(0, len(wanted), n))):
+            found.update(part)
+
+        missing = [t for t in wanted if t not in found]
+        events = dict.fromkeys('-'.join(t.split('-')[:2]) for t in missing if t.count('-') >= 2)
+        for markets in await asyncio.gather(*(self._fetch_v1_event(e) for e in events)):
+            found.update({md.symbol: md for md in markets if md.symbol in missing})
+        return found
+
+
+class AsyncCoinbaseProvider:
+    """Async Coinbase spot ticker."""
+
+    def __init__(self, provider: CoinbaseProvider, http: AsyncHTTP):
+        self.sync = provider
+        self.http = http
+
+    async def connect(self) -> bool:
+        return await self.fetch_latest() is not None
+
+    async def fetch_latest(self, symbol: str = None) -> Optional[MarketData]:
+        target = symbol if symbol else self.sync.product_id
+        try:
+            data = await self.http.get_json(f"{self.sync.BASE_URL}/products/{target}/ticker", timeout=5)
+            return self.sync._to_market_data(target, data)
+        except Exception as e:
+            logger.error(f"[AsyncCoinbase] Fetch Error: {e}")
+            return None
+
+
+class AsyncNWSProvider:
+    """
+    Async NWS observations. Station metadata and the HTTP cache are shared
+    with the wrapped NWSProvider; a station's latest observation, forecasts
+    and observation history are requested concurrently.
+    """
+
+    def __init__(self, provider: NWSProvider, http: AsyncHTTP):
+        self.sync = provider
+        self.http = http
+
+    async def _get(self, url: str, cache: bool = True) -> Any:
+        return await self.http.get_json(url, headers=self.sync.headers,
+                                        cache=self.sync.http_cache if cache else None)
+
+    async def _connect_station(self, station_id: str) -> bool:
+        try:
+            station = await self._get(f"{self.sync.BASE_URL}/stations/{station_id}")
+            coords = (station.get('geometry') or {}).get('coordinates')
+            if not coords:
+                return False
+            point = await self._get(f"{self.sync.BASE_URL}/points/{coords[1]},{coords[0]}")
+            self.sync.station_cache[station_id] = self.sync._station_meta(station, point)
+            self.sync.save_station_meta()
+            return True
+        except Exception as e:
+            logger.error(f"[AsyncNWS] Error connecting to {station_id}: {e}")
+            return False
+
+    async def connect(self) -> bool:
+        results = await asyncio.gather(*(self._connect_station(s) for s in self.sync.stations))
+        return any(results)
+
+    async def fetch_forecast(self, station_id: str) -> Optional[List[Dict[str, Any]]]:
+        meta = self.sync.station_cache.get(station_id)
+        if not meta:
+            if not await self._connect_station(station_id):
+                return None
+            meta = self.sync.station_cache[station_id]
+        try:
+            return (await self._get(meta['forecast_url']))['properties']['periods']
+        except Exception as e:
+            logger.error(f"[AsyncNWS] Forecast Fetch Error ({station_id}): {e}")
+            return None
+
+    async def fetch_hourly_forecast(self, station_id: str):
+        meta = self.sync.station_cache.get(station_id)
+        if not meta:
+            if not await self._connect_station(station_id):
+                return None
+            meta = self.sync.station_cache[station_id]
+        url = meta.get('forecast_hourly_url')
+        if not url:
+            return None
+        try:
+            return self.sync._parse_hourly(url, await self._get(url))
+        except Exception as e:
+            logger.error(f"[AsyncNWS] Hourly Forecast Fetch Error ({station_id}): {e}")
+            return None
+
+    async def _update_observations(self, station_id: str):
+        try:
+            data = await self._get(self.sync._observations_url(station_id), cache=False)
+            return self.sync._track_observations(station_id, data.get('features', []))
+        except Exception as e:
+            logger.error(f"[AsyncNWS] History Fetch Error ({station_id}): {e}")
+            return self.sync.observations.get(station_id)
+
+    async def fetch_latest(self, symbol: str = None) -> Optional[MarketData]:
+        target = symbol if symbol else self.sync.stations[0]
+        latest, forecast, observations, hourly = await asyncio.gather(
+            self._get(f"{self.sync.BASE_URL}/stations/{target}/observations/latest"),
+            self.fetch_forecast(target), self._update_observations(target), self.fetch_hourly_forecast(target),
+            return_exceptions=True)
+        if isinstance(latest, BaseException):
+            logger.error(f"[AsyncNWS] Fetch Error ({target}): {latest}")
+            return None
+        if isinstance(observations, BaseException):
+            observations = self.sync.observations.get(target)
+        if isinstance(hourly, BaseException):
+            hourly = None
+        return self.sync._to_market_data(target, latest['properties'], forecast, observations, hourly)
+
+
+# ==============================================================================
+# SYNC ADAPTER
+# ==============================================================================
+
+class AsyncRunner:
+    """An event loop on a daemon thread that synchronous code can submit coroutines to."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Blocks until the coroutine finishes; on timeout it is cancelled and TimeoutError raised."""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+
+class SyncProviderAdapter(DataProvider):
+    """
+    Exposes an async provider through the synchronous DataProvider interface
+    (and any other coroutine method as a blocking call with a timeout).
+    """
+
+    def __init__(self, provider, runner: Optional[AsyncRunner] = None, timeout: float = 15.0):
+        self.provider = provider
+        self.runner = runner or AsyncRunner()
+        self.timeout = timeout
+
+    def _call(self, coro, default=None):
+        try:
+            return self.runner.run(coro, self.timeout)
+        except concurrent.futures.TimeoutError:
+            logger.warning(f"[AsyncProviders] {type(self.provider).__name__} call timed out after {self.timeout:.1f}s")
+            return default
+
+    def connect(self) -> bool:
+        return bool(self._call(self.provider.connect(), False))
+
+    def fetch_latest(self, symbol: str = None) -> Optional[MarketData]:
+        return self._call(self.provider.fetch_latest(symbol))
+
+    def __getattr__(self, name):
+        attr = getattr(self.provider, name)
+        if inspect.iscoroutinefunction(attr):
+            return lambda *args, **kwargs: self._call(attr(*args, **kwargs))
+        return attr
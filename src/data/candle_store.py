@@ -0,0 +1,184 @@
+"""
+Local columnar store of Coinbase candles (one .npz per product and
+granularity) and a resumable, rate-limited, concurrent backfill into it.
+
+Columns follow the Coinbase candle layout: time (bucket start, epoch s),
+low, high, open, close, volume. The store also records which time ranges
+have been fetched, so an interrupted backfill resumes where it stopped and
+quiet minutes (no trades, no candle) are not re-requested.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.logger import logger
+
+
+DEFAULT_CANDLE_DIR = os.path.join("cache", "candles")
+CANDLE_COLUMNS = ("time", "low", "high", "open", "close", "volume")
+MAX_CANDLES_PER_REQUEST = 300  # Coinbase limit per /candles response
+
+
+class CandleStore:
+    """Candles of one product at one granularity, sorted by time (unique)."""
+
+    def __init__(self, product: str = "BTC-USD", granularity: int = 60, path: Optional[str] = None):
+        self.product = product
+        self.granularity = granularity
+        self.path = path or os.path.join(DEFAULT_CANDLE_DIR, f"{product}_{granularity}.npz")
+        self.data = np.zeros((0, len(CANDLE_COLUMNS)))
+        self.covered = np.zeros((0, 2), dtype=np.int64)  # fetched [start, end) ranges, merged
+        self._lock = threading.Lock()
+
+    # --- persistence ---
+
+    @classmethod
+    def load(cls, product: str = "BTC-USD", granularity: int = 60, path: Optional[str] = None) -> 'CandleStore':
+        """Store from disk; a missing or unreadable file yields an empty store."""
+        store = cls(product, granularity, path)
+        if not os.path.exists(store.path):
+            return store
+        try:
+            with np.load(store.path, allow_pickle=False) as data:
+                store.data = np.column_stack([data[c] for c in CANDLE_COLUMNS]).astype(float)
+                store.covered = data['covered'].astype(np.int64).reshape(-1, 2)
+        except Exception as e:
+            logger.error(f"[CandleStore] Failed to load {store.path}: {e}")
+            return cls(product, granularity, path)
+        return store
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock:
+            columns = {c: self.data[:, i] for i, c in enumerate(CANDLE_COLUMNS)}
+            columns['time'] = columns['time'].astype(np.int64)
+            covered = self.covered.copy()
+        tmp = f"{self.path}.tmp.npz"
+        np.savez_compressed(tmp, covered=covered, **columns)
+        os.replace(tmp, self.path)
+
+    # --- writing ---
+
+    def merge(self, rows: np.ndarray, fetched: Optional[Tuple[int, int]] = None) -> int:
+        """Adds candle rows (any order; newer rows win on duplicate times) and marks `fetched` as covered."""
+        rows = np.asarray(rows, dtype=float).reshape(-1, len(CANDLE_COLUMNS))
+        with self._lock:
+            before = len(self.data)
+            combined = np.concatenate([self.data, rows])
+            # keep the last occurrence of each time (incoming rows come after stored ones)
+            _, last = np.unique(combined[::-1, 0], return_index=True)
+            self.data = combined[len(combined) - 1 - last]
+            if fetched is not None:
+                self.covered = _merge_ranges(np.vstack([self.covered, [fetched]]))
+            return len(self.data) - before
+
+    def missing(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """Sub-ranges of [start, end) (epoch s, aligned to the granularity) not fetched yet."""
+        g = self.granularity
+        start, end = start // g * g, -(-end // g) * g
+        gaps, cursor = [], start
+        for lo, hi in self.covered:
+            if hi <= cursor or lo >= end:
+                continue
+            if lo > cursor:
+                gaps.append((cursor, int(lo)))
+            cursor = max(cursor, int(hi))
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    # --- reading ---
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def window(self, start: float, end: float) -> np.ndarray:
+        """Rows with start <= time < end (binary search on the sorted time column)."""
+        t = self.data[:, 0]
+        return self.data[np.searchsorted(t, start, side='left'):np.searchsorted(t, end, side='left')]
+
+    def recent_closes(self, seconds: float, now: Optional[float] = None) -> Tuple[List[datetime], List[float]]:
+        """(close times as naive local datetimes, close prices) of the candles ending in the last `seconds`."""
+        now = now or time.time()
+        rows = self.window(now - seconds - self.granularity, now)
+        ends = rows[:, 0] + self.granularity
+        rows = rows[(ends > now - seconds) & (ends <= now)]
+        return ([datetime.fromtimestamp(t + self.granularity) for t in rows[:, 0]], rows[:, 4].tolist())
+
+
+def _merge_ranges(ranges: np.ndarray) -> np.ndarray:
+    ranges = ranges[np.argsort(ranges[:, 0], kind='stable')]
+    out = []
+    for lo, hi in ranges:
+        if out and lo <= out[-1][1]:
+            out[-1][1] = max(out[-1][1], hi)
+        else:
+            out.append([lo, hi])
+    return np.array(out, dtype=np.int64).reshape(-1, 2)
+
+
+class _RateLimiter:
+    """Spaces request starts at least 1/max_rps apart across threads."""
+
+    def __init__(self, max_rps: float):
+        self.interval = 1.0 / max_rps
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def backfill(provider, store: CandleStore, start: int, end: int, workers: int = 4,
+             max_rps: float = 8.0, save_every: int = 50) -> int:
+    """
+    Fetches every not-yet-covered window of [start, end) (epoch s, capped at
+    the last complete bucket) with `workers` concurrent requests under a
+    shared max_rps limit, merging as results arrive and saving every
+    `save_every` windows (so a restart resumes). Failed windows stay
+    uncovered. Returns the number of new candles.
+    """
+    g = store.granularity
+    end = min(end, int(time.time()) // g * g)  # complete buckets only (a live candle would be stored half-built)
+    span = MAX_CANDLES_PER_REQUEST * g
+    windows = [(lo, min(lo + span, b)) for a, b in store.missing(start, end) for lo in range(a, b, span)]
+    if not windows:
+        return 0
+    logger.info(f"[CandleStore] Backfilling {store.product} {store.granularity}s: {len(windows)} requests")
+
+    limiter = _RateLimiter(max_rps)
+
+    def fetch(window):
+        limiter.wait()
+        return provider.fetch_candles(window[0], window[1], store.granularity, store.product)
+
+    added, done, failed = 0, 0, 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch, w): w for w in windows}
+        for future in as_completed(futures):
+            window = futures[future]
+            try:
+                rows = future.result()
+            except Exception as e:
+                logger.error(f"[CandleStore] Window {window} failed: {e}")
+                rows = None
+            if rows is None:
+                failed += 1
+                continue
+            added += store.merge(rows, fetched=window)
+            done += 1
+            if done % save_every == 0:
+                store.save()
+    store.save()
+    logger.info(f"[CandleStore] {store.product}: +{added} candles ({len(store)} total, {failed} windows failed)")
+    return added
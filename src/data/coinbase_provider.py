@@ -1,5 +1,6 @@
 import requests
-from datetime import datetime
+import numpy as np
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 from src.core.interfaces import DataProvider, MarketData
 
@@ -13,6 +14,8 @@ class CoinbaseProvider(DataProvider):
     
     def __init__(self, product_id: str = "BTC-USD"):
         self.product_id = product_id
+        # Pooled keep-alive connections (one TLS handshake instead of one per tick)
+        self.session = requests.Session()
         
     def connect(self) -> bool:
         """
@@ -21,7 +24,7 @@ class CoinbaseProvider(DataProvider):
         print(f"[CoinbaseProvider] Connecting to {self.BASE_URL} for {self.product_id}...")
         try:
             url = f"{self.BASE_URL}/products/{self.product_id}/ticker"
-            resp = requests.get(url, timeout=10)
+            resp = self.session.get(url, timeout=10)
             resp.raise_for_status()
             print(f"[CoinbaseProvider] Connection Successful. Price: {resp.json().get('price')}")
             return True
@@ -37,25 +40,47 @@ class CoinbaseProvider(DataProvider):
         url = f"{self.BASE_URL}/products/{target}/ticker"
         
         try:
-            resp = requests.get(url, timeout=5)
+            resp = self.session.get(url, timeout=5)
             resp.raise_for_status()
-            data = resp.json()
-            
-            price = float(data.get('price', 0))
-            
-            return MarketData(
-                symbol=target,
-                timestamp=datetime.now(),
-                price=price,
-                volume=float(data.get('volume', 0)),
-                bid=float(data.get('bid', 0)),
-                ask=float(data.get('ask', 0)),
-                extra={
-                    "source": "live_coinbase",
-                    "time": data.get('time')
-                }
-            )
+            return self._to_market_data(target, resp.json())
             
         except Exception as e:
             print(f"[CoinbaseProvider] Fetch Error: {e}")
             return None
+
+    def fetch_candles(self, start: float, end: float, granularity: int = 60, symbol: str = None) -> Optional[np.ndarray]:
+        """
+        Historical candles with start <= time < end (epoch seconds, at most
+        300 buckets per call) as an (n, 6) array of
+        [time, low, high, open, close, volume], oldest first.
+        Returns None on a failed request (an empty array means no trades).
+        """
+        target = symbol if symbol else self.product_id
+        url = f"{self.BASE_URL}/products/{target}/candles"
+        iso = lambda t: datetime.fromtimestamp(t, tz=timezone.utc).isoformat()
+        params = {"start": iso(start), "end": iso(end - granularity), "granularity": granularity}
+
+        try:
+            resp = self.session.get(url, params=params, timeout=10)
+            resp.raise_for_status()
+            rows = np.array(resp.json(), dtype=float).reshape(-1, 6)
+        except Exception as e:
+            print(f"[CoinbaseProvider] Candle Fetch Error: {e}")
+            return None
+        rows = rows[(rows[:, 0] >= start) & (rows[:, 0] < end)]
+        return rows[np.argsort(rows[:, 0])]
+
+    def _to_market_data(self, target: str, data: Dict[str, Any]) -> MarketData:
+        """Maps one /products/{id}/ticker payload to MarketData."""
+        return MarketData(
+            symbol=target,
+            timestamp=datetime.now(),
+            price=float(data.get('price', 0)),
+            volume=float(data.get('volume', 0)),
+            bid=float(data.get('bid', 0)),
+            ask=float(data.get('ask', 0)),
+            extra={
+                "source": "live_coinbase",
+                "time": data.get('time')
+            }
+        )
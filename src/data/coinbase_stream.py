@@ -0,0 +1,266 @@
+import asyncio
+import json
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from websockets.asyncio.client import connect
+
+from src.core.interfaces import DataProvider, MarketData
+from src.utils.logger import logger
+
+
+# ==============================================================================
+# LOCAL LEVEL-2 BOOK
+# ==============================================================================
+
+class Level2Book:
+    """Price -> size for both sides of one product (Coinbase sends decimal strings)."""
+
+    def __init__(self):
+        self.bids: Dict[float, float] = {}
+        self.asks: Dict[float, float] = {}
+
+    def apply_snapshot(self, msg: dict):
+        self.bids = {float(p): float(q) for p, q in msg.get('bids') or [] if float(q) > 0}
+        self.asks = {float(p): float(q) for p, q in msg.get('asks') or [] if float(q) > 0}
+
+    def apply_changes(self, changes: Iterable[list]):
+        for side, price, size in changes:
+            levels = self.bids if side == 'buy' else self.asks
+            price, size = float(price), float(size)
+            if size > 0:
+                levels[price] = size
+            else:
+                levels.pop(price, None)
+
+    def top(self) -> Tuple[float, float]:
+        """(best bid, best ask); 0.0 for an empty side."""
+        return (max(self.bids) if self.bids else 0.0, min(self.asks) if self.asks else 0.0)
+
+    def depth(self, levels: int = 10) -> Dict[str, np.ndarray]:
+        """Top `levels` of each side as (n, 2) [price, size] arrays, best first."""
+        bids = sorted(self.bids.items(), reverse=True)[:levels]
+        asks = sorted(self.asks.items())[:levels]
+        return {'bids': np.array(bids, dtype=float).reshape(-1, 2),
+                'asks': np.array(asks, dtype=float).reshape(-1, 2)}
+
+
+# ==============================================================================
+# STREAMING PROVIDER
+# ==============================================================================
+
+class CoinbaseStreamProvider(DataProvider):
+    """
+    Coinbase Exchange market data over the public WebSocket feed.
+
+    Subscribes to `ticker` and `level2_batch` for a set of products and keeps
+    the latest trade, best bid/ask, a local depth book and a short history
+    of trades in memory; every accessor reads that state without blocking.
+    The socket runs on its own asyncio loop in a daemon thread and
+    reconnects with exponential backoff (a fresh subscription brings a fresh
+    book snapshot). Before the first message arrives fetch_latest falls back
+    to the REST provider.
+    """
+
+    PUBLIC_WS_URL = "wss://ws-feed.exchange.coinbase.com"
+
+    def __init__(self, product_ids: Iterable[str] = ("BTC-USD",), rest=None, ws_url: str = None,
+                 channels=("ticker", "level2_batch"), reconnect_delay: float = 0.5,
+                 max_reconnect_delay: float = 30.0, history: int = 20000):
+        """
+        :param rest: CoinbaseProvider used while the stream has no data for a product
+        :param history: trades kept per product for spot_samples()
+        """
+        self.product_ids = list(product_ids)
+        self.rest = rest
+        self.ws_url = ws_url or self.PUBLIC_WS_URL
+        self.channels = list(channels)
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.history = history
+
+        self._lock = threading.Lock()
+        self._tickers: Dict[str, dict] = {}
+        self._books: Dict[str, Level2Book] = {}
+        self._trades: Dict[str, deque] = {p: deque(maxlen=history) for p in self.product_ids}
+        self._sequence: Dict[str, int] = {}
+
+        self._ws = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.connected = threading.Event()
+        self.stats = {'messages': 0, 'reconnects': 0, 'rest_fallbacks': 0, 'cache_hits': 0, 'gaps': 0}
+
+    # --- lifecycle -------------------------------------------------------------
+
+    def connect(self, timeout: float = 5.0) -> bool:
+        """Starts the streaming thread and waits up to `timeout` for the socket."""
+        if not self._running:
+            self._running = True
+            self._thread = threading.Thread(target=self._thread_main, daemon=True)
+            self._thread.start()
+        ok = self.connected.wait(timeout)
+        if not ok:
+            logger.warning(f"[CoinbaseStream] Not connected to {self.ws_url} yet; serving REST until it is.")
+        return ok
+
+    def close(self):
+        self._running = False
+        if self._loop and self._ws is not None:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _thread_main(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._run())
+        finally:
+            self._loop.close()
+
+    async def _run(self):
+        delay = self.reconnect_delay
+        while self._running:
+            try:
+                async with connect(self.ws_url, open_timeout=10, ping_interval=10, max_size=2 ** 24) as ws:
+                    self._ws = ws
+                    delay = self.reconnect_delay
+                    await ws.send(json.dumps({"type": "subscribe", "product_ids": self.product_ids,
+                                              "channels": self.channels}))
+                    self.connected.set()
+                    logger.info(f"[CoinbaseStream] Connected to {self.ws_url} ({', '.join(self.product_ids)})")
+                    async for raw in ws:
+                        self._on_message(json.loads(raw))
+            except Exception as e:
+                if self._running:
+                    logger.warning(f"[CoinbaseStream] Connection lost: {e}")
+            finally:
+                self._ws = None
+                self.connected.clear()
+                with self._lock:
+                    self._books.clear()  # sequences are kept: they keep increasing across connections
+            if self._running:
+                self.stats['reconnects'] += 1
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    # --- messages --------------------------------------------------------------
+
+    @staticmethod
+    def _parse_time(value: Optional[str]) -> datetime:
+        """ISO exchange time -> naive local datetime (same clock as datetime.now())."""
+        if not value:
+            return datetime.now()
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).astimezone().replace(tzinfo=None)
+        except ValueError:
+            return datetime.now()
+
+    def _on_message(self, msg: dict):
+        self.stats['messages'] += 1
+        kind = msg.get('type')
+        product = msg.get('product_id')
+        if kind == 'error':
+            logger.error(f"[CoinbaseStream] Server error: {msg.get('message')} {msg.get('reason', '')}")
+            return
+        if not product:
+            return
+
+        if kind == 'snapshot':
+            with self._lock:
+                book = self._books[product] = Level2Book()
+                book.apply_snapshot(msg)
+        elif kind == 'l2update':
+            with self._lock:
+                book = self._books.get(product)
+                if book is not None:
+                    book.apply_changes(msg.get('changes') or [])
+        elif kind == 'ticker':
+            seq = msg.get('sequence')
+            ts = self._parse_time(msg.get('time'))
+            price = float(msg.get('price') or 0)
+            with self._lock:
+                last = self._sequence.get(product)
+                if seq is not None:
+                    if last is not None and seq <= last:
+                        return  # duplicate / out of order
+                    if last is not None and seq > last + 1:
+                        self.stats['gaps'] += 1
+                    self._sequence[product] = seq
+                self._tickers[product] = {
+                    'price': price,
+                    'bid': float(msg.get('best_bid') or 0),
+                    'ask': float(msg.get('best_ask') or 0),
+                    'volume': float(msg.get('volume_24h') or 0),
+                    'last_size': float(msg.get('last_size') or 0),
+                    'time': msg.get('time'),
+                    'updated': ts,
+                }
+                if price > 0:
+                    self._trades.setdefault(product, deque(maxlen=self.history)).append((ts, price))
+
+    # --- non-blocking accessors ------------------------------------------------
+
+    def cached(self, symbol: str = None) -> Optional[MarketData]:
+        """Latest trade + top of book from memory, None until the product has stream data."""
+        product = symbol or self.product_ids[0]
+        with self._lock:
+            tick = self._tickers.get(product)
+            if tick is None:
+                return None
+            tick = dict(tick)
+            book = self._books.get(product)
+            bid, ask = book.top() if book is not None and book.bids and book.asks else (tick['bid'], tick['ask'])
+        self.stats['cache_hits'] += 1
+        return MarketData(
+            symbol=product,
+            timestamp=tick['updated'],
+            price=tick['price'],
+            volume=tick['volume'],
+            bid=bid,
+            ask=ask,
+            extra={
+                "source": "live_coinbase",
+                "time": tick['time'],
+                "last_size": tick['last_size'],
+                "stream": True
+            }
+        )
+
+    def depth(self, symbol: str = None, levels: int = 10) -> Optional[Dict[str, np.ndarray]]:
+        """Top-of-book depth snapshot ({'bids', 'asks'} arrays of [price, size]), None without a book."""
+        with self._lock:
+            book = self._books.get(symbol or self.product_ids[0])
+            return book.depth(levels) if book is not None else None
+
+    def spot_samples(self, symbol: str = None, since: Optional[datetime] = None,
+                     interval: float = 1.0) -> List[Tuple[datetime, float]]:
+        """
+        Trades after `since`, resampled to the last price per `interval`
+        seconds (bucket end time), oldest first.
+        """
+        with self._lock:
+            trades = list(self._trades.get(symbol or self.product_ids[0], ()))
+        if since is not None:
+            trades = [t for t in trades if t[0] > since]
+        if not trades:
+            return []
+        stamps = np.array([t.timestamp() for t, _ in trades])
+        buckets = np.floor(stamps / interval)
+        last = np.flatnonzero(np.append(buckets[1:] != buckets[:-1], True))
+        return [trades[i] for i in last]
+
+    # --- DataProvider ----------------------------------------------------------
+
+    def fetch_latest(self, symbol: str = None) -> Optional[MarketData]:
+        """Streamed quote when available, otherwise one pooled REST request."""
+        md = self.cached(symbol)
+        if md is not None or self.rest is None:
+            return md
+        self.stats['rest_fallbacks'] += 1
+        return self.rest.fetch_latest(symbol or self.product_ids[0])
@@ -0,0 +1,141 @@
+"""
+HTTP response cache for JSON endpoints that publish caching headers (NWS).
+
+A response is reused without a request while it is fresh per Cache-Control
+max-age (minus Age) or Expires. Once stale it is revalidated with
+If-None-Match / If-Modified-Since; a 304 keeps the cached body and only
+refreshes its lifetime. Shared by the sync and async providers: callers ask
+lookup() first, send validators() with the request, then hand the response
+to store() or not_modified(). At most max_entries bodies are kept; the
+least recently used is evicted first.
+"""
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Mapping, Optional
+
+
+class _Entry:
+    __slots__ = ('body', 'size', 'etag', 'last_modified', 'expires')
+
+    def __init__(self, body: Any, size: int, etag: Optional[str], last_modified: Optional[str], expires: float):
+        self.body = body
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers: Mapping[str, str], default: float = 0.0) -> float:
+    """Seconds a response stays fresh (RFC 9111: max-age - Age, else Expires - Date, else `default`)."""
+    directives = {}
+    for part in (headers.get('Cache-Control') or '').split(','):
+        name, _, value = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = value.strip('"')
+    if 'no-store' in directives or 'no-cache' in directives:
+        return 0.0
+    try:
+        age = float(headers.get('Age') or 0)
+    except ValueError:
+        age = 0.0
+    if 'max-age' in directives:
+        try:
+            return max(0.0, float(directives['max-age']) - age)
+        except ValueError:
+            return 0.0
+    expires = _http_date(headers.get('Expires'))
+    if expires is not None:
+        return max(0.0, expires - (_http_date(headers.get('Date')) or time.time()))
+    return default
+
+
+class HttpCache:
+    """
+    Per-URL cached JSON bodies with validators and expiry, bounded to
+    max_entries URLs (LRU). Only URLs that are requested repeatedly belong
+    here; one-off URLs (e.g. carrying a moving ?start=) should bypass it.
+    stats: fresh_hits (served without a request), not_modified (304s),
+    fetched (full 200 bodies), bytes_received, bytes_saved (cached bytes
+    served instead of downloaded) and requests_saved (= fresh_hits).
+    """
+
+    def __init__(self, default_ttl: float = 0.0, clock: Callable[[], float] = time.time, max_entries: int = 256):
+        """
+        :param default_ttl: lifetime of responses without caching headers (0 = always revalidate)
+        :param max_entries: URLs kept before the least recently used is evicted
+        """
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'fresh_hits': 0, 'not_modified': 0, 'fetched': 0,
+                      'bytes_received': 0, 'bytes_saved': 0, 'requests_saved': 0, 'evicted': 0}
+
+    def lookup(self, url: str) -> Optional[Any]:
+        """The cached body while it is fresh, else None (the caller makes a conditional request)."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None or self.clock() >= entry.expires:
+                return None
+            self._entries.move_to_end(url)
+            self.stats['fresh_hits'] += 1
+            self.stats['requests_saved'] += 1
+            self.stats['bytes_saved'] += entry.size
+            return entry.body
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for a stale entry ({} when nothing is cached)."""
+        with self._lock:
+            entry = self._entries.get(url)
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store(self, url: str, headers: Mapping[str, str], body: Any, size: int) -> Any:
+        """Caches a 200 response (unless it forbids storing) and returns its body."""
+        ttl = freshness_lifetime(headers, self.default_ttl)
+        etag, last_modified = headers.get('ETag'), headers.get('Last-Modified')
+        with self._lock:
+            self.stats['fetched'] += 1
+            self.stats['bytes_received'] += size
+            if 'no-store' in (headers.get('Cache-Control') or '').lower():
+                self._entries.pop(url, None)
+            elif ttl > 0 or etag or last_modified:
+                self._entries[url] = _Entry(body, size, etag, last_modified, self.clock() + ttl)
+                self._entries.move_to_end(url)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.stats['evicted'] += 1
+        return body
+
+    def not_modified(self, url: str, headers: Mapping[str, str]) -> Any:
+        """Handles a 304: extends the cached entry's lifetime and returns its body."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                raise KeyError(f"304 for uncached {url}")
+            self._entries.move_to_end(url)
+            entry.expires = self.clock() + freshness_lifetime(headers, self.default_ttl)
+            entry.etag = headers.get('ETag') or entry.etag
+            self.stats['not_modified'] += 1
+            self.stats['bytes_saved'] += entry.size
+            return entry.body
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,10 +1,12 @@
 import requests
 import json
+import threading
 import base64
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from cryptography.hazmat.primitives import serialization, hashes
 from cryptography.hazmat.primitives.asymmetric import padding
 from src.core.interfaces import DataProvider, MarketData
@@ -18,6 +20,8 @@ class KalshiProvider(DataProvider):
     
     PUBLIC_API_URL = "https://api.elections.kalshi.com/trade-api/v2"
     V1_API_URL = "https://api.elections.kalshi.com/v1"
+    BTC_HOURLY_LOOKAHEAD = 12    # candidate KXBTCD events probed: current hour + the next 11
+    EVENT_MISS_TTL_SEC = 120     # a probed-but-missing event is not re-probed for this long
     
     def __init__(self, key_id: str = None, private_key_path: str = None, api_url: str = None, read_only: bool = False):
         self.key_id = key_id
@@ -31,6 +35,9 @@ class KalshiProvider(DataProvider):
             self.private_key = None
             
         self.session = requests.Session()
+        # V1 event probes: { event_ticker: (expires_epoch, markets) }, markets == [] for missing events
+        self._event_cache: Dict[str, Tuple[float, List[MarketData]]] = {}
+        self._event_lock = threading.Lock()
         
     def _load_private_key(self, path_or_content: str):
         try:
@@ -59,7 +66,7 @@ class KalshiProvider(DataProvider):
             return ""
             
         full_path = path
-        if not path.startswith("/trade-api/v2"):
+        if not path.startswith("/trade-api/"):  # REST paths are relative; the WebSocket path is absolute
              full_path = "/trade-api/v2" + path
              
         payload = f"{timestamp}{method}{full_path}"
@@ -146,16 +153,9 @@ class KalshiProvider(DataProvider):
             logger.error(f"[KalshiProvider] Failed to fetch balance: {e}")
             return 0.0
 
-    def fetch_latest(self, symbol: str) -> MarketData:
-        """
-        Fetches market data for a specific ticker. 
-        Works without auth on the public elections endpoint.
-        """
-        path = f"/markets/{symbol}"
-        url = f"{self.api_url}{path}"
-        
+    def _headers(self, path: str) -> Dict[str, str]:
+        """JSON headers, signed for `path` when authenticated."""
         headers = {"Content-Type": "application/json"}
-        
         if not self.anonymous:
             timestamp = str(int(time.time() * 1000))
             signature = self._sign_request("GET", path, timestamp)
@@ -164,127 +164,216 @@ class KalshiProvider(DataProvider):
                 "KALSHI-ACCESS-SIGNATURE": signature,
                 "KALSHI-ACCESS-TIMESTAMP": timestamp
             })
+        return headers
+
+    def _to_market_data(self, data: Dict[str, Any], symbol: Optional[str] = None) -> MarketData:
+        """Maps one V2 market object (prices in cents) to MarketData."""
+        return MarketData(
+            symbol=symbol or data.get('ticker'),
+            timestamp=datetime.now(),
+            price=(data.get('last_price') or 0) / 100.0,
+            volume=data.get('volume', 0),
+            bid=(data.get('yes_bid') or 0) / 100.0,
+            ask=(data.get('yes_ask') or 0) / 100.0,
+            extra={
+                "status": data.get('status'),
+                "close_time": data.get('close_time'),
+                "source": "live_kalshi_ghost" if self.anonymous else "live_kalshi",
+                "no_bid": (data.get('no_bid') or 0) / 100.0,
+                "no_ask": (data.get('no_ask') or 0) / 100.0
+            }
+        )
+
+    def fetch_latest(self, symbol: str) -> MarketData:
+        """
+        Fetches market data for a specific ticker. 
+        Works without auth on the public elections endpoint.
+        """
+        path = f"/markets/{symbol}"
+        url = f"{self.api_url}{path}"
         
         try:
-            resp = self.session.get(url, headers=headers, timeout=10)
+            resp = self.session.get(url, headers=self._headers(path), timeout=10)
             resp.raise_for_status()
-            data = resp.json().get('market', {})
-            
-            yes_bid = data.get('yes_bid', 0) / 100.0
-            yes_ask = data.get('yes_ask', 0) / 100.0
-            no_bid = data.get('no_bid', 0) / 100.0
-            no_ask = data.get('no_ask', 0) / 100.0
-            last_price = data.get('last_price', 0) / 100.0
-            
-            return MarketData(
-                symbol=symbol,
-                timestamp=datetime.now(),
-                price=last_price,
-                volume=data.get('volume', 0),
-                bid=yes_bid,
-                ask=yes_ask,
-                extra={
-                    "status": data.get('status'),
-                    "close_time": data.get('close_time'),
-                    "source": "live_kalshi_ghost" if self.anonymous else "live_kalshi",
-                    "no_bid": no_bid,
-                    "no_ask": no_ask
-                }
-            )
+            return self._to_market_data(resp.json().get('market', {}), symbol)
             
         except Exception as e:
             logger.error(f"[KalshiProvider] Fetch Error for {symbol}: {e}")
             return None
 
-    def fetch_btc_hourly_markets(self) -> List[MarketData]:
+    def fetch_event(self, event_ticker: str) -> List[MarketData]:
         """
-        Special discovery for BTC Hourly markets which are hidden from V2 endpoint.
-        Uses V1 Event API to probe for active hourly events.
+        Every market of one event (e.g. KXHIGHNY-26FEB18) with its quotes, in a
+        single request. Returns [] on failure or for an unknown event.
         """
-        markets = []
-        now = datetime.now()
-        
-        # Candidate hours: Current hour + next 12 hours
-        candidates = []
-        for i in range(12):
-            t = now + timedelta(hours=i)
-            # Format: KXBTCD-YYMMMDDHH (e.g. 26FEB1717)
-            # Year: 26 (2-digit)
-            yy = t.strftime("%y")
-            # Month: FEB (3-char upper)
-            mmm = t.strftime("%b").upper()
-            # Day: 17 (2-digit)
-            dd = t.strftime("%d")
-            # Hour: 17 (24-hour)
-            hh = t.strftime("%H")
-            
-            ticker = f"KXBTCD-{yy}{mmm}{dd}{hh}"
-            candidates.append(ticker)
-            
-        logger.info(f"[KalshiProvider] Probing {len(candidates)} candidate BTC hourly events...")
-        
-        for event_ticker in candidates:
+        path = "/markets"
+        url = f"{self.api_url}{path}"
+
+        try:
+            resp = self.session.get(url, headers=self._headers(path),
+                                    params={"event_ticker": event_ticker, "limit": 200}, timeout=10)
+            resp.raise_for_status()
+            return [self._to_market_data(m) for m in resp.json().get('markets', []) if m.get('ticker')]
+
+        except Exception as e:
+            logger.error(f"[KalshiProvider] Event Fetch Error for {event_ticker}: {e}")
+            return []
+
+    def iter_market_pages(self, params: Dict[str, Any], max_pages: Optional[int] = None):
+        """
+        Raw V2 market objects of GET /markets, one list per page, following the
+        cursor. Stops quietly on an error (callers keep what they got).
+        """
+        path = "/markets"
+        params = dict(params, limit=params.get('limit', 200))
+        pages = 0
+        while max_pages is None or pages < max_pages:
             try:
-                # Probe V1
-                url = f"{self.V1_API_URL}/series/KXBTCD/events/{event_ticker}"
-                resp = self.session.get(url, timeout=2) # Fast timeout
-                
-                if resp.status_code == 200:
+                resp = self.session.get(f"{self.api_url}{path}", headers=self._headers(path), params=params, timeout=10)
+                resp.raise_for_status()
+                data = resp.json()
+            except Exception as e:
+                logger.error(f"[KalshiProvider] Listing Error ({params}): {e}")
+                return
+            pages += 1
+            page = data.get('markets', [])
+            yield page
+            cursor = data.get('cursor')
+            if not cursor or not page:
+                return
+            params = dict(params, cursor=cursor)
+
+    MAX_TICKERS_PER_REQUEST = 100
+
+    def fetch_many(self, tickers: List[str]) -> Dict[str, MarketData]:
+        """
+        Quotes for many tickers in as few requests as the API allows: one
+        GET /markets?tickers=a,b,... per chunk of MAX_TICKERS_PER_REQUEST.
+        Tickers the V2 listing does not return (e.g. BTC hourly strikes) are
+        fetched with one V1 event request per event. Tickers that are found
+        nowhere are absent from the result.
+        """
+        wanted = list(dict.fromkeys(t for t in tickers if t))
+        found: Dict[str, MarketData] = {}
+        path = "/markets"
+        url = f"{self.api_url}{path}"
+
+        for i in range(0, len(wanted), self.MAX_TICKERS_PER_REQUEST):
+            chunk = wanted[i:i + self.MAX_TICKERS_PER_REQUEST]
+            params = {"tickers": ",".join(chunk), "limit": len(chunk)}
+            while True:
+                try:
+                    resp = self.session.get(url, headers=self._headers(path), params=params, timeout=10)
+                    resp.raise_for_status()
                     data = resp.json()
-                    event = data.get('event', {})
-                    raw_markets = event.get('markets', [])
-                    
-                    if raw_markets:
-                        # logger.info(f"[KalshiProvider] FOUND {event_ticker}: {len(raw_markets)} markets")
-                        
-                        for m in raw_markets:
-                            # Check Expiration (Filter out past markets)
-                            close_str = m.get('close_date')
-                            if close_str:
-                                try:
-                                    # Handle ISO with Z
-                                    # 2026-02-17T05:00:00Z
-                                    # We use naive now() for simplicity if system is local, but API is UTC.
-                                    # Better to convert everything to UTC aware.
-                                    close_dt = datetime.fromisoformat(close_str.replace('Z', '+00:00'))
-                                    now_utc = datetime.now().astimezone()
-                                    
-                                    # Buffer: If closed within last 1 minute, consider closed.
-                                    if close_dt <= now_utc:
-                                        # logger.debug(f"Skipping expired market: {m.get('ticker_name')} (Closed {close_str})")
-                                        continue
-                                except Exception:
-                                    pass
+                except Exception as e:
+                    logger.error(f"[KalshiProvider] Bulk Fetch Error ({len(chunk)} tickers): {e}")
+                    break
+                for m in data.get('markets', []):
+                    if m.get('ticker') in chunk:
+                        found[m['ticker']] = self._to_market_data(m)
+                cursor = data.get('cursor')
+                if not cursor or all(t in found for t in chunk):
+                    break
+                params = dict(params, cursor=cursor)
 
-                            # Map V1 JSON to MarketData
-                            symbol = m.get('ticker_name')
-                            # Handle weird V1 keys
-                            bid = float(m.get('yes_bid', 0)) / 100.0
-                            ask = float(m.get('yes_ask', 0)) / 100.0
-                            no_bid = float(m.get('no_bid', 0)) / 100.0
-                            no_ask = float(m.get('no_ask', 0)) / 100.0
-                            last = float(m.get('last_price', 0)) / 100.0
-                            
-                            md = MarketData(
-                                symbol=symbol,
-                                timestamp=datetime.now(),
-                                price=last,
-                                volume=m.get('volume', 0),
-                                bid=bid,
-                                ask=ask,
-                                extra={
-                                    "status": m.get('status'),
-                                    "close_time": m.get('close_date'),
-                                    "source": "v1_discovery",
-                                    "strike_type": m.get('strike_type'),
-                                    "sub_title": m.get('sub_title'),
-                                    "no_bid": no_bid,
-                                    "no_ask": no_ask
-                                }
-                            )
-                            markets.append(md)
-            except Exception as e:
-                # logger.debug(f"Probe failed for {event_ticker}: {e}")
-                pass
-                
-        return markets
\ No newline at end of file
+        # Event-level fallback for markets hidden from the V2 listing
+        missing = [t for t in wanted if t not in found]
+        events = dict.fromkeys('-'.join(t.split('-')[:2]) for t in missing if t.count('-') >= 2)
+        for event_ticker in events:
+            for md in self._fetch_v1_event(event_ticker):
+                if md.symbol in missing:
+                    found[md.symbol] = md
+        return found
+
+    def _v1_to_market_data(self, m: Dict[str, Any]) -> MarketData:
+        """Maps one V1 event market (prices in cents, ticker_name/close_date keys) to MarketData."""
+        return MarketData(
+            symbol=m.get('ticker_name'),
+            timestamp=datetime.now(),
+            price=float(m.get('last_price', 0)) / 100.0,
+            volume=m.get('volume', 0),
+            bid=float(m.get('yes_bid', 0)) / 100.0,
+            ask=float(m.get('yes_ask', 0)) / 100.0,
+            extra={
+                "status": m.get('status'),
+                "close_time": m.get('close_date'),
+                "source": "v1_discovery",
+                "strike_type": m.get('strike_type'),
+                "sub_title": m.get('sub_title'),
+                "no_bid": float(m.get('no_bid', 0)) / 100.0,
+                "no_ask": float(m.get('no_ask', 0)) / 100.0
+            }
+        )
+
+    def _fetch_v1_event(self, event_ticker: str, timeout: float = 2) -> List[MarketData]:
+        """Every market of one event via the V1 event endpoint, [] if the event is unknown."""
+        series = event_ticker.split('-')[0]
+        try:
+            resp = self.session.get(f"{self.V1_API_URL}/series/{series}/events/{event_ticker}", timeout=timeout)
+            if resp.status_code != 200:
+                return []
+            raw_markets = resp.json().get('event', {}).get('markets', [])
+            return [self._v1_to_market_data(m) for m in raw_markets if m.get('ticker_name')]
+        except Exception:
+            return []
+
+    def _btc_hourly_candidates(self, now: datetime = None) -> List[str]:
+        """KXBTCD-YYMMMDDHH tickers (e.g. KXBTCD-26FEB1717) for the current hour and the ones after it."""
+        now = now or datetime.now()
+        return [f"KXBTCD-{(now + timedelta(hours=i)).strftime('%y%b%d%H').upper()}"
+                for i in range(self.BTC_HOURLY_LOOKAHEAD)]
+
+    @staticmethod
+    def _close_epoch(close_str: Optional[str]) -> Optional[float]:
+        if not close_str:
+            return None
+        try:
+            # Handle ISO with Z (2026-02-17T05:00:00Z)
+            return datetime.fromisoformat(close_str.replace('Z', '+00:00')).timestamp()
+        except Exception:
+            return None
+
+    def probe_events(self, event_tickers: List[str]) -> Dict[str, List[MarketData]]:
+        """
+        {event_ticker: markets} via the V1 event endpoint, probing uncached
+        events concurrently. Found events are cached until they close, missing
+        ones for EVENT_MISS_TTL_SEC. Cached quotes are as of discovery; use
+        fetch_many for fresh ones.
+        """
+        now = time.time()
+        with self._event_lock:
+            self._event_cache = {e: v for e, v in self._event_cache.items() if v[0] > now}
+            cached = {e: self._event_cache[e][1] for e in event_tickers if e in self._event_cache}
+        to_probe = [e for e in dict.fromkeys(event_tickers) if e not in cached]
+
+        if to_probe:
+            with ThreadPoolExecutor(max_workers=len(to_probe)) as pool:
+                probed = dict(zip(to_probe, pool.map(self._fetch_v1_event, to_probe)))
+            with self._event_lock:
+                for event_ticker, markets in probed.items():
+                    closes = [c for c in (self._close_epoch(m.extra.get('close_time')) for m in markets) if c]
+                    # Missing (or already settled) events are re-probed after the short TTL
+                    expires = max(closes) if closes and max(closes) > now else now + self.EVENT_MISS_TTL_SEC
+                    self._event_cache[event_ticker] = (expires, markets)
+            cached.update(probed)
+            logger.debug(f"[KalshiProvider] Probed {len(to_probe)} V1 events "
+                         f"({sum(1 for m in probed.values() if m)} found)")
+        return {e: cached[e] for e in event_tickers if e in cached}
+
+    def fetch_btc_hourly_markets(self) -> List[MarketData]:
+        """
+        Special discovery for BTC Hourly markets which are hidden from V2 endpoint.
+        Uses V1 Event API to probe for active hourly events (see probe_events
+        for caching); markets already closed are dropped.
+        """
+        now = time.time()
+        markets = []
+        for event_markets in self.probe_events(self._btc_hourly_candidates()).values():
+            for md in event_markets:
+                # Check Expiration (Filter out past markets)
+                close = self._close_epoch(md.extra.get('close_time'))
+                if close is not None and close <= now:
+                    continue
+                markets.append(md)
+        return markets
@@ -0,0 +1,392 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from websockets.asyncio.client import connect
+
+from src.core.interfaces import DataProvider, MarketData
+from src.utils.logger import logger
+
+
+# ==============================================================================
+# LOCAL ORDER BOOK
+# ==============================================================================
+
+class OrderBook:
+    """
+    Resting bids for one market, in cents -> contracts, for both sides.
+    A YES ask is the complement of the best NO bid (and vice versa).
+    """
+
+    def __init__(self):
+        self.yes: Dict[int, int] = {}
+        self.no: Dict[int, int] = {}
+
+    def apply_snapshot(self, msg: dict):
+        self.yes = {int(p): int(q) for p, q in msg.get('yes') or [] if q > 0}
+        self.no = {int(p): int(q) for p, q in msg.get('no') or [] if q > 0}
+
+    def apply_delta(self, msg: dict):
+        levels = self.yes if msg.get('side') == 'yes' else self.no
+        price = int(msg['price'])
+        qty = levels.get(price, 0) + int(msg['delta'])
+        if qty > 0:
+            levels[price] = qty
+        else:
+            levels.pop(price, None)
+
+    def quote(self) -> Dict[str, float]:
+        """Top of book in dollars (0.0 when a side is empty)."""
+        yes_bid = max(self.yes) if self.yes else 0
+        no_bid = max(self.no) if self.no else 0
+        return {
+            'bid': yes_bid / 100.0,
+            'ask': (100 - no_bid) / 100.0 if no_bid else 0.0,
+            'no_bid': no_bid / 100.0,
+            'no_ask': (100 - yes_bid) / 100.0 if yes_bid else 0.0,
+        }
+
+
+# ==============================================================================
+# STREAMING PROVIDER
+# ==============================================================================
+
+class KalshiStreamProvider(DataProvider):
+    """
+    Kalshi market data over the v2 WebSocket API.
+
+    Subscribes to the `ticker` and `orderbook_delta` channels for a dynamic
+    set of markets and keeps a local quote/book cache that fetch_latest reads
+    without a network round trip. The socket runs on its own asyncio loop in
+    a daemon thread; it reconnects with exponential backoff and resubscribes
+    every tracked market. A sequence gap on an order book subscription
+    triggers a fresh snapshot. Markets with no live data yet (cold start,
+    reconnect) are served by the REST provider and subscribed on the spot.
+    """
+
+    PUBLIC_WS_URL = "wss://api.elections.kalshi.com/trade-api/ws/v2"
+    WS_PATH = "/trade-api/ws/v2"
+    BOOK_CHANNEL = "orderbook_delta"
+
+    def __init__(self, rest=None, ws_url: str = None, channels=("ticker", "orderbook_delta"),
+                 reconnect_delay: float = 0.5, max_reconnect_delay: float = 30.0,
+                 idle_unsubscribe: float = 900.0, record_path: str = None):
+        """
+        :param rest: KalshiProvider used for signing the handshake and as the cold-cache fallback
+        :param idle_unsubscribe: markets not requested for this many seconds are unsubscribed
+        :param record_path: optional JSONL file receiving every raw message (replay recordings)
+        """
+        self.rest = rest
+        self.ws_url = ws_url or self._ws_url_for(getattr(rest, 'api_url', None))
+        self.channels = list(channels)
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.idle_unsubscribe = idle_unsubscribe
+        self.record_path = record_path
+
+        self._lock = threading.Lock()
+        self._tickers: Set[str] = set()
+        self._quotes: Dict[str, dict] = {}
+        self._books: Dict[str, OrderBook] = {}
+        self._live: Set[str] = set()          # markets with data since the current connection
+        self._meta: Dict[str, dict] = {}      # status / close_time learned from REST
+        self._last_request: Dict[str, float] = {}
+        self._last_prune = time.time()
+
+        self._sids: Dict[str, int] = {}       # channel -> subscription id
+        self._seq: Dict[int, int] = {}
+        self._next_id = 1
+        self._ws = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.connected = threading.Event()
+        self.stats = {'messages': 0, 'reconnects': 0, 'resyncs': 0, 'rest_fallbacks': 0, 'cache_hits': 0}
+
+    @classmethod
+    def _ws_url_for(cls, api_url: Optional[str]) -> str:
+        """https://host/trade-api/v2 -> wss://host/trade-api/ws/v2"""
+        if not api_url:
+            return cls.PUBLIC_WS_URL
+        host = api_url.split('://', 1)[-1].split('/', 1)[0]
+        return f"wss://{host}{cls.WS_PATH}"
+
+    # --- lifecycle -------------------------------------------------------------
+
+    def connect(self, timeout: float = 5.0) -> bool:
+        """Starts the streaming thread and waits up to `timeout` for the socket."""
+        if not self._running:
+            self._running = True
+            self._thread = threading.Thread(target=self._thread_main, daemon=True)
+            self._thread.start()
+        ok = self.connected.wait(timeout)
+        if not ok:
+            logger.warning(f"[KalshiStream] Not connected to {self.ws_url} yet; serving REST until it is.")
+        return ok
+
+    def close(self):
+        self._running = False
+        if self._loop and self._ws is not None:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _thread_main(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._run())
+        finally:
+            self._loop.close()
+
+    def _auth_headers(self) -> Dict[str, str]:
+        if self.rest is None or getattr(self.rest, 'anonymous', True):
+            return {}
+        return self.rest._headers(self.WS_PATH)
+
+    async def _run(self):
+        delay = self.reconnect_delay
+        while self._running:
+            try:
+                async with connect(self.ws_url, additional_headers=self._auth_headers(),
+                                   open_timeout=10, ping_interval=10) as ws:
+                    self._ws = ws
+                    delay = self.reconnect_delay
+                    with self._lock:
+                        tickers = sorted(self._tickers)
+                    if tickers:
+                        await self._subscribe(self.channels, tickers)
+                    self.connected.set()
+                    logger.info(f"[KalshiStream] Connected to {self.ws_url} ({len(tickers)} markets)")
+                    async for raw in ws:
+                        self._on_message(json.loads(raw))
+            except Exception as e:
+                if self._running:
+                    logger.warning(f"[KalshiStream] Connection lost: {e}")
+            finally:
+                self._ws = None
+                self.connected.clear()
+                self._sids.clear()
+                self._seq.clear()
+                with self._lock:
+                    self._live.clear()
+                    self._books.clear()
+            if self._running:
+                self.stats['reconnects'] += 1
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    # --- subscriptions ---------------------------------------------------------
+
+    async def _send(self, cmd: str, params: dict):
+        if self._ws is None:
+            return
+        self._next_id += 1
+        await self._ws.send(json.dumps({"id": self._next_id, "cmd": cmd, "params": params}))
+
+    async def _subscribe(self, channels: List[str], tickers: List[str]):
+        await self._send("subscribe", {"channels": channels, "market_tickers": tickers})
+
+    async def _add_markets(self, tickers: List[str]):
+        pending = [ch for ch in self.channels if ch not in self._sids]
+        for ch in self.channels:
+            if ch in self._sids:
+                await self._send("update_subscription", {"sids": [self._sids[ch]], "market_tickers": tickers,
+                                                         "action": "add_markets"})
+        if pending:
+            await self._subscribe(pending, tickers)
+
+    async def _remove_markets(self, tickers: List[str]):
+        for sid in list(self._sids.values()):
+            await self._send("update_subscription", {"sids": [sid], "market_tickers": tickers,
+                                                     "action": "delete_markets"})
+
+    async def _resync_books(self):
+        """Drops the order book subscription and takes fresh snapshots of every market."""
+        self.stats['resyncs'] += 1
+        sid = self._sids.pop(self.BOOK_CHANNEL, None)
+        if sid is not None:
+            self._seq.pop(sid, None)
+            await self._send("unsubscribe", {"sids": [sid]})
+        with self._lock:
+            self._books.clear()
+            tickers = sorted(self._tickers)
+        if tickers:
+            await self._subscribe([self.BOOK_CHANNEL], tickers)
+
+    def _submit(self, coro):
+        if self._loop is not None and self._ws is not None:
+            asyncio.run_coroutine_threadsafe(coro, self._loop)
+        else:
+            coro.close()  # subscribed on (re)connect
+
+    def subscribe(self, tickers: Iterable[str]):
+        with self._lock:
+            new = sorted(set(tickers) - self._tickers)
+            self._tickers.update(new)
+            now = time.time()
+            for t in new:
+                self._last_request.setdefault(t, now)
+        if new:
+            self._submit(self._add_markets(new))
+
+    def unsubscribe(self, tickers: Iterable[str]):
+        with self._lock:
+            gone = sorted(set(tickers) & self._tickers)
+            self._tickers.difference_update(gone)
+            for t in gone:
+                for table in (self._quotes, self._books, self._meta, self._last_request):
+                    table.pop(t, None)
+                self._live.discard(t)
+        if gone:
+            self._submit(self._remove_markets(gone))
+
+    @property
+    def tickers(self) -> Set[str]:
+        with self._lock:
+            return set(self._tickers)
+
+    def _prune_idle(self, now: float):
+        if now - self._last_prune < 60:
+            return
+        self._last_prune = now
+        with self._lock:
+            idle = [t for t, last in self._last_request.items() if now - last > self.idle_unsubscribe]
+        if idle:
+            logger.info(f"[KalshiStream] Unsubscribing {len(idle)} idle markets")
+            self.unsubscribe(idle)
+
+    # --- messages --------------------------------------------------------------
+
+    def _on_message(self, data: dict):
+        self.stats['messages'] += 1
+        if self.record_path:
+            with open(self.record_path, 'a') as f:
+                f.write(json.dumps(data) + "\n")
+
+        kind = data.get('type')
+        msg = data.get('msg') or {}
+        if kind == 'subscribed':
+            self._sids[msg.get('channel')] = msg.get('sid')
+            return
+        if kind == 'error':
+            logger.error(f"[KalshiStream] Server error: {msg}")
+            return
+
+        ticker = msg.get('market_ticker')
+        if not ticker:
+            return
+        if kind in ('orderbook_snapshot', 'orderbook_delta'):
+            sid, seq = data.get('sid'), data.get('seq')
+            if seq is not None:
+                expected = self._seq.get(sid, seq - 1) + 1
+                self._seq[sid] = seq
+                if kind == 'orderbook_delta' and seq != expected:
+                    logger.warning(f"[KalshiStream] Order book gap on sid {sid} ({expected} -> {seq}); resyncing")
+                    asyncio.ensure_future(self._resync_books())
+                    return
+            with self._lock:
+                book = self._books.get(ticker)
+                if kind == 'orderbook_snapshot':
+                    book = self._books[ticker] = OrderBook()
+                    book.apply_snapshot(msg)
+                elif book is None:
+                    return  # delta before its snapshot
+                else:
+                    book.apply_delta(msg)
+                self._update_quote(ticker, book.quote())
+        elif kind == 'ticker':
+            update = {'price': (msg.get('price') or 0) / 100.0, 'volume': msg.get('volume', 0)}
+            if ticker not in self._books:
+                yes_bid, yes_ask = msg.get('yes_bid') or 0, msg.get('yes_ask') or 0
+                update.update({'bid': yes_bid / 100.0, 'ask': yes_ask / 100.0,
+                               'no_bid': (100 - yes_ask) / 100.0 if yes_ask else 0.0,
+                               'no_ask': (100 - yes_bid) / 100.0 if yes_bid else 0.0})
+            with self._lock:
+                self._update_quote(ticker, update)
+
+    def _update_quote(self, ticker: str, update: dict):
+        quote = self._quotes.setdefault(ticker, {'price': 0.0, 'volume': 0, 'bid': 0.0, 'ask': 0.0,
+                                                 'no_bid': 0.0, 'no_ask': 0.0})
+        quote.update(update)
+        quote['updated'] = datetime.now()
+        self._live.add(ticker)
+
+    # --- DataProvider ----------------------------------------------------------
+
+    def cached(self, symbol: str) -> Optional[MarketData]:
+        """Quote from the local cache, None unless the market has live stream data."""
+        with self._lock:
+            if symbol not in self._live:
+                return None
+            quote = dict(self._quotes[symbol])
+            meta = self._meta.get(symbol, {})
+        self.stats['cache_hits'] += 1
+        return MarketData(
+            symbol=symbol,
+            timestamp=quote['updated'],
+            price=quote['price'],
+            volume=quote['volume'],
+            bid=quote['bid'],
+            ask=quote['ask'],
+            extra={
+                "status": meta.get('status', 'active'),
+                "close_time": meta.get('close_time'),
+                "source": "live_kalshi_stream",
+                "no_bid": quote['no_bid'],
+                "no_ask": quote['no_ask']
+            }
+        )
+
+    def fetch_latest(self, symbol: str) -> Optional[MarketData]:
+        """
+        Quote from the local cache when the market has live stream data;
+        otherwise one REST fetch (and the market is subscribed for next time).
+        """
+        now = time.time()
+        self.subscribe([symbol])
+        with self._lock:
+            self._last_request[symbol] = now
+        self._prune_idle(now)
+
+        md = self.cached(symbol)
+        if md is not None or self.rest is None:
+            return md
+        self.stats['rest_fallbacks'] += 1
+        md = self.rest.fetch_latest(symbol)
+        if md is not None:
+            self._remember_meta({symbol: md})
+        return md
+
+    def _remember_meta(self, fetched: Dict[str, MarketData]):
+        """Keeps status / close_time from REST results (the stream does not carry them)."""
+        with self._lock:
+            for t, md in fetched.items():
+                if t in self._tickers and md.extra:
+                    self._meta[t] = {'status': md.extra.get('status'), 'close_time': md.extra.get('close_time')}
+
+    def fetch_many(self, tickers: List[str]) -> Dict[str, MarketData]:
+        """fetch_latest for many markets: live ones from the cache, the rest in one bulk REST call."""
+        now = time.time()
+        tickers = list(dict.fromkeys(t for t in tickers if t))
+        self.subscribe(tickers)
+        with self._lock:
+            for t in tickers:
+                self._last_request[t] = now
+        self._prune_idle(now)
+
+        found = {}
+        for t in tickers:
+            md = self.cached(t)
+            if md is not None:
+                found[t] = md
+        cold = [t for t in tickers if t not in found]
+        if cold and self.rest is not None:
+            self.stats['rest_fallbacks'] += len(cold)
+            fetched = self.rest.fetch_many(cold)
+            self._remember_meta(fetched)
+            found.update(fetched)
+        return found
@@ -0,0 +1,221 @@
+"""
+Local index of one Kalshi series' markets (ticker, status, open/close/
+expiration time, strike, listing quotes), persisted to disk and refreshed
+incrementally from the V2 listing.
+
+Ticker resolution reads it from memory: the soonest-expiring active market
+is a bisect over expiration times, an event's active markets are one dict
+lookup. After a restart the index is loaded from disk and only markets
+closing after the stored high-water mark are listed again.
+
+Record quotes are as of the record's own last listing ('listed'), which for
+markets outside the incremental window is the last full refresh; they are
+not fit to rank on. rank_markets picks a strike from current quotes instead:
+a fresh listing payload or event_quotes(EventSnapshot).
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from src.core.interfaces import EventSnapshot
+from src.utils.logger import logger
+
+
+DEFAULT_INDEX_DIR = os.path.join("cache", "market_index")
+
+# Statuses that never trade again (anything else is active while open_time <= now < close_time)
+CLOSED_STATUSES = {"closed", "settled", "finalized", "determined", "deactivated"}
+# Listing fields kept per market besides the times (quotes are as of the last refresh)
+QUOTE_FIELDS = ("yes_bid", "yes_ask", "no_bid", "no_ask", "last_price", "volume")
+
+
+# Ranking criteria over listing payloads / index records (prices in cents): higher score = better,
+# None = not rankable. Register more with RANKING_CRITERIA[name] = fn.
+def _mid_distance(m: dict) -> Optional[float]:
+    bid, ask = m.get('yes_bid'), m.get('yes_ask')
+    return -abs((bid + ask) / 2 - 50) if bid and ask else None
+
+
+def _spread(m: dict) -> Optional[float]:
+    bid, ask = m.get('yes_bid'), m.get('yes_ask')
+    return -(ask - bid) if bid and ask else None
+
+
+RANKING_CRITERIA: Dict[str, Callable[[dict], Optional[float]]] = {
+    "sentiment": lambda m: m.get('yes_bid'),   # highest YES bid (implied probability)
+    "coinflip": _mid_distance,                 # mid closest to 50c
+    "volume": lambda m: m.get('volume'),       # most traded
+    "spread": _spread,                         # tightest two-sided YES quote
+}
+
+
+def rank_markets(markets: Iterable[dict], criteria: Union[str, Callable[[dict], Optional[float]]]) -> List[dict]:
+    """Markets best-first by a named (or custom) criterion; unrankable ones are dropped, ties keep input order."""
+    score = RANKING_CRITERIA[criteria] if isinstance(criteria, str) else criteria
+    scored = [(score(m), i, m) for i, m in enumerate(markets)]
+    scored = [x for x in scored if x[0] is not None]
+    scored.sort(key=lambda x: (-x[0], x[1]))
+    return [m for _, _, m in scored]
+
+
+def event_quotes(event: EventSnapshot) -> List[dict]:
+    """One rankable record per strike of a snapshot (ticker, strike, quotes in cents; missing quotes None)."""
+    def cents(x):
+        return None if np.isnan(x) else int(round(x * 100))
+
+    return [{'ticker': event.symbols[i], 'strike': float(event.strikes[i]),
+             'yes_bid': cents(event.yes_bid[i]), 'yes_ask': cents(event.yes_ask[i]),
+             'no_bid': cents(event.no_bid[i]), 'no_ask': cents(event.no_ask[i])} for i in range(len(event))]
+
+
+def _epoch(iso: Optional[str]) -> Optional[float]:
+    if not iso:
+        return None
+    try:
+        return datetime.fromisoformat(iso.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+class MarketIndex:
+    """Markets of one series; queries are lock-free reads of structures swapped in by refresh()."""
+
+    FULL_REFRESH_SEC = 1800   # re-list every open market this often (status changes, late additions)
+    OVERLAP_SEC = 3600        # incremental listings start this far before the close-time high-water mark
+    RETAIN_SEC = 86400        # markets closed longer than this are dropped
+
+    def __init__(self, series: str, path: Optional[str] = None):
+        self.series = series
+        self.path = path or os.path.join(DEFAULT_INDEX_DIR, f"{series}.json")
+        self.records: Dict[str, dict] = {}
+        self.updated = 0.0           # last refresh (epoch)
+        self.last_full = 0.0         # last full refresh (epoch)
+        self.stats = {'refreshes': 0, 'full_refreshes': 0, 'listed': 0}
+        self._lock = threading.Lock()
+        self._rebuild()
+
+    # --- persistence ---
+
+    @classmethod
+    def load(cls, series: str, path: Optional[str] = None) -> 'MarketIndex':
+        """Index from disk; a missing or unreadable file yields an empty index."""
+        index = cls(series, path)
+        if not os.path.exists(index.path):
+            return index
+        try:
+            with open(index.path) as f:
+                data = json.load(f)
+            index.records = {r['ticker']: r for r in data.get('markets', [])}
+            index.updated = data.get('updated', 0.0)
+            index.last_full = data.get('last_full', 0.0)
+            index._rebuild()
+        except Exception as e:
+            logger.error(f"[MarketIndex] Failed to load {index.path}: {e}")
+            return cls(series, path)
+        return index
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock:
+            data = {'series': self.series, 'updated': self.updated, 'last_full': self.last_full,
+                    'markets': list(self.records.values())}
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp, self.path)
+
+    # --- refresh ---
+
+    @staticmethod
+    def _record(m: dict) -> dict:
+        record = {
+            'ticker': m['ticker'],
+            'event_ticker': m.get('event_ticker') or m['ticker'].rsplit('-', 1)[0],
+            'status': m.get('status'),
+            'open': _epoch(m.get('open_time')),
+            'close': _epoch(m.get('close_time')),
+            'expiration': _epoch(m.get('expiration_time')) or _epoch(m.get('close_time')),
+            'close_time': m.get('close_time'),
+            'strike': EventSnapshot.parse_strike(m['ticker']),
+        }
+        record.update({k: m.get(k) for k in QUOTE_FIELDS})
+        return record
+
+    def refresh(self, provider, now: Optional[float] = None) -> int:
+        """
+        Lists markets closing after the high-water mark (everything not yet
+        closed on a full refresh) and merges them in. Returns how many markets
+        were listed.
+        """
+        now = now or time.time()
+        full = not self.records or now - self.last_full >= self.FULL_REFRESH_SEC
+        closes = [r['close'] for r in self.records.values() if r['close']]
+        since = now if full or not closes else max(now, max(closes) - self.OVERLAP_SEC)
+
+        listed = [self._record(m) for page in provider.iter_market_pages(
+            {"series_ticker": self.series, "min_close_ts": int(since)}) for m in page if m.get('ticker')]
+        for r in listed:
+            r['listed'] = now
+
+        with self._lock:
+            records = {t: r for t, r in self.records.items()
+                       if r['close'] is None or r['close'] > now - self.RETAIN_SEC}
+            records.update({r['ticker']: r for r in listed})
+            self.records = records
+            self.updated = now
+            if full:
+                self.last_full = now
+            self._rebuild()
+        self.stats['refreshes'] += 1
+        self.stats['full_refreshes'] += int(full)
+        self.stats['listed'] += len(listed)
+        return len(listed)
+
+    def _rebuild(self):
+        """Derived lookup structures: expiration-sorted keys and per-event strike-sorted lists."""
+        live = [r for r in self.records.values()
+                if r.get('status') not in CLOSED_STATUSES and r.get('expiration') is not None]
+        live.sort(key=lambda r: r['expiration'])
+        events: Dict[str, List[dict]] = {}
+        for r in live:
+            events.setdefault(r['event_ticker'], []).append(r)
+        for markets in events.values():
+            markets.sort(key=lambda r: (r['strike'] != r['strike'], r['strike']))
+        self._by_expiration = live
+        self._expirations = [r['expiration'] for r in live]
+        self._events = events
+
+    # --- queries ---
+
+    @staticmethod
+    def is_active(record: dict, now: float) -> bool:
+        return (record.get('status') not in CLOSED_STATUSES
+                and (record['open'] is None or record['open'] <= now)
+                and (record['close'] is None or now < record['close']))
+
+    def soonest_active(self, now: Optional[float] = None) -> Optional[dict]:
+        """Active market with the nearest expiration (binary search past already-expired markets)."""
+        now = now or time.time()
+        by_expiration = self._by_expiration
+        for i in range(bisect.bisect_right(self._expirations, now), len(by_expiration)):
+            if self.is_active(by_expiration[i], now):
+                return by_expiration[i]
+        return None
+
+    def event_markets(self, event_ticker: str, now: Optional[float] = None) -> List[dict]:
+        """Active markets of one event, sorted by strike."""
+        now = now or time.time()
+        return [r for r in self._events.get(event_ticker, []) if self.is_active(r, now)]
+
+    def is_fresh(self, max_age: float, now: Optional[float] = None) -> bool:
+        """Last refresh pass within max_age: listings/times are current, quotes only per record['listed']."""
+        return bool(self.records) and (now or time.time()) - self.updated < max_age
+
+    def __len__(self) -> int:
+        return len(self.records)
@@ -1,8 +1,17 @@
 import requests
 import json
-from datetime import datetime
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
 from src.core.interfaces import DataProvider, MarketData
+from src.data.http_cache import HttpCache
+from src.core.daily_max import DailyMaxForecast, HourlyForecast
+from src.data.observation_tracker import StationObservations, c_to_f, lst_day_start, standard_utc_offset
+
+DEFAULT_STATION_META_PATH = os.path.join("cache", "nws_stations.json")
 
 class NWSProvider(DataProvider):
     """
@@ -11,11 +20,14 @@ class NWSProvider(DataProvider):
     """
     
     BASE_URL = "https://api.weather.gov"
+    BACKFILL_LEAD_SEC = 3600  # first history request starts this long before the LST day (velocity window)
+    STATION_META_TTL_SEC = 7 * 86400  # cached station metadata older than this is revalidated in the background
     
-    def __init__(self, user_agent: str, station_id: str = "KJFK"):
+    def __init__(self, user_agent: str, station_id: str = "KJFK", meta_path: Optional[str] = None):
         """
         :param user_agent: Required string "(App Name, Email)"
         :param station_id: ICAO station ID (e.g., 'KJFK') OR a list of IDs ['KJFK', 'KLAX']
+        :param meta_path: JSON file persisting station metadata across runs (None = memory only)
         """
         self.user_agent = user_agent
         # Normalize input to list
@@ -25,45 +37,116 @@ class NWSProvider(DataProvider):
             self.stations = station_id
             
         self.headers = {"User-Agent": self.user_agent}
+        # Pooled connections + responses reused per Cache-Control/Expires, revalidated with ETag/Last-Modified
+        self.session = requests.Session()
+        self.http_cache = HttpCache()
         # Dictionary to store per-station data: { 'KJFK': { 'grid_id': ..., 'forecast_url': ... } }
-        self.station_cache = {} 
+        self.meta_path = meta_path
+        self._meta_lock = threading.Lock()
+        self.station_cache = self._load_station_meta()
+        # Per-station observation ring buffers + LST-day extremes, fed incrementally
+        self.observations: Dict[str, StationObservations] = {}
+        # Hourly forecast arrays per grid URL (with the response body they were parsed from)
+        self._hourly: Dict[str, tuple] = {}
         
     def connect(self) -> bool:
         """
-        Verifies connection for ALL configured stations.
+        Resolves metadata for ALL configured stations. Stations already in the
+        metadata cache connect without a request (stale entries are
+        revalidated on a background thread, and kept if NWS is unreachable);
+        unknown stations are resolved now, concurrently.
         """
-        success_count = 0
+        now = time.time()
+        missing = [s for s in self.stations if s not in self.station_cache]
+        stale = [s for s in self.stations if s in self.station_cache
+                 and now - self.station_cache[s].get('fetched', 0) >= self.STATION_META_TTL_SEC]
         for station in self.stations:
-            print(f"[NWSProvider] Connecting to {station}...")
-            if self._connect_station(station):
-                success_count += 1
-                
-        return success_count > 0
+            if station not in missing:
+                print(f"[NWSProvider] Resolved {station}: {self.station_cache[station].get('name')} (cached)")
+        if missing:
+            print(f"[NWSProvider] Connecting to {', '.join(missing)}...")
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                list(pool.map(self._connect_station, missing))
+        if stale:
+            threading.Thread(target=self._revalidate_stations, args=(stale,), daemon=True).start()
+        return any(s in self.station_cache for s in self.stations)
 
-    def _connect_station(self, station_id: str) -> bool:
+    # --- station metadata cache ---
+
+    def _load_station_meta(self) -> Dict[str, Dict[str, Any]]:
+        if not self.meta_path or not os.path.exists(self.meta_path):
+            return {}
         try:
-            url = f"{self.BASE_URL}/stations/{station_id}"
-            resp = requests.get(url, headers=self.headers, timeout=10)
+            with open(self.meta_path) as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"[NWSProvider] Failed to load station metadata {self.meta_path}: {e}")
+            return {}
+
+    def save_station_meta(self):
+        if not self.meta_path:
+            return
+        with self._meta_lock:
+            os.makedirs(os.path.dirname(self.meta_path) or ".", exist_ok=True)
+            tmp = f"{self.meta_path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.station_cache, f, indent=1)
+            os.replace(tmp, self.meta_path)
+
+    @staticmethod
+    def _station_meta(station: Dict[str, Any], point: Dict[str, Any]) -> Dict[str, Any]:
+        """/stations/{id} + /points/{lat},{lon} payloads -> the metadata kept per station."""
+        props, point_props = station.get('properties', {}), point.get('properties', {})
+        lon, lat = station['geometry']['coordinates'][:2]
+        return {
+            "name": props.get('name'),
+            "lat": lat,
+            "lon": lon,
+            "grid_id": point_props.get('gridId'),
+            "grid_x": point_props.get('gridX'),
+            "grid_y": point_props.get('gridY'),
+            "forecast_url": point_props.get('forecast'),
+            "forecast_hourly_url": point_props.get('forecastHourly'),
+            "time_zone": props.get('timeZone') or point_props.get('timeZone'),
+            "fetched": time.time()
+        }
+
+    def _revalidate_stations(self, stations: List[str]):
+        for station in stations:
+            self._connect_station(station)
+
+    def _get_json(self, url: str, cache: bool = True) -> Any:
+        """
+        GET through the HTTP cache: fresh bodies are served locally, stale
+        ones revalidated. cache=False is a plain GET for one-off URLs.
+        """
+        if not cache:
+            resp = self.session.get(url, headers=self.headers, timeout=10)
             resp.raise_for_status()
-            props = resp.json().get('properties', {})
-            geom = resp.json().get('geometry', {})
-            
-            coords = geom.get('coordinates')
+            return resp.json()
+        cached = self.http_cache.lookup(url)
+        if cached is not None:
+            return cached
+        resp = self.session.get(url, headers={**self.headers, **self.http_cache.validators(url)}, timeout=10)
+        if resp.status_code == 304:
+            return self.http_cache.not_modified(url, resp.headers)
+        resp.raise_for_status()
+        return self.http_cache.store(url, resp.headers, resp.json(), len(resp.content))
+
+    def _connect_station(self, station_id: str) -> bool:
+        try:
+            station = self._get_json(f"{self.BASE_URL}/stations/{station_id}")
+            coords = station.get('geometry', {}).get('coordinates')
             if not coords: return False
                 
             lat, lon = coords[1], coords[0]
             
             # Get Point Data
-            point_url = f"{self.BASE_URL}/points/{lat},{lon}"
-            resp = requests.get(point_url, headers=self.headers, timeout=10)
-            resp.raise_for_status()
-            point_props = resp.json()['properties']
+            point = self._get_json(f"{self.BASE_URL}/points/{lat},{lon}")
             
-            self.station_cache[station_id] = {
-                "name": props.get('name'),
-                "forecast_url": point_props.get('forecast')
-            }
-            print(f"[NWSProvider] Resolved {station_id}: {props.get('name')}")
+            self.station_cache[station_id] = self._station_meta(station, point)
+            self.save_station_meta()
+            print(f"[NWSProvider] Resolved {station_id}: {self.station_cache[station_id]['name']}")
             return True
             
         except Exception as e:
@@ -82,53 +165,79 @@ class NWSProvider(DataProvider):
             meta = self.station_cache.get(target)
             
         try:
-            resp = requests.get(meta['forecast_url'], headers=self.headers, timeout=10)
-            resp.raise_for_status()
-            return resp.json()['properties']['periods']
+            return self._get_json(meta['forecast_url'])['properties']['periods']
         except Exception as e:
             print(f"[NWSProvider] Forecast Fetch Error ({target}): {e}")
             return None
 
-    def _get_daily_max_temp(self, station_id: str) -> Optional[float]:
+    def _parse_hourly(self, url: str, body: Dict[str, Any]) -> HourlyForecast:
+        """Hourly periods as arrays, parsed once per response (stations sharing a grid share it)."""
+        cached = self._hourly.get(url)
+        if cached is None or cached[0] is not body:
+            cached = self._hourly[url] = (body, HourlyForecast.from_periods(body['properties']['periods']))
+        return cached[1]
+
+    def fetch_hourly_forecast(self, station_id: str = None) -> Optional[HourlyForecast]:
         """
-        Fetches observation history to find the max temp recorded so far TODAY.
+        Fetches the hourly gridpoint forecast for a station (None if unknown).
         """
+        target = station_id if station_id else self.stations[0]
+        meta = self.station_cache.get(target)
+        if not meta:
+            if not self._connect_station(target): return None
+            meta = self.station_cache.get(target)
+        url = meta.get('forecast_hourly_url')
+        if not url:
+            return None
+
         try:
-            # Fetch recent observations (returns ~24h worth usually)
-            url = f"{self.BASE_URL}/stations/{station_id}/observations"
-            resp = requests.get(url, headers=self.headers, timeout=10)
-            resp.raise_for_status()
-            
-            features = resp.json().get('features', [])
-            if not features: return None
-            
-            max_c = -999.0
-            found_data = False
-            
-            # Simple Date Check (System Local Time vs Observation Time)
-            # Ideally we check Station Local Time, but System Local is close enough for US Trading
-            today_str = datetime.now().strftime("%Y-%m-%d")
-            
-            for f in features:
-                props = f.get('properties', {})
-                ts_str = props.get('timestamp', '')
-                
-                # Check if observation is from Today
-                # ISO Format: 2026-01-31T15:53:00+00:00
-                if ts_str.startswith(today_str):
-                    val = props.get('temperature', {}).get('value')
-                    if val is not None:
-                        if val > max_c:
-                            max_c = val
-                            found_data = True
-                            
-            if found_data:
-                return (max_c * 9/5) + 32
+            return self._parse_hourly(url, self._get_json(url))
+        except Exception as e:
+            print(f"[NWSProvider] Hourly Forecast Fetch Error ({target}): {e}")
             return None
-            
+
+    def _tracker(self, station_id: str) -> StationObservations:
+        tracker = self.observations.get(station_id)
+        if tracker is None:
+            time_zone = self.station_cache.get(station_id, {}).get('time_zone')
+            tracker = self.observations[station_id] = StationObservations(station_id, standard_utc_offset(time_zone))
+        return tracker
+
+    def _observations_url(self, station_id: str) -> str:
+        """
+        History request for a station: the first one backfills from just
+        before today's LST day, later ones ask only for observations newer
+        than the last seen. The start moves with every new observation, so
+        these URLs are fetched outside the HTTP cache.
+        """
+        tracker = self._tracker(station_id)
+        if tracker.last_seen is not None:
+            start = tracker.last_seen + 1
+        else:
+            start = tracker.lst_day_start(time.time()) - self.BACKFILL_LEAD_SEC
+        start_iso = datetime.fromtimestamp(start, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return f"{self.BASE_URL}/stations/{station_id}/observations?start={start_iso}"
+
+    def _track_observations(self, station_id: str, features: List[Dict[str, Any]]) -> StationObservations:
+        tracker = self._tracker(station_id)
+        tracker.add(f.get('properties', {}) for f in features)
+        return tracker
+
+    def _update_observations(self, station_id: str) -> Optional[StationObservations]:
+        """Fetches the observations new since the last call into the station's tracker."""
+        try:
+            data = self._get_json(self._observations_url(station_id), cache=False)
+            return self._track_observations(station_id, data.get('features', []))
         except Exception as e:
             print(f"[NWSProvider] History Fetch Error ({station_id}): {e}")
-            return None
+            return self.observations.get(station_id)
+
+    def _get_daily_max_temp(self, station_id: str) -> Optional[float]:
+        """
+        Max temp recorded so far in today's LST day (the CLI settlement day).
+        """
+        tracker = self._update_observations(station_id)
+        return tracker.daily_max() if tracker else None
 
     def fetch_latest(self, symbol: str = None) -> MarketData:
         """
@@ -149,42 +258,62 @@ class NWSProvider(DataProvider):
         url = f"{self.BASE_URL}/stations/{target}/observations/latest"
         
         try:
-            resp = requests.get(url, headers=self.headers, timeout=10)
-            resp.raise_for_status()
-            data = resp.json()['properties']
-            
-            temp_c = data.get('temperature', {}).get('value')
-            temp_f = (temp_c * 9/5) + 32 if temp_c is not None else None
-            
-            forecast_periods = self.fetch_forecast(target)
-            
-            # NEW: Get Daily High so far
-            daily_high_f = self._get_daily_max_temp(target)
-            
-            # If no history (e.g. start of day), assume current is high
-            if daily_high_f is None and temp_f is not None:
-                daily_high_f = temp_f
-            # If current is higher than history (lag), update it
-            if temp_f and daily_high_f and temp_f > daily_high_f:
-                daily_high_f = temp_f
-            
-            return MarketData(
-                symbol=target,
-                timestamp=datetime.now(),
-                price=0.0,
-                volume=0,
-                bid=0,
-                ask=0,
-                extra={
-                    "temperature_f": temp_f,
-                    "max_temp_today_f": daily_high_f,
-                    "temperature_c": temp_c,
-                    "description": data.get('textDescription'),
-                    "source": "live_nws",
-                    "forecast": forecast_periods,
-                    "station_name": self.station_cache.get(target, {}).get('name')
-                }
-            )
+            data = self._get_json(url)['properties']
+            return self._to_market_data(target, data, self.fetch_forecast(target), self._update_observations(target),
+                                        self.fetch_hourly_forecast(target))
         except Exception as e:
             print(f"[NWSProvider] Fetch Error ({target}): {e}")
             return None
+
+    def _to_market_data(self, target: str, data: Dict[str, Any], forecast_periods: Optional[List[Dict[str, Any]]],
+                        observations: Optional[StationObservations],
+                        hourly: Optional[HourlyForecast] = None) -> MarketData:
+        """
+        Latest observation properties + forecast periods + the station's
+        observation tracker (today's LST max/min, velocity) + the hourly
+        forecast (remaining-day max distribution) -> MarketData.
+        The latest observation is folded into the tracker first.
+        """
+        temp_c = data.get('temperature', {}).get('value')
+        temp_f = c_to_f(temp_c)
+        daily_high_f = daily_low_f = velocity = None
+        if observations is not None:
+            observations.add([data])
+            daily_high_f, daily_low_f = observations.daily_max(), observations.daily_min()
+            velocity = observations.velocity()
+
+        # If no history (e.g. start of day), assume current is high
+        if daily_high_f is None and temp_f is not None:
+            daily_high_f = temp_f
+        # If current is higher than history (lag), update it
+        if temp_f and daily_high_f and temp_f > daily_high_f:
+            daily_high_f = temp_f
+
+        offset = observations.std_offset_sec if observations is not None else \
+            standard_utc_offset(self.station_cache.get(target, {}).get('time_zone'))
+        daily_max = None
+        if hourly is not None:
+            now = time.time()
+            daily_max = DailyMaxForecast(daily_high_f, hourly, now, lst_day_start(now, offset) + 86400)
+
+        return MarketData(
+            symbol=target,
+            timestamp=datetime.now(),
+            price=0.0,
+            volume=0,
+            bid=0,
+            ask=0,
+            extra={
+                "temperature_f": temp_f,
+                "max_temp_today_f": daily_high_f,
+                "min_temp_today_f": daily_low_f,
+                "temp_velocity_f_per_hr": velocity,
+                "daily_max_forecast": daily_max,
+                "std_offset_sec": offset,  # station's LST offset (CLI day boundaries)
+                "temperature_c": temp_c,
+                "description": data.get('textDescription'),
+                "source": "live_nws",
+                "forecast": forecast_periods,
+                "station_name": self.station_cache.get(target, {}).get('name')
+            }
+        )
@@ -0,0 +1,140 @@
+"""
+Incremental per-station NWS observation tracking.
+
+Observations are appended to a fixed-size ring buffer as they arrive (the
+provider backfills once, then only asks for observations newer than the last
+one seen), and the running max/min temperature is kept per climate day. NWS
+CLI reports cover midnight to midnight Local Standard Time (no DST shift),
+so days are split on the station's standard UTC offset. Temperature
+velocity is read from the same buffer.
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+
+def standard_utc_offset(time_zone: Optional[str]) -> float:
+    """Standard-time UTC offset (seconds) of an IANA zone; the system zone's when unknown."""
+    if time_zone:
+        try:
+            from zoneinfo import ZoneInfo
+            tz = ZoneInfo(time_zone)
+            probe = datetime(2026, 1, 15, tzinfo=tz)
+            return (probe.utcoffset() - probe.dst()).total_seconds()
+        except Exception:
+            pass
+    return float(-time.timezone)
+
+
+def lst_day_start(epoch: float, std_offset_sec: float) -> float:
+    """Epoch of the LST midnight that starts the climate day containing `epoch`."""
+    local = epoch + std_offset_sec
+    return local - local % 86400 - std_offset_sec
+
+
+def c_to_f(value: Optional[float]) -> Optional[float]:
+    return value * 9 / 5 + 32 if value is not None else None
+
+
+def _epoch(iso: Optional[str]) -> Optional[float]:
+    if not iso:
+        return None
+    try:
+        return datetime.fromisoformat(iso.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+class StationObservations:
+    """
+    Temperatures (°C) of one station in a ring buffer plus the running
+    extremes of each LST day. Accessors return °F like the rest of the
+    provider's MarketData fields.
+    """
+
+    DAYS_KEPT = 3  # per-day extremes retained
+
+    def __init__(self, station: str, std_offset_sec: float, capacity: int = 512):
+        self.station = station
+        self.std_offset_sec = std_offset_sec
+        self.capacity = capacity
+        self._times = np.full(capacity, np.nan)
+        self._temps = np.full(capacity, np.nan)
+        self._head = 0        # next write position
+        self._count = 0
+        self.last_seen: Optional[float] = None       # newest observation time (epoch)
+        self.extremes: Dict[str, Tuple[float, float]] = {}  # LST day -> (max_c, min_c)
+        self._lock = threading.Lock()
+
+    # --- writing ---
+
+    def lst_day(self, epoch: float) -> str:
+        return (datetime.fromtimestamp(epoch, tz=timezone.utc) + timedelta(seconds=self.std_offset_sec)).strftime("%Y-%m-%d")
+
+    def lst_day_start(self, epoch: float) -> float:
+        return lst_day_start(epoch, self.std_offset_sec)
+
+    def add(self, observations: Iterable[Dict[str, Any]]) -> int:
+        """
+        Folds in observation properties dicts (timestamp + temperature.value),
+        in any order; ones not newer than the last seen are ignored. Returns
+        how many were added.
+        """
+        rows = []
+        for props in observations:
+            ts = _epoch(props.get('timestamp'))
+            temp = (props.get('temperature') or {}).get('value')
+            if ts is not None and temp is not None:
+                rows.append((ts, float(temp)))
+        rows.sort()
+        added = 0
+        with self._lock:
+            for ts, temp in rows:
+                if self.last_seen is not None and ts <= self.last_seen:
+                    continue
+                self._times[self._head] = ts
+                self._temps[self._head] = temp
+                self._head = (self._head + 1) % self.capacity
+                self._count = min(self._count + 1, self.capacity)
+                self.last_seen = ts
+                day = self.lst_day(ts)
+                hi, lo = self.extremes.get(day, (temp, temp))
+                self.extremes[day] = (max(hi, temp), min(lo, temp))
+                added += 1
+            for day in sorted(self.extremes)[:-self.DAYS_KEPT]:
+                del self.extremes[day]
+        return added
+
+    # --- reading ---
+
+    def window(self, seconds: float, now: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(times, temps °C) of the buffered observations in the last `seconds`, oldest first."""
+        now = now or time.time()
+        with self._lock:
+            order = (np.arange(self._count) + self._head - self._count) % self.capacity
+            times, temps = self._times[order], self._temps[order]
+        keep = times > now - seconds
+        return times[keep], temps[keep]
+
+    def daily_max(self, now: Optional[float] = None) -> Optional[float]:
+        """Max so far in today's LST day (°F), None before the first observation of the day."""
+        day = self.extremes.get(self.lst_day(now or time.time()))
+        return c_to_f(day[0]) if day else None
+
+    def daily_min(self, now: Optional[float] = None) -> Optional[float]:
+        day = self.extremes.get(self.lst_day(now or time.time()))
+        return c_to_f(day[1]) if day else None
+
+    def velocity(self, window_sec: float = 3600, now: Optional[float] = None,
+                 min_span_sec: float = 360) -> Optional[float]:
+        """°F per hour between the oldest and newest observation in the window (None if under `min_span_sec` apart)."""
+        times, temps = self.window(window_sec, now)
+        if len(times) < 2 or times[-1] - times[0] < min_span_sec:
+            return None
+        return (temps[-1] - temps[0]) * 9 / 5 / ((times[-1] - times[0]) / 3600)
+
+    def __len__(self) -> int:
+        return self._count
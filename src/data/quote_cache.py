@@ -0,0 +1,113 @@
+"""
+Short-lived quote cache in front of a market-data provider.
+
+A quote younger than `ttl` seconds is served from memory, and concurrent
+requests for the same ticker share one in-flight fetch (single flight), so a
+market quoted by the position refresh, the ladder and a strategy in the same
+tick costs one request.
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.core.interfaces import DataProvider, MarketData
+
+
+class _Flight:
+    """One in-flight fetch; followers wait on `done` and read `result`."""
+    __slots__ = ('done', 'result')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[MarketData] = None
+
+
+class QuoteCache(DataProvider):
+    """
+    Wraps any provider with fetch_latest (and optionally fetch_many).
+    stats: hits (fresh in cache), misses (fetched), coalesced (waited on
+    another caller's fetch) and fetches (calls made to the source).
+    """
+
+    MAX_ENTRIES = 2048  # expired quotes are swept once the cache grows past this
+
+    def __init__(self, source, ttl: float = 2.0, wait_timeout: float = 15.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.source = source
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self.clock = clock
+        self._entries: Dict[str, Tuple[float, MarketData]] = {}
+        self._in_flight: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'fetches': 0}
+
+    def connect(self) -> bool:
+        return self.source.connect()
+
+    def fetch_latest(self, symbol: str) -> Optional[MarketData]:
+        return self.fetch_many([symbol]).get(symbol)
+
+    def fetch_many(self, tickers: List[str]) -> Dict[str, MarketData]:
+        """{ticker: MarketData} for the tickers that could be quoted, in request order."""
+        wanted = list(dict.fromkeys(t for t in tickers if t))
+        found: Dict[str, MarketData] = {}
+        lead: List[str] = []
+        follow: Dict[str, _Flight] = {}
+
+        now = self.clock()
+        with self._lock:
+            for t in wanted:
+                entry = self._entries.get(t)
+                if entry and now - entry[0] < self.ttl:
+                    found[t] = entry[1]
+                    self.stats['hits'] += 1
+                elif t in self._in_flight:
+                    follow[t] = self._in_flight[t]
+                    self.stats['coalesced'] += 1
+                else:
+                    self._in_flight[t] = _Flight()
+                    lead.append(t)
+                    self.stats['misses'] += 1
+
+        if lead:
+            fetched: Dict[str, MarketData] = {}
+            try:
+                fetched = self._fetch(lead)
+            finally:
+                with self._lock:
+                    stamp = self.clock()
+                    for t in lead:
+                        flight = self._in_flight.pop(t)
+                        flight.result = fetched.get(t)
+                        if flight.result is not None:
+                            self._entries[t] = (stamp, flight.result)
+                        flight.done.set()
+                    if len(self._entries) > self.MAX_ENTRIES:
+                        self._entries = {t: e for t, e in self._entries.items() if stamp - e[0] < self.ttl}
+            found.update({t: md for t, md in fetched.items() if md is not None})
+
+        for t, flight in follow.items():
+            if flight.done.wait(self.wait_timeout) and flight.result is not None:
+                found[t] = flight.result
+        return {t: found[t] for t in wanted if t in found}
+
+    def _fetch(self, tickers: List[str]) -> Dict[str, MarketData]:
+        if len(tickers) > 1 and hasattr(self.source, 'fetch_many'):
+            self.stats['fetches'] += 1
+            return self.source.fetch_many(tickers)
+        self.stats['fetches'] += len(tickers)
+        return {t: self.source.fetch_latest(t) for t in tickers}
+
+    def invalidate(self, symbol: str = None):
+        """Drops one cached quote (or all of them)."""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(symbol, None)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.stats['hits'] + self.stats['misses'] + self.stats['coalesced']
+        return (self.stats['hits'] + self.stats['coalesced']) / total if total else 0.0
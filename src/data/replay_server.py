@@ -0,0 +1,246 @@
+"""
+Local stand-in WebSocket servers (Kalshi, Coinbase) that replay recorded market-data messages.
+Used by the tests (and for offline runs of the streaming providers) in place
+of the live exchange feeds.
+"""
+import asyncio
+import itertools
+import json
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed
+
+
+class ReplayServer:
+    """
+    Runs a websockets server on its own event loop thread. Subclasses
+    implement `_on_command` for the exchange's subscription protocol.
+    """
+
+    def __init__(self, messages: Iterable[dict] = (), host: str = "127.0.0.1", port: int = 0, interval: float = 0.0):
+        """
+        :param messages: recorded messages, replayed in order to matching subscriptions
+        :param interval: delay between replayed messages (0 = as fast as possible)
+        """
+        self.messages: List[dict] = list(messages)
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.commands: List[dict] = []
+        self.request_headers: List[Dict[str, str]] = []
+        self.connections = 0
+        self._clients: Set["_Client"] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs):
+        """Loads a JSONL recording (e.g. written by a provider's record_path)."""
+        with open(path) as f:
+            return cls([json.loads(line) for line in f if line.strip()], **kwargs)
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    def start(self) -> "ReplayServer":
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._thread_main, args=(ready,), daemon=True)
+        self._thread.start()
+        if not ready.wait(5):
+            raise RuntimeError("Replay server failed to start")
+        return self
+
+    def stop(self):
+        if self._loop and self._stop:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _thread_main(self, ready: threading.Event):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._serve(ready))
+        self._loop.close()
+
+    async def _serve(self, ready: threading.Event):
+        self._stop = asyncio.Event()
+        async with serve(self._handler, self.host, self.port) as server:
+            self.port = next(iter(server.sockets)).getsockname()[1]
+            ready.set()
+            await self._stop.wait()
+
+    async def _handler(self, ws):
+        self.connections += 1
+        self.request_headers.append(dict(ws.request.headers))
+        client = _Client(ws)
+        self._clients.add(client)
+        try:
+            async for raw in ws:
+                cmd = json.loads(raw)
+                self.commands.append(cmd)
+                await self._on_command(client, cmd)
+        except ConnectionClosed:
+            pass
+        finally:
+            self._clients.discard(client)
+
+    async def _on_command(self, client: "_Client", cmd: dict):
+        raise NotImplementedError
+
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout=5)
+
+    def drop_clients(self):
+        """Closes every client connection (clients are expected to reconnect)."""
+        async def drop():
+            for client in list(self._clients):
+                await client.ws.close()
+        self._call(drop())
+
+
+class _Client:
+    def __init__(self, ws):
+        self.ws = ws
+        self.subs: Dict[int, dict] = {}
+
+
+class KalshiReplayServer(ReplayServer):
+    """
+    Stand-in for the Kalshi v2 WebSocket API (subscribe, update_subscription,
+    unsubscribe). Recorded messages look like the live feed, e.g.
+    {"type": "orderbook_delta", "msg": {"market_ticker": ..., "price": 45, "delta": 10, "side": "yes"}};
+    sid and seq are assigned per client subscription when they are sent.
+    """
+
+    CHANNEL_OF = {'ticker': 'ticker', 'orderbook_snapshot': 'orderbook_delta',
+                  'orderbook_delta': 'orderbook_delta', 'trade': 'trade'}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sid = itertools.count(1)
+
+    async def _on_command(self, client: _Client, cmd: dict):
+        params = cmd.get('params') or {}
+        name = cmd.get('cmd')
+        if name == 'subscribe':
+            markets = set(params.get('market_tickers') or [])
+            for channel in params.get('channels') or []:
+                sid = next(self._sid)
+                client.subs[sid] = {'channel': channel, 'markets': set(markets), 'seq': 0}
+                await client.ws.send(json.dumps({"id": cmd.get('id'), "type": "subscribed",
+                                                 "msg": {"channel": channel, "sid": sid}}))
+                await self._replay(client, sid, markets)
+        elif name == 'update_subscription':
+            markets = set(params.get('market_tickers') or [])
+            for sid in params.get('sids') or []:
+                sub = client.subs.get(sid)
+                if sub is None:
+                    continue
+                if params.get('action') == 'delete_markets':
+                    sub['markets'] -= markets
+                else:
+                    new = markets - sub['markets']
+                    sub['markets'] |= new
+                await client.ws.send(json.dumps({"id": cmd.get('id'), "type": "ok", "sid": sid}))
+                if params.get('action') != 'delete_markets':
+                    await self._replay(client, sid, new)
+        elif name == 'unsubscribe':
+            for sid in params.get('sids') or []:
+                client.subs.pop(sid, None)
+                await client.ws.send(json.dumps({"id": cmd.get('id'), "type": "unsubscribed", "sid": sid}))
+        else:
+            await client.ws.send(json.dumps({"id": cmd.get('id'), "type": "error",
+                                             "msg": {"code": 5, "msg": f"Unknown command {name}"}}))
+
+    def _matches(self, sub: dict, message: dict) -> bool:
+        return (self.CHANNEL_OF.get(message.get('type')) == sub['channel']
+                and (message.get('msg') or {}).get('market_ticker') in sub['markets'])
+
+    async def _send(self, client: _Client, sid: int, message: dict, seq_gap: bool = False):
+        sub = client.subs[sid]
+        out = {"type": message['type'], "sid": sid, "msg": message.get('msg') or {}}
+        if sub['channel'] == 'orderbook_delta':
+            sub['seq'] += 2 if seq_gap else 1
+            out['seq'] = sub['seq']
+        await client.ws.send(json.dumps(out))
+
+    async def _replay(self, client: _Client, sid: int, markets: Set[str]):
+        sub = dict(client.subs[sid], markets=markets)
+        for message in self.messages:
+            if sid not in client.subs:
+                break
+            if self._matches(sub, message):
+                await self._send(client, sid, message)
+                if self.interval:
+                    await asyncio.sleep(self.interval)
+
+    def inject(self, message: dict, seq_gap: bool = False):
+        """Pushes a live message to every matching subscription (seq_gap skips a sequence number)."""
+        async def push():
+            for client in list(self._clients):
+                for sid, sub in list(client.subs.items()):
+                    if self._matches(sub, message):
+                        await self._send(client, sid, message, seq_gap)
+        self._call(push())
+
+
+class CoinbaseReplayServer(ReplayServer):
+    """
+    Stand-in for the Coinbase Exchange WebSocket feed. A subscribe message
+    ({"type": "subscribe", "product_ids": [...], "channels": [...]}) is
+    answered with "subscriptions" and the recorded ticker / snapshot /
+    l2update messages of those products and channels.
+    """
+
+    CHANNEL_OF = {'ticker': 'ticker', 'snapshot': 'level2', 'l2update': 'level2'}
+    LEVEL2_CHANNELS = {'level2', 'level2_batch'}
+
+    def _channel(self, name: str) -> str:
+        return 'level2' if name in self.LEVEL2_CHANNELS else name
+
+    async def _on_command(self, client: _Client, cmd: dict):
+        name = cmd.get('type')
+        products = set(cmd.get('product_ids') or [])
+        channels = [c if isinstance(c, str) else c.get('name') for c in cmd.get('channels') or []]
+        if name == 'subscribe':
+            for channel in channels:
+                sub = client.subs.setdefault(self._channel(channel), {'products': set()})
+                sub['products'] |= products
+        elif name == 'unsubscribe':
+            for channel in channels:
+                client.subs.get(self._channel(channel), {'products': set()})['products'] -= products
+        else:
+            await client.ws.send(json.dumps({"type": "error", "message": "Failed to subscribe",
+                                             "reason": f"unknown type {name}"}))
+            return
+        await client.ws.send(json.dumps({"type": "subscriptions", "channels": [
+            {"name": ch, "product_ids": sorted(sub['products'])} for ch, sub in client.subs.items()]}))
+        if name == 'subscribe':
+            for message in self.messages:
+                if self._matches(client, message, products):
+                    await client.ws.send(json.dumps(message))
+                    if self.interval:
+                        await asyncio.sleep(self.interval)
+
+    def _matches(self, client: _Client, message: dict, products: Optional[Set[str]] = None) -> bool:
+        sub = client.subs.get(self.CHANNEL_OF.get(message.get('type')))
+        product = message.get('product_id')
+        return sub is not None and product in sub['products'] and (products is None or product in products)
+
+    def inject(self, message: dict):
+        """Pushes a live message to every client subscribed to its product and channel."""
+        async def push():
+            for client in list(self._clients):
+                if self._matches(client, message):
+                    await client.ws.send(json.dumps(message))
+        self._call(push())
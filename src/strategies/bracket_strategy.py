@@ -11,11 +11,12 @@ The strategy profits when events settle within a predicted range by selling
 contracts on outer strikes (low probability events) and collecting premium.
 """
 
-from src.core.interfaces import Strategy, MarketData, TradeSignal
+from src.core.interfaces import Strategy, MarketData, TradeSignal, MarketDataBatch, SignalBatch, EventSnapshot
 from typing import List, Optional, Dict, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 import re
+import numpy as np
 from src.utils.logger import logger
 
 
@@ -63,6 +64,104 @@ BRACKET_CONFIGS = {
 }
 
 
+# ==============================================================================
+# CONDOR ENGINE (joint leg selection and sizing)
+# ==============================================================================
+
+def settlement_outcomes(strikes) -> np.ndarray:
+    """One representative settlement value per region between distinct strikes, plus both tails."""
+    edges = np.unique(np.asarray(strikes, dtype=float))
+    if not len(edges):
+        return edges
+    return np.concatenate([[edges[0] - 1.0], (edges[:-1] + edges[1:]) / 2, [edges[-1] + 1.0]])
+
+
+def yes_payoff_grid(strikes, is_above, outcomes) -> np.ndarray:
+    """YES settlement value (0/1) of every strike at every outcome, shape (n_outcomes, n_strikes)."""
+    o = np.asarray(outcomes, dtype=float)[:, None]
+    k = np.asarray(strikes, dtype=float)[None, :]
+    return np.where(np.asarray(is_above, dtype=bool)[None, :], o > k, o < k).astype(float)
+
+
+@dataclass
+class CondorPlan:
+    """Jointly chosen and sized legs (event indices; None = no leg on that side)."""
+    above: Optional[int]
+    below: Optional[int]
+    quantity: int
+    premium: float   # credit per contract pair
+    max_loss: float  # worst-case loss per contract pair across the outcome grid
+
+    @property
+    def legs(self) -> List[int]:
+        return [i for i in (self.above, self.below) if i is not None]
+
+
+def plan_condor(strikes, is_above, bids, sell_above, sell_below,
+                budget: float, max_contracts: int, min_quantity: int = 5) -> Optional[CondorPlan]:
+    """
+    Evaluates every (above leg, below leg) pair of sellable strikes on the
+    settlement payoff grid at once - either side may be left empty - and picks
+    the pair with the best premium per dollar of worst-case loss. Both legs get
+    one quantity, sized so quantity * joint max loss <= budget.
+    """
+    strikes, bids = np.asarray(strikes, dtype=float), np.asarray(bids, dtype=float)
+    a, b = np.flatnonzero(sell_above), np.flatnonzero(sell_below)
+    if not len(a) and not len(b):
+        return None
+
+    payoff = yes_payoff_grid(strikes, is_above, settlement_outcomes(strikes))
+    n_out = len(payoff)
+    # Seller P&L per contract at each outcome; the trailing zero column is "no leg"
+    pnl_a = np.column_stack([bids[a][None, :] - payoff[:, a], np.zeros(n_out)])
+    pnl_b = np.column_stack([bids[b][None, :] - payoff[:, b], np.zeros(n_out)])
+    total = pnl_a[:, :, None] + pnl_b[:, None, :]  # (outcome, above leg, below leg)
+
+    max_loss = np.maximum(-total.min(axis=0), 0.0)
+    premium = np.add.outer(np.append(bids[a], 0.0), np.append(bids[b], 0.0))
+
+    # Don't sell at 99c+ (no risk left to be paid for)
+    at_risk = max_loss > 0.01
+    quantity = np.zeros_like(max_loss)
+    quantity[at_risk] = np.minimum(np.floor(budget / max_loss[at_risk]), max_contracts)
+    valid = at_risk & (quantity >= min_quantity)
+    valid[-1, -1] = False
+    if not valid.any():
+        return None
+
+    score = np.where(valid, premium / np.where(at_risk, max_loss, 1.0), -np.inf)
+    i, j = np.unravel_index(np.lexsort((premium.ravel(), score.ravel()))[-1], score.shape)
+    return CondorPlan(
+        above=int(a[i]) if i < len(a) else None,
+        below=int(b[j]) if j < len(b) else None,
+        quantity=int(quantity[i, j]),
+        premium=float(premium[i, j]),
+        max_loss=float(max_loss[i, j])
+    )
+
+
+def condor_signals(event: EventSnapshot, plan: CondorPlan, confidence: float) -> List[TradeSignal]:
+    """
+    Sell-YES signals for the plan's legs as one atomic group: every leg carries
+    group_id and the group's total worst-case loss (group_max_loss), so the
+    executor checks and fills the legs together or not at all.
+    """
+    group_id = f"CONDOR-{event.event_ticker}-{event.timestamp:%H%M%S}"
+    signals = []
+    for i in plan.legs:
+        sig = TradeSignal(
+            symbol=event.symbols[i],
+            side="sell",  # Selling YES contracts
+            quantity=plan.quantity,
+            limit_price=float(event.yes_bid[i]),
+            confidence=confidence
+        )
+        sig.group_id = group_id
+        sig.group_max_loss = plan.max_loss * plan.quantity
+        signals.append(sig)
+    return signals
+
+
 # ==============================================================================
 # IRON CONDOR BRACKET STRATEGY
 # ==============================================================================
@@ -137,130 +236,73 @@ class BracketStrategy(Strategy):
             return None
     
     def _calculate_time_to_settlement(self, symbol: str) -> float:
-        """Estimate hours until settlement based on symbol."""
-        now = datetime.now()
-        
-        # Try to parse date from symbol
-        try:
-            parts = symbol.split('-')
-            for part in parts:
-                # Look for date patterns like 26FEB05
-                if len(part) >= 7 and part[:2].isdigit():
-                    # Parse YYMMMDD
-                    year = 2000 + int(part[:2])
-                    month_str = part[2:5].upper()
-                    day = int(part[5:7])
-                    
-                    months = {
-                        'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4,
-                        'MAY': 5, 'JUN': 6, 'JUL': 7, 'AUG': 8,
-                        'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12
-                    }
-                    
-                    if month_str in months:
-                        settlement_date = datetime(year, months[month_str], day, 23, 59)
-                        delta = settlement_date - now
-                        return max(0.0, delta.total_seconds() / 3600)
-        except:
-            pass
-        
-        return 24.0  # Default assumption
+        """Hours until 23:59 on the ticker's YYMMMDD date (e.g. 26FEB05); 24h if none."""
+        match = re.search(r'\d{2}[A-Z]{3}\d{2}', symbol.upper())
+        if match:
+            try:
+                settlement = datetime.strptime(match.group(0), "%y%b%d").replace(hour=23, minute=59)
+                return max(0.0, (settlement - datetime.now()).total_seconds() / 3600)
+            except ValueError:
+                pass
+        return 24.0
     
-    def _is_outer_strike(self, strike: float, is_above: bool, config: BracketConfig) -> bool:
-        """Check if this strike is in the outer (sellable) zone."""
+    def _outer_strikes(self, strikes: np.ndarray, is_above: np.ndarray, config: BracketConfig) -> np.ndarray:
+        """Strikes in the outer (sellable) zone: high "Above" strikes, low "Below" strikes."""
         expected = config.expected_value
-        
-        if is_above:
-            # For "Above X" contracts, outer zone is high strikes
-            return strike >= (expected + config.outer_buffer)
-        else:
-            # For "Below Y" contracts, outer zone is low strikes  
-            return strike <= (expected - config.outer_buffer)
-    
-    def _calculate_position_size(self, 
-                                  market_price: float, 
-                                  portfolio_balance: float,
-                                  config: BracketConfig) -> int:
-        """Calculate appropriate position size based on risk limits."""
-        # Max exposure in dollars
-        max_exposure = portfolio_balance * self.max_exposure_per_bracket
-        
-        # Each contract costs (1 - price) to sell (max potential loss)
-        max_loss_per_contract = 1.0 - market_price
-        
-        if max_loss_per_contract <= 0.01:
-            return 0  # Don't sell at 99c+
-        
-        # Calculate max contracts
-        max_contracts = int(max_exposure / max_loss_per_contract)
-        
-        # Apply config limit
-        return min(max_contracts, config.max_contracts)
+        return np.where(is_above, strikes >= expected + config.outer_buffer,
+                        strikes <= expected - config.outer_buffer)
     
     def analyze(self, market_data: MarketData) -> List[TradeSignal]:
-        signals = []
-        symbol = market_data.symbol
-        extra = market_data.extra
-        
+        portfolio_balance = market_data.extra.get('portfolio_balance', 1000.0)
+        return self.analyze_event(EventSnapshot.from_markets([market_data]), portfolio_balance)
+
+    def analyze_event(self, event: EventSnapshot, portfolio_balance: float = 1000.0) -> List[TradeSignal]:
+        """
+        Builds one condor from every strike of an event: the above and below
+        legs are chosen and sized jointly (plan_condor) against
+        max_exposure_per_bracket of the portfolio, and emitted as one group.
+        """
         # 1. Identify market type
-        market_type = self._identify_market_type(symbol)
-        if not market_type or market_type not in BRACKET_CONFIGS:
+        market_type = self._identify_market_type(event.event_ticker)
+        if not market_type or market_type not in BRACKET_CONFIGS or not len(event):
             return []
         
         config = BRACKET_CONFIGS[market_type]
         
-        # 2. Parse strike information
-        strike_info = self._parse_strike(symbol)
-        if not strike_info:
-            return []
-        
-        strike_value, is_above = strike_info
+        # 2. Parse strike direction (unknown prefixes are never sold)
+        info = [self._parse_strike(sym) for sym in event.symbols]
+        known = np.array([i is not None for i in info], dtype=bool)
+        is_above = np.array([bool(i and i[1]) for i in info], dtype=bool)
         
         # 3. Check timing
-        hours_to_settlement = self._calculate_time_to_settlement(symbol)
+        hours_to_settlement = self._calculate_time_to_settlement(event.event_ticker)
         if hours_to_settlement < self.min_time_to_settlement:
             return []  # Too close to settlement (high gamma risk)
         if hours_to_settlement > self.max_time_to_settlement:
             return []  # Too far out (low theta value)
         
-        # 4. Check if this is an outer strike (profitable to sell)
-        if not self._is_outer_strike(strike_value, is_above, config):
-            return []  # Not in our sell zone
+        # 4. Outer strikes whose premium meets the minimum
+        sellable = known & self._outer_strikes(event.strikes, is_above, config) & (event.yes_bid >= config.min_premium)
         
-        # 5. Check market price meets minimum premium
-        market_bid = market_data.bid
-        if market_bid < config.min_premium:
-            return []  # Premium too low
-        
-        # 6. Calculate position size
-        portfolio_balance = extra.get('portfolio_balance', 1000.0)
-        position_size = self._calculate_position_size(market_bid, portfolio_balance, config)
-        
-        if position_size < 5:
+        # 5. Joint leg choice and sizing
+        plan = plan_condor(event.strikes, is_above, event.yes_bid, sellable & is_above, sellable & ~is_above,
+                           budget=portfolio_balance * self.max_exposure_per_bracket,
+                           max_contracts=config.max_contracts)
+        if plan is None:
             return []  # Too small to be worth it
         
-        # 7. Generate sell signal
-        direction = "Above" if is_above else "Below"
-        logger.info(
-            f"[Condor] 🦅 BRACKET SELL: {symbol} | "
-            f"{direction} {strike_value} @ {market_bid:.2f} | "
-            f"Expected: {config.expected_value} | "
-            f"Qty: {position_size}"
-        )
+        # 6. Generate sell signals
+        signals = condor_signals(event, plan, confidence=0.75)  # Moderate confidence for bracket trades
+        for sig in signals:
+            # Set stop loss at higher price (if market moves against us)
+            sig.stop_loss = min(0.95, sig.limit_price + 0.20)
         
-        sig = TradeSignal(
-            symbol=symbol,
-            side="sell",  # Selling YES contracts
-            quantity=position_size,
-            limit_price=market_bid,
-            confidence=0.75  # Moderate confidence for bracket trades
+        logger.info(
+            f"[Condor] 🦅 BRACKET SELL: {' + '.join(s.symbol for s in signals)} | "
+            f"Credit {plan.premium:.2f} / Max Loss {plan.max_loss:.2f} | "
+            f"Expected: {config.expected_value} | Qty: {plan.quantity}"
         )
-        
-        # Set stop loss at higher price (if market moves against us)
-        sig.stop_loss = min(0.95, market_bid + 0.20)
-        
-        signals.append(sig)
-        
+        self.active_brackets[event.event_ticker] = {'plan': plan, 'group_id': signals[0].group_id}
         return signals
     
     def _analyze_mock(self, market_data):
@@ -288,82 +330,119 @@ class WeatherBracketStrategy(Strategy):
     def __init__(self,
                  buffer_degrees: float = 8.0,  # Distance from forecast to sell zone
                  min_premium: float = 0.08,
-                 max_contracts: int = 30):
+                 max_contracts: int = 30,
+                 max_exposure_per_bracket: float = 0.05):  # 5% of portfolio per condor
         
         self.buffer_degrees = buffer_degrees
         self.min_premium = min_premium
         self.max_contracts = max_contracts
+        self.max_exposure_per_bracket = max_exposure_per_bracket
         
     def name(self) -> str:
         return "Weather Condor 🌡️🦅"
     
     def analyze(self, market_data: MarketData) -> List[TradeSignal]:
-        signals = []
-        extra = market_data.extra
-        symbol = market_data.symbol
-        
+        return self.analyze_event(EventSnapshot.from_markets([market_data]), market_data)
+
+    def analyze_event(self, event: EventSnapshot, weather: MarketData) -> List[TradeSignal]:
+        """
+        Builds one weather condor from every strike of a KXHIGH event: the
+        "Above" and "Below" legs are picked and sized jointly against
+        max_exposure_per_bracket and emitted as one signal group.
+        """
+        extra = weather.extra or {}
+
         # Must be weather data with forecast
-        if extra.get('source') != 'live_nws':
+        if extra.get('source') != 'live_nws' or not len(event):
             return []
-        
+
         forecasts = extra.get('forecast')
         if not forecasts:
             return []
-        
+
         # Get forecast high
         target_period = next((p for p in forecasts if p.get('isDaytime')), None)
         if not target_period:
             return []
-        
+
         forecast_high = target_period.get('temperature')
         if not forecast_high:
             return []
-        
-        # Parse symbol for strike
-        try:
-            parts = symbol.split('-')
-            strike_str = parts[-1]
-            
-            is_above = not strike_str.startswith('B')
-            strike_val = float(re.sub(r'[A-Za-z]', '', strike_str))
-        except:
+
+        strikes, bid = event.strikes, event.yes_bid
+        is_above = np.array([not s.split('-')[-1].startswith('B') for s in event.symbols], dtype=bool)
+
+        # Sell "Above X" if forecast is well below X; sell "Below Y" if forecast is well above Y
+        sellable = bid >= self.min_premium
+        sell_above = sellable & is_above & (strikes > forecast_high + self.buffer_degrees)
+        sell_below = sellable & ~is_above & (strikes < forecast_high - self.buffer_degrees)
+
+        plan = plan_condor(strikes, is_above, bid, sell_above, sell_below,
+                           budget=extra.get('portfolio_balance', 1000.0) * self.max_exposure_per_bracket,
+                           max_contracts=self.max_contracts, min_quantity=1)
+        if plan is None:
             return []
-        
-        market_bid = market_data.bid
-        
-        # Check if this is an outer strike we can sell
-        if is_above:
-            # Sell "Above X" if forecast is well below X
-            if strike_val > (forecast_high + self.buffer_degrees):
-                if market_bid >= self.min_premium:
-                    logger.info(
-                        f"[WeatherCondor] 🦅 SELL ABOVE: {symbol} | "
-                        f"Strike {strike_val}°F > Forecast {forecast_high}°F + {self.buffer_degrees}°"
-                    )
-                    signals.append(TradeSignal(
-                        symbol=symbol,
-                        side="sell",
-                        quantity=self.max_contracts,
-                        limit_price=market_bid,
-                        confidence=0.80
-                    ))
-        else:
-            # Sell "Below Y" if forecast is well above Y
-            if strike_val < (forecast_high - self.buffer_degrees):
-                if market_bid >= self.min_premium:
-                    logger.info(
-                        f"[WeatherCondor] 🦅 SELL BELOW: {symbol} | "
-                        f"Strike {strike_val}°F < Forecast {forecast_high}°F - {self.buffer_degrees}°"
-                    )
-                    signals.append(TradeSignal(
-                        symbol=symbol,
-                        side="sell",
-                        quantity=self.max_contracts,
-                        limit_price=market_bid,
-                        confidence=0.80
-                    ))
-        
+
+        signals = condor_signals(event, plan, confidence=0.80)
+        logger.info(
+            f"[WeatherCondor] 🦅 SELL: {' + '.join(s.symbol for s in signals)} | "
+            f"Forecast {forecast_high}°F ± {self.buffer_degrees}° | "
+            f"Credit {plan.premium:.2f} / Max Loss {plan.max_loss:.2f} | Qty: {plan.quantity}"
+        )
         return signals
+
+    def analyze_batch(self, batch: MarketDataBatch) -> SignalBatch:
+        """
+        Replay of `analyze_event`: rows sharing an event and a timestamp form
+        one snapshot (latest row per strike), and each snapshot is planned
+        with plan_condor like the live path. Needs a live_nws batch with a
+        'forecast_high' column; an optional 'portfolio_balance' column sets
+        the budget. Legs are emitted on their own rows (SignalBatch has no
+        group column), so a replay opens both legs of a condor in one snapshot.
+        """
+        forecast_high = batch.extra.get('forecast_high')
+        if batch.source != 'live_nws' or forecast_high is None or not len(batch):
+            return SignalBatch.empty()
+
+        def parse_strike(symbol):
+            try:
+                return float(re.sub(r'[A-Za-z]', '', symbol.split('-')[-1]))
+            except ValueError:
+                return np.nan
+
+        strikes = batch.per_symbol(parse_strike)
+        is_above = batch.per_symbol(lambda sym: not sym.split('-')[-1].startswith('B'), dtype=bool)
+        event_ids = batch.per_symbol(lambda sym: sym.rsplit('-', 1)[0], dtype=object)
+        _, event_ids = np.unique(event_ids.astype(str), return_inverse=True)
+        bid = batch.bid
+        balance = batch.extra.get('portfolio_balance', np.full(len(batch), 1000.0))
+        with np.errstate(invalid='ignore'):
+            sellable = (forecast_high != 0) & (bid >= self.min_premium)
+            sell_above = sellable & is_above & (strikes > forecast_high + self.buffer_degrees)
+            sell_below = sellable & ~is_above & (strikes < forecast_high - self.buffer_degrees)
+
+        # Snapshots: runs of equal (timestamp, event) in time order
+        order = np.lexsort((event_ids, batch.timestamps))
+        key_t, key_e = batch.timestamps[order], event_ids[order]
+        bounds = np.flatnonzero((key_t[1:] != key_t[:-1]) | (key_e[1:] != key_e[:-1])) + 1
+        candidates = sell_above | sell_below
+
+        rows, qty = [], []
+        for snap in np.split(order, bounds):
+            if not candidates[snap].any():
+                continue
+            # latest quote per strike within the snapshot
+            _, last = np.unique(batch.symbol_ids[snap][::-1], return_index=True)
+            snap = np.sort(snap[len(snap) - 1 - last])
+            plan = plan_condor(strikes[snap], is_above[snap], bid[snap], sell_above[snap], sell_below[snap],
+                               budget=balance[snap[-1]] * self.max_exposure_per_bracket,
+                               max_contracts=self.max_contracts, min_quantity=1)
+            if plan is not None:
+                rows.extend(snap[plan.legs])
+                qty.extend([plan.quantity] * len(plan.legs))
+
+        out = SignalBatch.build(rows, 'sell', qty, bid[np.asarray(rows, dtype=np.int64)], 0.80)
+        return SignalBatch.concat([out])
     
     def _analyze_mock(self, market_data):
         return []
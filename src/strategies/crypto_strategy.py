@@ -1,13 +1,14 @@
-from src.core.interfaces import Strategy, MarketData, TradeSignal
-from typing import List, Optional
+from src.core.interfaces import Strategy, MarketData, TradeSignal, MarketDataBatch, SignalBatch, EventSnapshot
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import numpy as np
 import os
-import joblib
-import pandas as pd
 from src.utils.logger import logger
 from collections import deque
 import re
+from src.strategies.cycles import CooldownMap, CycleTracker
+from src.core.portfolio_kelly import outcome_distribution
+from src.core.pricing import digital_fair_value
 
 
 # ==============================================================================
@@ -75,6 +76,92 @@ def calculate_macd(prices: List[float], fast: int = 12, slow: int = 26, signal:
     return (macd_line, signal_line, histogram)
 
 
+# ==============================================================================
+# BATCH (COLUMNAR) HELPERS
+# ==============================================================================
+# Vectorized twins of the indicator helpers, evaluated over many trailing windows
+# at once. They repeat the scalar arithmetic step by step so that analyze_batch
+# reproduces the per-row signals exactly.
+
+def _window_ema(values: np.ndarray, ends: np.ndarray, period: int) -> np.ndarray:
+    """calculate_ema(values[end - period:end], period) for every end (full windows)."""
+    multiplier = 2 / (period + 1)
+    ema = values[ends - period].astype(float)
+    for k in range(1, period):
+        ema = (values[ends - period + k] - ema) * multiplier + ema
+    return ema
+
+
+def _window_rsi(values: np.ndarray, ends: np.ndarray, lengths: np.ndarray, period: int = 14) -> np.ndarray:
+    """calculate_rsi over every window values[end - length:end]."""
+    rsi = np.full(len(ends), 50.0)
+    ok = lengths >= period + 1
+    if not ok.any():
+        return rsi
+    e = ends[ok]
+    gains = np.zeros(len(e))
+    losses = np.zeros(len(e))
+    for k in range(period):
+        d = values[e - period + k] - values[e - period - 1 + k]
+        gains += np.where(d > 0, d, 0.0)
+        losses += np.where(d < 0, -d, 0.0)
+    avg_gain = gains / period
+    avg_loss = losses / period
+    with np.errstate(divide='ignore', invalid='ignore'):
+        value = 100 - (100 / (1 + avg_gain / avg_loss))
+    rsi[ok] = np.where(avg_loss == 0, 100.0, value)
+    return rsi
+
+
+def _window_macd_histogram(values: np.ndarray, ends: np.ndarray, lengths: np.ndarray,
+                           fast: int = 12, slow: int = 26, signal: int = 9) -> np.ndarray:
+    """Histogram from calculate_macd over every window values[end - length:end]."""
+    histogram = np.zeros(len(ends))
+    ok = lengths >= slow + signal
+    if not ok.any():
+        return histogram
+    e = ends[ok]
+    slow_ema = _window_ema(values, e, slow)
+    macd_line = _window_ema(values, e, fast) - slow_ema
+    signal_line = _window_ema(values, e, signal) - slow_ema
+    histogram[ok] = macd_line - signal_line
+    return histogram
+
+
+def _run_lengths(mask: np.ndarray) -> np.ndarray:
+    """Length of the run of True values ending at each index (0 where False)."""
+    idx = np.arange(len(mask))
+    last_false = np.maximum.accumulate(np.where(mask, -1, idx)) if len(mask) else idx
+    return np.where(mask, idx - last_false, 0)
+
+
+def _strike_or_nan(symbol: str) -> float:
+    """Strike from the last ticker segment (e.g. T98000), NaN if unparseable."""
+    try:
+        return float(re.sub(r'[A-Za-z]', '', symbol.split('-')[-1]))
+    except ValueError:
+        return np.nan
+
+
+def _to_us(ts: datetime) -> int:
+    """Naive datetime -> microseconds on the datetime64[us] axis used by batches."""
+    return int(np.datetime64(ts, 'us').astype(np.int64))
+
+
+def _ladder_zones(event: EventSnapshot, predicted: float, spot: float, margin: float,
+                  max_dist: float = 750.0) -> tuple:
+    """Per-strike (in_range, bull, bear) masks: strike near spot, prediction beyond the safety margin."""
+    strikes = event.strikes
+    in_range = event.strike_index.band_mask(spot - max_dist, spot + max_dist)
+    return in_range, in_range & (predicted > strikes + margin), in_range & (predicted < strikes - margin)
+
+
+def _rank_opportunities(mask: np.ndarray, cushion: np.ndarray, entry: np.ndarray) -> np.ndarray:
+    """Indices where mask holds, best first: largest cushion past the margin, then cheapest entry."""
+    idx = np.flatnonzero(mask)
+    return idx[np.lexsort((entry[idx], -cushion[idx]))]
+
+
 # ==============================================================================
 # MOMENTUM CONFIRMATION CLASS
 # ==============================================================================
@@ -144,6 +231,19 @@ class MomentumConfirmation:
         
         return (False, f"No confirmation (RSI={rsi:.1f})", 0.0)
 
+    def confirm_batch(self, rsi: np.ndarray, histogram: np.ndarray) -> tuple:
+        """
+        Vectorized should_confirm_buy / should_confirm_sell over indicator arrays.
+        Returns: (buy_ok, buy_strength, sell_ok, sell_strength)
+        """
+        buy_strength = np.select(
+            [rsi > self.rsi_overbought, (rsi < 40) & (histogram > 0), histogram > 0, (rsi > 30) & (rsi < 60)],
+            [0.0, 1.0, 0.7, 0.5], default=0.0)
+        sell_strength = np.select(
+            [rsi < self.rsi_oversold, (rsi > 60) & (histogram < 0), histogram < 0, (rsi > 40) & (rsi < 70)],
+            [0.0, 1.0, 0.7, 0.5], default=0.0)
+        return (buy_strength > 0, buy_strength, sell_strength > 0, sell_strength)
+
 
 # ==============================================================================
 # ENHANCED CRYPTO STRATEGY V2
@@ -262,6 +362,10 @@ class Crypto15mTrendStrategyV2(Strategy):
                 return sig
         
         return None
+
+    def hydrate(self, times: List[datetime], prices: List[float]):
+        """Pre-fills the spot history so RSI/MACD run on BTC prices from the first tick."""
+        self.spot_price_history.extend(p for p in prices if p > 1.0)
         
     def analyze(self, market_data: MarketData) -> List[TradeSignal]:
         signals = []
@@ -421,6 +525,172 @@ class Crypto15mTrendStrategyV2(Strategy):
         self.last_price = price_to_monitor
         return signals
 
+    def analyze_batch(self, batch: MarketDataBatch) -> SignalBatch:
+        """
+        Vectorized replay of `analyze`. Indicators, strike-arb rows, N-tick runs and
+        mean-reversion candidates are computed for every row at once; the only
+        Python loop is one step per emitted trend/MR signal (post-trade cooldown).
+        Leaves the strategy in the same state as the per-row loop.
+        """
+        n = len(batch)
+        if n == 0:
+            return SignalBatch.empty()
+        t_us = batch.timestamps.astype(np.int64)
+        bid, ask, spot = batch.bid, batch.ask, batch.spot
+        period = self.momentum.rsi_period
+
+        # --- Histories (every row feeds them before any early return) ---
+        prior_prices = np.array(self.price_history, dtype=float)
+        prices = np.concatenate([prior_prices, ask])
+        price_ends = len(prior_prices) + np.arange(1, n + 1)
+        price_lens = np.minimum(price_ends, self.price_history.maxlen)
+
+        spot_ok = np.nan_to_num(spot) > 1.0
+        prior_spots = np.array(self.spot_price_history, dtype=float)
+        spots = np.concatenate([prior_spots, spot[spot_ok]])
+        spot_ends = len(prior_spots) + np.cumsum(spot_ok)
+        spot_lens = np.minimum(spot_ends, self.spot_price_history.maxlen)
+
+        # Indicators run on spot history once it has 15 points (same switch as analyze)
+        use_spot = spot_lens >= 15
+        rsi = np.where(use_spot, _window_rsi(spots, spot_ends, spot_lens, period),
+                       _window_rsi(prices, price_ends, price_lens, period))
+        histogram = np.where(use_spot, _window_macd_histogram(spots, spot_ends, spot_lens),
+                             _window_macd_histogram(prices, price_ends, price_lens))
+        buy_ok, buy_strength, sell_ok, sell_strength = self.momentum.confirm_batch(rsi, histogram)
+
+        # --- 0.5 Strike Arb (fires regardless of delay/cooldown) ---
+        strikes = batch.per_symbol(_strike_or_nan)
+        is_btc = batch.per_symbol(lambda sym: "KXBTC" in sym or "kxbtcd" in sym, dtype=bool)
+        with np.errstate(invalid='ignore'):
+            real_strike = strikes >= 1000
+            arb_buy = is_btc & real_strike & (spot > strikes + 25.0) & (ask < 0.85) & (ask > 0.01)
+            arb_sell = is_btc & real_strike & (spot < strikes - 25.0) & (bid > 0.15)
+        parts = [
+            SignalBatch.build(np.flatnonzero(arb_buy), 'buy', 10, ask[arb_buy], 0.95),
+            SignalBatch.build(np.flatnonzero(arb_sell), 'sell', 10, bid[arb_sell], 0.95),
+        ]
+
+        # --- 0. Delay Logic ---
+        minute = batch.timestamps.astype('datetime64[m]').astype(np.int64) % 60
+        second = batch.timestamps.astype('datetime64[s]').astype(np.int64) % 60
+        delayed = (minute % 15 == 0) & (second < self.confirmation_delay)
+
+        # Rows that reach the cooldown gate, in order
+        pos = np.flatnonzero(~(arb_buy | arb_sell) & ~delayed)
+        m = len(pos)
+        t_e, a_e = t_us[pos], ask[pos]
+        above = a_e > self.bull_trigger
+        below = a_e < self.bear_trigger
+
+        # --- 3. Mean Reversion candidates ---
+        mr_buy = np.zeros(m, dtype=bool)
+        mr_sell = np.zeros(m, dtype=bool)
+        if self.enable_mean_reversion and m:
+            ends, lens = price_ends[pos], price_lens[pos]
+            maxlen = self.price_history.maxlen
+            total = np.zeros(m)
+            for k in range(maxlen):
+                idx = ends - maxlen + k
+                total += np.where(idx >= ends - lens, prices[np.maximum(idx, 0)], 0.0)
+            mean_price = total / lens
+            with np.errstate(divide='ignore', invalid='ignore'):
+                deviation = np.where(mean_price > 0, (a_e - mean_price) / mean_price, 0.0)
+            mr_rsi = _window_rsi(prices, ends, lens)
+            ranging = (lens >= 30) & (a_e < self.bull_trigger) & (a_e > self.bear_trigger)
+            mr_buy = ranging & (deviation < -self.mean_reversion_threshold) & (mr_rsi < 40)
+            mr_sell = ranging & ~mr_buy & (deviation > self.mean_reversion_threshold) & (mr_rsi > 60)
+        mr_any = mr_buy | mr_sell
+
+        N = self.trend_confirm_ticks
+        ok_buy, ok_sell = buy_ok[pos], sell_ok[pos]
+
+        def trigger_kinds(run_above, run_below, sl=slice(None)):
+            # 1 = bull breakout, 2 = bear breakout, 3 = mean reversion (elif chain in analyze)
+            bull = run_above >= N
+            bear = ~bull & (run_below >= N)
+            return np.select([bull & ok_buy[sl], bear & ok_sell[sl], ~bull & ~bear & mr_any[sl]],
+                             [1, 2, 3], default=0)
+
+        run_above, run_below = _run_lengths(above), _run_lengths(below)
+        kinds = trigger_kinds(run_above, run_below)
+        fire_idx = np.flatnonzero(kinds)
+        mr_idx = np.flatnonzero(mr_any)
+        cooldown_us = int(self.cooldown_seconds * 1_000_000)
+
+        # First segment continues the live counters (frozen while in cooldown)
+        start = int(np.searchsorted(t_e, _to_us(self.cooldown_until), side='left'))
+        hits, hit_kinds = [], []
+        final_above, final_below = self.consecutive_above, self.consecutive_below
+        last_processed = None
+        if start < m:
+            first_above, first_below = _run_lengths(above[start:]), _run_lengths(below[start:])
+            steps = np.arange(1, m - start + 1)
+            first_above[first_above == steps] += self.consecutive_above
+            first_below[first_below == steps] += self.consecutive_below
+            first_kinds = trigger_kinds(first_above, first_below, slice(start, None))
+            first_hit = np.flatnonzero(first_kinds)
+            if len(first_hit):
+                hits.append(start + first_hit[0])
+                hit_kinds.append(first_kinds[first_hit[0]])
+            else:
+                final_above, final_below = first_above[-1], first_below[-1]
+                last_processed = m - 1
+
+        # After a signal the counters restart at 0, so runs are truncated at the
+        # segment start: only MR can fire in its first N-1 rows.
+        while hits and last_processed is None:
+            # the signalling row itself is consumed even with a zero cooldown
+            seg = max(int(np.searchsorted(t_e, t_e[hits[-1]] + cooldown_us, side='left')), hits[-1] + 1)
+            if seg >= m:
+                final_above = final_below = 0
+                last_processed = hits[-1]
+                break
+            head_end = max(seg, seg + N - 1)
+            j = np.searchsorted(mr_idx, seg)
+            if j < len(mr_idx) and mr_idx[j] < head_end:
+                hits.append(mr_idx[j])
+                hit_kinds.append(3)
+                continue
+            j = np.searchsorted(fire_idx, head_end)
+            if j < len(fire_idx):
+                hits.append(fire_idx[j])
+                hit_kinds.append(kinds[fire_idx[j]])
+                continue
+            final_above = min(run_above[-1], m - seg)
+            final_below = min(run_below[-1], m - seg)
+            last_processed = m - 1
+
+        hits = np.asarray(hits, dtype=np.int64)
+        hit_kinds = np.asarray(hit_kinds)
+        rows = pos[hits]
+        for kind, strength, limit, contract_side in (
+                (1, buy_strength, ask, 'YES'),
+                (2, sell_strength, 1.0 - bid, 'NO')):
+            r = rows[hit_kinds == kind]
+            qty = (10 * (0.5 + strength[r] * 0.5)).astype(np.int64)
+            parts.append(SignalBatch.build(r, 'buy', qty, limit[r], 0.6 + (strength[r] * 0.3),
+                                           contract_side=contract_side, stop_loss=0.50))
+        mr_rows = rows[hit_kinds == 3]
+        r = mr_rows[mr_buy[hits[hit_kinds == 3]]]
+        parts.append(SignalBatch.build(r, 'buy', 5, ask[r], 0.6,
+                                       stop_loss=ask[r] * (1.0 - self.stop_loss_buffer)))
+        r = mr_rows[mr_sell[hits[hit_kinds == 3]]]
+        parts.append(SignalBatch.build(r, 'sell', 5, bid[r], 0.6,
+                                       stop_loss=bid[r] * (1.0 + self.stop_loss_buffer)))
+
+        # --- Update State ---
+        self.price_history.extend(ask.tolist())
+        self.spot_price_history.extend(spot[spot_ok].tolist())
+        self.consecutive_above, self.consecutive_below = int(final_above), int(final_below)
+        if len(hits):
+            last_us = int(t_e[hits[-1]]) + cooldown_us
+            self.cooldown_until = np.datetime64(last_us, 'us').item()
+        if last_processed is not None:
+            self.last_price = float(a_e[last_processed])
+
+        return SignalBatch.concat(parts)
+
 class Crypto15mTrendStrategy(Strategy):
     """
     The Trend Catcher 📈 (15m)
@@ -519,6 +789,13 @@ class CryptoHourlyStrategy(Strategy):
     def name(self) -> str:
         return "The Time Traveler (Hourly)"
 
+    def hydrate(self, times: List[datetime], prices: List[float]):
+        """Seeds the regression window with the last `window_minutes` of spot history."""
+        if not times:
+            return
+        cutoff = times[-1] - timedelta(minutes=self.window_minutes)
+        self.price_history = sorted(self.price_history + [(t, p) for t, p in zip(times, prices) if t > cutoff])
+
     def _predict_future_price(self, current_time: datetime, target_time: datetime) -> float:
         """
         Fits a linear trend to the history and extrapolates to target_time.
@@ -547,14 +824,13 @@ class CryptoHourlyStrategy(Strategy):
         return predicted_price
 
     def analyze(self, market_data: MarketData) -> List[TradeSignal]:
-        signals = []
         extra = market_data.extra
         now = sorted(self.price_history)[-1][0] if self.price_history else datetime.now()
         
         # 1. Handle Spot Price Updates (Coinbase)
         if "Coinbase" in market_data.symbol or extra.get('source') == 'live_coinbase':
             spot_price = market_data.price
-            now = datetime.now()
+            now = market_data.timestamp or datetime.now()
             
             # Maintain 20m Rolling Window
             self.price_history.append((now, spot_price))
@@ -568,66 +844,49 @@ class CryptoHourlyStrategy(Strategy):
         if ("KXBTC" not in symbol and "kxbtcd" not in symbol) or "15M" in symbol: 
             return [] 
 
+        return self.analyze_event(EventSnapshot.from_markets([market_data]))
+
+    def analyze_event(self, event: EventSnapshot) -> List[TradeSignal]:
+        """
+        Evaluates every strike of one hourly event against a single regression
+        prediction. A lone Kalshi tick is the one-strike case. Signals are
+        ranked best first (largest cushion past the margin, then cheapest entry).
+        """
         # Need Spot History to trade
-        if not self.price_history: 
+        if not self.price_history or not len(event):
             return []
-            
+
         current_spot = self.price_history[-1][1]
-            
-        # Extract Strike
-        try:
-            parts = symbol.split('-')
-            # KXBTC-26JAN31-1800-T98000
-            strike_part = parts[-1] 
-            strike_val = float(re.sub(r'[A-Za-z]', '', strike_part))
-            
-            # --- FILTER: Relevance Check ---
-            # Only trade markers within $750 of spot
-            dist = abs(strike_val - current_spot)
-            if dist > 750:
-                return []
-            
-            # Target Time: The Hour in the ticker (1800 -> 18:00)
-            target_time = (datetime.now() + timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
-            
-        except Exception as e:
-            return []
+
+        # Target Time: top of the next hour
+        target_time = (datetime.now() + timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
 
         # Predict
         predicted_price = self._predict_future_price(datetime.now(), target_time)
         if not predicted_price: return []
 
-        # Decision Logic (Arbitrage)
-        # Compare Prediction vs Strike vs Market Probability
-        
-        # Case A: We predict HIGHER than Strike (Bullish for YES)
-        if predicted_price > (strike_val + self.confidence_margin):
-            # If Market Price is LOW (e.g. < 0.85), it's a steal.
-            # Buying YES means we believe Price > Strike.
-            if market_data.ask < 0.85 and market_data.ask > 0:
-                 logger.info(f"[Hourly] 🚀 BULL SIGNAL: Pred ${predicted_price:.2f} > Strike ${strike_val} (Spot ${current_spot:.2f}). Ask {market_data.ask:.2f}. BUY YES.")
-                 signals.append(TradeSignal(
-                    symbol=symbol,
-                    side="buy", # Buy YES
-                    quantity=5, # Conservative size
-                    limit_price=market_data.ask,
-                    confidence=0.8
-                ))
-                
-        # Case B: We predict LOWER than Strike (Bearish for YES)
-        elif predicted_price < (strike_val - self.confidence_margin):
-            # If Market Price is HIGH (e.g. > 0.15), we short it.
-            # Selling YES (Buying NO) means we believe Price < Strike.
-            if market_data.bid > 0.15 and market_data.bid < 1.0:
-                 logger.info(f"[Hourly] 📉 BEAR SIGNAL: Pred ${predicted_price:.2f} < Strike ${strike_val}. Market Bid {market_data.bid:.2f}. SELL YES.")
-                 signals.append(TradeSignal(
-                    symbol=symbol,
-                    side="sell", # Sell YES
-                    quantity=5,
-                    limit_price=market_data.bid,
-                    confidence=0.8
-                ))
-        
+        # Decision Logic (Arbitrage), all strikes at once.
+        # Relevance: only strikes within $750 of spot.
+        # Case A: predict HIGHER than strike and YES ask is LOW (< 0.85) -> BUY YES.
+        # Case B: predict LOWER than strike and YES bid is HIGH (> 0.15) -> SELL YES.
+        _, bull, bear = _ladder_zones(event, predicted_price, current_spot, self.confidence_margin)
+        bull &= (event.yes_ask < 0.85) & (event.yes_ask > 0)
+        bear &= (event.yes_bid > 0.15) & (event.yes_bid < 1.0)
+        cushion = np.abs(predicted_price - event.strikes) - self.confidence_margin
+        ranked = _rank_opportunities(bull | bear, cushion, np.where(bull, event.yes_ask, 1.0 - event.yes_bid))
+
+        signals = []
+        for i in ranked:
+            symbol, strike_val = event.symbols[i], event.strikes[i]
+            if bull[i]:
+                ask = float(event.yes_ask[i])
+                logger.info(f"[Hourly] 🚀 BULL SIGNAL: Pred ${predicted_price:.2f} > Strike ${strike_val} (Spot ${current_spot:.2f}). Ask {ask:.2f}. BUY YES.")
+                signals.append(TradeSignal(symbol=symbol, side="buy", quantity=5, limit_price=ask, confidence=0.8))
+            else:
+                bid = float(event.yes_bid[i])
+                logger.info(f"[Hourly] 📉 BEAR SIGNAL: Pred ${predicted_price:.2f} < Strike ${strike_val}. Market Bid {bid:.2f}. SELL YES.")
+                signals.append(TradeSignal(symbol=symbol, side="sell", quantity=5, limit_price=bid, confidence=0.8))
+
         return signals
 
 # ==============================================================================
@@ -652,6 +911,9 @@ class Crypto15mTrendStrategyV3(Strategy):
     
     def name(self) -> str:
         return f"Trend Catcher V3 (15m | OBI>{self.obi_threshold})"
+
+    def hydrate(self, times: List[datetime], prices: List[float]):
+        self.spot_price_history.extend((t, p) for t, p in zip(times, prices) if p > 1.0)
         
     def _calculate_60s_brti_ma(self, now: datetime) -> Optional[float]:
         # Filter prices within the last window_seconds
@@ -729,6 +991,68 @@ class Crypto15mTrendStrategyV3(Strategy):
 
         return signals
 
+    def analyze_batch(self, batch: MarketDataBatch) -> SignalBatch:
+        """
+        Vectorized replay of `analyze`: BRTI MA from prefix sums over the spot
+        history, reciprocal math and OBI as column arithmetic. Stateless apart
+        from the spot history, so no per-row loop at all.
+        """
+        n = len(batch)
+        if n == 0:
+            return SignalBatch.empty()
+        t_us = batch.timestamps.astype(np.int64)
+        bid, ask, spot = batch.bid, batch.ask, batch.spot
+
+        # Spot history: prior deque + qualifying rows, bounded by maxlen and window
+        spot_ok = np.nan_to_num(spot) > 1.0
+        prior = list(self.spot_price_history)
+        hist_t = np.concatenate([np.array([_to_us(t) for t, p in prior], dtype=np.int64), t_us[spot_ok]])
+        hist_p = np.concatenate([np.array([p for t, p in prior], dtype=float), spot[spot_ok]])
+        ends = len(prior) + np.cumsum(spot_ok)
+        window_start = np.searchsorted(hist_t, t_us - self.window_seconds * 1_000_000, side='right')
+        starts = np.minimum(np.maximum(ends - self.spot_price_history.maxlen, window_start), ends)
+        prefix = np.concatenate([[0.0], np.cumsum(hist_p)])
+        count = ends - starts
+        with np.errstate(divide='ignore', invalid='ignore'):
+            brti_ma = (prefix[ends] - prefix[starts]) / count
+
+        minute = batch.timestamps.astype('datetime64[m]').astype(np.int64) % 60
+        second = batch.timestamps.astype('datetime64[s]').astype(np.int64) % 60
+        delayed = (minute % 15 == 0) & (second < self.confirmation_delay)
+
+        # Reciprocal Math + OBI
+        no_bid = batch.extra.get('no_bid', np.zeros(n))
+        no_ask = batch.extra.get('no_ask', np.zeros(n))
+        implied_yes_ask = np.where(no_bid > 0, 1.0 - no_bid, ask)
+        implied_no_ask = np.where(bid > 0, 1.0 - bid, no_ask)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            obi_yes = np.where(bid + implied_yes_ask > 0, bid / (bid + implied_yes_ask), 0.5)
+            obi_no = np.where(no_bid + implied_no_ask > 0, no_bid / (no_bid + implied_no_ask), 0.5)
+
+        strikes = batch.per_symbol(_strike_or_nan)
+        with np.errstate(invalid='ignore'):
+            live = ~delayed & (count > 0) & (brti_ma != 0) & ~np.isnan(strikes)
+            strong_up = brti_ma > strikes + 25.0
+            bull = live & strong_up & (obi_yes > self.obi_threshold) & (implied_yes_ask < 0.85)
+            bear = (live & ~strong_up & (brti_ma < strikes - 25.0)
+                    & (obi_no > self.obi_threshold) & (bid > 0.15))
+
+        yes_px = implied_yes_ask[bull]
+        no_px = (no_ask if 'no_ask' in batch.extra else implied_no_ask)[bear]
+        signals = SignalBatch.concat([
+            SignalBatch.build(np.flatnonzero(bull), 'buy', 10, yes_px, 0.8,
+                              stop_loss=yes_px - self.FIXED_STOP_CENTS,
+                              trailing_trigger=yes_px + 0.10, trailing_new_sl=yes_px + 0.05),
+            SignalBatch.build(np.flatnonzero(bear), 'buy', 10, no_px, 0.8, contract_side='NO',
+                              stop_loss=no_px - self.FIXED_STOP_CENTS,
+                              trailing_trigger=no_px + 0.10, trailing_new_sl=no_px + 0.05),
+        ])
+
+        keep = self.spot_price_history.maxlen
+        for t, p in zip(t_us[spot_ok][-keep:], spot[spot_ok][-keep:]):
+            self.spot_price_history.append((np.datetime64(int(t), 'us').item(), float(p)))
+        return signals
+
 class CryptoHourlyStrategyV3(Strategy):
     """
     The Time Traveler V3 ⏳ (Hourly Prediction)
@@ -740,10 +1064,19 @@ class CryptoHourlyStrategyV3(Strategy):
         self.price_history = [] 
         self.window_minutes = 20
         self.FIXED_STOP_CENTS = 0.05
+        self.probability_surface = None  # Optional ImpliedProbabilitySurface (adds 'fair_yes' to scans)
+        self.last_forecast = None  # (event_ticker, predicted price, target time) of the last scan
         
     def name(self) -> str:
         return f"The Time Traveler V3 (Hourly | OBI>{self.obi_threshold})"
 
+    def hydrate(self, times: List[datetime], prices: List[float]):
+        """Seeds the regression window with the last `window_minutes` of spot history."""
+        if not times:
+            return
+        cutoff = times[-1] - timedelta(minutes=self.window_minutes)
+        self.price_history = sorted(self.price_history + [(t, p) for t, p in zip(times, prices) if t > cutoff])
+
     def _predict_future_price(self, current_time: datetime, target_time: datetime) -> float:
         if len(self.price_history) < 10: return None
         start_time = self.price_history[0][0]
@@ -758,13 +1091,12 @@ class CryptoHourlyStrategyV3(Strategy):
             return None
 
     def analyze(self, market_data: MarketData) -> List[TradeSignal]:
-        signals = []
         extra = market_data.extra
         now = sorted(self.price_history)[-1][0] if self.price_history else datetime.now()
         
         if "Coinbase" in market_data.symbol or extra.get('source') == 'live_coinbase':
             spot_price = market_data.price
-            now = datetime.now()
+            now = market_data.timestamp or datetime.now()
             self.price_history.append((now, spot_price))
             cutoff = now - timedelta(minutes=self.window_minutes)
             self.price_history = [x for x in self.price_history if x[0] > cutoff]
@@ -774,8 +1106,62 @@ class CryptoHourlyStrategyV3(Strategy):
         if ("KXBTC" not in symbol and "kxbtcd" not in symbol) or "15M" in symbol: 
             return [] 
 
+        return self.analyze_event(EventSnapshot.from_markets([market_data]))
+
+    def scan_event(self, event: EventSnapshot, predicted_price: float, current_spot: float) -> Dict[str, np.ndarray]:
+        """
+        Vectorized per-strike evaluation of one event: margin vs prediction,
+        reciprocal-math implied asks, synthetic OBI, entry masks and ranking.
+        """
+        yes_bid, no_bid = event.yes_bid, event.no_bid
+
+        # Reciprocal Math
+        implied_yes_ask = np.where(no_bid > 0, 1.0 - no_bid, event.yes_ask)
+        no_ask = np.where(np.isnan(event.no_ask), 1.0 - yes_bid, event.no_ask)
+
+        # Synthetic OBI (0.5 when the book is empty)
+        yes_depth = yes_bid + implied_yes_ask
+        no_depth = no_bid + (1.0 - yes_bid)
+        obi_yes = np.divide(yes_bid, yes_depth, out=np.full(len(event), 0.5), where=yes_depth > 0)
+        obi_no = np.divide(no_bid, no_depth, out=np.full(len(event), 0.5), where=no_depth > 0)
+
+        in_range, bull, bear = _ladder_zones(event, predicted_price, current_spot, self.confidence_margin)
+        bull &= (obi_yes > self.obi_threshold) & (implied_yes_ask < 0.85) & (implied_yes_ask > 0)
+        bear &= (obi_no > self.obi_threshold) & (yes_bid > 0.15) & (yes_bid < 1.0)
+
+        margin = predicted_price - event.strikes
+        cushion = np.abs(margin) - self.confidence_margin
+        return {
+            'margin': margin,
+            'in_range': in_range,
+            'implied_yes_ask': implied_yes_ask,
+            'no_ask': no_ask,
+            'obi_yes': obi_yes,
+            'obi_no': obi_no,
+            'bull': bull,
+            'bear': bear,
+            'cushion': cushion,
+            'rank': _rank_opportunities(bull | bear, cushion, np.where(bull, implied_yes_ask, no_ask)),
+            'fair_yes': self._surface_fair_values(event),
+        }
+
+    def _surface_fair_values(self, event: EventSnapshot) -> np.ndarray:
+        """Ladder-implied P(S > K) per strike from the shared surface (NaN when unavailable)."""
+        fair = None
+        if self.probability_surface is not None:
+            fair = self.probability_surface.probabilities(event.event_ticker, event.strikes)
+        return fair if fair is not None else np.full(len(event), np.nan)
+
+    def analyze_event(self, event: EventSnapshot) -> List[TradeSignal]:
+        """
+        Evaluates every strike of one hourly event in a single pass. A lone
+        Kalshi tick is the one-strike case. Signals are ranked best first.
+        """
+        if not len(event):
+            return []
+
         if not self.price_history:
-            logger.debug(f"[HourlyV3] No price history yet, skipping {symbol}")
+            logger.debug(f"[HourlyV3] No price history yet, skipping {event.event_ticker}")
             return []
 
         # Time window filter: first 15 min, mid-hour 25-35, last 15 min
@@ -785,56 +1171,50 @@ class CryptoHourlyStrategyV3(Strategy):
             return []
 
         current_spot = self.price_history[-1][1]
-
-        try:
-            parts = symbol.split('-')
-            strike_val = float(re.sub(r'[A-Za-z]', '', parts[-1]))
-            dist = abs(strike_val - current_spot)
-            if dist > 750:
-                logger.debug(f"[HourlyV3] Strike ${strike_val} too far from spot ${current_spot:.2f} (dist={dist:.0f})")
-                return []
-            target_time = (datetime.now() + timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
-        except:
-            return []
+        target_time = (datetime.now() + timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
 
         predicted_price = self._predict_future_price(datetime.now(), target_time)
         if not predicted_price:
             logger.debug(f"[HourlyV3] Prediction failed (need 10+ points, have {len(self.price_history)})")
             return []
 
-        # Reciprocal Math
-        no_bid = extra.get('no_bid', 0.0)
-        yes_bid = market_data.bid
-        implied_yes_ask = 1.0 - no_bid if no_bid > 0 else market_data.ask
+        self.last_forecast = (event.event_ticker, predicted_price, target_time)
+        scan = self.scan_event(event, predicted_price, current_spot)
+        ranked = scan['rank']
 
-        # Synthetic OBI 
-        obi_yes = (yes_bid / (yes_bid + implied_yes_ask)) if (yes_bid + implied_yes_ask) > 0 else 0.5
-        no_ask_proxy = 1.0 - yes_bid
-        obi_no = (no_bid / (no_bid + no_ask_proxy)) if (no_bid + no_ask_proxy) > 0 else 0.5
-        
-        close_time = extra.get('close_time')
+        logger.info(f"[HourlyV3] Scan {event.event_ticker}: Pred=${predicted_price:.2f}, {int(scan['in_range'].sum())}/{len(event)} strikes within $750 of spot, {len(ranked)} opportunities, Threshold={self.obi_threshold}")
 
-        logger.info(f"[HourlyV3] Eval {symbol}: Pred=${predicted_price:.2f}, Strike=${strike_val}, Margin={abs(predicted_price-strike_val):.2f}, OBI_YES={obi_yes:.3f}, OBI_NO={obi_no:.3f}, Threshold={self.obi_threshold}")
-
-        if predicted_price > (strike_val + self.confidence_margin):
-            if obi_yes > self.obi_threshold and implied_yes_ask < 0.85 and implied_yes_ask > 0:
-                 logger.info(f"[HourlyV3] 🚀 BULL SIGNAL: Pred ${predicted_price:.2f} > Strike ${strike_val}. OBI: {obi_yes:.2f}, Ask {implied_yes_ask:.2f}.")
-                 sig = TradeSignal(symbol=symbol, side="buy", quantity=5, limit_price=implied_yes_ask, confidence=0.8)
-                 sig.stop_loss = 0.50  # Hold through hour
-                 if close_time: sig.expiration_time = close_time
-                 signals.append(sig)
-
-        elif predicted_price < (strike_val - self.confidence_margin):
-            if obi_no > self.obi_threshold and yes_bid > 0.15 and yes_bid < 1.0:
-                 no_ask = extra.get('no_ask', 1.0 - yes_bid)
-                 logger.info(f"[HourlyV3] 📉 BEAR SIGNAL (BUY NO): Pred ${predicted_price:.2f} < Strike ${strike_val}. OBI NO: {obi_no:.2f}, NO Ask {no_ask:.2f}.")
-                 sig = TradeSignal(symbol=symbol, side="buy", quantity=5, limit_price=no_ask, confidence=0.8)
-                 sig.stop_loss = 0.50  # Hold through hour
-                 sig.contract_side = 'NO'
-                 if close_time: sig.expiration_time = close_time
-                 signals.append(sig)
+        signals = []
+        for i in ranked:
+            symbol, strike_val = event.symbols[i], event.strikes[i]
+            if scan['bull'][i]:
+                ask = float(scan['implied_yes_ask'][i])
+                logger.info(f"[HourlyV3] 🚀 BULL SIGNAL: Pred ${predicted_price:.2f} > Strike ${strike_val}. OBI: {scan['obi_yes'][i]:.2f}, Ask {ask:.2f}.")
+                sig = TradeSignal(symbol=symbol, side="buy", quantity=5, limit_price=ask, confidence=0.8)
+            else:
+                no_ask = float(scan['no_ask'][i])
+                logger.info(f"[HourlyV3] 📉 BEAR SIGNAL (BUY NO): Pred ${predicted_price:.2f} < Strike ${strike_val}. OBI NO: {scan['obi_no'][i]:.2f}, NO Ask {no_ask:.2f}.")
+                sig = TradeSignal(symbol=symbol, side="buy", quantity=5, limit_price=no_ask, confidence=0.8)
+                sig.contract_side = 'NO'
+            sig.stop_loss = 0.50  # Hold through hour
+            if event.close_time: sig.expiration_time = event.close_time
+            signals.append(sig)
         return signals
 
+    def outcome_model(self, event: EventSnapshot, volatility) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Settlement distribution behind this strategy's signals, for joint
+        sizing: lognormal around the last regression forecast with `volatility`
+        (an EwmaVolatility) over the time to the target, discretized at the
+        event's strikes. None without a forecast for this event.
+        """
+        if self.last_forecast is None or self.last_forecast[0] != event.event_ticker or len(event) < 2:
+            return None
+        _, predicted_price, target_time = self.last_forecast
+        seconds_left = max((target_time - datetime.now()).total_seconds(), 0.0)
+        p_above = digital_fair_value(predicted_price, event.strikes, volatility.sigma_sqrt_t(seconds_left), True)
+        return outcome_distribution(event.strikes, p_above)
+
 class CryptoArbitrageStrategy(Strategy):
     """
     The Satoshi Arbitrageur ₿ (ML-Enhanced - 15m)
@@ -847,21 +1227,35 @@ class CryptoArbitrageStrategy(Strategy):
         self.price_history = [] 
         self.window_size = 25 # Increased to 25 to avoid NaNs in SMA_20 and ROC_5
         
-        # Load Model
-        self.model = None
-        model_path = os.path.join("models", "crypto_rf.pkl")
-        if os.path.exists(model_path):
-            try:
-                self.model = joblib.load(model_path)
-                logger.info("[Strategy] [ML] ML Model Loaded Successfully.")
-            except Exception as e:
-                logger.error(f"[Strategy] Failed to load ML model: {e}")
-        else:
-            logger.warning("[Strategy] No ML Model found. Using heuristic fallback.")
-        
+        # ML model is loaded on first use (joblib/sklearn import cost is paid only if this strategy runs)
+        self.model_path = os.path.join("models", "crypto_rf.pkl")
+        self._model = None
+        self._model_loaded = False
+
+    @property
+    def model(self):
+        if not self._model_loaded:
+            self._model_loaded = True
+            if os.path.exists(self.model_path):
+                try:
+                    import joblib
+                    self._model = joblib.load(self.model_path)
+                    logger.info("[Strategy] [ML] ML Model Loaded Successfully.")
+                except Exception as e:
+                    logger.error(f"[Strategy] Failed to load ML model: {e}")
+            else:
+                logger.warning("[Strategy] No ML Model found. Using heuristic fallback.")
+        return self._model
+
     def name(self) -> str:
-        mode = "ML" if self.model else "Heuristic"
+        # Don't trigger the deferred load just to label the strategy
+        has_model = self._model is not None if self._model_loaded else os.path.exists(self.model_path)
+        mode = "ML" if has_model else "Heuristic"
         return f"The Satoshi Arbitrageur ({mode})"
+
+    def hydrate(self, times: List[datetime], prices: List[float]):
+        """Real history instead of the warm-start padding (25 copies of the first live price)."""
+        self.price_history = (list(zip(times, prices)) + self.price_history)[-(self.window_size + 5):]
         
     def analyze(self, market_data: MarketData) -> List[TradeSignal]:
         signals = []
@@ -883,6 +1277,7 @@ class CryptoArbitrageStrategy(Strategy):
                 self.price_history.insert(0, (now, spot_price))
 
         # Feature Engineering (Must match training!)
+        import pandas as pd
         prices = pd.Series([p for t, p in self.price_history])
         
         sma_3 = prices.rolling(window=3).mean().iloc[-1]
@@ -1009,15 +1404,15 @@ class CryptoLongShotFader(Strategy):
         self.min_price = min_price
         self.quantity = quantity
         self.cooldown_seconds = cooldown_seconds
-        # Track last trade time per symbol
-        self._last_trade: dict = {}
+        # Last trade time per symbol; expired symbols are evicted (15m tickers roll forever)
+        self._last_trade = CooldownMap(cooldown_seconds)
 
     def name(self) -> str:
         return f"LongShot Fader (< ${self.longshot_ceiling:.2f})"
 
     def analyze(self, market_data: MarketData) -> List[TradeSignal]:
         signals = []
-        now = datetime.now()
+        now = market_data.timestamp or datetime.now()
 
         bid = market_data.bid
         if bid <= 0:
@@ -1029,8 +1424,7 @@ class CryptoLongShotFader(Strategy):
             return signals
 
         # --- COOLDOWN CHECK per symbol ---
-        last = self._last_trade.get(market_data.symbol, datetime.min)
-        if (now - last).total_seconds() < self.cooldown_seconds:
+        if not self._last_trade.ready(market_data.symbol, now):
             return signals
 
         # --- GENERATE SELL SIGNAL ---
@@ -1058,6 +1452,42 @@ class CryptoLongShotFader(Strategy):
         signals.append(sig)
         return signals
 
+    def analyze_batch(self, batch: MarketDataBatch) -> SignalBatch:
+        """
+        Vectorized replay of `analyze`. The longshot filter is one mask; the
+        per-symbol cooldown jumps between candidates with searchsorted, so the
+        loop runs once per emitted signal rather than once per row.
+        """
+        bid = batch.bid
+        candidates = np.flatnonzero((bid > 0) & (bid >= self.min_price) & (bid <= self.longshot_ceiling))
+        if not len(candidates):
+            return SignalBatch.empty()
+        t_us = batch.timestamps.astype(np.int64)
+        cooldown_us = int(self.cooldown_seconds * 1_000_000)
+
+        accepted, updates = [], []
+        ids = batch.symbol_ids[candidates]
+        order = np.argsort(ids, kind='stable')
+        groups = np.split(candidates[order], np.flatnonzero(np.diff(ids[order])) + 1)
+        for rows in groups:
+            symbol = batch.symbols[batch.symbol_ids[rows[0]]]
+            times = t_us[rows]
+            last = self._last_trade.get(symbol)
+            j = 0 if last is None else int(np.searchsorted(times, _to_us(last) + cooldown_us, side='left'))
+            while j < len(rows):
+                accepted.append(rows[j])
+                j = int(np.searchsorted(times, times[j] + cooldown_us, side='left'))
+            if accepted and batch.symbol_ids[accepted[-1]] == batch.symbol_ids[rows[0]]:
+                updates.append((accepted[-1], symbol))
+        # Record in time order so the cooldown map stays oldest-first, then evict as the row path would
+        for row, symbol in sorted(updates):
+            self._last_trade[symbol] = batch.timestamps[row].item()
+        self._last_trade.purge(batch.timestamps[candidates[-1]].item())
+
+        rows = np.sort(np.asarray(accepted, dtype=np.int64))
+        price = bid[rows]
+        return SignalBatch.build(rows, 'sell', self.quantity, price, (1.0 - price) * 0.95, stop_loss=0.20)
+
 
 # ==============================================================================
 # CRYPTO 15M LATE SNIPER — Enter last 5 minutes, ride to expiry
@@ -1083,10 +1513,11 @@ class Crypto15mLateSniper(Strategy):
         self.TIGHTEN_STEP = 0.05  # On loss
         self.RELAX_STEP = 0.03    # On win
 
-        # Cycle tracking
-        self._current_cycle_key = None  # e.g. "KXBTC15M-26FEB281330"
+        # Cycle tracking (ticker -> cycle resolved once; rollover resets the entry gate)
+        self.cycles = CycleTracker()
+        self.cycles.on_rollover(self._on_new_cycle)
         self._traded_this_cycle = False
-        self._trade_history = []  # list of (odds, won: bool)
+        self._trade_history = deque(maxlen=200)  # recent (odds, won: bool)
 
         # Counter-trade state
         self._counter_armed = False
@@ -1096,26 +1527,9 @@ class Crypto15mLateSniper(Strategy):
 
         self.quantity = 10  # placeholder, Kelly will override
 
-    def _cycle_key(self, symbol: str) -> str:
-        """Extract cycle identifier from ticker, e.g. 'KXBTC15M-26FEB281330'."""
-        parts = symbol.split('-')
-        if len(parts) >= 2:
-            return f"{parts[0]}-{parts[1]}"
-        return symbol
-
-    def _minute_in_cycle(self, symbol: str) -> Optional[int]:
-        """Parse the minute-of-cycle from the ticker timestamp."""
-        try:
-            parts = symbol.split('-')
-            if len(parts) < 2:
-                return None
-            time_part = parts[1]
-            # Format: 26FEB281330 -> last 4 digits are HHMM
-            hhmm = time_part[-4:]
-            mm = int(hhmm[2:])
-            return mm % 15
-        except Exception:
-            return None
+    def _on_new_cycle(self, previous, cycle):
+        self._traded_this_cycle = False
+        logger.info(f"[LateSniper] New cycle: {cycle.key} | Threshold: {self.max_odds:.2f}")
 
     def analyze(self, market_data: MarketData) -> Optional[list]:
         """
@@ -1126,13 +1540,8 @@ class Crypto15mLateSniper(Strategy):
             return None
 
         now = datetime.now()
-        cycle_key = self._cycle_key(market_data.symbol)
-
-        # Detect new cycle
-        if cycle_key != self._current_cycle_key:
-            self._current_cycle_key = cycle_key
-            self._traded_this_cycle = False
-            logger.info(f"[LateSniper] New cycle: {cycle_key} | Threshold: {self.max_odds:.2f}")
+        # Detect new cycle (fires _on_new_cycle)
+        cycle, _ = self.cycles.observe(market_data.symbol, (market_data.extra or {}).get('close_time'))
 
         if self._traded_this_cycle:
             # Check if counter-trade is armed
@@ -1140,8 +1549,8 @@ class Crypto15mLateSniper(Strategy):
                 return self._fire_counter_trade(market_data)
             return None
 
-        # Determine minute in cycle from wall clock
-        minute_in_cycle = now.minute % 15
+        # Determine minute in cycle from the market's close time (wall clock grid if unknown)
+        minute_in_cycle = cycle.minute_in_cycle(now)
 
         # Trade from minute 6 onward (avoid minute 14 = final-minute freeze)
         if minute_in_cycle < 6:
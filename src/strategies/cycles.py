@@ -0,0 +1,153 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import re
+
+from src.utils.logger import logger
+
+
+# ==============================================================================
+# CYCLE METADATA
+# ==============================================================================
+
+# Series suffix -> cycle length, e.g. KXBTC15M -> 15 minutes
+_PERIOD_RE = re.compile(r'(\d+)(M|H)$')
+
+
+def series_period(series: str) -> Optional[timedelta]:
+    """Cycle length encoded in a series ticker (KXBTC15M -> 15 min), None if not periodic."""
+    match = _PERIOD_RE.search(series)
+    if not match:
+        return None
+    n = int(match.group(1))
+    return timedelta(minutes=n) if match.group(2) == 'M' else timedelta(hours=n)
+
+
+def _parse_close(close_time) -> Optional[datetime]:
+    """Kalshi close_time (ISO string or datetime) -> naive local datetime comparable with datetime.now()."""
+    if close_time is None or close_time == '':
+        return None
+    try:
+        if not isinstance(close_time, datetime):
+            close_time = datetime.fromisoformat(str(close_time).replace('Z', '+00:00'))
+        if close_time.tzinfo is not None:
+            close_time = close_time.astimezone().replace(tzinfo=None)
+        return close_time
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class CycleInfo:
+    """
+    Everything a strategy needs about the cycle a ticker trades in, resolved
+    once per ticker. `key` is the event ticker (e.g. KXBTC15M-26FEB281330).
+    """
+    key: str
+    period: Optional[timedelta]
+    close: Optional[datetime]
+
+    @property
+    def start(self) -> Optional[datetime]:
+        if self.close is None or self.period is None:
+            return None
+        return self.close - self.period
+
+    def minute_in_cycle(self, now: datetime) -> int:
+        """Minutes elapsed in the cycle; falls back to the wall clock grid when no close time is known."""
+        period_min = int(self.period.total_seconds() // 60) if self.period else 15
+        if self.close is None:
+            return now.minute % period_min
+        elapsed = (now - self.start).total_seconds() // 60
+        return int(min(max(elapsed, 0), period_min - 1))
+
+
+class CycleTracker:
+    """
+    Resolves tickers to CycleInfo once (cached per ticker) and reports
+    rollovers to the next cycle. Only the tickers of the current cycle are
+    kept, so memory stays flat on rolling series like KXBTC15M.
+    """
+
+    def __init__(self):
+        self.current: Optional[CycleInfo] = None
+        self._resolved: Dict[str, CycleInfo] = {}
+        self._listeners: List[Callable[[Optional[CycleInfo], CycleInfo], None]] = []
+
+    def on_rollover(self, callback: Callable[[Optional[CycleInfo], CycleInfo], None]):
+        """Registers callback(previous, current), fired when a new cycle is first seen."""
+        self._listeners.append(callback)
+
+    def resolve(self, symbol: str, close_time=None) -> CycleInfo:
+        info = self._resolved.get(symbol)
+        if info is None or (info.close is None and close_time):
+            parts = symbol.split('-')
+            key = f"{parts[0]}-{parts[1]}" if len(parts) >= 2 else symbol
+            info = CycleInfo(key, series_period(parts[0]), _parse_close(close_time))
+            self._resolved[symbol] = info
+        return info
+
+    def observe(self, symbol: str, close_time=None) -> Tuple[CycleInfo, bool]:
+        """Returns (cycle, rolled) for a tick on `symbol`; rolled is True on the first tick of a new cycle."""
+        info = self.resolve(symbol, close_time)
+        if self.current is not None and info.key == self.current.key:
+            return info, False
+        previous, self.current = self.current, info
+        # Drop tickers of finished cycles
+        self._resolved = {s: i for s, i in self._resolved.items() if i.key == info.key}
+        for callback in self._listeners:
+            try:
+                callback(previous, info)
+            except Exception as e:
+                logger.error(f"[CycleTracker] Rollover callback failed: {e}")
+        return info, True
+
+
+# ==============================================================================
+# COOLDOWNS
+# ==============================================================================
+
+class CooldownMap:
+    """
+    Last-trade time per key with a fixed TTL. Entries older than the TTL can
+    no longer block a trade, so `purge(now)` drops them (oldest first) and
+    the map only holds keys traded within the last TTL.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self._last: "OrderedDict[str, datetime]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._last)
+
+    def __contains__(self, key) -> bool:
+        return key in self._last
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._last)
+
+    def items(self):
+        return self._last.items()
+
+    def get(self, key, default=None):
+        return self._last.get(key, default)
+
+    def __setitem__(self, key, when: datetime):
+        self._last[key] = when
+        self._last.move_to_end(key)
+
+    def purge(self, now: datetime):
+        cutoff = now - self.ttl
+        while self._last:
+            key, when = next(iter(self._last.items()))
+            if when > cutoff:
+                break
+            del self._last[key]
+
+    def ready(self, key, now: datetime) -> bool:
+        """True when `key` has not traded within the TTL. Expects non-decreasing `now`."""
+        self.purge(now)
+        last = self._last.get(key)
+        return last is None or now - last >= self.ttl
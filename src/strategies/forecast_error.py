@@ -0,0 +1,252 @@
+"""
+Forecast-error lookup tables for KXHIGH contracts.
+
+Per city and per lead-time bucket, the distribution of
+    error = observed daily high - NWS daytime forecast high  (°F, integer grid)
+is kept as smoothed counts (a discretized Normal prior adds `PRIOR_WEIGHT`
+pseudo-days, so sparse buckets stay sane). A cached survival table turns
+P(high >= strike) into index arithmetic: O(1) per strike, vectorized over arrays.
+
+Tables are built offline from the weather harvest (FORECAST / OBS_MAX rows)
+and grow incrementally: each (city, day) is folded in exactly once.
+"""
+import csv
+import os
+from datetime import datetime, date, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from src.core.pricing import norm_cdf
+from src.utils.logger import logger
+
+
+# ==============================================================================
+# TABLE LAYOUT
+# ==============================================================================
+
+DEFAULT_TABLES_PATH = os.path.join("models", "forecast_error_tables.npz")
+
+# Lead-time buckets (hours to settlement): <=2, <=6, <=12, <=24, <=48, >48
+LEAD_EDGES_H = np.array([2.0, 6.0, 12.0, 24.0, 48.0])
+# Prior error spread per bucket (°F), widening with lead time
+PRIOR_SIGMA_F = np.array([1.5, 2.0, 2.5, 3.0, 4.0, 5.5])
+PRIOR_WEIGHT = 8.0
+
+ERROR_MIN, ERROR_MAX = -20, 20
+ERROR_GRID = np.arange(ERROR_MIN, ERROR_MAX + 1, dtype=float)
+
+HARVEST_HEADER = ["Timestamp", "City", "Kind", "TargetDate", "LeadHours", "Value"]
+
+# Harvest days are station LST days; a day is over everywhere once it is over at UTC-12
+LATEST_STD_OFFSET_H = -12
+
+
+def lead_bucket(lead_hours) -> np.ndarray:
+    """Bucket index for lead time(s) in hours."""
+    return np.searchsorted(LEAD_EDGES_H, np.asarray(lead_hours, dtype=float), side='left')
+
+
+def _prior_pmf() -> np.ndarray:
+    """Discretized Normal(0, sigma_bucket) over ERROR_GRID, shape (n_lead, n_err)."""
+    upper = norm_cdf((ERROR_GRID[None, :] + 0.5) / PRIOR_SIGMA_F[:, None])
+    lower = norm_cdf((ERROR_GRID[None, :] - 0.5) / PRIOR_SIGMA_F[:, None])
+    pmf = upper - lower
+    return pmf / pmf.sum(axis=1, keepdims=True)
+
+
+# ==============================================================================
+# LOOKUP TABLES
+# ==============================================================================
+
+class ForecastErrorTables:
+    """Per-city, per-lead forecast-error distributions with O(1) P(high >= strike)."""
+
+    def __init__(self):
+        self.cities: Dict[str, int] = {}
+        self.counts = np.zeros((0, len(PRIOR_SIGMA_F), len(ERROR_GRID)))
+        self.processed: set = set()  # {"KXHIGHNY|2026-02-17", ...}
+        self._survival: Optional[np.ndarray] = None
+        self._prior_survival = self._survival_of(PRIOR_WEIGHT * _prior_pmf())
+
+    # --- persistence ---
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_TABLES_PATH) -> 'ForecastErrorTables':
+        """Loads tables from disk; a missing file yields prior-only tables."""
+        tables = cls()
+        if not os.path.exists(path):
+            return tables
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if not (np.array_equal(data['lead_edges'], LEAD_EDGES_H) and np.array_equal(data['error_grid'], ERROR_GRID)):
+                    logger.warning(f"[ErrorTables] Layout mismatch in {path}; starting from prior.")
+                    return tables
+                tables.cities = {str(c): i for i, c in enumerate(data['cities'])}
+                tables.counts = data['counts'].astype(float)
+                tables.processed = set(str(k) for k in data['processed'])
+        except Exception as e:
+            logger.error(f"[ErrorTables] Failed to load {path}: {e}")
+            return cls()
+        return tables
+
+    def save(self, path: str = DEFAULT_TABLES_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(
+            path,
+            lead_edges=LEAD_EDGES_H,
+            error_grid=ERROR_GRID,
+            cities=np.array(sorted(self.cities, key=self.cities.get), dtype=str),
+            counts=self.counts.astype(np.int32),
+            processed=np.array(sorted(self.processed), dtype=str)
+        )
+
+    # --- building ---
+
+    def _city_index(self, city: str) -> int:
+        if city not in self.cities:
+            self.cities[city] = len(self.cities)
+            self.counts = np.concatenate([self.counts, np.zeros((1,) + self.counts.shape[1:])])
+        return self.cities[city]
+
+    def add_day(self, city: str, day: str, observed_high: float, forecasts: Dict[int, float]) -> bool:
+        """
+        Folds one settled (city, day) into the tables.
+        forecasts: {lead_bucket: forecast_high} (one forecast per bucket).
+        Returns False if the day was already processed.
+        """
+        key = f"{city}|{day}"
+        if key in self.processed or not forecasts:
+            return False
+        c = self._city_index(city)
+        buckets = np.fromiter(forecasts.keys(), dtype=np.int64)
+        errors = observed_high - np.fromiter(forecasts.values(), dtype=float)
+        k = np.clip(np.rint(errors).astype(np.int64) - ERROR_MIN, 0, len(ERROR_GRID) - 1)
+        np.add.at(self.counts[c], (buckets, k), 1.0)
+        self.processed.add(key)
+        self._survival = None
+        return True
+
+    def add_harvest(self, rows: Iterable[dict], today: Optional[date] = None) -> int:
+        """
+        Incremental rebuild from harvest rows (HARVEST_HEADER dicts).
+        Only days strictly before `today` with an observed max are settled (by
+        default the current day at UTC-12, so every station's LST day is over);
+        per lead bucket the forecast issued closest to settlement is used.
+        Returns the number of newly added days.
+        """
+        today = today or (datetime.now(timezone.utc) + timedelta(hours=LATEST_STD_OFFSET_H)).date()
+        today_str = today.isoformat()
+        observed: Dict[Tuple[str, str], float] = {}
+        forecasts: Dict[Tuple[str, str], Dict[int, Tuple[float, float]]] = {}
+
+        for row in rows:
+            try:
+                city, day, kind = row['City'], row['TargetDate'], row['Kind']
+                value = float(row['Value'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if day >= today_str or f"{city}|{day}" in self.processed:
+                continue
+            if kind == 'OBS_MAX':
+                observed[(city, day)] = max(value, observed.get((city, day), -999.0))
+            elif kind == 'FORECAST':
+                try:
+                    lead = float(row['LeadHours'])
+                except (TypeError, ValueError):
+                    continue
+                per_bucket = forecasts.setdefault((city, day), {})
+                b = int(lead_bucket(lead))
+                if b not in per_bucket or lead < per_bucket[b][0]:
+                    per_bucket[b] = (lead, value)
+
+        added = 0
+        for (city, day), high in observed.items():
+            by_bucket = {b: v for b, (_, v) in forecasts.get((city, day), {}).items()}
+            added += self.add_day(city, day, high, by_bucket)
+        return added
+
+    # --- queries ---
+
+    @staticmethod
+    def _survival_of(weights: np.ndarray) -> np.ndarray:
+        """P(error >= grid[k]) along the last axis."""
+        tail = np.cumsum(weights[..., ::-1], axis=-1)[..., ::-1]
+        return tail / tail[..., :1]
+
+    def _table(self) -> np.ndarray:
+        if self._survival is None:
+            self._survival = self._survival_of(self.counts + PRIOR_WEIGHT * _prior_pmf()[None])
+        return self._survival
+
+    def prob_at_least(self, city: str, strikes, forecast_high: float, lead_hours: float) -> np.ndarray:
+        """
+        P(observed high >= strike) for each strike, given the raw NWS forecast.
+        Unknown cities use the prior. Linear between integer error grid points.
+        """
+        c = self.cities.get(city)
+        surv = (self._table()[c] if c is not None else self._prior_survival)[int(lead_bucket(lead_hours))]
+        x = np.asarray(strikes, dtype=float) - forecast_high - ERROR_MIN
+        lo = np.clip(np.floor(x).astype(np.int64), 0, len(ERROR_GRID) - 1)
+        hi = np.minimum(lo + 1, len(ERROR_GRID) - 1)
+        frac = np.clip(x - lo, 0.0, 1.0)
+        p = surv[lo] * (1.0 - frac) + surv[hi] * frac
+        return np.where(x <= 0, 1.0, np.where(x > len(ERROR_GRID) - 1, 0.0, p))
+
+    def sample_size(self, city: str, lead_hours: float) -> int:
+        """Recorded days behind one (city, lead bucket) cell."""
+        c = self.cities.get(city)
+        return 0 if c is None else int(self.counts[c, int(lead_bucket(lead_hours))].sum())
+
+
+# ==============================================================================
+# HARVEST (live recording for the offline build)
+# ==============================================================================
+
+def forecast_harvest_rows(city: str, forecasts: Optional[List[dict]], max_obs: Optional[float],
+                          now: Optional[datetime] = None, std_offset_sec: Optional[float] = None) -> List[list]:
+    """
+    Rows to append for one NWS fetch: every daytime forecast period (target
+    date, hours to end of that day, forecast high) plus today's observed max.
+    With the station's standard UTC offset, days are its LST (CLI) days;
+    without it, the host's local days.
+    """
+    if std_offset_sec is not None:
+        lst = timezone(timedelta(seconds=std_offset_sec))
+        now = (now or datetime.now(timezone.utc)).astimezone(lst)
+    else:
+        lst, now = None, now or datetime.now()
+    rows = []
+    for period in forecasts or []:
+        if not period.get('isDaytime') or period.get('temperature') is None:
+            continue
+        target = str(period.get('startTime', ''))[:10]
+        try:
+            settle = datetime.fromisoformat(target).replace(hour=23, minute=59, tzinfo=lst)
+        except ValueError:
+            continue
+        lead = max(0.0, (settle - now).total_seconds() / 3600)
+        rows.append([now.isoformat(), city, 'FORECAST', target, f"{lead:.2f}", period['temperature']])
+    if max_obs is not None:
+        rows.append([now.isoformat(), city, 'OBS_MAX', now.date().isoformat(), "", max_obs])
+    return rows
+
+
+def append_harvest(path: str, rows: List[list]):
+    if not rows:
+        return
+    new_file = not os.path.exists(path)
+    with open(path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        if new_file:
+            writer.writerow(HARVEST_HEADER)
+        writer.writerows(rows)
+
+
+def read_harvest(paths: Iterable[str]) -> List[dict]:
+    rows = []
+    for path in paths:
+        try:
+            with open(path, newline='', encoding='utf-8') as f:
+                rows.extend(csv.DictReader(f))
+        except OSError as e:
+            logger.warning(f"[ErrorTables] Skipping {path}: {e}")
+    return rows
@@ -0,0 +1,113 @@
+"""
+Strategy plug-in registry.
+
+Maps orchestrator strategy names to "module:Class" entry points so that a
+run imports and constructs only the strategies it enables. Each entry also
+declares the market_loop feed (role) that drives it and the label its
+trades are recorded under. Import and construction times are recorded per
+strategy for the startup report.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+import importlib
+import sys
+import time
+
+from src.core.interfaces import Strategy
+from src.utils.logger import logger
+
+# market_loop feeds, and the call each one makes
+ROLES = {
+    "crypto_15m": "analyze(MarketData) on the fused KXBTC15M tick; first strategy to trade takes the interval",
+    "crypto_hourly": "analyze(spot MarketData) per spot sample + analyze_event(EventSnapshot) on the BTC hourly event",
+    "weather_event": "analyze_event(EventSnapshot, NWS MarketData) per city",
+}
+
+
+@dataclass(frozen=True)
+class StrategyEntry:
+    entry_point: str  # "package.module:Class"
+    role: str         # key of ROLES
+    label: str        # strategy_name for risk/dashboard accounting
+
+
+STRATEGY_REGISTRY: Dict[str, StrategyEntry] = {
+    "weather": StrategyEntry("src.strategies.weather_strategy:WeatherArbitrageStrategyV2", "weather_event", "Meteorologist V1"),
+    "weather_bracket": StrategyEntry("src.strategies.bracket_strategy:WeatherBracketStrategy", "weather_event", "Weather Condor"),
+    "crypto": StrategyEntry("src.strategies.crypto_strategy:Crypto15mTrendStrategyV3", "crypto_15m", "Trend Catcher V3"),
+    "crypto_v2": StrategyEntry("src.strategies.crypto_strategy:Crypto15mTrendStrategyV2", "crypto_15m", "Trend Catcher V2"),
+    "crypto_hr": StrategyEntry("src.strategies.crypto_strategy:CryptoHourlyStrategyV3", "crypto_hourly", "Crypto Hourly"),
+    "crypto_ml": StrategyEntry("src.strategies.crypto_strategy:CryptoArbitrageStrategy", "crypto_15m", "Satoshi Arbitrageur"),
+    "longshot": StrategyEntry("src.strategies.crypto_strategy:CryptoLongShotFader", "crypto_15m", "LongShot Fader"),
+    "late_sniper": StrategyEntry("src.strategies.crypto_strategy:Crypto15mLateSniper", "crypto_15m", "Late Sniper"),
+}
+
+
+@dataclass
+class StrategyLoadReport:
+    """Seconds spent importing (first import of the module only) and constructing each strategy."""
+    import_seconds: Dict[str, float] = field(default_factory=dict)
+    construct_seconds: Dict[str, float] = field(default_factory=dict)
+    failed: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.import_seconds.values()) + sum(self.construct_seconds.values())
+
+    def lines(self) -> List[str]:
+        out = [f"[Registry] Strategy startup: {self.total_seconds * 1000:.1f} ms"]
+        for name in self.construct_seconds:
+            out.append(f"[Registry]   {name:<16} import {self.import_seconds.get(name, 0.0) * 1000:7.1f} ms | "
+                       f"init {self.construct_seconds[name] * 1000:7.1f} ms")
+        for name, err in self.failed.items():
+            out.append(f"[Registry]   {name:<16} FAILED: {err}")
+        return out
+
+
+def resolve(entry_point: str):
+    """'package.module:Class' -> the class object (imports the module)."""
+    module_name, _, attr = entry_point.partition(':')
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def by_role(strategies: Dict[str, Strategy], role: str,
+            registry: Optional[Dict[str, StrategyEntry]] = None) -> List[tuple]:
+    """(name, label, strategy) of the loaded strategies driven by `role`, in enabled order."""
+    registry = STRATEGY_REGISTRY if registry is None else registry
+    return [(name, registry[name].label, strategy) for name, strategy in strategies.items()
+            if name in registry and registry[name].role == role]
+
+
+def load_strategies(enabled: Iterable[str], registry: Optional[Dict[str, StrategyEntry]] = None,
+                    report: Optional[StrategyLoadReport] = None) -> Dict[str, Strategy]:
+    """
+    Imports and constructs the enabled strategies, in order. Unknown names,
+    entries without a market_loop feed (role not in ROLES) and strategies
+    that fail to import or construct are logged and skipped.
+    """
+    registry = STRATEGY_REGISTRY if registry is None else registry
+    report = StrategyLoadReport() if report is None else report
+    strategies: Dict[str, Strategy] = {}
+    for name in enabled:
+        entry = registry.get(name)
+        if entry is None:
+            report.failed[name] = "not registered"
+            logger.error(f"[Registry] Unknown strategy '{name}'")
+            continue
+        if entry.role not in ROLES:
+            report.failed[name] = f"no feed for role '{entry.role}'"
+            logger.error(f"[Registry] Strategy '{name}' has no market_loop feed (role '{entry.role}')")
+            continue
+        entry_point = entry.entry_point
+        try:
+            fresh = entry_point.partition(':')[0] not in sys.modules
+            start = time.perf_counter()
+            cls = resolve(entry_point)
+            report.import_seconds[name] = time.perf_counter() - start if fresh else 0.0
+            start = time.perf_counter()
+            strategies[name] = cls()
+            report.construct_seconds[name] = time.perf_counter() - start
+        except Exception as e:
+            report.failed[name] = str(e)
+            logger.error(f"[Registry] Failed to load strategy '{name}' ({entry_point}): {e}")
+    return strategies
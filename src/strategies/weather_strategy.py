@@ -1,7 +1,11 @@
-from src.core.interfaces import Strategy, MarketData, TradeSignal
+from src.core.interfaces import Strategy, MarketData, TradeSignal, EventSnapshot
 from typing import List, Optional, Dict
 from datetime import datetime, timedelta
+import os
 import re
+import numpy as np
+from src.core.daily_max import DailyMaxErrorModel
+from src.strategies.forecast_error import ForecastErrorTables, DEFAULT_TABLES_PATH
 from src.utils.logger import logger
 
 
@@ -79,15 +83,23 @@ class WeatherArbitrageStrategyV2(Strategy):
     - Confidence scoring based on forecast lead time
     - NWS CLI settlement timing awareness (LST vs local DST)
     - Improved intraday logic with temperature velocity tracking
+    - Forecast-error lookup tables (when built) replace the hand-set confidences
     """
     
     def __init__(self, 
                  threshold: float = 0.15,
                  min_edge_degrees: float = 2.0,
-                 enable_bias_correction: bool = True):
+                 enable_bias_correction: bool = True,
+                 error_tables: Optional[ForecastErrorTables] = None):
         self.threshold = threshold
         self.min_edge_degrees = min_edge_degrees
         self.enable_bias_correction = enable_bias_correction
+
+        # Empirical P(high >= strike) per city / lead time (built offline by lab.py --error-tables)
+        self.error_tables = error_tables
+        if self.error_tables is None and os.path.exists(DEFAULT_TABLES_PATH):
+            self.error_tables = ForecastErrorTables.load(DEFAULT_TABLES_PATH)
+            logger.info(f"[MeteorV2] Loaded forecast-error tables ({len(self.error_tables.processed)} city-days)")
         
         # Track temperature observations for velocity calculation
         self.temp_history: Dict[str, List[tuple]] = {}  # {city: [(timestamp, temp), ...]}
@@ -169,211 +181,175 @@ class WeatherArbitrageStrategyV2(Strategy):
         velocity = (last_temp - first_temp) / time_diff_hours
         return velocity
         
+    # Per-strike rules in precedence order: (scan column, contract side, quantity, confidence, stop loss, log label).
+    # A confidence of None reads the per-strike "<column>_conf" scan column.
+    EVENT_RULES = [
+        ('winner', 'YES', 100, 1.0, None, "🏆 HIGH MET (WON)"),
+        ('yogi', 'NO', 100, 0.99, 0.20, "⚾ YOGI BERRA"),
+        ('cooling', 'NO', 50, 0.85, 0.25, "❄️ COOLING VELOCITY"),
+        ('heating', 'YES', 50, 0.80, None, "🔥 HEATING VELOCITY"),
+        ('fade', 'NO', 20, 0.70, 0.20, "📉 FADE LONGSHOT"),
+        ('forecast_yes', 'YES', 50, None, None, "🌡️ FORECAST LONG"),
+        ('forecast_no', 'NO', 50, None, 0.25, "❄️ FORECAST SHORT"),
+    ]
+
     def analyze(self, market_data: MarketData) -> List[TradeSignal]:
-        # 0. Warmup Period (Don't trade before 10 AM)
-        if not (10 <= datetime.now().hour < 14):
-            return []
+        """Single-strike entry point: a one-strike event through `analyze_event`."""
+        return self.analyze_event(EventSnapshot.from_markets([market_data]), market_data)
 
-        signals = []
-        extra = market_data.extra
-        symbol = market_data.symbol
+    def scan_event(self, event: EventSnapshot, weather: MarketData) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Evaluates the Winner Guard, Yogi Berra, velocity, longshot-fade and
+        forecast-edge rules against every strike of one KXHIGH event in one pass.
+        Returns one boolean column per EVENT_RULES entry (plus the forecast
+        confidences), or None when the NWS reading is not live.
+        """
+        bid, ask, strikes = event.yes_bid, event.yes_ask, event.strikes
+        is_above = np.array([not s.split('-')[-1].startswith('B') for s in event.symbols], dtype=bool)
+        none = np.zeros(len(event), dtype=bool)
 
         # Skip near-resolved markets (99-cent filter)
-        if market_data.bid >= 0.95 or market_data.ask <= 0.05:
-            logger.info(f"[MeteorV2] SKIP: near-resolved {market_data.symbol} bid={market_data.bid} ask={market_data.ask}")
-            return []
+        near_resolved = (bid >= 0.95) | (ask <= 0.05)
+        for i in np.flatnonzero(near_resolved):
+            logger.info(f"[MeteorV2] SKIP: near-resolved {event.symbols[i]} bid={bid[i]} ask={ask[i]}")
 
         # 1. Source Fidelity
+        extra = weather.extra or {}
         if extra.get('source') != 'live_nws':
-            return []
+            return None
 
-        # 2. Extract Key Data
+        # 2. Extract Key Data (one reading and one settlement clock for the whole event)
         forecasts = extra.get('forecast')
         current_temp = extra.get('temperature_f')
         daily_max_obs = extra.get('max_temp_today_f')
-        
-        # Get city configuration
-        city_config = self._get_city_from_symbol(symbol)
-        
-        # Market Sentiment
-        if market_data.bid > 0:
-            market_bid = market_data.bid
-            market_ask = market_data.ask
-        else:
-            return []
-
-        # 3. Parse Ticker for Strike & Date
-        try:
-            parts = symbol.split('-')
-            strike_str = parts[-1]  # e.g. T80 or B85.5
-            
-            is_above_contract = True
-            if strike_str.startswith('B'):
-                is_above_contract = False
-            
-            strike_val = float(re.sub(r'[A-Za-z]', '', strike_str))
-            
-            today_str = datetime.now().strftime("%y%b%d").upper()
-            is_today = today_str in symbol
-        except:
-            return []
-
-        # 4. Calculate Confidence and Timing
-        hours_until_settlement = self._get_hours_until_settlement(symbol)
+        city_key = event.event_ticker.split('-')[0]
+        city_config = self._get_city_from_symbol(event.event_ticker)
+        is_today = datetime.now().strftime("%y%b%d").upper() in event.event_ticker
+        hours_until_settlement = self._get_hours_until_settlement(event.event_ticker)
         time_confidence = get_forecast_confidence(hours_until_settlement)
-        
-        # --- MANDATORY PROTECTION: THE WINNER GUARD ---
-        contract_has_won = False
-        if is_today and daily_max_obs:
-            if is_above_contract:
-                if daily_max_obs >= strike_val:
-                    contract_has_won = True
 
-        # IF LOST (Below contract with temp above strike):
-        if is_today and daily_max_obs and not is_above_contract and daily_max_obs > strike_val:
-            return []
-
-        # IF WON (buy remaining value):
-        if contract_has_won:
-            if market_ask < 0.98:
-                logger.info(f"[MeteorV2] 🏆 HIGH MET: {symbol} WON. BUY YES.")
-                signals.append(TradeSignal(
-                    symbol=symbol, side="buy", quantity=100, 
-                    limit_price=market_ask, confidence=1.0
-                ))
-            return signals
+        live = ~near_resolved & (bid > 0)
 
+        # --- MANDATORY PROTECTION: THE WINNER GUARD ---
+        # Above contracts at/below today's max have WON; Below contracts under it have LOST.
+        max_obs = daily_max_obs if (is_today and daily_max_obs) else np.nan
+        won = live & is_above & (max_obs >= strikes)
+        lost = live & ~is_above & (max_obs > strikes)
+        scan = {'winner': won & (ask < 0.98)}
+        open_ = live & ~won & ~lost
 
         # --- INTRADAY VELOCITY CHECK ---
-        if is_today and current_temp:
-            velocity = self._calculate_temp_velocity(symbol, current_temp)
-            
-            # YOGI BERRA LOGIC (End of Day Reality Check)
-            # "It ain't over till it's over"... but sometimes it IS over.
-            if hours_until_settlement < 1.0: # Last hour
-                # Max realistic temp rise in 1 hour is ~5-8 degrees? 
-                # Let's say 10 degrees to be safe.
-                max_rise = 10.0
-                projected_max = max(daily_max_obs or -999, current_temp + max_rise)
-                
-                # If even with a miracle rise, we are below strike (for Above contract)
-                if is_above_contract and projected_max < strike_val:
-                    if market_bid > 0.05:
-                        logger.info(f"[MeteorV2] ⚾ YOGI BERRA: Proj Max {projected_max:.1f} < Strike {strike_val}. BUY NO.")
-                        sig = TradeSignal(
-                             symbol=symbol, side="buy", quantity=100,
-                             limit_price=1.0 - market_bid, confidence=0.99
-                        )
-                        sig.contract_side = 'NO'
-                        sig.stop_loss = 0.20
-                        signals.append(sig)
-                        return signals
+        yogi, cooling, heating = none, none, none
+        if is_today and current_temp and open_.any():
+            # Provider-side velocity (station observation ring buffer) when present, else this strategy's own ticks
+            if 'temp_velocity_f_per_hr' in extra:
+                velocity = extra['temp_velocity_f_per_hr']
+            else:
+                velocity = self._calculate_temp_velocity(city_key, current_temp)
+
+            # YOGI BERRA LOGIC: in the last hour, even a 10°F miracle rise cannot reach the strike
+            if hours_until_settlement < 1.0:
+                projected_max = max(daily_max_obs or -999, current_temp + 10.0)
+                yogi = open_ & is_above & (projected_max < strikes) & (bid > 0.05)
+                open_ = open_ & ~yogi
 
             if velocity is not None:
-                # High confidence short: temp dropping and already below strike
-                if is_above_contract and velocity < -1.0 and current_temp < (strike_val - 3):
-                    if market_bid > 0.40:
-                        logger.info(f"[MeteorV2] ❄️ COOLING VELOCITY ({velocity:.1f}°/hr): BUY NO {symbol}")
-                        sig = TradeSignal(
-                            symbol=symbol, side="buy", quantity=50,
-                            limit_price=1.0 - market_bid, confidence=0.85
-                        )
-                        sig.contract_side = 'NO'
-                        sig.stop_loss = 0.25
-                        signals.append(sig)
-                        return signals
-                
-                # High confidence long: temp rising rapidly toward strike
-                if is_above_contract and velocity > 2.0 and current_temp > (strike_val - 5):
-                    if market_ask < 0.70:
-                        logger.info(f"[MeteorV2] 🔥 HEATING VELOCITY ({velocity:.1f}°/hr): Buy {symbol}")
-                        signals.append(TradeSignal(
-                            symbol=symbol, side="buy", quantity=50,
-                            limit_price=market_ask, confidence=0.80
-                        ))
-                        return signals
-                        
+                # Temp dropping and already below strike / rising rapidly toward it
+                cooling = open_ & is_above & (velocity < -1.0) & (current_temp < strikes - 3) & (bid > 0.40)
+                open_ = open_ & ~cooling
+                heating = open_ & is_above & (velocity > 2.0) & (current_temp > strikes - 5) & (ask < 0.70)
+                open_ = open_ & ~heating
+                if (cooling | heating).any():
+                    logger.info(f"[MeteorV2] Velocity {city_key}: {velocity:.1f}°/hr")
+        scan.update(yogi=yogi, cooling=cooling, heating=heating)
+
         # --- FADE THE LONGSHOT ---
-        # If market is pricing probability < 10%, and we agree (no strong signal), SELL into it.
-        # Shorting 'pennies' (selling at 0.05-0.10) for 10% yield.
-        # Risk: It hits. Payout 0.90 loss. Win 0.10. Odds 1:9.
-        # Needs high confidence.
-        if market_bid < 0.10 and market_bid > 0.02:
-             # Only fade if we have NO other signal and time is running out (< 4 hours)
-             if hours_until_settlement < 4.0 and not signals:
-                 # Check if we are comfortably safe
-                 # For Above contract: Current Temp < Strike - 5
-                 if is_above_contract and current_temp and current_temp < (strike_val - 5):
-                     logger.info(f"[MeteorV2] 📉 FADE LONGSHOT: Bid {market_bid:.2f} < 0.10. BUY NO pennies.")
-                     sig = TradeSignal(
-                         symbol=symbol, side="buy", quantity=20,
-                         limit_price=1.0 - market_bid, confidence=0.7
-                     )
-                     sig.contract_side = 'NO'
-                     sig.stop_loss = 0.20
-                     signals.append(sig)
+        # Market prices < 10% with < 4 hours left and temp comfortably below an Above strike: BUY NO pennies.
+        fade = none
+        if current_temp and hours_until_settlement < 4.0:
+            fade = open_ & (bid > 0.02) & (bid < 0.10) & is_above & (current_temp < strikes - 5)
 
         # 5. Forecast-Based Logic with Bias Correction
-        if not forecasts:
-            return []
-        target_period = next((p for p in forecasts if p.get('isDaytime')), None)
-        if not target_period:
-            return []
+        target_period = next((p for p in forecasts if p.get('isDaytime')), None) if forecasts else None
+        raw_nws_high = target_period.get('temperature') if target_period else None
+        if raw_nws_high is None:
+            # No forecast: nothing beyond the guard / intraday rules trades (the fade needs the forecast gate too)
+            scan.update(fade=none, forecast_yes=none, forecast_no=none)
+            return scan
 
-        raw_nws_high = target_period.get('temperature')
         nws_high = self._apply_bias_correction(raw_nws_high, city_config)
-        
-        if city_config and self.enable_bias_correction:
-            bias = city_config.get('bias_f', 0)
-            if abs(bias) > 0.2:
-                logger.info(f"[MeteorV2] Bias correction for {city_config['name']}: {raw_nws_high}°F -> {nws_high:.1f}°F")
-        
-        # Calculate edge (difference between forecast and strike)
-        edge = abs(nws_high - strike_val)
-        
-        # Only trade if edge exceeds minimum threshold
-        if edge < self.min_edge_degrees:
-            return []
-        
-        # Adjust confidence based on time and edge
-        base_confidence = min(0.95, 0.6 + (edge / 20))  # More edge = more confidence
-        final_confidence = base_confidence * time_confidence
-        
-        # Forecast Arbitrage
-        if is_above_contract:
-            if nws_high > (strike_val + self.min_edge_degrees) and market_ask < 0.80:
-                logger.info(f"[MeteorV2] 🌡️ FORECAST LONG: {nws_high:.1f}°F > {strike_val}°F (conf={final_confidence:.2f})")
-                signals.append(TradeSignal(
-                    symbol=symbol, side="buy", quantity=50,
-                    limit_price=market_ask, confidence=final_confidence
-                ))
-            elif nws_high < (strike_val - self.min_edge_degrees) and market_bid > 0.20:
-                logger.info(f"[MeteorV2] ❄️ FORECAST SHORT: {nws_high:.1f}°F < {strike_val}°F (conf={final_confidence:.2f}) BUY NO")
-                sig = TradeSignal(
-                    symbol=symbol, side="buy", quantity=50,
-                    limit_price=1.0 - market_bid, confidence=final_confidence
-                )
-                sig.contract_side = 'NO'
-                sig.stop_loss = 0.25
-                signals.append(sig)
+        if city_config and self.enable_bias_correction and abs(city_config.get('bias_f', 0)) > 0.2:
+            logger.info(f"[MeteorV2] Bias correction for {city_config['name']}: {raw_nws_high}°F -> {nws_high:.1f}°F")
+
+        # Only trade strikes whose edge (forecast vs strike) exceeds the minimum
+        edge = np.abs(nws_high - strikes)
+        tradeable = open_ & (edge >= self.min_edge_degrees)
+        scan['fade'] = fade & tradeable
+
+        # YES side expects the forecast beyond the strike in the contract's direction
+        m = self.min_edge_degrees
+        yes_side = np.where(is_above, nws_high > strikes + m, nws_high < strikes - m)
+        no_side = np.where(is_above, nws_high < strikes - m, nws_high > strikes + m)
+        buy_yes = tradeable & yes_side & (ask < 0.80)
+        buy_no = tradeable & no_side & (bid > 0.20)
+
+        # Today: remaining-day max distribution (observed max + hourly forecast path + per-city error model)
+        daily_max = extra.get('daily_max_forecast')
+        p_high = None
+        if is_today and daily_max is not None and daily_max.peak_f is not None:
+            p_high = daily_max.prob_at_least(strikes, DailyMaxErrorModel.for_city(city_config))
+        elif self.error_tables is not None:
+            # Empirical P(high >= strike) per strike (raw forecast: the bias lives in the table)
+            p_high = self.error_tables.prob_at_least(city_key, strikes, raw_nws_high, hours_until_settlement)
+
+        if p_high is not None:
+            # Only buy the side whose probability beats its price
+            yes_conf = np.where(is_above, p_high, 1.0 - p_high)
+            no_conf = 1.0 - yes_conf
+            buy_yes &= yes_conf > ask
+            buy_no &= no_conf > 1.0 - bid
         else:
-            # Below Contract
-            if nws_high < (strike_val - self.min_edge_degrees) and market_ask < 0.80:
-                signals.append(TradeSignal(
-                    symbol=symbol, side="buy", quantity=50,
-                    limit_price=market_ask, confidence=final_confidence
-                ))
-            elif nws_high > (strike_val + self.min_edge_degrees) and market_bid > 0.20:
-                logger.info(f"[MeteorV2] FORECAST SHORT (Below): BUY NO (conf={final_confidence:.2f})")
+            # More edge = more confidence, scaled by lead time
+            yes_conf = no_conf = np.minimum(0.95, 0.6 + edge / 20) * time_confidence
+
+        scan.update(forecast_yes=buy_yes, forecast_no=buy_no, forecast_yes_conf=yes_conf, forecast_no_conf=no_conf)
+        return scan
+
+    def analyze_event(self, event: EventSnapshot, weather: MarketData) -> List[TradeSignal]:
+        """
+        Signals for every strike of one KXHIGH event against one NWS reading,
+        ranked best first by expected edge per contract (confidence - price),
+        so per-city slot limits take the strongest trade.
+        """
+        # 0. Warmup Period (Don't trade before 10 AM)
+        if not (10 <= datetime.now().hour < 14) or not len(event):
+            return []
+
+        scan = self.scan_event(event, weather)
+        if scan is None:
+            return []
+
+        signals = []
+        for column, contract_side, quantity, confidence, stop_loss, label in self.EVENT_RULES:
+            for i in np.flatnonzero(scan[column]):
+                price = event.yes_ask[i] if contract_side == 'YES' else 1.0 - event.yes_bid[i]
+                conf = confidence if confidence is not None else scan[f"{column}_conf"][i]
                 sig = TradeSignal(
-                    symbol=symbol, side="buy", quantity=50,
-                    limit_price=1.0 - market_bid, confidence=final_confidence
+                    symbol=event.symbols[i], side="buy", quantity=quantity,
+                    limit_price=float(price), confidence=float(conf)
                 )
-                sig.contract_side = 'NO'
-                sig.stop_loss = 0.25
+                if contract_side == 'NO':
+                    sig.contract_side = 'NO'
+                if stop_loss is not None:
+                    sig.stop_loss = stop_loss
+                logger.info(f"[MeteorV2] {label}: {sig.symbol} BUY {contract_side} @ {price:.2f} (conf={conf:.2f})")
                 signals.append(sig)
-        
-        return signals
+
+        if not signals:
+            return []
+        edge = np.array([s.confidence - s.limit_price for s in signals])
+        conf = np.array([s.confidence for s in signals])
+        return [signals[i] for i in np.lexsort((-conf, -edge))]
 
     def _analyze_mock(self, market_data):
         return []
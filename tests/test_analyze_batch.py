@@ -0,0 +1,164 @@
+"""
+Tests for Strategy.analyze_batch: every vectorized implementation must emit the
+same signals (and leave the same state) as replaying analyze() row by row.
+"""
+import numpy as np
+from datetime import datetime
+
+from src.core.interfaces import EventSnapshot, MarketDataBatch, SignalBatch
+from src.strategies.crypto_strategy import (
+    Crypto15mTrendStrategy, Crypto15mTrendStrategyV2, Crypto15mTrendStrategyV3, CryptoLongShotFader
+)
+from src.strategies.bracket_strategy import WeatherBracketStrategy
+
+
+def make_batch(n=1500, seed=7, symbols=None, source='batch', extra=None):
+    """Random-walk replay: option ask swings through both triggers, spot around $69k."""
+    rng = np.random.default_rng(seed)
+    symbols = symbols or ["KXBTC15M-26FEB151215-15", "KXBTCD-26FEB1517-T69000", "KXBTCD-26FEB1517-T69500"]
+    start = np.datetime64(datetime(2026, 2, 15, 12, 0, 0), 'us')
+    timestamps = start + np.arange(n) * np.timedelta64(5, 's')
+    ask = np.clip(0.5 + np.cumsum(rng.normal(0, 0.03, n)) % 0.9 - 0.45, 0.02, 0.98)
+    bid = np.clip(ask - rng.uniform(0.01, 0.04, n), 0.0, 1.0)
+    spot = 69000 + np.cumsum(rng.normal(0, 15, n))
+    ids = rng.choice(len(symbols), n, p=[0.8] + [0.2 / (len(symbols) - 1)] * (len(symbols) - 1))
+    return MarketDataBatch(timestamps=timestamps, symbol_ids=ids, symbols=symbols,
+                           bid=bid, ask=ask, spot=spot, extra=extra or {}, source=source)
+
+
+def replay_rows(strategy, batch):
+    """Reference path: analyze() on every materialized row."""
+    rows, signals = [], []
+    for i in range(len(batch)):
+        out = strategy.analyze(batch.row(i)) or []
+        for sig in (out if isinstance(out, list) else [out]):
+            rows.append(i)
+            signals.append(sig)
+    return SignalBatch.from_signals(rows, signals)
+
+
+def assert_same(expected, actual):
+    assert len(expected) > 0, "fixture should produce signals"
+    np.testing.assert_array_equal(expected.rows, actual.rows)
+    np.testing.assert_array_equal(expected.side, actual.side)
+    np.testing.assert_array_equal(expected.contract_side, actual.contract_side)
+    np.testing.assert_array_equal(expected.quantity, actual.quantity)
+    np.testing.assert_allclose(expected.limit_price, actual.limit_price)
+    np.testing.assert_allclose(expected.confidence, actual.confidence)
+    np.testing.assert_allclose(expected.stop_loss, actual.stop_loss)
+    np.testing.assert_allclose(expected.trailing_trigger, actual.trailing_trigger)
+
+
+def test_trend_v2_batch_matches_rows():
+    batch = make_batch()
+    row_strat = Crypto15mTrendStrategyV2(cooldown_seconds=120)
+    batch_strat = Crypto15mTrendStrategyV2(cooldown_seconds=120)
+    assert_same(replay_rows(row_strat, batch), batch_strat.analyze_batch(batch))
+
+    assert batch_strat.consecutive_above == row_strat.consecutive_above
+    assert batch_strat.consecutive_below == row_strat.consecutive_below
+    assert batch_strat.cooldown_until == row_strat.cooldown_until
+    assert list(batch_strat.price_history) == list(row_strat.price_history)
+    assert list(batch_strat.spot_price_history) == list(row_strat.spot_price_history)
+
+
+def test_trend_v2_batch_matches_rows_without_cooldown():
+    batch = make_batch(seed=3)
+    row_strat = Crypto15mTrendStrategyV2(cooldown_seconds=0)
+    batch_strat = Crypto15mTrendStrategyV2(cooldown_seconds=0)
+    assert_same(replay_rows(row_strat, batch), batch_strat.analyze_batch(batch))
+    assert batch_strat.consecutive_above == row_strat.consecutive_above
+    assert batch_strat.consecutive_below == row_strat.consecutive_below
+    assert batch_strat.cooldown_until == row_strat.cooldown_until
+
+
+def test_trend_v2_batch_continues_from_live_state():
+    """Splitting a replay into two batches must equal one continuous row loop."""
+    batch = make_batch(seed=11)
+    row_strat = Crypto15mTrendStrategyV2(cooldown_seconds=90, trend_confirm_ticks=2)
+    expected = replay_rows(row_strat, batch)
+
+    batch_strat = Crypto15mTrendStrategyV2(cooldown_seconds=90, trend_confirm_ticks=2)
+    half = len(batch) // 2
+    first = batch_strat.analyze_batch(MarketDataBatch(
+        batch.timestamps[:half], batch.symbol_ids[:half], batch.symbols,
+        batch.bid[:half], batch.ask[:half], batch.spot[:half]))
+    second = batch_strat.analyze_batch(MarketDataBatch(
+        batch.timestamps[half:], batch.symbol_ids[half:], batch.symbols,
+        batch.bid[half:], batch.ask[half:], batch.spot[half:]))
+    second.rows += half
+    assert_same(expected, SignalBatch.concat([first, second]))
+
+
+def test_trend_v3_batch_matches_rows():
+    n = 1500
+    rng = np.random.default_rng(3)
+    extra = {'no_bid': rng.uniform(0.0, 0.6, n), 'no_ask': rng.uniform(0.3, 0.9, n)}
+    batch = make_batch(n=n, seed=5, extra=extra)
+    row_strat = Crypto15mTrendStrategyV3(obi_threshold=0.3)
+    batch_strat = Crypto15mTrendStrategyV3(obi_threshold=0.3)
+    assert_same(replay_rows(row_strat, batch), batch_strat.analyze_batch(batch))
+    assert list(batch_strat.spot_price_history) == list(row_strat.spot_price_history)
+
+
+def test_longshot_batch_matches_rows():
+    batch = make_batch(seed=9)
+    batch.bid = np.round(batch.bid / 8, 3)  # push bids into longshot territory
+    row_strat = CryptoLongShotFader(cooldown_seconds=120)
+    batch_strat = CryptoLongShotFader(cooldown_seconds=120)
+    assert_same(replay_rows(row_strat, batch), batch_strat.analyze_batch(batch))
+    assert dict(batch_strat._last_trade.items()) == dict(row_strat._last_trade.items())
+
+
+def test_weather_bracket_batch_matches_rows():
+    symbols = ["KXHIGHNY-26FEB15-T90", "KXHIGHNY-26FEB15-B60", "KXHIGHNY-26FEB15-T80", "KXHIGHNY-26FEB15-B70"]
+    n = 400
+    rng = np.random.default_rng(1)
+    batch = make_batch(n=n, symbols=symbols, source='live_nws',
+                       extra={'forecast_high': rng.integers(66, 84, n).astype(float)})
+    row_strat, batch_strat = WeatherBracketStrategy(), WeatherBracketStrategy()
+    assert_same(replay_rows(row_strat, batch), batch_strat.analyze_batch(batch))
+
+
+def test_weather_bracket_batch_plans_condors_per_snapshot():
+    symbols = ["KXHIGHNY-26FEB15-B60", "KXHIGHNY-26FEB15-B70", "KXHIGHNY-26FEB15-T80", "KXHIGHNY-26FEB15-T90"]
+    start = np.datetime64(datetime(2026, 2, 15, 12, 0, 0), 'us')
+    # two snapshots of the whole event; the second one quotes B60 twice (the later row counts)
+    batch = MarketDataBatch(timestamps=[start] * 4 + [start + np.timedelta64(5, 's')] * 5,
+                            symbol_ids=[0, 1, 2, 3, 0, 1, 2, 3, 0], symbols=symbols,
+                            bid=[0.20, 0.30, 0.35, 0.15, 0.01, 0.30, 0.35, 0.25, 0.18],
+                            ask=[0.25] * 9, spot=[0.0] * 9, source='live_nws',
+                            extra={'forecast_high': [75.0] * 9})
+    strategy = WeatherBracketStrategy()
+    signals = strategy.analyze_batch(batch)
+
+    for snap in (range(0, 4), range(5, 9)):
+        rows = [batch.row(i) for i in snap]
+        live = strategy.analyze_event(EventSnapshot.from_markets(rows), rows[0])
+        assert len(live) == 2
+        mine = [k for k in range(len(signals)) if signals.rows[k] in snap]
+        assert sorted(batch.symbols[batch.symbol_ids[signals.rows[k]]] for k in mine) == sorted(s.symbol for s in live)
+        assert {int(signals.quantity[k]) for k in mine} == {live[0].quantity}
+        assert sorted(signals.limit_price[mine]) == sorted(s.limit_price for s in live)
+
+
+def test_weather_bracket_batch_requires_forecast():
+    batch = make_batch(n=50, symbols=["KXHIGHNY-26FEB15-T90", "KXHIGHNY-26FEB15-B60"], source='live_nws')
+    assert len(WeatherBracketStrategy().analyze_batch(batch)) == 0
+
+
+def test_base_class_falls_back_to_rows():
+    """Strategies without a fast path still work through the per-row fallback."""
+    batch = make_batch(n=600, seed=2)
+    expected = replay_rows(Crypto15mTrendStrategy(), batch)
+    assert_same(expected, Crypto15mTrendStrategy().analyze_batch(batch))
+
+
+def test_signal_batch_to_signals_carries_risk_rules():
+    batch = make_batch(n=10)
+    sigs = SignalBatch.build([3], 'buy', 10, 0.6, 0.8, contract_side='NO', stop_loss=0.55,
+                             trailing_trigger=0.7, trailing_new_sl=0.65).to_signals(batch)
+    assert sigs[0].symbol == batch.symbols[batch.symbol_ids[3]]
+    assert sigs[0].contract_side == 'NO'
+    assert sigs[0].stop_loss == 0.55
+    assert sigs[0].trailing_rules == {'trigger': 0.7, 'new_sl': 0.65}
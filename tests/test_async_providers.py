@@ -0,0 +1,141 @@
+"""
+Async provider layer against a local HTTP stand-in: per-host concurrency
+limits, deadline-bounded fan-out and the synchronous adapter.
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from src.data.async_providers import (AsyncCoinbaseProvider, AsyncHTTP, AsyncKalshiProvider, AsyncNWSProvider,
+                                      AsyncRunner, SyncProviderAdapter, gather_with_deadline)
+from src.data.coinbase_provider import CoinbaseProvider
+from src.data.kalshi_provider import KalshiProvider
+from src.data.nws_provider import NWSProvider
+
+
+def _market(ticker):
+    return {"ticker": ticker, "yes_bid": 40, "yes_ask": 44, "no_bid": 56, "no_ask": 60, "last_price": 42,
+            "volume": 7, "status": "active", "close_time": "2026-02-19T04:59:00Z"}
+
+
+ROUTES = {
+    "/coinbase/products/BTC-USD/ticker": {"price": "97000.5", "bid": "97000", "ask": "97001", "volume": "12.5"},
+    "/nws/stations/KNYC": {"geometry": {"coordinates": [-73.97, 40.78]}, "properties": {"name": "Central Park"}},
+    "/nws/gridpoints/OKX/33,37/forecast": {"properties": {"periods": [{"name": "Today", "temperature": 41,
+                                                                       "isDaytime": True}]}},
+    "/nws/stations/KNYC/observations/latest": {"properties": {"temperature": {"value": 5.0},
+                                                              "textDescription": "Cloudy"}},
+    "/nws/stations/KNYC/observations": {"features": []},
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    delay = {}
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        time.sleep(self.delay.get(path, 0.05))
+        if path.startswith("/trade-api/v2/markets/"):
+            body = {"market": _market(path.rsplit("/", 1)[-1])}
+        elif path == "/nws/points/40.78,-73.97":
+            body = {"properties": {"forecast": f"http://{self.headers['Host']}/nws/gridpoints/OKX/33,37/forecast"}}
+        elif path in ROUTES:
+            body = ROUTES[path]
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    _Handler.delay = {}
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _nws(base):
+    nws = NWSProvider("(test, test@example.com)", ["KNYC"])
+    nws.BASE_URL = f"{base}/nws"
+    return nws
+
+
+def test_fan_out_respects_per_host_limit():
+    server, base = _serve()
+    _Handler.delay = {f"/trade-api/v2/markets/KXBTCD-26FEB1814-T{k}": 0.2 for k in range(6)}
+
+    async def run():
+        http = AsyncHTTP(host_limits={"127.0.0.1": 3})
+        kalshi = AsyncKalshiProvider(KalshiProvider(api_url=f"{base}/trade-api/v2"), http)
+        try:
+            start = time.perf_counter()
+            quotes = await asyncio.gather(*(kalshi.fetch_latest(f"KXBTCD-26FEB1814-T{k}") for k in range(6)))
+            return quotes, time.perf_counter() - start, http.peak_in_flight["127.0.0.1"]
+        finally:
+            await http.close()
+
+    try:
+        quotes, elapsed, peak = asyncio.run(run())
+        assert [q.bid for q in quotes] == [0.40] * 6 and quotes[3].symbol == "KXBTCD-26FEB1814-T3"
+        # two waves of three instead of six sequential 200ms requests
+        assert peak == 3
+        assert elapsed < 0.9
+    finally:
+        server.shutdown()
+
+
+def test_deadline_returns_partial_results():
+    server, base = _serve()
+    _Handler.delay = {"/nws/stations/KNYC/observations/latest": 2.0}
+
+    async def run():
+        http = AsyncHTTP()
+        coinbase = CoinbaseProvider()
+        coinbase.BASE_URL = f"{base}/coinbase"
+        calls = {'spot': AsyncCoinbaseProvider(coinbase, http).fetch_latest(),
+                 'nws:KNYC': AsyncNWSProvider(_nws(base), http).fetch_latest("KNYC")}
+        try:
+            start = time.perf_counter()
+            return await gather_with_deadline(calls, 0.5), time.perf_counter() - start
+        finally:
+            await http.close()
+
+    try:
+        results, elapsed = asyncio.run(run())
+        assert results['spot'].price == 97000.5
+        assert results['nws:KNYC'] is None
+        assert elapsed < 1.0
+    finally:
+        server.shutdown()
+
+
+def test_sync_adapter_keeps_data_provider_interface():
+    server, base = _serve()
+    runner = AsyncRunner()
+    try:
+        nws = _nws(base)
+        adapter = SyncProviderAdapter(AsyncNWSProvider(nws, AsyncHTTP()), runner)
+        assert adapter.connect()
+        assert nws.station_cache["KNYC"]["name"] == "Central Park"
+
+        md = adapter.fetch_latest("KNYC")
+        assert md.extra['temperature_f'] == 41.0 and md.extra['max_temp_today_f'] == 41.0
+        assert md.extra['forecast'][0]['temperature'] == 41 and md.extra['station_name'] == "Central Park"
+        # other coroutine methods become blocking calls
+        assert adapter.fetch_forecast("KNYC")[0]['name'] == "Today"
+        runner.run(adapter.http.close())
+    finally:
+        runner.close()
+        server.shutdown()
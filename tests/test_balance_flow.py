@@ -38,20 +38,19 @@ class TestBalanceFlow(unittest.TestCase):
 
     def test_basic_long_trade_flow_valid_pricing(self):
         print("\n--- Test 1B: Valid Pricing Long Trade ---")
-        # Strike 100. Entry 0.50. Cost $50 (100 qty).
-        self.rm.record_execution(50.0, "KXBTC-TEST-100", "buy", 100, 0.50)
+        # Strike 100000. Entry 0.50. Cost $50 (100 qty).
+        self.rm.record_execution(50.0, "KXBTC-TEST-100000", "buy", 100, 0.50)
         self.assertEqual(self.rm.balance, 50.0)
         
-        # Spot moves to 105 (+5 over strike of 100).
-        # With tanh formula: diff=5, scale=1000 (BTC), norm=0.005
-        # tanh(0.005) ≈ 0.005, shift = 0.005 * 0.49 ≈ 0.00245
-        # estimated_price ≈ 0.50 + 0.00245 = 0.50245
-        # PnL = (0.50245 - 0.50) * 100 ≈ 0.245
+        # Spot moves to 100005 (+$5 over strike).
+        # Digital fair value N(d2) with the default 50% vol over the 60 min horizon:
+        # sigma*sqrt(T) ≈ 0.0053, d2 ≈ 0.007 -> estimated_price ≈ 0.503
+        # PnL = (0.503 - 0.50) * 100 ≈ 0.3
         
-        self.rm.update_market_data("BTC", 105.0)
+        self.rm.update_market_data("BTC", 100005.0)
         
         print(f"Unrealized after move: {self.rm.unrealized_pnl}")
-        # Tanh formula produces a small shift for small BTC moves relative to scale=1000
+        # A small BTC move relative to the 1h volatility produces a small shift
         self.assertGreater(self.rm.unrealized_pnl, 0.0)
         self.assertLess(self.rm.unrealized_pnl, 1.0)
         
@@ -0,0 +1,115 @@
+"""
+Candle backfill against a local Coinbase stand-in: paging, rate-limited
+concurrency, resume after a failed window, persistence and strategy hydration.
+"""
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from src.data.candle_store import CandleStore, backfill
+from src.data.coinbase_provider import CoinbaseProvider
+from src.strategies.crypto_strategy import CryptoArbitrageStrategy, CryptoHourlyStrategyV3
+
+END = 1_771_000_000 // 3600 * 3600   # a past hour (epoch s)
+START = END - 2000 * 60               # 2000 one-minute buckets -> 7 requests of <= 300
+
+
+def _quiet(t):
+    return t % 420 == 0  # minutes without trades have no candle
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests, fail_once, in_flight, peak = [], set(), 0, 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        query = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        start = int(datetime.fromisoformat(query['start']).timestamp())
+        last = int(datetime.fromisoformat(query['end']).timestamp())
+        g = int(query['granularity'])
+        cls = type(self)
+        with cls.lock:
+            cls.requests.append(start)
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+            failing = start in cls.fail_once
+            cls.fail_once.discard(start)
+        time.sleep(0.02)
+        with cls.lock:
+            cls.in_flight -= 1
+        if failing:
+            self.send_response(500)
+            self.end_headers()
+            return
+        # Coinbase: end inclusive, newest first, [time, low, high, open, close, volume]
+        body = [[t, 99.0, 101.0, 100.0, 1000 + t / 60, 1.5] for t in range(last, start - 1, -g) if not _quiet(t)]
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def _provider():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    provider = CoinbaseProvider("BTC-USD")
+    provider.BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    return server, provider
+
+
+def test_backfill_pages_resumes_and_persists(tmp_path):
+    server, provider = _provider()
+    _Handler.requests.clear()
+    _Handler.fail_once = {START + 300 * 60}
+    path = str(tmp_path / "BTC-USD_60.npz")
+    try:
+        store = CandleStore.load("BTC-USD", 60, path)
+        backfill(provider, store, START, END, workers=3, max_rps=200)
+        assert len(_Handler.requests) == 7 and 1 < _Handler.peak <= 3
+        # the failed window is the only gap left
+        assert store.missing(START, END) == [(START + 300 * 60, START + 600 * 60)]
+
+        # a fresh process resumes from disk and requests only that window
+        store = CandleStore.load("BTC-USD", 60, path)
+        _Handler.requests.clear()
+        backfill(provider, store, START, END, workers=3, max_rps=200)
+        assert _Handler.requests == [START + 300 * 60] and store.missing(START, END) == []
+
+        expected = [t for t in range(START, END, 60) if not _quiet(t)]
+        assert store.data[:, 0].tolist() == expected  # sorted, unique, quiet minutes not re-requested
+        assert backfill(provider, store, START, END) == 0 and len(_Handler.requests) == 1
+
+        window = store.window(END - 600, END)
+        assert window[:, 0].tolist() == [t for t in range(END - 600, END, 60) if not _quiet(t)]
+        np.testing.assert_allclose(window[:, 4], 1000 + window[:, 0] / 60)
+    finally:
+        server.shutdown()
+
+
+def test_merge_prefers_newer_rows_and_hydrates_strategies(tmp_path):
+    store = CandleStore("BTC-USD", 60, str(tmp_path / "c.npz"))
+    t = np.arange(END - 3600, END, 60, dtype=float)
+    rows = np.column_stack([t, t * 0, t * 0, t * 0, 97000 + np.arange(len(t)), t * 0])
+    assert store.merge(rows[::-1]) == 60
+    rows[-1, 4] = 1.0
+    assert store.merge(rows[-1:]) == 0 and store.data[-1, 4] == 1.0
+
+    times, prices = store.recent_closes(1800, now=END)
+    assert len(times) == 30 and times[-1] == datetime.fromtimestamp(END)
+
+    arb = CryptoArbitrageStrategy()
+    arb.hydrate(times, prices)
+    assert len(arb.price_history) == arb.window_size + 5 and arb.price_history[-1] == (times[-1], prices[-1])
+    hourly = CryptoHourlyStrategyV3()
+    hourly.hydrate(times, prices)
+    assert len(hourly.price_history) == 20 and hourly._predict_future_price(times[-1], times[-1]) is not None
@@ -0,0 +1,96 @@
+"""
+CoinbaseStreamProvider against the local replay server: level-2 book,
+ticker cache, 1 s spot resampling, reconnect and the REST fallback.
+"""
+import time
+from datetime import datetime
+
+from src.core.interfaces import MarketData
+from src.data.coinbase_stream import CoinbaseStreamProvider, Level2Book
+from src.data.replay_server import CoinbaseReplayServer
+
+RECORDING = [
+    {"type": "snapshot", "product_id": "BTC-USD",
+     "bids": [["97000.00", "0.5"], ["96999.50", "1.2"]], "asks": [["97001.00", "0.3"], ["97002.00", "2.0"]]},
+    {"type": "l2update", "product_id": "BTC-USD", "time": "2026-02-18T14:00:00.100Z",
+     "changes": [["buy", "97000.50", "0.4"], ["sell", "97001.00", "0"]]},
+    {"type": "ticker", "product_id": "BTC-USD", "sequence": 10, "price": "97000.10", "best_bid": "97000.00",
+     "best_ask": "97001.00", "volume_24h": "8123.5", "last_size": "0.01", "time": "2026-02-18T14:00:00.200Z"},
+    {"type": "ticker", "product_id": "BTC-USD", "sequence": 11, "price": "97000.60", "best_bid": "97000.50",
+     "best_ask": "97002.00", "volume_24h": "8123.6", "last_size": "0.02", "time": "2026-02-18T14:00:00.700Z"},
+    {"type": "ticker", "product_id": "BTC-USD", "sequence": 12, "price": "97003.00", "best_bid": "97002.50",
+     "best_ask": "97003.50", "volume_24h": "8123.7", "last_size": "0.05", "time": "2026-02-18T14:00:01.300Z"},
+    {"type": "ticker", "product_id": "ETH-USD", "sequence": 5, "price": "2700.00", "time": "2026-02-18T14:00:01.300Z"},
+]
+
+
+def _wait(predicate, timeout=3.0):
+    end = time.time() + timeout
+    while time.time() < end:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class _Rest:
+    """REST stand-in: counts fallbacks."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_latest(self, symbol=None):
+        self.calls += 1
+        return MarketData(symbol, datetime.now(), 96990.0, 0, 96989.0, 96991.0, {'source': 'live_coinbase'})
+
+
+def test_level2_book():
+    book = Level2Book()
+    book.apply_snapshot(RECORDING[0])
+    book.apply_changes(RECORDING[1]["changes"])
+    assert book.top() == (97000.5, 97002.0)
+    depth = book.depth(2)
+    assert depth['bids'].tolist() == [[97000.5, 0.4], [97000.0, 0.5]] and depth['asks'].shape == (1, 2)
+
+
+def test_stream_cache_depth_and_samples():
+    rest = _Rest()
+    with CoinbaseReplayServer(RECORDING) as server:
+        stream = CoinbaseStreamProvider(["BTC-USD"], rest=rest, ws_url=server.url)
+        # before the first message: pooled REST fallback
+        assert stream.fetch_latest().extra['source'] == 'live_coinbase' and rest.calls == 1
+
+        assert stream.connect()
+        assert _wait(lambda: stream.cached() is not None and stream.cached().price == 97003.0)
+        md = stream.fetch_latest()
+        assert (md.bid, md.ask) == (97000.5, 97002.0)  # top of the local book
+        assert md.extra['stream'] and md.volume == 8123.7 and rest.calls == 1
+        assert stream.depth(levels=1)['bids'].tolist() == [[97000.5, 0.4]]
+        # only the subscribed product arrives
+        assert stream.cached("ETH-USD") is None
+        assert server.commands[0]["channels"] == ["ticker", "level2_batch"]
+
+        # three trades in two seconds -> last price of each second
+        samples = stream.spot_samples()
+        assert [p for _, p in samples] == [97000.6, 97003.0]
+        assert stream.spot_samples(since=samples[-1][0]) == []
+
+        # live book changes land in milliseconds
+        server.inject({"type": "l2update", "product_id": "BTC-USD", "changes": [["buy", "97002.00", "1.0"]]})
+        assert _wait(lambda: stream.cached().bid == 97002.0, timeout=0.5)
+        stream.close()
+
+
+def test_reconnect_takes_fresh_snapshot():
+    with CoinbaseReplayServer(RECORDING) as server:
+        stream = CoinbaseStreamProvider(["BTC-USD"], ws_url=server.url, reconnect_delay=0.05)
+        assert stream.connect()
+        assert _wait(lambda: stream.depth() is not None)
+
+        server.drop_clients()
+        assert _wait(lambda: server.connections == 2 and stream.connected.is_set())
+        assert _wait(lambda: stream.depth() is not None and stream.cached().bid == 97000.5)
+        assert stream.stats['reconnects'] >= 1
+        # replayed tickers after the reconnect are not double counted in the trade history
+        assert len(stream.spot_samples()) == 2
+        stream.close()
@@ -0,0 +1,91 @@
+"""
+Joint condor construction: settlement payoff grid, joint leg choice and
+sizing against max_exposure_per_bracket, and atomic leg groups.
+"""
+import itertools
+import numpy as np
+from datetime import datetime, timedelta
+
+from src.core.interfaces import MarketData, EventSnapshot
+from src.strategies.bracket_strategy import (BracketStrategy, WeatherBracketStrategy, plan_condor,
+                                             settlement_outcomes, yes_payoff_grid)
+
+
+def test_payoff_grid_covers_every_settlement_region():
+    strikes = np.array([4.5, 5.0, 5.0, 5.5])
+    outcomes = settlement_outcomes(strikes)
+    assert np.allclose(outcomes, [3.5, 4.75, 5.25, 6.5])
+    grid = yes_payoff_grid(strikes, np.array([True, True, False, False]), outcomes)
+    assert grid.shape == (4, 4)
+    assert grid[:, 0].tolist() == [0, 1, 1, 1] and grid[:, 3].tolist() == [1, 1, 1, 0]
+
+
+def test_joint_sizing_shares_the_budget_across_legs():
+    strikes = np.array([4.0, 4.25, 5.25, 5.5])
+    is_above = np.array([False, False, True, True])
+    bids = np.array([0.10, 0.20, 0.25, 0.15])
+    plan = plan_condor(strikes, is_above, bids, is_above, ~is_above, budget=50.0, max_contracts=500)
+
+    # only one leg can settle YES, so the pair risks 1 - credit
+    assert (plan.above, plan.below) == (2, 1)
+    assert abs(plan.max_loss - (1.0 - 0.45)) < 1e-12
+    assert plan.quantity == int(50.0 / 0.55) and plan.quantity * plan.max_loss <= 50.0
+
+    # crossed legs can both lose: the grid charges the overlap
+    # (as a disjoint pair, 0.8 credit would risk only 0.2; crossed it risks 1.2)
+    crossed = plan_condor(np.array([4.5, 5.0]), np.array([True, False]), np.array([0.3, 0.5]),
+                          np.array([True, False]), np.array([False, True]), budget=50.0, max_contracts=500)
+    assert crossed.legs == [1] and abs(crossed.max_loss - 0.5) < 1e-12
+
+
+def test_plan_matches_brute_force():
+    rng = np.random.default_rng(11)
+    strikes = np.arange(60.0, 90.0, 2.0)
+    is_above = rng.random(len(strikes)) < 0.5
+    bids = np.round(rng.uniform(0.05, 0.6, len(strikes)), 2)
+    sell = rng.random(len(strikes)) < 0.7
+    plan = plan_condor(strikes, is_above, bids, sell & is_above, sell & ~is_above, budget=40.0, max_contracts=60)
+
+    outcomes = settlement_outcomes(strikes)
+    best = None
+    above = [None] + list(np.flatnonzero(sell & is_above))
+    below = [None] + list(np.flatnonzero(sell & ~is_above))
+    for a, b in itertools.product(above, below):
+        legs = [i for i in (a, b) if i is not None]
+        if not legs:
+            continue
+        pnl = [sum(bids[i] - (o > strikes[i] if is_above[i] else o < strikes[i]) for i in legs) for o in outcomes]
+        loss = max(0.0, -min(pnl))
+        qty = min(int(np.floor(40.0 / loss)), 60) if loss > 0.01 else 0
+        if qty < 5:
+            continue
+        key = (sum(bids[i] for i in legs) / loss, sum(bids[i] for i in legs))
+        if best is None or key > best[0]:
+            best = (key, legs, qty)
+    assert sorted(plan.legs) == sorted(best[1]) and plan.quantity == best[2]
+
+
+def test_bracket_strategy_emits_one_atomic_condor():
+    day = (datetime.now() + timedelta(days=1)).strftime("%y%b%d").upper()
+    quotes = [("B4.00", 0.12), ("B4.25", 0.20), ("T5.00", 0.30), ("T5.25", 0.18), ("T5.50", 0.11)]
+    markets = [MarketData(f"FED-{day}-{s}", datetime.now(), 0.0, 0, bid, bid + 0.03, {}) for s, bid in quotes]
+    strat = BracketStrategy()
+    assert 0 < strat._calculate_time_to_settlement(f"FED-{day}-T5.25") <= 48
+
+    sigs = strat.analyze_event(EventSnapshot.from_markets(markets), portfolio_balance=1000.0)
+    assert [s.symbol.split('-')[-1] for s in sigs] == ["T5.25", "B4.25"]
+    assert len({s.group_id for s in sigs}) == 1 and len({s.quantity for s in sigs}) == 1
+    assert abs(sigs[0].group_max_loss - sigs[0].quantity * (1.0 - 0.38)) < 1e-9
+    assert sigs[0].group_max_loss <= 1000.0 * strat.max_exposure_per_bracket
+    assert all(s.side == 'sell' and abs(s.stop_loss - (s.limit_price + 0.20)) < 1e-12 for s in sigs)
+
+
+def test_weather_condor_pairs_above_and_below_legs():
+    nws = {'source': 'live_nws', 'forecast': [{'isDaytime': True, 'temperature': 46}], 'portfolio_balance': 200.0}
+    quotes = [("T60", 0.10), ("T55", 0.12), ("T50", 0.30), ("B40", 0.09), ("B35", 0.14), ("B30", 0.05)]
+    markets = [MarketData(f"KXHIGHNY-26FEB18-{s}", datetime.now(), 0.0, 0, bid, bid + 0.05, {}) for s, bid in quotes]
+    weather = MarketData("KNYC", datetime.now(), 40.0, 0, 0.0, 0.0, nws)
+
+    sigs = WeatherBracketStrategy().analyze_event(EventSnapshot.from_markets(markets), weather)
+    assert [s.symbol.split('-')[-1] for s in sigs] == ["T55", "B35"]
+    assert sigs[0].quantity == sigs[1].quantity == int(200.0 * 0.05 / (1.0 - 0.26))
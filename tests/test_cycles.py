@@ -0,0 +1,94 @@
+"""
+Shared cycle tracking and TTL cooldowns: per-ticker cycle resolution,
+rollover events, flat memory on rolling 15m tickers.
+"""
+from datetime import datetime, timedelta, timezone
+
+import src.strategies.crypto_strategy as crypto_strategy
+from src.core.interfaces import MarketData
+from src.strategies.crypto_strategy import Crypto15mLateSniper, CryptoLongShotFader
+from src.strategies.cycles import CooldownMap, CycleTracker, series_period
+
+T0 = datetime(2026, 2, 28, 13, 0, 0)
+
+
+def _ticker(close: datetime) -> str:
+    return f"KXBTC15M-{close.strftime('%y%b%d%H%M').upper()}-{close.minute:02d}"
+
+
+def test_cycle_resolution_and_rollover():
+    assert series_period("KXBTC15M") == timedelta(minutes=15)
+    assert series_period("KXBTCD") is None
+
+    tracker = CycleTracker()
+    rolls = []
+    tracker.on_rollover(lambda prev, cur: rolls.append((prev and prev.key, cur.key)))
+
+    close = (T0 + timedelta(minutes=15)).replace(tzinfo=timezone.utc)
+    info, rolled = tracker.observe("KXBTC15M-26FEB281315-15", close.isoformat().replace('+00:00', 'Z'))
+    assert rolled and info.key == "KXBTC15M-26FEB281315"
+    assert info.start == info.close - timedelta(minutes=15)
+    assert info.minute_in_cycle(info.start + timedelta(minutes=11, seconds=30)) == 11
+    assert info.minute_in_cycle(info.close + timedelta(minutes=3)) == 14
+
+    # repeated ticks are cache hits; another strike of the same event is not a rollover
+    assert tracker.observe("KXBTC15M-26FEB281315-15") == (info, False)
+    assert tracker.observe("KXBTC15M-26FEB281315-T98000")[1] is False
+    assert tracker.observe("KXBTC15M-26FEB281330-30")[1] is True
+    assert rolls == [(None, "KXBTC15M-26FEB281315"), ("KXBTC15M-26FEB281315", "KXBTC15M-26FEB281330")]
+
+    # no close time known: wall clock grid
+    assert tracker.current.minute_in_cycle(datetime(2026, 2, 28, 13, 22)) == 7
+
+
+def test_cooldown_map_evicts_expired_keys():
+    cd = CooldownMap(600)
+    cd["A"] = T0
+    assert not cd.ready("A", T0 + timedelta(seconds=599))
+    assert cd.ready("A", T0 + timedelta(seconds=600)) and "A" not in cd
+    assert cd.ready("B", T0)
+
+
+def test_longshot_memory_stays_flat_over_weeks():
+    strat = CryptoLongShotFader(cooldown_seconds=600)
+    for i in range(4 * 24 * 14):  # two weeks of 15m tickers, one tick each minute 5
+        close = T0 + timedelta(minutes=15 * (i + 1))
+        md = MarketData(_ticker(close), close - timedelta(minutes=10), 0.0, 0, 0.05, 0.07, {})
+        assert len(strat.analyze(md)) == 1
+    assert len(strat._last_trade) == 1
+
+    md.timestamp += timedelta(minutes=1)
+    assert strat.analyze(md) == []
+
+
+class _Clock(datetime):
+    now_value = T0
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.now_value
+
+
+def test_late_sniper_rolls_cycles_from_close_time(monkeypatch):
+    monkeypatch.setattr(crypto_strategy, 'datetime', _Clock)
+    sniper = Crypto15mLateSniper()
+    close = T0 + timedelta(minutes=15)
+    close_iso = close.astimezone().astimezone(timezone.utc).isoformat()
+    md = lambda c, ci: MarketData(_ticker(c), T0, 0.0, 0, 0.80, 0.82, {'close_time': ci})
+
+    _Clock.now_value = T0 + timedelta(minutes=4)
+    assert sniper.analyze(md(close, close_iso)) is None  # too early
+
+    _Clock.now_value = T0 + timedelta(minutes=8)
+    sigs = sniper.analyze(md(close, close_iso))
+    assert sigs[0].contract_side == 'YES' and abs(sigs[0].limit_price - 0.82) < 1e-12
+    assert sniper.analyze(md(close, close_iso)) is None  # one entry per cycle
+
+    nxt = close + timedelta(minutes=15)
+    _Clock.now_value = close + timedelta(minutes=9)
+    assert sniper.analyze(md(nxt, nxt.astimezone().astimezone(timezone.utc).isoformat())) is not None
+    assert len(sniper.cycles._resolved) == 1
+
+    for i in range(500):
+        sniper._handle_position_close({'pnl': 1.0, 'entry_price': 0.8})
+    assert len(sniper._trade_history) == 200
@@ -0,0 +1,123 @@
+"""
+Remaining-day max distribution from the NWS hourly forecast: parsing,
+the vectorized P(high >= strike) against a scalar reference, provider
+ingestion (one parse per grid) and the strategy's use of it.
+"""
+import json
+import math
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import numpy as np
+
+import src.strategies.weather_strategy as weather_strategy
+from src.core.daily_max import DailyMaxErrorModel, DailyMaxForecast, HourlyForecast
+from src.core.interfaces import EventSnapshot, MarketData
+from src.data.nws_provider import NWSProvider
+from src.strategies.weather_strategy import WeatherArbitrageStrategyV2
+
+NOON = datetime(2026, 2, 17, 17, 0, tzinfo=timezone.utc).timestamp()  # 12:00 EST
+DAY_END = datetime(2026, 2, 18, 5, 0, tzinfo=timezone.utc).timestamp()
+
+
+def _periods(start, temps, unit="F"):
+    return [{"startTime": datetime.fromtimestamp(start + 3600 * i, tz=timezone.utc).isoformat(),
+             "temperature": t, "temperatureUnit": unit} for i, t in enumerate(temps)]
+
+
+def test_hourly_parsing_and_remaining_path():
+    periods = _periods(NOON - 7200, [40, 42, 45, 47, 46, 44] + [39] * 12)[::-1]
+    periods.append({"startTime": "2026-02-17T16:00:00+00:00", "temperature": {"unitCode": "wmoUnit:degC", "value": 10.0}})
+    hourly = HourlyForecast.from_periods(periods)
+    assert np.all(np.diff(hourly.starts) >= 0) and 50.0 in hourly.temps_f
+
+    dist = DailyMaxForecast(43.0, HourlyForecast.from_periods(_periods(NOON - 7200, [40, 42, 45, 47, 46, 44] + [39] * 30)),
+                            NOON + 1800, DAY_END)
+    # 10:00 and 11:00 are over, the 12:00 hour is still partly ahead, hours past LST midnight are not today
+    assert dist.path_f[0] == 45 and len(dist.path_f) == 12 and dist.peak_f == 47.0
+    assert dist.hours_to_peak == 0.5
+
+
+def test_prob_at_least_matches_scalar_reference():
+    dist = DailyMaxForecast(43.0, HourlyForecast.from_periods(_periods(NOON, [44, 46, 48, 47])), NOON, DAY_END)
+    model = DailyMaxErrorModel(bias_f=0.8, floor_sigma=1.2)
+    strikes = np.arange(38.0, 56.0, 0.5)
+    p = dist.prob_at_least(strikes, model)
+
+    sigma = math.sqrt(1.2 ** 2 + 0.6 ** 2 * 2.0)  # peak (48F) two hours out
+    ref = [1.0 if 43.0 >= k else 0.5 * math.erfc((k - (48 - 0.8)) / sigma / math.sqrt(2)) for k in strikes]
+    np.testing.assert_allclose(p, ref, atol=1e-6)
+    assert np.all(np.diff(p) <= 0)
+    # late evening: no forecast path left, the observed max decides
+    late = DailyMaxForecast(43.0, HourlyForecast.from_periods(_periods(NOON, [44])), DAY_END - 60, DAY_END)
+    assert late.peak_f is None and late.prob_at_least([42, 44]).tolist() == [1.0, 0.0]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    hits = {}
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        self.hits[path] = self.hits.get(path, 0) + 1
+        now = datetime.now(timezone.utc).timestamp() // 3600 * 3600
+        body = {
+            "/grid/hourly": {"properties": {"periods": _periods(now, [50, 52, 55, 53])}},
+            "/forecast": {"properties": {"periods": [{"isDaytime": True, "temperature": 54}]}},
+            "/stations/KNYC/observations/latest": {"properties": {"temperature": {"value": 10.0}}},
+        }.get(path, {"features": []})
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Cache-Control", "max-age=3600")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_provider_ingests_hourly_forecast_once_per_grid():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    nws = NWSProvider("(test, test@example.com)", ["KNYC", "KJFK"])
+    nws.BASE_URL = base
+    for station in ("KNYC", "KJFK"):  # two stations on one grid
+        nws.station_cache[station] = {"name": station, "forecast_url": f"{base}/forecast",
+                                      "forecast_hourly_url": f"{base}/grid/hourly", "time_zone": "America/New_York"}
+    try:
+        md = nws.fetch_latest("KNYC")
+        assert nws.fetch_hourly_forecast("KJFK") is nws.fetch_hourly_forecast("KNYC")
+        assert _Handler.hits["/grid/hourly"] == 1
+
+        dist = md.extra['daily_max_forecast']
+        assert dist.observed_max_f == 50.0 and dist.peak_f in (50.0, 52.0, 55.0, 53.0)
+        assert dist.prob_at_least([49.0])[0] == 1.0
+    finally:
+        server.shutdown()
+
+
+class _Noon(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 2, 17, 12, 0, 0)
+
+
+def test_strategy_prices_today_from_the_distribution(monkeypatch):
+    monkeypatch.setattr(weather_strategy, 'datetime', _Noon)
+    event = EventSnapshot.from_markets([
+        MarketData(f"KXHIGHNY-26FEB17-T{k}", _Noon.now(), 0.0, 0, bid, ask, {})
+        for k, bid, ask in [(42, 0.45, 0.50), (52, 0.45, 0.50)]])
+    dist = DailyMaxForecast(41.0, HourlyForecast.from_periods(_periods(NOON, [44, 46, 48, 47])), NOON, DAY_END)
+    nws = MarketData("KNYC", _Noon.now(), 40.0, 0, 0.0, 0.0, {
+        'source': 'live_nws', 'temperature_f': 40.0, 'max_temp_today_f': 41.0, 'daily_max_forecast': dist,
+        'forecast': [{'isDaytime': True, 'temperature': 48}]})
+    strat = WeatherArbitrageStrategyV2(error_tables=None)
+    strat.error_tables = None
+
+    scan = strat.scan_event(event, nws)
+    p_high = dist.prob_at_least(event.strikes, DailyMaxErrorModel.for_city(weather_strategy.CITY_CONFIG['KXHIGHNY']))
+    np.testing.assert_allclose(scan['forecast_yes_conf'], p_high)
+    assert scan['forecast_yes'].tolist() == [True, False] and scan['forecast_no'].tolist() == [False, True]
@@ -0,0 +1,125 @@
+"""
+Forecast-error lookup tables: prior behaviour, incremental harvest builds,
+persistence, and WeatherArbitrageStrategyV2 reading P(high >= strike).
+"""
+import numpy as np
+from datetime import datetime, date, timedelta, timezone
+
+import src.strategies.weather_strategy as weather_strategy
+from src.core.interfaces import MarketData
+from src.strategies.forecast_error import (ForecastErrorTables, forecast_harvest_rows, lead_bucket)
+from src.strategies.weather_strategy import WeatherArbitrageStrategyV2
+
+
+def _harvest(days, bias, city="KXHIGHNY", start=date(2026, 1, 1), lead=5.0):
+    rows = []
+    for d in range(days):
+        day = (start + timedelta(days=d)).isoformat()
+        forecast = 50 + (d % 7)
+        rows.append({'City': city, 'Kind': 'FORECAST', 'TargetDate': day, 'LeadHours': '30', 'Value': forecast - 4})
+        rows.append({'City': city, 'Kind': 'FORECAST', 'TargetDate': day, 'LeadHours': str(lead), 'Value': forecast})
+        rows.append({'City': city, 'Kind': 'OBS_MAX', 'TargetDate': day, 'LeadHours': '', 'Value': forecast + bias - 1})
+        rows.append({'City': city, 'Kind': 'OBS_MAX', 'TargetDate': day, 'LeadHours': '', 'Value': forecast + bias})
+    return rows
+
+
+def test_prior_only_tables_are_monotone_and_widen_with_lead():
+    tables = ForecastErrorTables()
+    strikes = np.arange(60.0, 81.0, 0.5)
+    near = tables.prob_at_least("KXHIGHNY", strikes, 70.0, 1.0)
+    far = tables.prob_at_least("KXHIGHNY", strikes, 70.0, 72.0)
+    assert np.all(np.diff(near) <= 1e-12) and np.all(np.diff(far) <= 1e-12)
+    assert near[0] > far[0] and near[-1] < far[-1]
+    assert tables.prob_at_least("KXHIGHNY", [40.0], 70.0, 1.0)[0] == 1.0
+    assert tables.prob_at_least("KXHIGHNY", [100.0], 70.0, 1.0)[0] == 0.0
+
+
+def test_harvest_build_is_incremental():
+    tables = ForecastErrorTables()
+    rows = _harvest(60, bias=3)
+    assert tables.add_harvest(rows, today=date(2026, 6, 1)) == 60
+    assert tables.add_harvest(rows, today=date(2026, 6, 1)) == 0
+    assert tables.sample_size("KXHIGHNY", 5.0) == 60
+    assert tables.sample_size("KXHIGHNY", 30.0) == 60
+
+    # the learned +3°F under-forecast dominates the prior
+    p = tables.prob_at_least("KXHIGHNY", [52.0, 53.0, 54.0], 50.0, 5.0)
+    assert p[0] > 0.9 and p[1] > 0.85 and p[2] < 0.2
+
+    # unsettled days (today or later) wait for a later rebuild
+    more = _harvest(2, bias=3, start=date(2026, 4, 1))
+    assert tables.add_harvest(more, today=date(2026, 4, 2)) == 1
+    assert tables.add_harvest(more, today=date(2026, 4, 5)) == 1
+    assert tables.sample_size("KXHIGHNY", 5.0) == 62
+
+
+def test_save_load_roundtrip(tmp_path):
+    path = str(tmp_path / "tables.npz")
+    tables = ForecastErrorTables()
+    tables.add_harvest(_harvest(20, bias=-2, city="KXHIGHCHI"), today=date(2026, 6, 1))
+    tables.save(path)
+
+    loaded = ForecastErrorTables.load(path)
+    assert loaded.processed == tables.processed
+    strikes = np.arange(40.0, 60.0)
+    assert np.allclose(loaded.prob_at_least("KXHIGHCHI", strikes, 50.0, 3.0),
+                       tables.prob_at_least("KXHIGHCHI", strikes, 50.0, 3.0))
+    assert ForecastErrorTables.load(str(tmp_path / "missing.npz")).cities == {}
+
+
+def test_forecast_harvest_rows():
+    now = datetime(2026, 2, 17, 9, 0)
+    periods = [
+        {'isDaytime': True, 'temperature': 48, 'startTime': '2026-02-17T06:00:00-05:00'},
+        {'isDaytime': False, 'temperature': 35, 'startTime': '2026-02-17T18:00:00-05:00'},
+        {'isDaytime': True, 'temperature': 51, 'startTime': '2026-02-18T06:00:00-05:00'},
+    ]
+    rows = forecast_harvest_rows("KXHIGHNY", periods, 46.4, now=now)
+    assert [(r[2], r[3], r[5]) for r in rows] == [
+        ('FORECAST', '2026-02-17', 48), ('FORECAST', '2026-02-18', 51), ('OBS_MAX', '2026-02-17', 46.4)]
+    assert float(rows[0][4]) == 14.98 and int(lead_bucket(float(rows[1][4]))) == 4
+
+
+def test_forecast_harvest_rows_use_the_station_lst_day():
+    # 01:30 UTC Feb 18 is still Feb 17 in Chicago (LST, UTC-6), whatever the host zone
+    now = datetime(2026, 2, 18, 1, 30, tzinfo=timezone.utc)
+    periods = [{'isDaytime': True, 'temperature': 40, 'startTime': '2026-02-18T06:00:00-06:00'}]
+    rows = forecast_harvest_rows("KXHIGHCHI", periods, 44.0, now=now, std_offset_sec=-6 * 3600)
+    assert [(r[2], r[3]) for r in rows] == [('FORECAST', '2026-02-18'), ('OBS_MAX', '2026-02-17')]
+    assert float(rows[0][4]) == 28.48  # to 23:59 CST on Feb 18
+
+
+class _Noon(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 2, 17, 12, 0, 0)
+
+
+def _nws_tick(strike, forecast):
+    return MarketData(
+        symbol=f"KXHIGHNY-26FEB18-T{strike}", timestamp=_Noon.now(), price=0.5, volume=0,
+        bid=0.40, ask=0.45,
+        extra={'source': 'live_nws', 'temperature_f': 40.0, 'max_temp_today_f': 41.0,
+               'forecast': [{'isDaytime': True, 'temperature': forecast}]})
+
+
+def test_strategy_uses_table_probability(monkeypatch):
+    monkeypatch.setattr(weather_strategy, 'datetime', _Noon)
+    warm = ForecastErrorTables()
+    warm.add_harvest(_harvest(60, bias=3, lead=20.0), today=date(2026, 6, 1))
+
+    strat = WeatherArbitrageStrategyV2(error_tables=warm)
+    sigs = strat.analyze(_nws_tick(50, 53))
+    assert len(sigs) == 1 and sigs[0].contract_side == 'YES'
+    expected = warm.prob_at_least("KXHIGHNY", [50.0], 53.0, 24.0)[0]
+    assert abs(sigs[0].confidence - expected) < 1e-12
+
+    # tables that learned a -6°F over-forecast see no edge in buying YES at 0.45
+    cold = ForecastErrorTables()
+    cold.add_harvest(_harvest(60, bias=-6, lead=20.0), today=date(2026, 6, 1))
+    assert WeatherArbitrageStrategyV2(error_tables=cold).analyze(_nws_tick(50, 53)) == []
+
+    # no tables: hand-set confidence path unchanged
+    legacy = WeatherArbitrageStrategyV2(error_tables=None)
+    legacy.error_tables = None
+    assert legacy.analyze(_nws_tick(50, 53))[0].confidence == min(0.95, 0.6 + (53.5 - 50) / 20) * 0.7
@@ -0,0 +1,124 @@
+"""
+Whole-event evaluation for the hourly BTC strategies.
+analyze_event(snapshot) must produce the same signals as analyzing each
+strike on its own, ranked best first.
+"""
+import numpy as np
+from datetime import datetime, timedelta
+
+import src.strategies.crypto_strategy as crypto_strategy
+from src.core.interfaces import MarketData, EventSnapshot
+from src.strategies.crypto_strategy import CryptoHourlyStrategy, CryptoHourlyStrategyV3
+
+
+class _InWindowDatetime(datetime):
+    """Pins now() to minute 5 so the V3 time-window filter is open."""
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 2, 17, 16, 5, 0)
+
+
+def _seed(strat, start=68000.0, step=2.0):
+    now = _InWindowDatetime.now()
+    strat.price_history = [(now - timedelta(minutes=20 - i), start + i * step) for i in range(20)]
+
+
+def _event_markets():
+    """Ladder around ~68.4k spot, with a mix of books (some one-sided, one missing no_ask)."""
+    rng = np.random.default_rng(7)
+    markets = []
+    for k, strike in enumerate(np.arange(67000.0, 70000.0, 100.0) - 0.01):
+        yes_bid = float(np.round(rng.uniform(0.0, 0.95), 2))
+        extra = {
+            'no_bid': float(np.round(rng.uniform(0.0, 0.95), 2)) if k % 5 else 0.0,
+            'close_time': '2026-02-17T17:00:00Z',
+        }
+        if k % 7:
+            extra['no_ask'] = float(np.round(rng.uniform(0.05, 0.99), 2))
+        markets.append(MarketData(
+            symbol=f"KXBTCD-26FEB1717-T{strike:.2f}",
+            timestamp=_InWindowDatetime.now(),
+            price=0.0, volume=0,
+            bid=yes_bid,
+            ask=float(np.round(min(yes_bid + rng.uniform(0.01, 0.2), 0.99), 2)),
+            extra=extra,
+        ))
+    rng.shuffle(markets)
+    return markets
+
+
+def _key(sig):
+    return (sig.symbol, sig.side, sig.contract_side, sig.limit_price, getattr(sig, 'stop_loss', None),
+            getattr(sig, 'expiration_time', None))
+
+
+def test_event_snapshot_sorts_strikes_and_defaults_no_side():
+    markets = _event_markets()
+    markets.append(MarketData("KXBTCD-26FEB1717-BAD", datetime.now(), 0.0, 0, 0.1, 0.2, {}))
+    event = EventSnapshot.from_markets(markets)
+
+    assert len(event) == 30
+    assert event.event_ticker == "KXBTCD-26FEB1717"
+    assert np.all(np.diff(event.strikes) > 0)
+    assert event.close_time == '2026-02-17T17:00:00Z'
+    assert np.isnan(event.no_ask).any()
+    assert all(s.endswith(f"T{k:.2f}") for s, k in zip(event.symbols, event.strikes))
+
+
+def test_v3_event_matches_per_strike_analyze(monkeypatch):
+    monkeypatch.setattr(crypto_strategy, 'datetime', _InWindowDatetime)
+    markets = _event_markets()
+
+    per_strike = CryptoHourlyStrategyV3(confidence_margin=50.0, obi_threshold=0.3)
+    _seed(per_strike)
+    expected = [sig for m in markets for sig in per_strike.analyze(m)]
+
+    whole = CryptoHourlyStrategyV3(confidence_margin=50.0, obi_threshold=0.3)
+    _seed(whole)
+    got = whole.analyze_event(EventSnapshot.from_markets(markets))
+
+    assert expected, "fixture should produce signals"
+    assert {'YES', 'NO'} <= {s.contract_side for s in got}
+    assert sorted(map(_key, got)) == sorted(map(_key, expected))
+
+
+def test_v3_scan_ranks_by_cushion_then_price(monkeypatch):
+    monkeypatch.setattr(crypto_strategy, 'datetime', _InWindowDatetime)
+    strat = CryptoHourlyStrategyV3(confidence_margin=50.0, obi_threshold=0.3)
+    _seed(strat)
+    event = EventSnapshot.from_markets(_event_markets())
+
+    scan = strat.scan_event(event, predicted_price=68500.0, current_spot=68380.0)
+    ranked = scan['rank']
+    assert len(ranked) == int((scan['bull'] | scan['bear']).sum())
+    assert np.all(np.diff(scan['cushion'][ranked]) <= 0)
+    assert not (scan['bull'] & ~scan['in_range']).any()
+    assert np.all(np.abs(scan['margin'][ranked]) > 50.0)
+
+    # analyze_event emits signals in the scan's rank order
+    predicted = strat._predict_future_price(_InWindowDatetime.now(), _InWindowDatetime(2026, 2, 17, 17))
+    live_rank = strat.scan_event(event, predicted, strat.price_history[-1][1])['rank']
+    assert [s.symbol for s in strat.analyze_event(event)] == [event.symbols[i] for i in live_rank]
+
+
+def test_v1_event_matches_per_strike_analyze(monkeypatch):
+    monkeypatch.setattr(crypto_strategy, 'datetime', _InWindowDatetime)
+    markets = _event_markets()
+
+    per_strike = CryptoHourlyStrategy(confidence_margin=50.0)
+    _seed(per_strike)
+    expected = [sig for m in markets for sig in per_strike.analyze(m)]
+
+    whole = CryptoHourlyStrategy(confidence_margin=50.0)
+    _seed(whole)
+    got = whole.analyze_event(EventSnapshot.from_markets(markets))
+
+    assert expected
+    assert {'buy', 'sell'} <= {s.side for s in got}
+    assert sorted(map(_key, got)) == sorted(map(_key, expected))
+
+
+def test_empty_event_or_no_history_yields_nothing():
+    strat = CryptoHourlyStrategyV3()
+    assert strat.analyze_event(EventSnapshot.from_markets([])) == []
+    assert strat.analyze_event(EventSnapshot.from_markets(_event_markets())) == []
@@ -0,0 +1,131 @@
+"""
+NWS conditional GETs against a local server that sends Cache-Control,
+Expires and ETag headers like api.weather.gov.
+"""
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from src.data.async_providers import AsyncHTTP, AsyncNWSProvider
+from src.data.http_cache import HttpCache, freshness_lifetime
+from src.data.nws_provider import NWSProvider
+
+OBS = {"properties": {"temperature": {"value": 5.0}, "textDescription": "Cloudy"}}
+HISTORY = {"features": []}
+FORECAST = {"properties": {"periods": [{"name": "Today", "temperature": 41, "isDaytime": True}]}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    hits = {}
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        self.hits[path] = self.hits.get(path, 0) + 1
+        host = self.headers['Host']
+        routes = {
+            # path: (body, cache headers)
+            "/stations/KNYC": ({"geometry": {"coordinates": [-73.97, 40.78]}, "properties": {"name": "Central Park"}},
+                               {"Cache-Control": "public, max-age=86400"}),
+            "/points/40.78,-73.97": ({"properties": {"forecast": f"http://{host}/gridpoints/OKX/33,37/forecast"}},
+                                     {"Cache-Control": "public, max-age=86400"}),
+            "/gridpoints/OKX/33,37/forecast": (FORECAST, {"Cache-Control": "public, max-age=3600", "ETag": '"f1"'}),
+            "/stations/KNYC/observations/latest": (OBS, {"Cache-Control": "max-age=0", "ETag": '"o1"'}),
+            "/stations/KNYC/observations": (HISTORY, {"Last-Modified": "Wed, 18 Feb 2026 14:00:00 GMT",
+                                                      "Cache-Control": "no-cache"}),
+        }
+        if path not in routes:
+            self.send_response(404)
+            self.end_headers()
+            return
+        body, headers = routes[path]
+        unchanged = (headers.get("ETag") and self.headers.get("If-None-Match") == headers["ETag"]) or \
+                    (headers.get("Last-Modified") and self.headers.get("If-Modified-Since") == headers["Last-Modified"])
+        payload = b"" if unchanged else json.dumps(body).encode()
+        self.send_response(304 if unchanged else 200)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    _Handler.hits = {}
+    nws = NWSProvider("(test, test@example.com)", ["KNYC"])
+    nws.BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    return server, nws
+
+
+def test_freshness_lifetime():
+    assert freshness_lifetime({"Cache-Control": "public, max-age=600", "Age": "100"}) == 500
+    assert freshness_lifetime({"Cache-Control": "max-age=600, no-cache"}) == 0
+    assert freshness_lifetime({"Expires": "Wed, 18 Feb 2026 14:05:00 GMT",
+                               "Date": "Wed, 18 Feb 2026 14:00:00 GMT"}) == 300
+    assert freshness_lifetime({}, default=30) == 30
+
+
+def test_entries_are_bounded_lru():
+    cache = HttpCache(max_entries=2)
+    fresh = {"Cache-Control": "max-age=60"}
+    cache.store("a", fresh, 1, 1)
+    cache.store("b", fresh, 2, 1)
+    assert cache.lookup("a") == 1  # "b" is now least recently used
+    cache.store("c", fresh, 3, 1)
+    assert len(cache) == 2 and cache.lookup("b") is None and cache.lookup("a") == 1
+    assert cache.stats['evicted'] == 1
+
+
+def test_forecast_reused_and_observations_revalidated():
+    server, nws = _serve()
+    try:
+        assert nws.connect()
+        for _ in range(3):
+            md = nws.fetch_latest("KNYC")
+            assert md.extra['temperature_f'] == 41.0 and md.extra['forecast'][0]['temperature'] == 41
+        hits = _Handler.hits
+        # forecast fresh for an hour: one request; latest observation revalidated every tick (304s);
+        # the ?start= history is a plain GET and never enters the cache
+        assert hits["/gridpoints/OKX/33,37/forecast"] == 1
+        assert hits["/stations/KNYC/observations/latest"] == 3 and hits["/stations/KNYC/observations"] == 3
+        assert not any("?start=" in url for url in nws.http_cache._entries)
+        # a reconnect reuses the resolved station metadata
+        assert nws.connect() and hits["/stations/KNYC"] == 1
+
+        stats = nws.http_cache.stats
+        assert stats['requests_saved'] == 2 and stats['not_modified'] == 2  # two forecast reuses
+    finally:
+        server.shutdown()
+
+
+def test_async_provider_shares_the_cache():
+    server, nws = _serve()
+
+    async def run():
+        http = AsyncHTTP()
+        provider = AsyncNWSProvider(nws, http)
+        try:
+            assert await provider.connect()
+            first = await provider.fetch_latest("KNYC")
+            second = await provider.fetch_latest("KNYC")
+            return first, second, http.stats['requests']
+        finally:
+            await http.close()
+
+    try:
+        first, second, requests = asyncio.run(run())
+        assert first.extra['forecast'] == second.extra['forecast'] == FORECAST['properties']['periods']
+        assert _Handler.hits["/gridpoints/OKX/33,37/forecast"] == 1
+        assert requests == 2 + 1 + 2 * 2  # station + point, forecast once, two observation calls per tick
+        assert nws.http_cache.stats['not_modified'] == 1
+        # a sync call after the async ones is served from the same entries
+        nws.fetch_forecast("KNYC")
+        assert _Handler.hits["/gridpoints/OKX/33,37/forecast"] == 1
+    finally:
+        server.shutdown()
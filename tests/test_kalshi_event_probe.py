@@ -0,0 +1,79 @@
+"""
+BTC hourly discovery against a local V1 stand-in: candidate events are
+probed concurrently, found events are cached until they close and missing
+ones for EVENT_MISS_TTL_SEC.
+"""
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from src.data.kalshi_provider import KalshiProvider
+
+PROBE_DELAY = 0.2
+
+
+class _Handler(BaseHTTPRequestHandler):
+    events = {}
+    requests = []
+
+    def do_GET(self):
+        event = urlparse(self.path).path.rsplit("/", 1)[-1]
+        _Handler.requests.append(event)
+        time.sleep(PROBE_DELAY)
+        if event not in self.events:
+            self.send_response(404)
+            self.end_headers()
+            return
+        payload = json.dumps({"event": {"markets": self.events[event]}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def _v1_markets(event_ticker, close):
+    return [{"ticker_name": f"{event_ticker}-T{k}.00", "yes_bid": 40, "yes_ask": 44, "no_bid": 56, "no_ask": 60,
+             "last_price": 42, "volume": 5, "status": "active", "close_date": close}
+            for k in (97750, 98000, 98250)]
+
+
+def test_hourly_discovery_probes_concurrently_and_caches():
+    provider = KalshiProvider()
+    candidates = provider._btc_hourly_candidates()
+    in_an_hour = (datetime.now(timezone.utc) + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    closed = (datetime.now(timezone.utc) - timedelta(minutes=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    _Handler.events = {candidates[0]: _v1_markets(candidates[0], closed),
+                       candidates[1]: _v1_markets(candidates[1], in_an_hour)}
+    _Handler.requests = []
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    provider.V1_API_URL = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    try:
+        start = time.perf_counter()
+        markets = provider.fetch_btc_hourly_markets()
+        elapsed = time.perf_counter() - start
+
+        # closed markets are dropped; 12 probes ran side by side rather than 12 x 200ms
+        assert [m.symbol for m in markets] == [m["ticker_name"] for m in _Handler.events[candidates[1]]]
+        assert sorted(_Handler.requests) == sorted(candidates)
+        assert elapsed < PROBE_DELAY * 4
+
+        # next tick: everything answered from the cache
+        assert [m.symbol for m in provider.fetch_btc_hourly_markets()] == [m.symbol for m in markets]
+        assert len(_Handler.requests) == len(candidates)
+
+        # once the negative TTL lapses only the missing events are probed again; the found one is kept until close
+        provider._event_cache = {e: (0 if not v[1] else v[0], v[1]) for e, v in provider._event_cache.items()}
+        provider.fetch_btc_hourly_markets()
+        reprobed = _Handler.requests[len(candidates):]
+        assert candidates[1] not in reprobed and len(reprobed) == len(candidates) - 2
+    finally:
+        server.shutdown()
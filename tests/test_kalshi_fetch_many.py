@@ -0,0 +1,97 @@
+"""
+KalshiProvider.fetch_many against a local HTTP stand-in of the V2 listing
+and V1 event endpoints: chunking, cursor paging, event-level fallback and
+request counts.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src.data.kalshi_provider import KalshiProvider
+
+V2 = {f"KXHIGHNY-26FEB18-T{k}": {"ticker": f"KXHIGHNY-26FEB18-T{k}", "yes_bid": k, "yes_ask": k + 3,
+                                "no_bid": 97 - k, "no_ask": 100 - k, "last_price": k + 1, "volume": 10,
+                                "status": "active", "close_time": "2026-02-19T04:59:00Z"} for k in range(20, 80)}
+V1_EVENT = {"KXBTCD-26FEB1814": [{"ticker_name": f"KXBTCD-26FEB1814-T{k}.00", "yes_bid": 40, "yes_ask": 44,
+                                  "no_bid": 56, "no_ask": 60, "last_price": 42, "volume": 5, "status": "active",
+                                  "close_date": "2026-02-18T19:00:00Z"} for k in (97750, 98000, 98250)]}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests = []
+    page_size = 25
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        _Handler.requests.append(url.path)
+        if url.path == "/trade-api/v2/markets":
+            tickers = query["tickers"][0].split(",")
+            hits = [V2[t] for t in tickers if t in V2]
+            start = int(query.get("cursor", ["0"])[0])
+            page = hits[start:start + self.page_size]
+            cursor = str(start + self.page_size) if start + self.page_size < len(hits) else ""
+            body = {"markets": page, "cursor": cursor}
+        elif url.path.startswith("/v1/series/"):
+            event = url.path.rsplit("/", 1)[-1]
+            if event not in V1_EVENT:
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = {"event": {"markets": V1_EVENT[event]}}
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    provider = KalshiProvider(api_url=f"{base}/trade-api/v2")
+    provider.V1_API_URL = f"{base}/v1"
+    _Handler.requests = []
+    return server, provider
+
+
+def test_fetch_many_chunks_and_pages():
+    server, provider = _serve()
+    try:
+        tickers = list(V2)[:40] + ["KXHIGHNY-26FEB18-T999"]
+        provider.MAX_TICKERS_PER_REQUEST = 30
+        quotes = provider.fetch_many(tickers + tickers[:5])
+
+        assert set(quotes) == set(tickers[:40])
+        md = quotes["KXHIGHNY-26FEB18-T20"]
+        assert (md.bid, md.ask, md.price) == (0.20, 0.23, 0.21)
+        assert md.extra['no_ask'] == 0.80 and md.extra['close_time'] == "2026-02-19T04:59:00Z"
+        # 41 tickers: chunk of 30 (2 pages of 25) + chunk of 11; the unknown ticker's event is probed once
+        assert _Handler.requests.count("/trade-api/v2/markets") == 3
+        assert _Handler.requests.count("/v1/series/KXHIGHNY/events/KXHIGHNY-26FEB18") == 1
+    finally:
+        server.shutdown()
+
+
+def test_fetch_many_falls_back_to_event_listing():
+    server, provider = _serve()
+    try:
+        ladder = [m["ticker_name"] for m in V1_EVENT["KXBTCD-26FEB1814"]]
+        quotes = provider.fetch_many(["KXHIGHNY-26FEB18-T50"] + ladder)
+        assert set(quotes) == {"KXHIGHNY-26FEB18-T50", *ladder}
+        assert quotes[ladder[1]].extra['source'] == 'v1_discovery' and quotes[ladder[1]].bid == 0.40
+        # one listing request + one event request instead of four per-ticker GETs
+        assert len(_Handler.requests) == 2
+        assert provider.fetch_many([]) == {}
+    finally:
+        server.shutdown()
@@ -0,0 +1,133 @@
+"""
+KalshiStreamProvider against the local replay server: book/quote cache,
+dynamic subscriptions, reconnect + resubscribe, sequence-gap resync and the
+REST fallback for markets without live data.
+"""
+import time
+from datetime import datetime
+
+from src.core.interfaces import MarketData
+from src.data.kalshi_stream import KalshiStreamProvider, OrderBook
+from src.data.replay_server import KalshiReplayServer
+
+A = "KXBTC15M-26FEB281330-30"
+B = "KXBTCD-26FEB2814-T98000.00"
+
+RECORDING = [
+    {"type": "orderbook_snapshot", "msg": {"market_ticker": A, "yes": [[40, 10], [44, 25]], "no": [[50, 5], [53, 12]]}},
+    {"type": "orderbook_delta", "msg": {"market_ticker": A, "price": 45, "delta": 8, "side": "yes"}},
+    {"type": "orderbook_delta", "msg": {"market_ticker": A, "price": 53, "delta": -12, "side": "no"}},
+    {"type": "ticker", "msg": {"market_ticker": A, "price": 46, "yes_bid": 45, "yes_ask": 50, "volume": 1200}},
+    {"type": "ticker", "msg": {"market_ticker": B, "price": 31, "yes_bid": 30, "yes_ask": 33, "volume": 50}},
+]
+
+
+def _wait(predicate, timeout=3.0):
+    end = time.time() + timeout
+    while time.time() < end:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class _Rest:
+    """REST stand-in: counts fallbacks."""
+    api_url = None
+    anonymous = True
+
+    def __init__(self):
+        self.calls = []
+
+    def fetch_latest(self, symbol):
+        self.calls.append(symbol)
+        return MarketData(symbol, datetime.now(), 0.5, 0, 0.49, 0.51,
+                          {'status': 'active', 'close_time': '2026-02-28T18:30:00Z', 'source': 'live_kalshi'})
+
+    def fetch_many(self, tickers):
+        return {t: self.fetch_latest(t) for t in tickers}
+
+
+def test_order_book_top_of_book():
+    book = OrderBook()
+    book.apply_snapshot({"yes": [[40, 10], [44, 25]], "no": [[50, 5], [53, 12]]})
+    assert book.quote() == {'bid': 0.44, 'ask': 0.47, 'no_bid': 0.53, 'no_ask': 0.56}
+    book.apply_delta({"price": 53, "delta": -12, "side": "no"})
+    book.apply_delta({"price": 44, "delta": -5, "side": "yes"})
+    assert book.quote()['ask'] == 0.50 and book.yes[44] == 20
+
+
+def test_stream_cache_and_dynamic_subscriptions():
+    rest = _Rest()
+    with KalshiReplayServer(RECORDING) as server:
+        stream = KalshiStreamProvider(rest=rest, ws_url=server.url)
+        assert stream.connect()
+
+        # cold: served by REST once, then live from the book
+        assert stream.fetch_latest(A).extra['source'] == 'live_kalshi'
+        assert _wait(lambda: stream.cached(A) is not None)
+        md = stream.fetch_latest(A)
+        assert md.extra['source'] == 'live_kalshi_stream'
+        assert (md.bid, md.ask, md.price, md.volume) == (0.45, 0.50, 0.46, 1200)
+        assert md.extra['close_time'] == '2026-02-28T18:30:00Z' and md.extra['no_ask'] == 0.55
+
+        # a second market joins the existing subscriptions
+        stream.subscribe([B])
+        assert _wait(lambda: stream.cached(B) is not None)
+        assert stream.fetch_latest(B).ask == 0.33
+        assert any(c['cmd'] == 'update_subscription' and c['params']['market_tickers'] == [B] for c in server.commands)
+        assert rest.calls == [A]
+
+        # live updates land in milliseconds
+        server.inject({"type": "orderbook_delta", "msg": {"market_ticker": A, "price": 47, "delta": 3, "side": "yes"}})
+        assert _wait(lambda: stream.cached(A).bid == 0.47, timeout=0.5)
+
+        stream.unsubscribe([B])
+        assert B not in stream.tickers
+        stream.close()
+
+
+def test_reconnect_resubscribes_everything():
+    with KalshiReplayServer(RECORDING) as server:
+        stream = KalshiStreamProvider(ws_url=server.url, reconnect_delay=0.05)
+        stream.subscribe([A, B])
+        assert stream.connect()
+        assert _wait(lambda: stream.cached(B) is not None)
+
+        server.drop_clients()
+        assert _wait(lambda: server.connections == 2 and stream.connected.is_set())
+        assert _wait(lambda: stream.cached(A) is not None and stream.cached(A).bid == 0.45)
+        resubscribed = [c for c in server.commands if c['cmd'] == 'subscribe'][-1]
+        assert resubscribed['params']['market_tickers'] == sorted([A, B])
+        assert stream.stats['reconnects'] >= 1
+        stream.close()
+
+
+def test_sequence_gap_triggers_fresh_snapshot():
+    with KalshiReplayServer(RECORDING) as server:
+        stream = KalshiStreamProvider(ws_url=server.url)
+        stream.subscribe([A])
+        assert stream.connect()
+        assert _wait(lambda: stream.cached(A) is not None and stream.cached(A).bid == 0.45)
+
+        # a delta arrives with a missing sequence number: the book is rebuilt from a new snapshot
+        server.inject({"type": "orderbook_delta", "msg": {"market_ticker": A, "price": 48, "delta": 5, "side": "yes"}},
+                      seq_gap=True)
+        assert _wait(lambda: stream.stats['resyncs'] == 1)
+        assert _wait(lambda: any(c['cmd'] == 'unsubscribe' for c in server.commands))
+        assert _wait(lambda: stream.cached(A) is not None and stream.cached(A).bid == 0.45)
+        stream.close()
+
+
+def test_fetch_many_splits_live_and_cold_markets():
+    rest = _Rest()
+    with KalshiReplayServer(RECORDING) as server:
+        stream = KalshiStreamProvider(rest=rest, ws_url=server.url)
+        stream.subscribe([A])
+        assert stream.connect()
+        assert _wait(lambda: stream.cached(A) is not None)
+
+        quotes = stream.fetch_many([A, B, A])
+        assert quotes[A].extra['source'] == 'live_kalshi_stream' and quotes[B].extra['source'] == 'live_kalshi'
+        assert rest.calls == [B] and B in stream.tickers
+        stream.close()
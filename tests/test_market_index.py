@@ -0,0 +1,144 @@
+"""
+MarketIndex against a local V2 listing stand-in: in-memory resolution
+queries, persistence across restarts and incremental refreshes that only
+list markets past the close-time high-water mark.
+"""
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src.data.kalshi_provider import KalshiProvider
+from src.core.interfaces import EventSnapshot
+from src.data.market_index import RANKING_CRITERIA, MarketIndex, event_quotes, rank_markets
+
+NOW = time.time()
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _market(i, status="active"):
+    """KXBTC15M market i: the i-th 15 minute window relative to NOW."""
+    close = NOW + i * 900
+    return {"ticker": f"KXBTC15M-W{i + 100}-15", "event_ticker": f"KXBTC15M-W{i + 100}", "status": status,
+            "open_time": _iso(close - 900), "close_time": _iso(close), "expiration_time": _iso(close + 300),
+            "yes_bid": 40, "yes_ask": 44, "volume": 10}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    markets = []
+    requests = []
+    page_size = 50
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        _Handler.requests.append(query)
+        min_close = int(query.get("min_close_ts", ["0"])[0])
+        hits = [m for m in self.markets if m["ticker"].startswith(query["series_ticker"][0])
+                and datetime.fromisoformat(m["close_time"].replace("Z", "+00:00")).timestamp() >= min_close]
+        start = int(query.get("cursor", ["0"])[0])
+        more = start + self.page_size < len(hits)
+        payload = json.dumps({"markets": hits[start:start + self.page_size],
+                              "cursor": str(start + self.page_size) if more else ""}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_index_resolves_persists_and_refreshes_incrementally(tmp_path):
+    # 40 settled windows, the current one, and 80 upcoming (not yet open) ones
+    _Handler.markets = [_market(i, "settled") for i in range(-40, 0)] + [_market(i) for i in range(0, 81)]
+    _Handler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    provider = KalshiProvider(api_url=f"http://127.0.0.1:{server.server_address[1]}/trade-api/v2")
+    path = str(tmp_path / "KXBTC15M.json")
+    try:
+        index = MarketIndex("KXBTC15M", path)
+        assert index.refresh(provider, now=NOW) == 81
+        assert len(_Handler.requests) == 2
+
+        # the current window is the soonest-expiring active market; later windows are not open yet
+        assert index.soonest_active(NOW + 1)["ticker"] == "KXBTC15M-W101-15"
+        assert index.soonest_active(NOW + 901)["ticker"] == "KXBTC15M-W102-15"
+        assert [r["ticker"] for r in index.event_markets("KXBTC15M-W101", NOW + 1)] == ["KXBTC15M-W101-15"]
+        assert index.event_markets("KXBTC15M-W150", NOW + 1) == []
+        assert all(r["listed"] == NOW for r in index.records.values())
+        index.save()
+
+        # restart: loaded from disk, and the next refresh only lists the tail past the high-water mark
+        _Handler.markets.append(_market(81))
+        reloaded = MarketIndex.load("KXBTC15M", path)
+        assert len(reloaded) == 81 and reloaded.soonest_active(NOW + 1)["ticker"] == "KXBTC15M-W101-15"
+        before = len(_Handler.requests)
+        # the overlap hour (windows 76-80) plus the new window
+        assert reloaded.refresh(provider, now=NOW + 60) == 6
+        assert len(_Handler.requests) == before + 1
+        assert len(reloaded) == 82 and reloaded.stats['full_refreshes'] == 0
+        # only the re-listed tail has current quotes
+        assert reloaded.records["KXBTC15M-W180-15"]["listed"] == NOW + 60
+        assert reloaded.records["KXBTC15M-W101-15"]["listed"] == NOW
+    finally:
+        server.shutdown()
+
+
+def test_missing_index_file_is_empty(tmp_path):
+    index = MarketIndex.load("KXHIGHNY", str(tmp_path / "none.json"))
+    assert len(index) == 0 and index.soonest_active() is None and not index.is_fresh(300)
+
+
+def test_rank_markets_from_listing_quotes():
+    listing = [
+        {"ticker": "KXHIGHNY-26FEB18-B40.5", "yes_bid": 12, "yes_ask": 15, "volume": 900},
+        {"ticker": "KXHIGHNY-26FEB18-B42.5", "yes_bid": 47, "yes_ask": 55, "volume": 300},
+        {"ticker": "KXHIGHNY-26FEB18-B44.5", "yes_bid": 61, "yes_ask": 62, "volume": 40},
+        {"ticker": "KXHIGHNY-26FEB18-T46", "yes_bid": 0, "yes_ask": 3, "volume": None},
+    ]
+    top = {c: rank_markets(listing, c)[0]["ticker"][-5:] for c in RANKING_CRITERIA}
+    assert top == {"sentiment": "B44.5", "coinflip": "B42.5", "volume": "B40.5", "spread": "B44.5"}
+    # one-sided quotes cannot be ranked on mid or spread; custom criteria plug in as callables
+    assert len(rank_markets(listing, "spread")) == 3
+    assert rank_markets(listing, lambda m: -m["yes_ask"])[0]["ticker"].endswith("T46")
+
+
+def test_weather_event_resolved_from_the_index():
+    from scripts.run_dashboard import OrchestratorEngine
+
+    engine = OrchestratorEngine.__new__(OrchestratorEngine)
+    engine.ticker_cache = {}
+    index = MarketIndex("KXHIGHNY", "unused.json")
+    engine.market_indexes = {"KXHIGHNY": index}
+    dated = engine._weather_event_candidates("KXHIGHNY")
+    assert len(dated) == 2 and all(c.startswith("KXHIGHNY-") for c in dated)
+
+    # today's event already closed, so the index points at the next one; date probes stay as fallback
+    listing = [{"ticker": f"KXHIGHNY-EV{d}-B40.5", "event_ticker": f"KXHIGHNY-EV{d}", "status": "active",
+                "open_time": _iso(NOW + d * 86400 - 86400), "close_time": _iso(NOW + d * 86400)} for d in (0, 1)]
+    index.records = {r["ticker"]: r for r in map(MarketIndex._record, listing)}
+    index.updated = time.time()
+    index._rebuild()
+    candidates = engine._weather_event_candidates("KXHIGHNY")
+    assert candidates[0] == "KXHIGHNY-EV1" and candidates[1:] == dated
+
+
+def test_weather_lead_strike_ranks_the_snapshot_quotes():
+    from scripts.run_dashboard import OrchestratorEngine
+
+    event = EventSnapshot("KXHIGHNY-26FEB18", datetime.now(), ["KXHIGHNY-26FEB18-B40.5", "KXHIGHNY-26FEB18-B42.5",
+                                                               "KXHIGHNY-26FEB18-B44.5"],
+                          [40.5, 42.5, 44.5], [0.12, 0.47, 0.61], [0.15, 0.55, 0.62], [0.85, 0.45, 0.38],
+                          [float("nan")] * 3)
+    quotes = event_quotes(event)
+    assert quotes[1]["yes_bid"] == 47 and quotes[0]["no_ask"] is None
+    assert OrchestratorEngine._weather_lead_strike(event) == 2                    # sentiment: highest YES bid
+    assert OrchestratorEngine._weather_lead_strike(event, "coinflip") == 1
+    assert OrchestratorEngine._weather_lead_strike(event, "volume") == 2          # no volume in a snapshot
@@ -0,0 +1,102 @@
+"""
+Incremental NWS observation tracking: LST-day extremes, the ring buffer,
+velocity and the provider's backfill-then-`start=` history requests.
+"""
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from src.data.nws_provider import NWSProvider
+from src.data.observation_tracker import StationObservations, standard_utc_offset
+
+EST = -5 * 3600
+
+
+def _obs(iso, temp_c):
+    return {"timestamp": iso, "temperature": {"value": temp_c}}
+
+
+def test_lst_days_ignore_daylight_saving():
+    assert standard_utc_offset("America/New_York") == EST
+    tracker = StationObservations("KNYC", EST)
+    # 00:30 EDT on Jul 10 is still 23:30 EST on Jul 9 (the CLI day)
+    tracker.add([_obs("2026-07-10T04:30:00+00:00", 30.0), _obs("2026-07-09T18:00:00+00:00", 33.0),
+                 _obs("2026-07-10T05:10:00+00:00", 25.0)])
+    assert tracker.extremes == {"2026-07-09": (33.0, 30.0), "2026-07-10": (25.0, 25.0)}
+    now = datetime(2026, 7, 10, 4, 59, tzinfo=timezone.utc).timestamp()
+    assert tracker.daily_max(now) == 33.0 * 9 / 5 + 32 and tracker.daily_min(now) == 86.0
+    # older / duplicate observations are ignored once newer ones were seen
+    assert tracker.add([_obs("2026-07-09T19:00:00+00:00", 40.0)]) == 0
+
+
+def test_ring_buffer_and_velocity():
+    tracker = StationObservations("KNYC", EST, capacity=8)
+    base = 1_771_400_000
+    tracker.add([_obs(datetime.fromtimestamp(base + 300 * i, tz=timezone.utc).isoformat(), 10.0 + i)
+                 for i in range(12)])
+    times, temps = tracker.window(1e9, now=base + 3600)
+    assert len(tracker) == 8 and temps.tolist() == [14.0 + i for i in range(8)]
+    assert np.all(np.diff(times) > 0)
+    # +1 °C per 5 minutes = +21.6 °F per hour over the last hour
+    assert abs(tracker.velocity(now=base + 3300) - 21.6) < 1e-9
+    assert tracker.velocity(window_sec=300, now=base + 3300) is None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    features, starts = [], []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/stations/KNYC/observations":
+            start = datetime.fromisoformat(parse_qs(url.query)["start"][0].replace("Z", "+00:00")).timestamp()
+            self.starts.append(start)
+            features = [{"properties": f} for f in self.features
+                        if datetime.fromisoformat(f["timestamp"]).timestamp() >= start]
+            body = {"features": features[::-1]}
+        elif url.path == "/stations/KNYC/observations/latest":
+            body = {"properties": self.features[-1]}
+        else:
+            body = {"properties": {"periods": []}}
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_provider_backfills_once_then_fetches_only_new_observations():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    nws = NWSProvider("(test, test@example.com)", ["KNYC"])
+    nws.BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    nws.station_cache["KNYC"] = {"name": "Central Park", "forecast_url": f"{nws.BASE_URL}/forecast",
+                                 "time_zone": "America/New_York"}
+    now = time.time()
+    iso = lambda t: datetime.fromtimestamp(t, tz=timezone.utc).isoformat()
+    _Handler.features = [_obs(iso(now - 3000 + 600 * i), 10.0 + i) for i in range(5)]
+    _Handler.starts = []
+    try:
+        md = nws.fetch_latest("KNYC")
+        tracker = nws.observations["KNYC"]
+        lst_midnight = tracker.lst_day_start(now)
+        assert _Handler.starts[0] == lst_midnight - NWSProvider.BACKFILL_LEAD_SEC
+        assert md.extra['temperature_f'] == 14.0 * 9 / 5 + 32
+        assert md.extra['temp_velocity_f_per_hr'] > 0
+        today = [10.0 + i for i in range(5) if now - 3000 + 600 * i >= lst_midnight]
+        if today:
+            assert md.extra['max_temp_today_f'] == max(today) * 9 / 5 + 32
+
+        _Handler.features.append(_obs(iso(now - 10), 20.0))
+        md = nws.fetch_latest("KNYC")
+        assert abs(_Handler.starts[1] - (now - 600 + 1)) < 1  # only after the last seen observation
+        assert len(tracker) == 6 and md.extra['max_temp_today_f'] == 68.0
+    finally:
+        server.shutdown()
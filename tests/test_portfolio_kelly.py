@@ -0,0 +1,133 @@
+"""
+Portfolio Kelly for correlated binaries on one underlying: outcome grids,
+the projected Newton solver, and RiskManager's joint sizing.
+"""
+import time
+import numpy as np
+
+from src.core.interfaces import TradeSignal
+from src.core.portfolio_kelly import bet_returns, optimize_kelly, outcome_distribution, portfolio_kelly
+from src.core.risk_manager import RiskManager
+
+STRIKES = np.arange(67000.0, 70000.0, 100.0)
+SURVIVAL = 1.0 / (1.0 + np.exp((STRIKES - 68400.0) / 300.0))
+
+
+def test_outcome_distribution_regions():
+    outcomes, probs = outcome_distribution([5.0, 4.5, 5.5], [0.5, 0.8, 0.1])
+    assert np.allclose(outcomes, [4.25, 4.75, 5.25, 5.75])
+    assert np.allclose(probs, [0.2, 0.3, 0.4, 0.1]) and abs(probs.sum() - 1.0) < 1e-12
+
+
+def test_single_bet_reduces_to_classic_kelly():
+    # P(win) 0.7 at a 50c price: f* = p - q/b = 0.4
+    f = optimize_kelly(np.array([[1.0], [-1.0]]), [0.7, 0.3], max_fraction=1.0, max_total=0.9)
+    assert abs(f[0] - 0.4) < 1e-8
+
+    rm = RiskManager(starting_balance=1000.0)
+    sig = TradeSignal("KXBTCD-26FEB1717-T68000.00", "buy", 1, limit_price=0.50, confidence=0.55)
+    joint = rm.calculate_portfolio_kelly_sizes([sig], [67000.0, 69000.0], [0.45, 0.55])
+    assert joint == [rm.calculate_kelly_size(0.55, 0.50)]
+
+
+def test_correlated_duplicates_do_not_double_bet():
+    R = bet_returns([68000.0], [True], [True], [0.50], [67000.0, 69000.0])
+    single = optimize_kelly(R, [0.45, 0.55], max_fraction=1.0, max_total=0.9)
+    pair = optimize_kelly(np.hstack([R, R]), [0.45, 0.55], max_fraction=1.0, max_total=0.9)
+    assert abs(pair.sum() - single.sum()) < 1e-6
+
+
+def test_ladder_solve_is_fast_and_optimal():
+    rng = np.random.default_rng(0)
+    outcomes, probs = outcome_distribution(STRIKES, SURVIVAL)
+    holds_yes = rng.random(len(STRIKES)) < 0.5
+    fair_yes = np.clip(SURVIVAL + rng.normal(0.0, 0.05, len(STRIKES)), 0.03, 0.97)
+    costs = np.where(holds_yes, fair_yes, 1.0 - fair_yes)
+    R = bet_returns(STRIKES, np.ones(len(STRIKES), bool), holds_yes, costs, outcomes)
+
+    start = time.perf_counter()
+    f = optimize_kelly(R, probs, max_fraction=0.05 / 0.75, max_total=0.5 / 0.75)
+    assert time.perf_counter() - start < 0.1
+    assert f.min() >= 0 and f.max() <= 0.05 / 0.75 + 1e-12 and f.sum() <= 0.5 / 0.75 + 1e-12
+
+    growth = probs @ np.log1p(R @ f)
+    for _ in range(300):
+        x = np.clip(f + rng.normal(0.0, 0.01, len(f)), 0.0, 0.05 / 0.75)
+        x *= min(1.0, (0.5 / 0.75) / x.sum())
+        assert probs @ np.log1p(R @ x) <= growth + 1e-12
+
+    damped = portfolio_kelly(STRIKES, np.ones(len(STRIKES), bool), holds_yes, costs, outcomes, probs)
+    assert np.allclose(damped, np.minimum(0.75 * f, 0.05), atol=1e-9)
+
+
+def test_risk_manager_sizes_ladder_jointly():
+    rm = RiskManager(starting_balance=1000.0)
+    outcomes, probs = outcome_distribution(STRIKES, SURVIVAL)
+    # Three adjacent strikes quoted 10c cheap: independently each would take the 5% cap
+    sigs = [TradeSignal(f"KXBTCD-26FEB1717-T{k:.2f}", "buy", 1, limit_price=float(p - 0.10), confidence=float(p))
+            for k, p in zip(STRIKES[13:16], SURVIVAL[13:16])]
+    sizes = rm.calculate_portfolio_kelly_sizes(sigs, outcomes, probs)
+    independent = [rm.calculate_kelly_size(s.confidence, s.limit_price) for s in sigs]
+    stake = sum(q * s.limit_price for q, s in zip(sizes, sigs))
+    assert stake < sum(q * s.limit_price for q, s in zip(independent, sigs))
+    assert all(q * s.limit_price <= 1000.0 * rm.MAX_RISK_PER_TRADE_PCT + s.limit_price for q, s in zip(sizes, sigs))
+
+    # an overpriced NO leg adds nothing; YES + NO below $1 is a lock and is bet to the cap
+    rich = TradeSignal(sigs[1].symbol, "buy", 1, limit_price=float(1.0 - SURVIVAL[14] + 0.15), confidence=0.5)
+    rich.contract_side = 'NO'
+    assert rm.calculate_portfolio_kelly_sizes([sigs[1], rich], outcomes, probs)[1] == 0
+    cheap = TradeSignal(sigs[1].symbol, "sell", 1, limit_price=float(SURVIVAL[14] + 0.05), confidence=0.5)
+    sizes = rm.calculate_portfolio_kelly_sizes([sigs[1], cheap], outcomes, probs)
+    assert sizes[1] * (1.0 - cheap.limit_price) >= 1000.0 * rm.MAX_RISK_PER_TRADE_PCT - 1.0
+
+
+def _engine(tmp_path, monkeypatch):
+    """Bare orchestrator (no providers) around a real RiskManager and Dashboard, logging under tmp_path."""
+    from scripts.run_dashboard import OrchestratorEngine
+    from src.visualization.dashboard import Dashboard
+    monkeypatch.chdir(tmp_path)
+    engine = OrchestratorEngine.__new__(OrchestratorEngine)
+    engine.dashboard = Dashboard()
+    engine.risk_manager = RiskManager(starting_balance=1000.0)
+    return engine
+
+
+def test_hourly_buys_at_the_ask_are_sized(tmp_path, monkeypatch):
+    from datetime import datetime, timedelta
+    from src.core.interfaces import EventSnapshot
+    from src.core.pricing import EwmaVolatility
+    from src.core.probability_surface import ImpliedProbabilitySurface
+    from src.strategies.crypto_strategy import CryptoHourlyStrategyV3
+
+    strikes = np.arange(68000.0, 68900.0, 100.0)
+    mid = 1.0 / (1.0 + np.exp((strikes - 68400.0) / 200.0))
+    symbols = [f"KXBTCD-26FEB1717-T{k:.2f}" for k in strikes]
+    event = EventSnapshot("KXBTCD-26FEB1717", datetime.now(), symbols, strikes,
+                          mid - 0.02, mid + 0.02, 1.0 - mid - 0.02, 1.0 - mid + 0.02)
+    surface = ImpliedProbabilitySurface()
+    surface.update(event)
+
+    def buys():
+        return [TradeSignal(symbols[i], "buy", 5, limit_price=float(event.yes_ask[i]), confidence=0.8) for i in (2, 3, 4)]
+
+    # the ladder-implied distribution prices the asks at no edge: joint sizing alone would place nothing
+    implied = surface.outcome_distribution(event.event_ticker)
+    assert RiskManager(starting_balance=1000.0).calculate_portfolio_kelly_sizes(buys(), *implied) == [0, 0, 0]
+    signals = buys()
+    _engine(tmp_path, monkeypatch)._process_signals(signals, strategy_name="Crypto Hourly", outcome_model=implied)
+    assert all(s.quantity > 0 for s in signals)
+
+    # the strategy's own forecast (above the ladder) gives the buys an edge and sizes them jointly
+    strategy = CryptoHourlyStrategyV3()
+    strategy.last_forecast = (event.event_ticker, 68900.0, datetime.now() + timedelta(minutes=30))
+    model = strategy.outcome_model(event, EwmaVolatility())
+    assert all(RiskManager(starting_balance=1000.0).calculate_portfolio_kelly_sizes(buys(), *model))
+    signals = buys()
+    _engine(tmp_path, monkeypatch)._process_signals(signals, strategy_name="Crypto Hourly", outcome_model=model)
+    assert all(s.quantity > 0 for s in signals)
+
+
+def test_kelly_fraction_below_one_contract_is_not_rounded_up():
+    rm = RiskManager(starting_balance=10.0)
+    assert rm._kelly_quantity(0.001, 0.50) == 0
+    assert rm.calculate_kelly_size(0.51, 0.50) == 0
@@ -0,0 +1,88 @@
+"""
+Digital-option pricing used for OMS marks: normal CDF, streaming EWMA vol,
+N(d2) fair value, the temperature error model and the one-call-per-tick mark.
+"""
+import math
+import numpy as np
+from datetime import datetime, timedelta
+
+from src.core.matching_engine import SimulatedExchange
+from src.core.pricing import (norm_cdf, EwmaVolatility, digital_fair_value,
+                              TemperatureErrorModel, SECONDS_PER_YEAR)
+
+
+def test_norm_cdf_matches_erf():
+    x = np.linspace(-6, 6, 241)
+    exact = np.array([0.5 * (1 + math.erf(v / math.sqrt(2))) for v in x])
+    assert np.max(np.abs(norm_cdf(x) - exact)) < 2e-7
+
+
+def test_ewma_volatility_tracks_realized_vol():
+    rng = np.random.default_rng(3)
+    vol = EwmaVolatility(halflife_sec=600.0, prior_annual_vol=0.10)
+    true_vol, dt = 0.80, 5.0
+    t0, price = datetime(2026, 2, 17, 12), 68000.0
+    step_sd = true_vol * math.sqrt(dt / SECONDS_PER_YEAR)
+    for i in range(4000):
+        price *= math.exp(rng.normal(0.0, step_sd))
+        vol.update(price, t0 + timedelta(seconds=dt * i))
+    assert abs(vol.annualized - true_vol) < 0.12
+
+    # sub-interval ticks are absorbed, not treated as instantaneous returns
+    before = vol.var_per_sec
+    vol.update(price * 1.01, vol.last_time + timedelta(milliseconds=10))
+    assert vol.var_per_sec == before
+
+
+def test_digital_fair_value_shape():
+    strikes = np.linspace(66000, 70000, 81)
+    p = digital_fair_value(68000.0, strikes, 0.005, True)
+    assert np.all(np.diff(p) < 0)
+    assert abs(digital_fair_value(68000.0, 68000.0, 0.005, True) - 0.499) < 0.01
+    assert np.allclose(digital_fair_value(68000.0, strikes, 0.005, False), 1 - p)
+    # expired: intrinsic
+    assert np.array_equal(digital_fair_value(68000.0, [67000.0, 69000.0], 0.0, True), [1.0, 0.0])
+    # longer horizon pulls ITM strikes toward 0.5
+    assert digital_fair_value(68000.0, 67500.0, 0.02, True) < digital_fair_value(68000.0, 67500.0, 0.005, True)
+
+
+def test_temperature_error_model_widens_with_horizon():
+    model = TemperatureErrorModel()
+    sig = model.sigma([0.0, 1.0, 6.0, np.nan])
+    assert sig[0] == model.floor_sigma
+    assert np.all(np.diff(sig[:3]) > 0)
+    assert sig[3] == model.sigma(model.default_hours)
+    near, far = model.fair_value(80.0, 78.0, [0.5, 12.0], True)
+    assert near > far > 0.5
+
+
+def test_oms_marks_all_positions_in_one_call():
+    ex = SimulatedExchange()
+    ex.TAKE_PROFIT_PCT = ex.STOP_LOSS_PCT = 100.0
+    soon = datetime.now() + timedelta(minutes=2)
+    ex.open_position("KXBTCD-26FEB1717-T67000.00", "buy", 0.90, 1, expiration_time=soon, disable_profit_targets=True)
+    ex.open_position("KXBTCD-26FEB1717-T69000.00", "buy", 0.10, 1, expiration_time=soon, disable_profit_targets=True)
+    ex.open_position("KXBTCD-26FEB1717-T68010.00", "buy", 0.50, 1, disable_profit_targets=True)
+
+    calls = []
+    original = ex.pricer.mark
+    ex.pricer.mark = lambda *a, **k: calls.append(len(a[1])) or original(*a, **k)
+    ex.update_market("BTC", 68000.0)
+
+    assert calls == [3]
+    itm, otm, atm = (p['current_price'] for p in ex.positions)
+    assert itm == 0.99 and otm == 0.01
+    assert 0.40 < atm < 0.50
+
+
+def test_temperature_marks_respect_the_days_observed_max():
+    model = TemperatureErrorModel()
+    # afternoon cooling: reading 74F, high so far 79F
+    above, below = model.fair_value(74.0, [78.0, 82.0], 3.0, [True, False], observed_max=79.0)
+    assert above == 1.0 and below == 1.0 - model.fair_value(74.0, 82.0, 3.0, True)
+
+    ex = SimulatedExchange()
+    ex.TAKE_PROFIT_PCT = ex.STOP_LOSS_PCT = 100.0
+    ex.open_position("KXHIGHNY-26FEB17-T78", "buy", 0.60, 1, disable_profit_targets=True)
+    ex.update_market("TEMP_KNYC", 74.0, observed_max=79.0)
+    assert ex.positions[0]['current_price'] == 0.99
@@ -0,0 +1,99 @@
+"""
+Implied probability surface across BTC ladder strikes: monotone isotonic CDF,
+lazy incremental refits, fair-value queries and monotonicity (arbitrage) flags.
+"""
+import numpy as np
+from datetime import datetime
+
+from src.core.interfaces import MarketData, EventSnapshot
+from src.core.matching_engine import SimulatedExchange
+from src.core.probability_surface import ImpliedProbabilitySurface, isotonic_decreasing
+
+EVENT = "KXBTCD-26FEB1717"
+
+
+def _market(strike, bid, ask, no_bid=0.0):
+    return MarketData(f"{EVENT}-T{strike:.2f}", datetime.now(), 0.0, 0, bid, ask,
+                      {'no_bid': no_bid, 'close_time': '2026-02-17T17:00:00Z'})
+
+
+def _ladder():
+    # Mids: 0.90, 0.70, 0.40 (!), 0.50, 0.20 -> the 68000/68250 pair is inverted
+    return EventSnapshot.from_markets([
+        _market(67500, 0.88, 0.92),
+        _market(67750, 0.68, 0.72),
+        _market(68000, 0.38, 0.42),
+        _market(68250, 0.48, 0.52),
+        _market(68500, 0.18, 0.22),
+    ])
+
+
+def test_isotonic_fit_is_monotone_and_pools_violators():
+    fit = isotonic_decreasing(np.array([0.9, 0.7, 0.4, 0.5, 0.2]), np.ones(5))
+    assert np.all(np.diff(fit) <= 1e-12)
+    assert np.allclose(fit, [0.9, 0.7, 0.45, 0.45, 0.2])
+    # already monotone input is returned unchanged
+    y = np.array([0.95, 0.6, 0.3, 0.05])
+    assert np.allclose(isotonic_decreasing(y, np.array([1.0, 3.0, 2.0, 0.5])), y)
+
+
+def test_fair_value_interpolates_between_strikes():
+    surface = ImpliedProbabilitySurface()
+    assert surface.update(_ladder())
+
+    assert abs(surface.fair_value(f"{EVENT}-T67500.00") - 0.90) < 1e-9
+    assert abs(surface.fair_value(f"{EVENT}-T67625.00") - 0.80) < 1e-9
+    assert abs(surface.fair_value(f"{EVENT}-T68000.00") - 0.45) < 1e-9
+    # flat beyond the outermost strikes, and unknown events / B strikes are not covered
+    assert abs(surface.fair_value(f"{EVENT}-T90000.00") - 0.20) < 1e-9
+    assert surface.fair_value("KXBTCD-26FEB1718-T68000.00") is None
+    assert surface.fair_value(f"{EVENT}-B68000") is None
+
+    probs = surface.probabilities(EVENT, np.linspace(67000, 69000, 41))
+    assert np.all(np.diff(probs) <= 1e-12)
+
+
+def test_refresh_is_lazy_and_incremental():
+    surface = ImpliedProbabilitySurface()
+    surface.update(_ladder())
+    surface.fair_value(f"{EVENT}-T68000.00")
+    assert not surface.events[EVENT].dirty
+
+    # identical snapshot: nothing to refit
+    assert not surface.update(_ladder())
+    assert not surface.events[EVENT].dirty
+
+    # one strike re-quoted: marked dirty, refit on next query
+    assert surface.update_quote(f"{EVENT}-T68250.00", 0.33, 0.37)
+    assert surface.events[EVENT].dirty
+    assert abs(surface.fair_value(f"{EVENT}-T68250.00") - 0.35) < 1e-9
+    assert abs(surface.fair_value(f"{EVENT}-T68000.00") - 0.40) < 1e-9
+    assert not surface.update_quote(f"{EVENT}-T68250.00", 0.33, 0.37)
+    assert not surface.update_quote(f"{EVENT}-T99999.00", 0.5, 0.6)
+
+
+def test_violations_flag_inverted_pairs():
+    surface = ImpliedProbabilitySurface()
+    surface.update(_ladder())
+    found = surface.violations(EVENT)
+    assert [(v.lower_strike, v.upper_strike) for v in found] == [(68000.0, 68250.0)]
+    assert abs(found[0].edge - 0.10) < 1e-9
+    assert found[0].tradeable  # 68250 bid 0.48 > 68000 ask 0.42
+
+    surface.update_quote(f"{EVENT}-T68250.00", 0.40, 0.60)
+    found = surface.violations(EVENT)
+    assert len(found) == 1 and not found[0].tradeable
+
+
+def test_oms_marks_ladder_positions_from_surface():
+    surface = ImpliedProbabilitySurface()
+    surface.update(_ladder())
+    ex = SimulatedExchange()
+    ex.probability_surface = surface
+    ex.open_position(f"{EVENT}-T67750.00", "buy", 0.68, 10)
+    ex.open_position(f"{EVENT}-T67750.00", "buy", 0.29, 10, contract_side='NO')
+
+    ex.update_market("BTC", 67760.0)
+    yes_pos, no_pos = ex.positions
+    assert abs(yes_pos['current_price'] - 0.70) < 1e-9
+    assert abs(no_pos['current_price'] - 0.30) < 1e-9
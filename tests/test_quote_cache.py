@@ -0,0 +1,82 @@
+"""
+QuoteCache: TTL freshness, single-flight coalescing of concurrent requests
+and bulk fetches that only go to the source for missing quotes.
+"""
+import threading
+import time
+from datetime import datetime
+
+from src.core.interfaces import MarketData
+from src.data.quote_cache import QuoteCache
+
+
+class _Source:
+    """Slow provider stand-in that records every call."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    def _quote(self, symbol):
+        return MarketData(symbol, datetime.now(), 0.42, 0, 0.40, 0.44, {'source': 'live_kalshi'})
+
+    def fetch_latest(self, symbol):
+        self.calls.append([symbol])
+        time.sleep(self.delay)
+        return self._quote(symbol)
+
+    def fetch_many(self, tickers):
+        self.calls.append(list(tickers))
+        time.sleep(self.delay)
+        return {t: self._quote(t) for t in tickers if not t.endswith("-GONE")}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_hits_and_expiry():
+    source, clock = _Source(), _Clock()
+    cache = QuoteCache(source, ttl=2.0, clock=clock)
+
+    first = cache.fetch_latest("KXBTCD-T1")
+    clock.now = 1.5
+    assert cache.fetch_latest("KXBTCD-T1") is first
+    clock.now = 2.5
+    assert cache.fetch_latest("KXBTCD-T1") is not first
+    assert source.calls == [["KXBTCD-T1"], ["KXBTCD-T1"]]
+    assert cache.stats == {'hits': 1, 'misses': 2, 'coalesced': 0, 'fetches': 2}
+
+
+def test_concurrent_requests_share_one_fetch():
+    source = _Source(delay=0.2)
+    cache = QuoteCache(source)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.fetch_latest("KXBTC15M-A"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(source.calls) == 1
+    assert len(results) == 8 and all(r is results[0] for r in results)
+    assert cache.stats['misses'] == 1 and cache.stats['coalesced'] == 7
+
+
+def test_fetch_many_only_requests_missing_quotes():
+    source = _Source()
+    cache = QuoteCache(source)
+    # positions, then the 15m ticker + ladder in the same tick: the overlap is served from memory
+    cache.fetch_many(["KXBTCD-T1", "KXBTCD-T2"])
+    quotes = cache.fetch_many(["KXBTC15M-A", "KXBTCD-T1", "KXBTCD-T2", "KXBTCD-T3", "KXBTCD-T3-GONE"])
+
+    assert list(quotes) == ["KXBTC15M-A", "KXBTCD-T1", "KXBTCD-T2", "KXBTCD-T3"]
+    assert source.calls == [["KXBTCD-T1", "KXBTCD-T2"], ["KXBTC15M-A", "KXBTCD-T3", "KXBTCD-T3-GONE"]]
+    # unquotable tickers are not cached and are retried next time
+    cache.fetch_many(["KXBTCD-T1", "KXBTCD-T3-GONE"])
+    assert source.calls[-1] == ["KXBTCD-T3-GONE"]
+    assert cache.stats['hits'] == 3 and cache.hit_rate == 3 / 9
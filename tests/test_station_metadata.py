@@ -0,0 +1,89 @@
+"""
+On-disk NWS station metadata: first run resolves and persists, later runs
+connect without requests (even with NWS down), stale entries refresh in
+the background.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from src.data.nws_provider import NWSProvider
+
+STATIONS = {"KNYC": [-73.97, 40.78], "KDFW": [-97.03, 32.9]}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    hits = []
+    name_suffix = ""
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        self.hits.append(path)
+        station = path.rsplit("/", 1)[-1]
+        if station in STATIONS:
+            body = {"geometry": {"coordinates": STATIONS[station]},
+                    "properties": {"name": station + self.name_suffix, "timeZone": "America/Chicago"}}
+        elif path.startswith("/points/"):
+            body = {"properties": {"gridId": "OKX", "gridX": 33, "gridY": 37,
+                                   "forecast": "http://x/gridpoints/OKX/33,37/forecast",
+                                   "forecastHourly": "http://x/gridpoints/OKX/33,37/forecast/hourly"}}
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def _provider(base, path):
+    nws = NWSProvider("(test, test@example.com)", list(STATIONS), meta_path=path)
+    nws.BASE_URL = base
+    return nws
+
+
+def test_metadata_persists_and_revalidates(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    path = str(tmp_path / "nws_stations.json")
+    _Handler.hits = []
+    try:
+        assert _provider(base, path).connect()
+        assert len(_Handler.hits) == 4  # station + point for each
+        meta = json.load(open(path))["KDFW"]
+        assert (meta["grid_id"], meta["grid_x"], meta["grid_y"]) == ("OKX", 33, 37)
+        assert meta["forecast_hourly_url"].endswith("/forecast/hourly") and meta["time_zone"] == "America/Chicago"
+
+        # next start: no requests at all
+        _Handler.hits = []
+        nws = _provider(base, path)
+        assert nws.connect() and _Handler.hits == []
+        assert nws.station_cache["KNYC"]["name"] == "KNYC"
+
+        # stale: connect returns from disk at once, the refresh lands in the background
+        _Handler.name_suffix = " (renamed)"
+        nws = _provider(base, path)
+        nws.STATION_META_TTL_SEC = 0
+        assert nws.connect() and nws.station_cache["KNYC"]["name"] in ("KNYC", "KNYC (renamed)")
+        deadline = time.time() + 3
+        while time.time() < deadline and json.load(open(path))["KDFW"]["name"] != "KDFW (renamed)":
+            time.sleep(0.01)
+        assert json.load(open(path))["KDFW"]["name"] == "KDFW (renamed)"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # NWS unreachable: cached stations still connect (stale entries are kept)
+    nws = _provider(base, path)
+    nws.STATION_META_TTL_SEC = 0
+    assert nws.connect() and nws.station_cache["KDFW"]["forecast_url"]
+    time.sleep(0.2)
+    assert json.load(open(path))["KDFW"]["name"] == "KDFW (renamed)"
@@ -0,0 +1,68 @@
+"""
+Strategy registry: only enabled strategies are imported/constructed, heavy
+ML dependencies stay unloaded until first use, and load failures are
+reported instead of aborting startup.
+"""
+import os
+import subprocess
+import sys
+
+from src.strategies.registry import (ROLES, STRATEGY_REGISTRY, StrategyEntry, StrategyLoadReport, by_role,
+                                     load_strategies, resolve)
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _fresh_python(code: str) -> str:
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return out.stdout.strip()
+
+
+def test_every_entry_point_resolves_and_has_a_feed():
+    for name, entry in STRATEGY_REGISTRY.items():
+        assert isinstance(resolve(entry.entry_point), type), name
+        assert entry.role in ROLES, name
+        if entry.role in ("weather_event", "crypto_hourly"):
+            assert hasattr(resolve(entry.entry_point), "analyze_event"), name
+
+
+def test_enabled_subset_and_report():
+    report = StrategyLoadReport()
+    strategies = load_strategies(["longshot", "late_sniper", "nope"], report=report)
+    assert list(strategies) == ["longshot", "late_sniper"]
+    assert set(report.construct_seconds) == {"longshot", "late_sniper"}
+    assert report.failed == {"nope": "not registered"}
+    assert any("FAILED" in line for line in report.lines())
+
+    broken = load_strategies(["x"], registry={"x": StrategyEntry("src.strategies.crypto_strategy:Missing", "crypto_15m", "X")},
+                             report=report)
+    assert broken == {} and "x" in report.failed
+
+    # an entry the market loop has no feed for is rejected before it is imported
+    orphan = {"fed": StrategyEntry("src.strategies.bracket_strategy:BracketStrategy", "fed_rates", "Condor")}
+    assert load_strategies(["fed"], registry=orphan, report=report) == {}
+    assert report.failed["fed"] == "no feed for role 'fed_rates'"
+
+
+def test_dispatch_by_role_keeps_enabled_order():
+    strategies = load_strategies(["late_sniper", "weather", "crypto", "longshot"])
+    assert [label for _, label, _ in by_role(strategies, "crypto_15m")] == ["Late Sniper", "Trend Catcher V3", "LongShot Fader"]
+    assert [name for name, _, _ in by_role(strategies, "weather_event")] == ["weather"]
+
+
+def test_heavy_imports_are_deferred():
+    loaded = _fresh_python(
+        "import sys\n"
+        "from src.strategies.registry import load_strategies\n"
+        "s = load_strategies(['weather', 'crypto', 'crypto_hr', 'longshot', 'late_sniper', 'crypto_ml'])\n"
+        "label = s['crypto_ml'].name()\n"
+        "print(len(s), 'pandas' in sys.modules, 'joblib' in sys.modules, 'src.strategies.bracket_strategy' in sys.modules)")
+    assert loaded == "6 False False False"
+
+
+def test_ml_strategy_name_does_not_load_the_model(tmp_path):
+    strategy = load_strategies(["crypto_ml"])["crypto_ml"]
+    strategy.model_path = str(tmp_path / "crypto_rf.pkl")
+    assert strategy.name() == "The Satoshi Arbitrageur (Heuristic)"
+    (tmp_path / "crypto_rf.pkl").write_bytes(b"")
+    assert strategy.name() == "The Satoshi Arbitrageur (ML)" and not strategy._model_loaded
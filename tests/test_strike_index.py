@@ -0,0 +1,50 @@
+"""
+StrikeIndex queries checked against brute-force scans over the same ladder.
+"""
+from datetime import datetime
+
+import numpy as np
+
+from src.core.interfaces import EventSnapshot, MarketData
+from src.core.strike_index import StrikeIndex
+
+STRIKES = [97250.0, 97500.0, 97750.0, 98000.0, 98250.0, 98750.0]
+SYMBOLS = [f"KXBTCD-26FEB1814-T{k:.2f}" for k in STRIKES]
+
+
+def test_nearest_and_k_nearest_match_brute_force():
+    # built from unsorted tickers (plus an unparseable one, which is dropped)
+    index = StrikeIndex.from_symbols(SYMBOLS[::-1] + ["KXBTCD-26FEB1814-BAD"])
+    assert index.symbols == SYMBOLS
+
+    rng = np.random.default_rng(7)
+    spots = rng.uniform(96000, 100000, 500)
+    brute = np.argmin(np.abs(np.array(STRIKES)[None, :] - spots[:, None]), axis=1)
+    np.testing.assert_array_equal(index.nearest(spots), brute)
+    assert index.nearest(97625.0) == 1  # exact tie goes to the lower strike
+
+    for spot in spots[:50]:
+        expected = np.argsort(np.abs(np.array(STRIKES) - spot), kind='stable')[:4]
+        assert sorted(index.k_nearest(spot, 4)) == sorted(expected)
+        assert index.k_nearest(spot, 4)[0] == index.nearest(spot)
+    assert len(index.k_nearest(98000.0, 99)) == len(STRIKES)
+
+
+def test_band_offsets_and_ladder():
+    index = StrikeIndex(STRIKES, SYMBOLS)
+    assert index.strikes[index.band(97500, 98250)].tolist() == [97500.0, 97750.0, 98000.0, 98250.0]
+    assert index.band_mask(99000, 99500).sum() == 0
+
+    # 98250 has no +250 neighbour (98500 is not listed)
+    assert index.offsets(4, (-250, 250)) == [3, None]
+    assert index.ladder(98190.0) == [SYMBOLS[4], SYMBOLS[3]]
+    assert index.ladder(97760.0) == [SYMBOLS[2], SYMBOLS[1], SYMBOLS[3]]
+    assert index.center_range(2) == (97625.0, 97875.0)
+    assert index.center_range(0)[0] == -np.inf
+
+
+def test_event_snapshot_shares_one_index():
+    markets = [MarketData(s, datetime.now(), 0.5, 0, 0.4, 0.6, {}) for s in SYMBOLS]
+    event = EventSnapshot.from_markets(markets)
+    assert event.strike_index is event.strike_index
+    assert event.strike_index.ladder(98000.0) == [SYMBOLS[3], SYMBOLS[2], SYMBOLS[4]]
@@ -0,0 +1,129 @@
+"""
+Whole-event evaluation for the KXHIGH weather strategies.
+analyze_event(snapshot, nws) must produce the same signals as analyzing each
+strike on its own, ranked best first for the city.
+"""
+from datetime import datetime, timedelta
+
+import src.strategies.weather_strategy as weather_strategy
+from src.core.interfaces import MarketData, EventSnapshot
+from src.strategies.bracket_strategy import WeatherBracketStrategy
+from src.strategies.weather_strategy import WeatherArbitrageStrategyV2
+
+EVENT = "KXHIGHNY-26FEB17"
+
+
+class _Noon(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 2, 17, 12, 0, 0)
+
+
+def _nws(forecast=44):
+    return {'source': 'live_nws', 'temperature_f': 40.0, 'max_temp_today_f': 41.0,
+            'forecast': [{'isDaytime': True, 'temperature': forecast}]}
+
+
+def _markets():
+    quotes = [
+        ("T40", 0.85, 0.90),   # daily max 41 >= 40: won
+        ("T42", 0.45, 0.50),   # forecast 44.5 clears the strike by 2.5
+        ("T48", 0.45, 0.50),   # cooling and 8 below the strike
+        ("B39", 0.30, 0.35),   # below contract, max already above: lost
+        ("T55", 0.03, 0.06),   # too cheap to short, too early to fade
+        ("T60", 0.97, 0.99),   # near-resolved
+    ]
+    return [MarketData(f"{EVENT}-{s}", _Noon.now(), 0.0, 0, bid, ask, {}) for s, bid, ask in quotes]
+
+
+def _strategy():
+    strat = WeatherArbitrageStrategyV2(error_tables=None)
+    strat.error_tables = None
+    strat.temp_history["KXHIGHNY"] = [(_Noon.now() - timedelta(minutes=30), 43.0)]  # -6°F/hr
+    return strat
+
+
+def _key(sig):
+    return (sig.symbol, sig.side, sig.contract_side, round(sig.limit_price, 6), round(sig.confidence, 6),
+            getattr(sig, 'stop_loss', None))
+
+
+def test_event_scan_matches_per_strike_analyze(monkeypatch):
+    monkeypatch.setattr(weather_strategy, 'datetime', _Noon)
+    nws = MarketData("KNYC", _Noon.now(), 40.0, 0, 0.0, 0.0, _nws())
+
+    event_sigs = _strategy().analyze_event(EventSnapshot.from_markets(_markets()), nws)
+
+    per_strike = []
+    for m in _markets():
+        m.extra = _nws()
+        per_strike.extend(_strategy().analyze(m))
+
+    assert sorted(map(_key, event_sigs)) == sorted(map(_key, per_strike))
+    assert {s.symbol.split('-')[-1] for s in event_sigs} == {"T40", "T42", "T48"}
+
+
+def test_event_signals_ranked_by_expected_edge(monkeypatch):
+    monkeypatch.setattr(weather_strategy, 'datetime', _Noon)
+    nws = MarketData("KNYC", _Noon.now(), 40.0, 0, 0.0, 0.0, _nws())
+    sigs = _strategy().analyze_event(EventSnapshot.from_markets(_markets()), nws)
+
+    # cooling NO (0.85 - 0.55), winner YES (1.0 - 0.90), forecast YES (0.58 - 0.50)
+    assert [(s.symbol.split('-')[-1], s.contract_side) for s in sigs] == [("T48", "NO"), ("T40", "YES"), ("T42", "YES")]
+    assert sigs[0].stop_loss == 0.25 and abs(sigs[0].limit_price - 0.55) < 1e-12
+    edges = [s.confidence - s.limit_price for s in sigs]
+    assert edges == sorted(edges, reverse=True)
+
+
+def test_event_scan_gates(monkeypatch):
+    monkeypatch.setattr(weather_strategy, 'datetime', _Noon)
+    event = EventSnapshot.from_markets(_markets())
+    stale = MarketData("KNYC", _Noon.now(), 40.0, 0, 0.0, 0.0, dict(_nws(), source='cached'))
+    assert _strategy().analyze_event(event, stale) == []
+    assert _strategy().analyze_event(EventSnapshot.from_markets([]), stale) == []
+
+    # without a forecast only the guard / intraday rules trade
+    blind = MarketData("KNYC", _Noon.now(), 40.0, 0, 0.0, 0.0, dict(_nws(), forecast=[]))
+    sigs = _strategy().analyze_event(event, blind)
+    assert [s.symbol.split('-')[-1] for s in sigs] == ["T48", "T40"]
+
+
+def test_bracket_event_matches_per_strike_analyze():
+    markets = [MarketData(f"KXHIGHNY-26FEB18-{s}", datetime.now(), 0.0, 0, bid, bid + 0.05, {})
+               for s, bid in [("T60", 0.10), ("T55", 0.12), ("T50", 0.30), ("B40", 0.09), ("B30", 0.05)]]
+    nws = MarketData("KNYC", datetime.now(), 40.0, 0, 0.0, 0.0, _nws(forecast=46))
+    strat = WeatherBracketStrategy()
+
+    # no sellable "Below" leg (B30 premium too low, B40 inside the buffer): best single leg
+    sigs = strat.analyze_event(EventSnapshot.from_markets(markets), nws)
+    assert [s.symbol.split('-')[-1] for s in sigs] == ["T55"]
+
+    per_strike = []
+    for m in markets:
+        m.extra = _nws(forecast=46)
+        per_strike.extend(strat.analyze(m))
+    assert sorted(s.symbol.split('-')[-1] for s in per_strike) == ["T55", "T60"]
+
+
+def test_cities_analyzed_in_parallel_match_serial(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    monkeypatch.setattr(weather_strategy, 'datetime', _Noon)
+
+    def city_inputs(series):
+        markets = [MarketData(m.symbol.replace("KXHIGHNY", series), m.timestamp, 0.0, 0, m.bid, m.ask, {})
+                   for m in _markets()]
+        # provider-side velocity (observation ring buffer) replaces the strategy's own tick history
+        nws = MarketData("STN", _Noon.now(), 40.0, 0, 0.0, 0.0, dict(_nws(), temp_velocity_f_per_hr=-6.0))
+        return EventSnapshot.from_markets(markets), nws
+
+    inputs = {series: city_inputs(series) for series in weather_strategy.CITY_CONFIG}
+    serial = {series: _strategy().analyze_event(*args) for series, args in inputs.items()}
+    shared = WeatherArbitrageStrategyV2(error_tables=None)
+    shared.error_tables = None
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        jobs = {series: pool.submit(shared.analyze_event, *args) for series, args in inputs.items()}
+        parallel = {series: job.result() for series, job in jobs.items()}
+
+    for series in inputs:
+        assert list(map(_key, parallel[series])) == list(map(_key, serial[series]))
+        assert (parallel[series][0].symbol.split('-')[-1], parallel[series][0].contract_side) == ("T48", "NO")